@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Batch Result Journal
+
+Streams Message Batches API results to an append-only JSONL file, one line per
+processed request, instead of collecting every result in memory and writing one
+big JSON file at the end. Used by BatchQuestionBankExtender (qb_extender.py) and
+QuestionQCAnalyzerV3Batch (qc_pipeline).
+
+The journal doubles as the resume cursor: a line is appended only after its
+result has been fully processed, so a crashed retrieval re-opens the journal,
+skips every custom_id already in it and continues after the last one.
+
+Line format:
+    {"custom_id": "...", "record": {...}}
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+
+def repair_jsonl_tail(path: Path) -> None:
+    """Truncate a JSONL file after its last complete line (drops a torn final write)."""
+    path = Path(path)
+    if not path.exists():
+        return
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        # Scan back to the last complete line
+        pos = size - 1
+        chunk = 4096
+        while pos > 0:
+            start = max(0, pos - chunk)
+            f.seek(start)
+            data = f.read(pos - start)
+            idx = data.rfind(b'\n')
+            if idx != -1:
+                f.truncate(start + idx + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+
+class BatchResultJournal:
+    """
+    Append-only JSONL journal of processed batch results with a resume cursor.
+
+    Usage:
+        journal = BatchResultJournal(path)
+        new = journal.consume(client.messages.batches.results(batch_id), process)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.processed_ids: Set[str] = set()
+        self.last_custom_id: Optional[str] = None
+
+        self._repair_tail()
+        for custom_id, _ in self.iter_records():
+            self.processed_ids.add(custom_id)
+            self.last_custom_id = custom_id
+
+    def _repair_tail(self):
+        """Drop a partially written last line left behind by a crash."""
+        repair_jsonl_tail(self.path)
+
+    def __len__(self) -> int:
+        return len(self.processed_ids)
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (custom_id, record) for every journaled result, in order."""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                yield entry.get('custom_id', ''), entry.get('record', {})
+
+    def consume(
+        self,
+        results: Iterable[Any],
+        process: Callable[[Any], Dict[str, Any]]
+    ) -> int:
+        """
+        Process a stream of batch results, skipping those already journaled.
+
+        process(result) is called for each new result and must return a
+        JSON-serializable record; the record is journaled only after process
+        returns, so an interrupted result is retried on the next run.
+
+        Returns:
+            Number of results processed in this call
+        """
+        processed = 0
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for result in results:
+                custom_id = result.custom_id
+                if custom_id in self.processed_ids:
+                    continue
+
+                record = process(result)
+                f.write(json.dumps({'custom_id': custom_id, 'record': record}, ensure_ascii=False) + '\n')
+                f.flush()
+
+                self.processed_ids.add(custom_id)
+                self.last_custom_id = custom_id
+                processed += 1
+        return processed
@@ -26,7 +26,6 @@ import json
 import logging
 import os
 import random
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
@@ -34,6 +33,9 @@ import shutil
 
 from openai import AsyncOpenAI
 
+from llm_cache import LLMResponseCache, get_llm_cache, configure_llm_cache
+from rate_governor import get_rate_governor_for, governed_create, is_rate_limit_error
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -51,38 +53,6 @@ JITTER_FACTOR = 0.3
 DEFAULT_MODEL = "anthropic/claude-sonnet-4"
 
 
-class TokenBucketRateLimiter:
-    """Token bucket rate limiter for smooth request distribution."""
-    
-    def __init__(self, rate_per_minute: int = 25, burst_size: int = 5):
-        self.rate_per_second = rate_per_minute / 60.0
-        self.max_tokens = burst_size
-        self.tokens = burst_size
-        self.last_update = time.monotonic()
-        self._lock = asyncio.Lock()
-    
-    async def acquire(self):
-        """Wait until a token is available, then consume it."""
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self.last_update
-            self.tokens = min(self.max_tokens, self.tokens + elapsed * self.rate_per_second)
-            self.last_update = now
-            
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return
-            
-            wait_time = (1 - self.tokens) / self.rate_per_second
-            
-        if wait_time > 0:
-            await asyncio.sleep(wait_time)
-            
-        async with self._lock:
-            self.tokens = 0
-            self.last_update = time.monotonic()
-
-
 class ExplanationRewriter:
     """Rewrites question explanations for grade-level readability."""
     
@@ -97,14 +67,16 @@ class ExplanationRewriter:
         self.client = client
         self.model = model
         self.grade = grade
-        self.rate_limiter = TokenBucketRateLimiter(rate_per_minute, burst_size=5)
+        self.rate_governor = get_rate_governor_for(client, rpm=rate_per_minute)
         self.max_concurrent = max_concurrent
+        self.llm_cache = get_llm_cache()
         
         # Stats tracking
         self._stats = {
             'processed': 0,
             'skipped': 0,
             'errors': 0,
+            'cache_hits': 0,
             'total_time': 0
         }
     
@@ -206,16 +178,32 @@ D) {explanations.get('D', '')}
                 question, correct_answer, options, explanations, passage
             )
             
+            response_format = {"type": "json_object"}
+            cache_key = LLMResponseCache.make_key(
+                model=self.model, prompt=prompt, schema=response_format
+            )
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                self._stats['processed'] += 1
+                self._stats['cache_hits'] += 1
+                logger.info(f"✓ Rewrote {question_id} (cached)")
+                return {
+                    'question_id': question_id,
+                    'success': True,
+                    'rewritten': cached,
+                    'original': explanations
+                }
+            
             # Call API with retries
             for attempt in range(MAX_RETRIES):
                 try:
-                    await self.rate_limiter.acquire()
-                    
-                    response = await self.client.chat.completions.create(
+                    response = await governed_create(
+                        self.client.chat.completions,
+                        self.rate_governor,
                         model=self.model,
                         max_tokens=1000,
                         messages=[{"role": "user", "content": prompt}],
-                        response_format={"type": "json_object"},
+                        response_format=response_format,
                         extra_headers={
                             "HTTP-Referer": "https://github.com/playcademy",
                             "X-Title": "Explanation Rewriter"
@@ -224,6 +212,7 @@ D) {explanations.get('D', '')}
                     
                     response_text = response.choices[0].message.content
                     rewritten = json.loads(response_text)
+                    self.llm_cache.put(cache_key, rewritten, model=self.model)
                     
                     self._stats['processed'] += 1
                     logger.info(f"✓ Rewrote {question_id}")
@@ -243,6 +232,7 @@ D) {explanations.get('D', '')}
                         json_match = re.search(r'\{[^{}]*\}', response_text, re.DOTALL)
                         if json_match:
                             rewritten = json.loads(json_match.group())
+                            self.llm_cache.put(cache_key, rewritten, model=self.model)
                             self._stats['processed'] += 1
                             return {
                                 'question_id': question_id,
@@ -254,8 +244,7 @@ D) {explanations.get('D', '')}
                         pass
                     
                 except Exception as e:
-                    error_str = str(e)
-                    if '429' in error_str or 'rate' in error_str.lower():
+                    if is_rate_limit_error(e):
                         delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, JITTER_FACTOR), MAX_DELAY)
                         logger.warning(f"Rate limit for {question_id}, retry in {delay:.1f}s")
                         await asyncio.sleep(delay)
@@ -483,6 +472,7 @@ class RewritePipeline:
         logger.info("=" * 60)
         logger.info(f"Processed: {stats['processed']}")
         logger.info(f"Errors:    {stats['errors']}")
+        logger.info(f"Cached:    {stats['cache_hits']}")
         logger.info(f"Time:      {elapsed:.1f}s ({len(to_process) / elapsed:.1f} questions/sec)")
         logger.info(f"Output:    {self.output_path}")
         logger.info(f"Log:       {log_path}")
@@ -531,9 +521,17 @@ def main():
         default=20,
         help="Questions per batch for checkpointing (default: 20)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk LLM response cache (always call the API)"
+    )
     
     args = parser.parse_args()
     
+    if args.no_cache:
+        configure_llm_cache(enabled=False)
+    
     pipeline = RewritePipeline(args)
     asyncio.run(pipeline.run())
 
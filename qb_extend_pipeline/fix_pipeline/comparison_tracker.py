@@ -3,7 +3,8 @@
 Comparison Tracker Module
 
 Tracks before/after state for each fixed question.
-Generates comparison reports.
+Generates comparison reports (with a per-round convergence curve for
+multi-round fix runs).
 """
 
 import json
@@ -24,6 +25,9 @@ class ComparisonTracker:
         self.before_state: Dict[str, Dict[str, Any]] = {}
         self.after_state: Dict[str, Dict[str, Any]] = {}
         self.fix_attempts: List[Dict[str, Any]] = []
+        # Multi-round runs: one entry per round (round 0 = before fixing)
+        self.rounds: List[Dict[str, Any]] = []
+        self.stop_reason: Optional[str] = None
         
         # Create run directory
         self.run_dir.mkdir(parents=True, exist_ok=True)
@@ -72,11 +76,13 @@ class ComparisonTracker:
         question_id: str,
         fix_strategy: str,
         fixed_data: Optional[Dict[str, Any]],
-        success: bool
+        success: bool,
+        round_num: int = 1
     ) -> None:
         """Record a fix attempt."""
         attempt = {
             'question_id': question_id,
+            'round': round_num,
             'timestamp': datetime.now().isoformat(),
             'fix_strategy': fix_strategy,
             'success': success,
@@ -105,6 +111,14 @@ class ComparisonTracker:
                 reasons[check_name] = check_data.get('response', check_data.get('reasoning', ''))
         return reasons
     
+    def record_round(self, round_stats: Dict[str, Any]) -> None:
+        """Record one point of the convergence curve (pass rate, cost, ... after a round)."""
+        self.rounds.append(round_stats)
+        
+        path = self.run_dir / "convergence.json"
+        with open(path, 'w') as f:
+            json.dump({'rounds': self.rounds, 'stop_reason': self.stop_reason}, f, indent=2)
+    
     def save_before_state(self) -> None:
         """Save before state to file."""
         path = self.run_dir / "before_state.json"
@@ -117,6 +131,9 @@ class ComparisonTracker:
         
         # Calculate per-question comparisons
         questions = []
+        attempts_by_question: Dict[str, List[Dict[str, Any]]] = {}
+        for attempt in self.fix_attempts:
+            attempts_by_question.setdefault(attempt['question_id'], []).append(attempt)
         
         for question_id in self.before_state:
             before = self.before_state.get(question_id, {})
@@ -125,15 +142,14 @@ class ComparisonTracker:
             before_score = before.get('score', 0)
             after_score = after.get('score', 0)
             
-            # Find the fix attempt for this question
-            fix_attempt = next(
-                (a for a in self.fix_attempts if a['question_id'] == question_id),
-                {}
-            )
+            # The last fix attempt is the one the after state reflects
+            attempts = attempts_by_question.get(question_id, [])
+            fix_attempt = attempts[-1] if attempts else {}
             
             questions.append({
                 'question_id': question_id,
                 'fix_strategy': fix_attempt.get('fix_strategy', 'unknown'),
+                'fix_rounds': len(attempts),
                 'before': {
                     'score': before_score,
                     'failed_checks': before.get('failed_checks', []),
@@ -201,6 +217,11 @@ class ComparisonTracker:
             'by_check_improvement': check_improvement,
             'questions': questions
         }
+        if self.rounds:
+            report['convergence'] = {
+                'rounds': self.rounds,
+                'stop_reason': self.stop_reason
+            }
         
         return report
     
@@ -225,6 +246,14 @@ class ComparisonTracker:
         logger.info(f"Now passing: {summary['now_passing']} ({summary['improvement_rate']})")
         logger.info(f"Still failing: {summary['still_failing']}")
         logger.info(f"Average score: {summary['avg_score_before']:.2f} → {summary['avg_score_after']:.2f} (+{summary['avg_score_improvement']:.2f})")
+        if self.rounds:
+            logger.info(f"Convergence ({len(self.rounds) - 1} rounds, stopped: {self.stop_reason}):")
+            for r in self.rounds:
+                logger.info(
+                    f"  Round {r['round']}: pass rate {r['pass_rate']:.1%} "
+                    f"({r['pass_rate_gain']:+.1%}), avg score {r['avg_score']:.2f}, "
+                    f"cost ${r['spent_usd']:.2f}"
+                )
         
         return str(path)
 
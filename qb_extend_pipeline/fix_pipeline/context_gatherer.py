@@ -7,10 +7,15 @@ Gathers all necessary context for fixing a question:
 - Existing questions for uniqueness checking
 - Passage text
 - Metadata (DOK, CCSS, grade)
+
+QuestionIndex indexes the questions DataFrame once (question_id -> row,
+article_id -> rows, with DOK/CCSS sub-keys) so a lookup costs O(article size)
+instead of a scan of the whole bank.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -113,10 +118,168 @@ def format_existing_questions(existing_questions: List[Dict[str, Any]]) -> str:
     return "\n".join(lines)
 
 
+EXISTING_QUESTION_FIELDS = [
+    'question_id', 'question', 'DOK', 'CCSS', 'correct_answer',
+    'option_1', 'option_2', 'option_3', 'option_4'
+]
+
+
+class QuestionIndex:
+    """
+    Index over a questions DataFrame for context gathering.
+    
+    Keeps question_id -> row label and article_id -> row labels (plus
+    (article_id, DOK) and (article_id, CCSS) sub-keys), caches each article's
+    existing-question dicts and formatted blocks, and reads rows from the
+    DataFrame itself, so edits made in place are visible. Call update() after
+    editing a question to refresh its keys and its article's caches.
+    
+    Usage:
+        index = QuestionIndex(questions_df)
+        context = get_question_context(question_id, questions_df, index=index)
+        ...edit questions_df in place...
+        index.update(question_id)
+    """
+    
+    def __init__(self, questions_df: pd.DataFrame):
+        self.questions_df = questions_df
+        self.rebuild()
+    
+    def rebuild(self):
+        """Index every row (first row wins for duplicate question_ids)."""
+        self._row_by_id: Dict[Any, Any] = {}
+        self._position: Dict[Any, int] = {}
+        self._keys_by_row: Dict[Any, Tuple[Any, str, Any]] = {}
+        self._rows_by_article: Dict[Any, List[Any]] = defaultdict(list)
+        self._rows_by_article_dok: Dict[Tuple[Any, str], List[Any]] = defaultdict(list)
+        self._rows_by_article_ccss: Dict[Tuple[Any, Any], List[Any]] = defaultdict(list)
+        self._existing_cache: Dict[Any, Dict[Any, Dict[str, Any]]] = {}
+        self._formatted_cache: Dict[Tuple[Any, Any], str] = {}
+        
+        for position, (label, question_id) in enumerate(zip(self.questions_df.index, self.questions_df['question_id'])):
+            if question_id in self._row_by_id:
+                continue
+            self._row_by_id[question_id] = label
+            self._position[label] = position
+            self._add_keys(label)
+    
+    def _row_keys(self, label: Any) -> Tuple[Any, str, Any]:
+        df = self.questions_df
+        article_id = df.at[label, 'article_id'] if 'article_id' in df.columns else None
+        dok = str(df.at[label, 'DOK']) if 'DOK' in df.columns else ''
+        ccss = df.at[label, 'CCSS'] if 'CCSS' in df.columns else None
+        return article_id, dok, ccss
+    
+    def _add_keys(self, label: Any):
+        article_id, dok, ccss = keys = self._row_keys(label)
+        self._keys_by_row[label] = keys
+        position = self._position[label]
+        for rows in (
+            self._rows_by_article[article_id],
+            self._rows_by_article_dok[(article_id, dok)],
+            self._rows_by_article_ccss[(article_id, ccss)]
+        ):
+            # Keep DataFrame row order (appends during rebuild, in place when a row moves)
+            insert_at = len(rows)
+            while insert_at > 0 and self._position[rows[insert_at - 1]] > position:
+                insert_at -= 1
+            rows.insert(insert_at, label)
+    
+    def _remove_keys(self, label: Any):
+        article_id, dok, ccss = self._keys_by_row.pop(label)
+        self._rows_by_article[article_id].remove(label)
+        self._rows_by_article_dok[(article_id, dok)].remove(label)
+        self._rows_by_article_ccss[(article_id, ccss)].remove(label)
+    
+    def row_label(self, question_id: str) -> Optional[Any]:
+        """DataFrame row label of a question, or None if not found."""
+        return self._row_by_id.get(question_id)
+    
+    def article_id(self, question_id: str) -> Optional[Any]:
+        label = self._row_by_id.get(question_id)
+        return self._keys_by_row[label][0] if label is not None else None
+    
+    def get_question_data(self, question_id: str) -> Optional[Dict[str, Any]]:
+        """Same as get_question_data(), without scanning the DataFrame."""
+        label = self._row_by_id.get(question_id)
+        if label is None:
+            logger.warning(f"Question {question_id} not found in CSV")
+            return None
+        return self.questions_df.loc[label].to_dict()
+    
+    def _article_questions(self, article_id: str) -> Dict[Any, Dict[str, Any]]:
+        """Existing-question dicts by row label for every question in an article (cached)."""
+        cached = self._existing_cache.get(article_id)
+        if cached is None:
+            df = self.questions_df
+            labels = self._rows_by_article.get(article_id, [])
+            columns = {
+                field: (df.loc[labels, field].tolist() if field in df.columns else [''] * len(labels))
+                for field in EXISTING_QUESTION_FIELDS
+            }
+            cached = {
+                label: {field: columns[field][i] for field in EXISTING_QUESTION_FIELDS}
+                for i, label in enumerate(labels)
+            }
+            self._existing_cache[article_id] = cached
+        return cached
+    
+    def get_existing_questions(
+        self,
+        article_id: str,
+        exclude_question_id: Optional[str] = None,
+        dok: Optional[str] = None,
+        ccss: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Same as get_existing_questions(), over the article's rows only."""
+        if dok:
+            labels = self._rows_by_article_dok.get((article_id, str(dok)), [])
+        else:
+            labels = self._rows_by_article.get(article_id, [])
+        if ccss:
+            ccss_labels = set(self._rows_by_article_ccss.get((article_id, ccss), []))
+            labels = [label for label in labels if label in ccss_labels]
+        
+        questions = self._article_questions(article_id)
+        result = [
+            questions[label] for label in labels
+            if not exclude_question_id or questions[label]['question_id'] != exclude_question_id
+        ]
+        
+        logger.debug(f"Found {len(result)} existing questions for article {article_id}")
+        return result
+    
+    def format_existing_questions(self, article_id: str, exclude_question_id: Optional[str] = None) -> str:
+        """Formatted existing-questions block for an article (cached)."""
+        key = (article_id, exclude_question_id)
+        if key not in self._formatted_cache:
+            self._formatted_cache[key] = format_existing_questions(
+                self.get_existing_questions(article_id, exclude_question_id)
+            )
+        return self._formatted_cache[key]
+    
+    def update(self, question_id: str):
+        """Refresh a question's keys and its article's caches after it was edited in place."""
+        label = self._row_by_id.get(question_id)
+        if label is None:
+            return
+        
+        old_article_id = self._keys_by_row[label][0]
+        if self._row_keys(label) != self._keys_by_row[label]:
+            self._remove_keys(label)
+            self._add_keys(label)
+        
+        for article_id in {old_article_id, self._keys_by_row[label][0]}:
+            self._existing_cache.pop(article_id, None)
+            for key in [k for k in self._formatted_cache if k[0] == article_id]:
+                del self._formatted_cache[key]
+
+
 def get_question_context(
     question_id: str,
     questions_df: pd.DataFrame,
-    include_existing: bool = True
+    include_existing: bool = True,
+    index: Optional[QuestionIndex] = None
 ) -> Dict[str, Any]:
     """
     Get complete context for a question.
@@ -127,8 +290,13 @@ def get_question_context(
         - passage_text: The passage text
         - existing_questions: Other questions for same article (if include_existing)
         - formatted_existing: Formatted string of existing questions
+    
+    Pass index (built over questions_df) to look up without scanning the DataFrame.
     """
-    question_data = get_question_data(question_id, questions_df)
+    if index is not None:
+        question_data = index.get_question_data(question_id)
+    else:
+        question_data = get_question_data(question_id, questions_df)
     
     if question_data is None:
         return None
@@ -158,7 +326,13 @@ def get_question_context(
         'question_type': question_data.get('question_type', 'MCQ')
     }
     
-    if include_existing:
+    if include_existing and index is not None:
+        context['existing_questions'] = index.get_existing_questions(
+            context['article_id'],
+            exclude_question_id=question_id
+        )
+        context['formatted_existing'] = index.format_existing_questions(context['article_id'], question_id)
+    elif include_existing:
         existing = get_existing_questions(
             article_id=context['article_id'],
             questions_df=questions_df,
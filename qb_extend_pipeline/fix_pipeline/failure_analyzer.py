@@ -16,7 +16,9 @@ logger = logging.getLogger(__name__)
 CRITICAL_CHECKS = {
     'single_correct_answer',  # Multiple answers could be correct - fundamental issue
     'passage_reference',      # References non-existent content
-    'standard_alignment'      # Tests wrong skill
+    'standard_alignment',     # Tests wrong skill
+    'answer_in_options',      # Correct answer is not one of the options (cascade QC)
+    'unique_question'         # Exact duplicate of a sibling (cascade QC)
 }
 
 DISTRACTOR_CHECKS = {
@@ -25,7 +27,9 @@ DISTRACTOR_CHECKS = {
     'homogeneity',            # Mixed categories in options
     'specificity_balance',    # Uneven detail levels
     'too_close',              # Distractor too similar to correct
-    'length_check'            # Length imbalance
+    'length_check',           # Length imbalance
+    'distinct_options',       # Duplicate / near-duplicate options (cascade QC)
+    'explanations_present'    # Missing option explanations (cascade QC)
 }
 
 QUESTION_CLARITY_CHECKS = {
@@ -115,10 +119,15 @@ def determine_fix_strategy(failed_checks: Dict[str, Dict[str, Any]]) -> str:
     return 'distractor_fix'
 
 
-def analyze_question(question_result: Dict[str, Any]) -> Dict[str, Any]:
+def analyze_question(question_result: Dict[str, Any], escalate: bool = False) -> Dict[str, Any]:
     """
     Analyze a single failed question and prepare fix details.
     
+    Args:
+        question_result: QC result of the question
+        escalate: Use full regeneration whatever failed (an earlier
+            fix round did not make the question pass)
+    
     Returns:
         Dict with question_id, failed_checks, fix_strategy, and formatted failure details
     """
@@ -129,6 +138,9 @@ def analyze_question(question_result: Dict[str, Any]) -> Dict[str, Any]:
     
     # Determine strategy
     fix_strategy = determine_fix_strategy(failed_checks)
+    if escalate and fix_strategy == 'distractor_fix':
+        logger.debug(f"{question_id}: earlier fix did not pass -> full_regeneration")
+        fix_strategy = 'full_regeneration'
     
     # Categorize failures
     failed_distractor = set(failed_checks.keys()) & DISTRACTOR_CHECKS
@@ -10,6 +10,17 @@ Automatically fixes failed QC questions by:
 5. Updating all output files
 6. Generating before/after comparison report
 
+Fixes for different articles run concurrently (--max-concurrent-articles);
+questions within one article are fixed in order behind a per-article lock,
+so each fix sees its siblings as the previous fixes left them. Each
+article's fixes are re-QC'd as soon as its last fix lands, through one
+QC analyzer shared by the whole run.
+
+With --max-rounds N the questions that still fail after re-QC are fixed again
+(in memory, without reloading the CSV or QC JSON), escalating distractor
+fixes to full regeneration, until they all pass, a round gains less than
+--min-pass-rate-gain, or the --budget-usd estimate is spent.
+
 Usage:
     python -m fix_pipeline.fix_pipeline \
         --qc-results outputs/qc_results/question_qc_merged.json \
@@ -24,9 +35,10 @@ import json
 import asyncio
 import argparse
 import logging
+from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import pandas as pd
 from dotenv import load_dotenv
@@ -37,31 +49,28 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from qc_pipeline.utils import (
     compute_content_hash,
     extract_passage_title,
+    find_stale_checks,
+    question_input_fields,
     truncate_text
 )
 
 from fix_pipeline.failure_analyzer import (
-    load_qc_results,
+    PASS_THRESHOLD,
     get_failed_extended_questions,
     analyze_question,
     format_failure_reasoning
 )
-from fix_pipeline.context_gatherer import (
-    load_questions_csv,
-    get_question_context
-)
+from fix_pipeline.context_gatherer import get_question_context
 from fix_pipeline.question_fixer import (
     create_openrouter_client,
-    fix_question
-)
-from fix_pipeline.output_updater import (
-    backup_files,
-    update_questions_csv,
-    update_qc_merged,
-    regenerate_summary_csv,
-    regenerate_summary_report
+    fix_question,
+    get_fix_usage
 )
+from fix_pipeline.output_updater import backup_files, FixOutputStore
 from fix_pipeline.comparison_tracker import ComparisonTracker
+from fix_pipeline.qc_service import FixQCService
+from llm_cache import get_llm_cache, configure_llm_cache
+from rate_governor import estimate_cost_usd
 
 # Load environment variables
 ENV_FILE = Path(__file__).parent.parent / ".env"
@@ -76,6 +85,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _usage_cost_usd(
+    usage: Dict[str, Dict[str, int]],
+    baseline: Optional[Dict[str, Dict[str, int]]] = None
+) -> float:
+    """Estimated list-price cost of per-model usage (minus a baseline snapshot)."""
+    total = 0.0
+    for model, u in usage.items():
+        base = (baseline or {}).get(model, {})
+        total += estimate_cost_usd(
+            model,
+            u['input_tokens'] - base.get('input_tokens', 0),
+            u['output_tokens'] - base.get('output_tokens', 0)
+        ) or 0.0
+    return total
+
+
 class QuestionFixPipeline:
     """Main pipeline for fixing failed questions."""
     
@@ -84,12 +109,22 @@ class QuestionFixPipeline:
         qc_results_path: str,
         questions_csv_path: str,
         output_dir: str,
-        article_ids: Optional[List[str]] = None
+        article_ids: Optional[List[str]] = None,
+        max_concurrent_articles: int = 5,
+        checkpoint_every: int = 25,
+        max_rounds: int = 1,
+        budget_usd: Optional[float] = None,
+        min_pass_rate_gain: float = 0.02
     ):
         self.qc_results_path = Path(qc_results_path)
         self.questions_csv_path = Path(questions_csv_path)
         self.output_dir = Path(output_dir)
         self.article_ids = article_ids
+        self.max_concurrent_articles = max(1, max_concurrent_articles)
+        self.checkpoint_every = checkpoint_every
+        self.max_rounds = max(1, max_rounds)
+        self.budget_usd = budget_usd
+        self.min_pass_rate_gain = min_pass_rate_gain
         
         # Generate run ID
         self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -107,6 +142,9 @@ class QuestionFixPipeline:
         # Initialize client
         self.client = create_openrouter_client(self.api_key)
         
+        # Re-QC analyzer, clients and rate governors shared by every round
+        self.qc_service = FixQCService(self.client)
+        
         # Initialize tracker
         self.tracker = ComparisonTracker(self.run_dir, self.run_id)
         
@@ -115,19 +153,33 @@ class QuestionFixPipeline:
             'total_failed': 0,
             'attempted': 0,
             'fix_success': 0,
-            'fix_failed': 0
+            'fix_failed': 0,
+            'skipped_budget': 0,
+            'rounds': 0
         }
+        
+        # Multi-round state: current round, last strategy per question, API usage
+        self.round_num = 1
+        self._strategy_by_question: Dict[str, str] = {}
+        self._fix_usage_start = get_fix_usage()
     
     def load_data(self):
         """Load QC results and questions CSV."""
         logger.info("Loading data...")
         
-        # Load QC results
-        self.qc_results = load_qc_results(str(self.qc_results_path))
+        # Questions and QC results stay in memory for the whole run; edits are
+        # logged and flushed atomically (replaying edits from an interrupted run)
+        self.store = FixOutputStore(
+            str(self.questions_csv_path),
+            str(self.qc_results_path),
+            self.run_id,
+            checkpoint_every=self.checkpoint_every
+        )
+        self.qc_results = self.store.qc_results()
         logger.info(f"Loaded {len(self.qc_results)} QC results")
         
-        # Load questions CSV
-        self.questions_df = load_questions_csv(str(self.questions_csv_path))
+        self.questions_df = self.store.questions_df
+        self.question_index = self.store.index
         logger.info(f"Loaded {len(self.questions_df)} questions from CSV")
         
         # Get failed extended questions
@@ -135,14 +187,9 @@ class QuestionFixPipeline:
         
         # Filter by article IDs if specified
         if self.article_ids:
-            # Build a map of question_id -> article_id
-            qid_to_article = dict(zip(
-                self.questions_df['question_id'],
-                self.questions_df['article_id']
-            ))
             failed = [
                 q for q in failed
-                if qid_to_article.get(q['question_id']) in self.article_ids
+                if self.question_index.article_id(q['question_id']) in self.article_ids
             ]
             logger.info(f"Filtered to {len(failed)} questions from articles: {self.article_ids}")
         
@@ -170,12 +217,23 @@ class QuestionFixPipeline:
             'questions_csv_path': str(self.questions_csv_path),
             'output_dir': str(self.output_dir),
             'article_ids': self.article_ids,
+            'max_concurrent_articles': self.max_concurrent_articles,
+            'max_rounds': self.max_rounds,
+            'budget_usd': self.budget_usd,
+            'min_pass_rate_gain': self.min_pass_rate_gain,
             'total_failed': self.stats['total_failed']
         }
         
         with open(self.run_dir / "config.json", 'w') as f:
             json.dump(config, f, indent=2)
     
+    def spent_usd(self) -> float:
+        """Estimated API cost of this run so far (fix and re-QC calls, list prices)."""
+        return _usage_cost_usd(get_fix_usage(), self._fix_usage_start) + _usage_cost_usd(self.qc_service.usage)
+    
+    def budget_exhausted(self) -> bool:
+        return self.budget_usd is not None and self.spent_usd() >= self.budget_usd
+    
     async def fix_single_question(
         self,
         qc_result: Dict[str, Any],
@@ -191,20 +249,25 @@ class QuestionFixPipeline:
         question_id = qc_result.get('question_id', 'unknown')
         logger.info(f"[{question_num}/{total}] Processing {question_id}")
         
-        # Analyze failure
-        failure_details = analyze_question(qc_result)
+        # Analyze failure (after an earlier round's fix did not pass, regenerate)
+        failure_details = analyze_question(
+            qc_result,
+            escalate=question_id in self._strategy_by_question
+        )
+        self._strategy_by_question[question_id] = failure_details['fix_strategy']
         logger.info(f"  Strategy: {failure_details['fix_strategy']}")
         logger.info(f"  Failed checks: {failure_details['failed_check_names']}")
         
         # Get context
-        context = get_question_context(question_id, self.questions_df)
+        context = get_question_context(question_id, self.questions_df, index=self.question_index)
         if context is None:
             logger.error(f"  Could not get context for {question_id}")
-            self.tracker.record_fix_attempt(question_id, failure_details['fix_strategy'], None, False)
+            self.tracker.record_fix_attempt(question_id, failure_details['fix_strategy'], None, False, self.round_num)
             return None
         
-        # Record before state
-        self.tracker.record_before_state(question_id, qc_result, context.get('question_data'))
+        # Record before state (the original one, not a later round's)
+        if question_id not in self.tracker.before_state:
+            self.tracker.record_before_state(question_id, qc_result, context.get('question_data'))
         
         # Fix the question
         try:
@@ -216,16 +279,13 @@ class QuestionFixPipeline:
                     question_id, 
                     failure_details['fix_strategy'],
                     fixed_data,
-                    True
+                    True,
+                    self.round_num
                 )
                 
-                # Update CSV immediately
-                update_questions_csv(
-                    question_id,
-                    fixed_data,
-                    str(self.questions_csv_path),
-                    self.run_id
-                )
+                # Update the in-memory questions immediately, so the next fix
+                # in this article sees this sibling as just updated
+                self.store.apply_fix(question_id, fixed_data)
                 
                 self.stats['fix_success'] += 1
                 return fixed_data
@@ -235,7 +295,8 @@ class QuestionFixPipeline:
                     question_id,
                     failure_details['fix_strategy'],
                     None,
-                    False
+                    False,
+                    self.round_num
                 )
                 self.stats['fix_failed'] += 1
                 return None
@@ -246,53 +307,96 @@ class QuestionFixPipeline:
                 question_id,
                 failure_details['fix_strategy'],
                 None,
-                False
+                False,
+                self.round_num
             )
             self.stats['fix_failed'] += 1
             return None
     
+    async def fix_questions_by_article(
+        self,
+        failed: List[Dict[str, Any]]
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Fix failed questions, up to max_concurrent_articles articles at a time.
+        
+        Each question waits on its article's lock (FIFO, so questions keep their
+        order within an article), then on the shared article slots. Only the
+        uniqueness context within an article has to stay current, so different
+        articles never wait on each other beyond the concurrency limit. When an
+        article's last question is done, its fixes are re-QC'd while other
+        articles are still being fixed.
+        
+        Returns:
+            (IDs of successfully fixed questions in input order, their new QC results)
+        """
+        article_locks = defaultdict(asyncio.Lock)
+        article_slots = asyncio.Semaphore(self.max_concurrent_articles)
+        
+        article_of = {q.get('question_id'): self.question_index.article_id(q.get('question_id')) for q in failed}
+        remaining = Counter(article_of[q.get('question_id')] for q in failed)
+        fixed_by_article: Dict[Any, List[str]] = defaultdict(list)
+        qc_tasks = []
+        
+        logger.info(
+            f"\nFixing {len(failed)} questions from {len(remaining)} articles "
+            f"({self.max_concurrent_articles} articles at a time, in order within each article)..."
+        )
+        
+        async def fix_in_article(qc_result: Dict[str, Any], question_num: int) -> Optional[str]:
+            question_id = qc_result.get('question_id')
+            article_id = article_of[question_id]
+            fixed = None
+            async with article_locks[article_id]:
+                try:
+                    async with article_slots:
+                        if self.budget_exhausted():
+                            self.stats['skipped_budget'] += 1
+                        else:
+                            self.stats['attempted'] += 1
+                            fixed = await self.fix_single_question(qc_result, question_num, len(failed))
+                finally:
+                    if fixed:
+                        fixed_by_article[article_id].append(question_id)
+                    remaining[article_id] -= 1
+                    if remaining[article_id] == 0 and fixed_by_article[article_id]:
+                        qc_tasks.append(asyncio.create_task(self.qc_fixed_questions(fixed_by_article[article_id])))
+            return question_id if fixed else None
+        
+        fixed_ids = await asyncio.gather(*[
+            fix_in_article(qc_result, i) for i, qc_result in enumerate(failed, 1)
+        ])
+        new_qc_results = [result for results in await asyncio.gather(*qc_tasks) for result in results]
+        return [qid for qid in fixed_ids if qid], new_qc_results
+    
+    async def qc_fixed_questions(self, fixed_question_ids: List[str]) -> List[Dict[str, Any]]:
+        """Re-QC fixed questions, then record their after state and new QC results."""
+        new_qc_results = await self.run_qc_on_fixed(fixed_question_ids)
+        for result in new_qc_results:
+            question_id = result.get('question_id')
+            self.tracker.record_after_state(question_id, result)
+            
+            # Update QC results (in memory, journaled)
+            self.store.update_qc_result(question_id, result)
+        return new_qc_results
+    
     async def run_qc_on_fixed(self, fixed_question_ids: List[str]) -> List[Dict[str, Any]]:
         """
         Run QC on all fixed questions.
         
-        Uses V2 pipeline with OpenRouter.
+        Uses V2 pipeline with OpenRouter. Only the checks whose inputs the fix
+        changed are re-run (e.g. distractor checks after a distractor-only fix);
+        the rest are kept from the previous QC result.
         """
         if not fixed_question_ids:
             return []
         
         logger.info(f"\nRunning QC on {len(fixed_question_ids)} fixed questions...")
         
-        # Import QC modules
-        from qc_pipeline.modules.question_qc_v2_openrouter import QuestionQCAnalyzerV2OpenRouter
-        
-        # Get OpenAI key for supplementary checks
-        openai_key = os.getenv('OPENAI_API_KEY')
-        if not openai_key:
-            openai_keys = []
-            i = 1
-            while True:
-                key = os.getenv(f'OPENAI_API_KEY_{i}')
-                if key:
-                    openai_keys.append(key)
-                    i += 1
-                else:
-                    break
-            openai_key = openai_keys[0] if openai_keys else None
-        
-        from openai import AsyncOpenAI
-        openai_client = AsyncOpenAI(api_key=openai_key) if openai_key else None
-        
-        # Create analyzer
-        analyzer = QuestionQCAnalyzerV2OpenRouter(
-            openrouter_client=self.client,
-            openai_client=openai_client,
-            skip_openai=(openai_client is None)
-        )
-        
         # Prepare questions for QC
         questions_to_qc = []
         for qid in fixed_question_ids:
-            context = get_question_context(qid, self.questions_df, include_existing=False)
+            context = get_question_context(qid, self.questions_df, include_existing=False, index=self.question_index)
             if context:
                 questions_to_qc.append({
                     'question_id': qid,
@@ -304,15 +408,44 @@ class QuestionFixPipeline:
                         'choices': context.get('options', {}),
                         'correct_answer': context.get('correct_answer', ''),
                         'CCSS': context.get('CCSS', ''),
-                        'CCSS_description': '',
+                        'CCSS_description': (context.get('question_data') or {}).get('CCSS_description', ''),
                         'DOK': context.get('DOK', '')
-                    }
+                    },
+                    'explanations': context.get('explanations', {})
                 })
         
-        # Run QC
-        results = await analyzer.analyze_batch(questions_to_qc, concurrency=10)
+        # Split into full re-runs and stale-checks-only re-runs
+        previous = {}
+        for qid in fixed_question_ids:
+            existing = self.store.qc_result(qid)
+            if existing is not None:
+                previous[qid] = existing
+        questions_full = []
+        questions_partial = []
+        for q in questions_to_qc:
+            existing = previous.get(q['question_id'])
+            stale = find_stale_checks(existing.get('checks', {}), question_input_fields(q)) if existing else None
+            if stale is None or existing.get('cascade_stage') in ('local', 'cheap'):
+                # No fingerprinted result to compare against, or screened out
+                # before the full checks ran; screen again from scratch
+                questions_full.append(q)
+            else:
+                q['rerun_checks'] = stale
+                questions_partial.append(q)
+        if questions_partial:
+            logger.info(f"Re-running only stale checks for {len(questions_partial)} questions")
+        
+        # Run QC (shared analyzer: rate learned so far, shared concurrency limit)
+        results = await self.qc_service.analyze(questions_full, questions_partial, previous, self.run_id)
         
         # Add metadata (matching V2 pipeline output format)
+        self._add_result_metadata(results, questions_to_qc)
+        
+        logger.info(f"QC complete for {len(results)} questions")
+        return results
+    
+    def _add_result_metadata(self, results: List[Dict[str, Any]], questions_to_qc: List[Dict[str, Any]]):
+        """Add run_id, article_id, content_hash, passage_title and question_preview to QC results."""
         for result in results:
             qid = result['question_id']
             
@@ -324,8 +457,8 @@ class QuestionFixPipeline:
                     break
             
             # Get row from DataFrame
-            mask = self.questions_df['question_id'] == qid
-            row = self.questions_df[mask].iloc[0] if mask.any() else {}
+            idx = self.question_index.row_label(qid)
+            row = self.questions_df.loc[idx] if idx is not None else {}
             
             # Compute content hash
             if q_data:
@@ -348,9 +481,50 @@ class QuestionFixPipeline:
             result['content_hash'] = content_hash
             result['passage_title'] = extract_passage_title(passage_text, max_length=50)
             result['question_preview'] = truncate_text(question_text, max_length=60)
+    
+    def _convergence_point(
+        self,
+        round_num: int,
+        target_ids: List[str],
+        previous_pass_rate: float,
+        round_info: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Pass rate, average score and spend over the originally failed questions after a round."""
+        scores = [(self.store.qc_result(qid) or {}).get('overall_score', 0) for qid in target_ids]
+        passing = sum(1 for score in scores if score >= PASS_THRESHOLD)
+        pass_rate = passing / len(target_ids) if target_ids else 0.0
+        return {
+            'round': round_num,
+            **round_info,
+            'now_passing': passing,
+            'still_failing': len(target_ids) - passing,
+            'pass_rate': round(pass_rate, 4),
+            'pass_rate_gain': round(pass_rate - previous_pass_rate, 4),
+            'avg_score': round(sum(scores) / len(scores), 3) if scores else 0,
+            'spent_usd': round(self.spent_usd(), 4)
+        }
+    
+    async def run_round(self, round_num: int, failed: List[Dict[str, Any]], after_qc: Dict[str, Dict[str, Any]]):
+        """Fix the given failed questions, re-QC the fixes and update the in-memory results."""
+        self.round_num = round_num
+        self.stats['rounds'] = round_num
+        if self.max_rounds > 1:
+            logger.info(f"\n--- Round {round_num}/{self.max_rounds}: {len(failed)} failing questions ---")
+        
+        # Fix questions (articles in parallel, each article's questions in
+        # order); each article is re-QC'd as soon as its fixes are done
+        fixed_question_ids, new_qc_results = await self.fix_questions_by_article(failed)
+        
+        if new_qc_results:
+            for result in new_qc_results:
+                after_qc[result.get('question_id')] = result
+            
+            # Save new QC results (latest per question across rounds)
+            with open(self.run_dir / "after_qc.json", 'w') as f:
+                json.dump(list(after_qc.values()), f, indent=2)
         
-        logger.info(f"QC complete for {len(results)} questions")
-        return results
+        self.qc_results = self.store.qc_results()
+        return fixed_question_ids
     
     async def run(self):
         """Run the fix pipeline."""
@@ -365,6 +539,8 @@ class QuestionFixPipeline:
         
         if not failed:
             logger.info("No failed extended questions to fix!")
+            self.store.close()
+            await self.qc_service.close()
             return
         
         # Create backups
@@ -376,7 +552,7 @@ class QuestionFixPipeline:
         # Save before state
         for qc_result in failed:
             question_id = qc_result.get('question_id')
-            context = get_question_context(question_id, self.questions_df, include_existing=False)
+            context = get_question_context(question_id, self.questions_df, include_existing=False, index=self.question_index)
             if context:
                 self.tracker.record_before_state(
                     question_id,
@@ -385,58 +561,55 @@ class QuestionFixPipeline:
                 )
         self.tracker.save_before_state()
         
-        # Fix each question one at a time
-        logger.info(f"\nFixing {len(failed)} questions one at a time...")
-        
-        fixed_questions = []
-        fixed_question_ids = []
-        
-        for i, qc_result in enumerate(failed, 1):
-            self.stats['attempted'] += 1
-            
-            fixed = await self.fix_single_question(qc_result, i, len(failed))
+        # Fix rounds: each re-fixes the originally failed questions still below
+        # the pass threshold, with the data kept in memory between rounds
+        target_ids = [q['question_id'] for q in failed]
+        target_set = set(target_ids)
+        after_qc: Dict[str, Dict[str, Any]] = {}
+        point = self._convergence_point(0, target_ids, 0.0, {'attempted': 0, 'fixed': 0, 'strategies': {}})
+        self.tracker.record_round(point)
+        
+        for round_num in range(1, self.max_rounds + 1):
+            if self.budget_exhausted():
+                self.tracker.stop_reason = 'budget'
+                logger.info(f"Budget of ${self.budget_usd:.2f} spent (${self.spent_usd():.2f}), stopping")
+                break
             
-            if fixed:
-                fixed_questions.append(fixed)
-                fixed_question_ids.append(qc_result.get('question_id'))
+            attempted_before = self.stats['attempted']
+            fixed_question_ids = await self.run_round(round_num, failed, after_qc)
             
-            # Small delay between questions
-            await asyncio.sleep(0.5)
-        
-        # Run QC on fixed questions
-        if fixed_question_ids:
-            # Reload questions CSV to get updated data
-            self.questions_df = load_questions_csv(str(self.questions_csv_path))
-            
-            new_qc_results = await self.run_qc_on_fixed(fixed_question_ids)
+            failed = [
+                r for r in get_failed_extended_questions(self.qc_results)
+                if r.get('question_id') in target_set
+            ]
+            point = self._convergence_point(round_num, target_ids, point['pass_rate'], {
+                'attempted': self.stats['attempted'] - attempted_before,
+                'fixed': len(fixed_question_ids),
+                'strategies': dict(Counter(
+                    a['fix_strategy'] for a in self.tracker.fix_attempts if a.get('round') == round_num
+                ))
+            })
             
-            # Record after state and update QC files
-            for result in new_qc_results:
-                question_id = result.get('question_id')
-                self.tracker.record_after_state(question_id, result)
-                
-                # Update QC merged
-                update_qc_merged(
-                    question_id,
-                    result,
-                    str(self.qc_results_path)
-                )
+            if not failed:
+                self.tracker.stop_reason = 'all_passing'
+            elif round_num == self.max_rounds:
+                self.tracker.stop_reason = 'max_rounds'
+            elif point['pass_rate_gain'] < self.min_pass_rate_gain:
+                self.tracker.stop_reason = 'converged'
+            self.tracker.record_round(point)
+            logger.info(
+                f"Round {round_num}: pass rate {point['pass_rate']:.1%} ({point['pass_rate_gain']:+.1%}), "
+                f"{point['still_failing']} still failing, ${point['spent_usd']:.2f} spent"
+            )
+            if self.tracker.stop_reason:
+                break
             
-            # Save new QC results
-            with open(self.run_dir / "after_qc.json", 'w') as f:
-                json.dump(new_qc_results, f, indent=2)
+            # Checkpoint between rounds
+            self.store.flush()
         
-        # Regenerate summary files
-        qc_dir = self.qc_results_path.parent
-        regenerate_summary_csv(
-            str(self.qc_results_path),
-            str(qc_dir / "question_qc_merged_summary.csv")
-        )
-        regenerate_summary_report(
-            str(self.qc_results_path),
-            str(qc_dir / "summary_report.json"),
-            self.run_id
-        )
+        # Write questions CSV, QC merged and summary files in one atomic pass
+        self.store.close()
+        await self.qc_service.close()
         
         # Generate comparison report
         self.tracker.save_comparison_report()
@@ -449,6 +622,11 @@ class QuestionFixPipeline:
         logger.info(f"Attempted: {self.stats['attempted']}")
         logger.info(f"Fix success: {self.stats['fix_success']}")
         logger.info(f"Fix failed: {self.stats['fix_failed']}")
+        if self.max_rounds > 1 or self.budget_usd is not None:
+            logger.info(f"Rounds: {self.stats['rounds']} (stopped: {self.tracker.stop_reason})")
+            logger.info(f"Skipped (budget): {self.stats['skipped_budget']}")
+        logger.info(f"Estimated cost: ${self.spent_usd():.2f}")
+        logger.info(get_llm_cache().format_stats())
         logger.info(f"\nResults saved to: {self.run_dir}")
 
 
@@ -470,6 +648,13 @@ Examples:
         --questions outputs/qb_extended_combined.csv \\
         --output outputs/fix_results \\
         --article-ids article_101006,article_101007
+
+    # Keep fixing what still fails, up to 3 rounds or ~$20 of API calls
+    python -m fix_pipeline.fix_pipeline \\
+        --qc-results outputs/qc_results/question_qc_merged.json \\
+        --questions outputs/qb_extended_combined.csv \\
+        --output outputs/fix_results \\
+        --max-rounds 3 --budget-usd 20
         """
     )
     
@@ -492,9 +677,48 @@ Examples:
         "--article-ids",
         help="Comma-separated list of article IDs to fix (optional, fixes all if not specified)"
     )
+    parser.add_argument(
+        "--max-concurrent-articles",
+        type=int,
+        default=5,
+        help="Articles fixed concurrently; questions within an article are always fixed in order (default: 5, 1 = serial)"
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=25,
+        help="Flush questions CSV and QC results to disk every N edits (default: 25, 0 = only at the end)"
+    )
+    parser.add_argument(
+        "--max-rounds",
+        type=int,
+        default=1,
+        help="Fix rounds: questions still failing after re-QC are fixed again, "
+             "distractor fixes escalated to full regeneration (default: 1)"
+    )
+    parser.add_argument(
+        "--budget-usd",
+        type=float,
+        help="Stop fixing once the estimated API cost (fixes + re-QC, list prices) "
+             "reaches this amount; fixes already made are still re-QC'd"
+    )
+    parser.add_argument(
+        "--min-pass-rate-gain",
+        type=float,
+        default=0.02,
+        help="Stop after a round that raises the pass rate by less than this (default: 0.02)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk LLM response cache (always call the API)"
+    )
     
     args = parser.parse_args()
     
+    if args.no_cache:
+        configure_llm_cache(enabled=False)
+    
     # Parse article IDs
     article_ids = None
     if args.article_ids:
@@ -506,7 +730,12 @@ Examples:
             qc_results_path=args.qc_results,
             questions_csv_path=args.questions,
             output_dir=args.output,
-            article_ids=article_ids
+            article_ids=article_ids,
+            max_concurrent_articles=args.max_concurrent_articles,
+            checkpoint_every=args.checkpoint_every,
+            max_rounds=args.max_rounds,
+            budget_usd=args.budget_usd,
+            min_pass_rate_gain=args.min_pass_rate_gain
         )
         
         asyncio.run(pipeline.run())
@@ -7,8 +7,13 @@ Updates all output files after fixing questions:
 - question_qc_merged.json - QC results
 - question_qc_merged_summary.csv - Summary CSV
 - summary_report.json - Overall stats
+
+FixOutputStore keeps the questions and QC results in memory during a fix run
+and writes all four files in one atomic flush (at checkpoints and at the end).
+Edits made since the last flush are logged so a crashed run can replay them.
 """
 
+import os
 import json
 import shutil
 import logging
@@ -17,6 +22,10 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 import pandas as pd
 
+from batch_results import repair_jsonl_tail
+from fix_pipeline.context_gatherer import QuestionIndex
+from qc_pipeline.results_journal import QCResultJournal
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +55,77 @@ def backup_files(
         logger.info(f"Backed up QC merged JSON to {backup_dir}")
 
 
+def apply_fix_to_dataframe(
+    df: pd.DataFrame,
+    question_id: str,
+    fixed_data: Dict[str, Any],
+    run_id: str,
+    idx: Optional[Any] = None,
+    timestamp: Optional[str] = None
+) -> bool:
+    """
+    Apply a fix to a question's row of the questions DataFrame, in place.
+    
+    Args:
+        df: Questions DataFrame
+        question_id: ID of question to update
+        fixed_data: New data from LLM
+        run_id: Current fix run ID
+        idx: Row label of the question, if already known
+        timestamp: fix_timestamp to record (default: now)
+    
+    Returns:
+        True if the question was found and updated, False otherwise
+    """
+    if idx is None:
+        # Find the row
+        mask = df['question_id'] == question_id
+        if not mask.any():
+            logger.error(f"Question {question_id} not found in CSV")
+            return False
+        idx = df[mask].index[0]
+    
+    strategy = fixed_data.get('fix_strategy', 'unknown')
+    
+    # Update based on strategy
+    if strategy == 'full_regeneration':
+        # Store original question
+        df.loc[idx, 'original_question'] = df.loc[idx, 'question']
+        # Update question
+        if 'question' in fixed_data:
+            df.loc[idx, 'question'] = fixed_data['question']
+    
+    # Update options (for both strategies)
+    if 'option_A' in fixed_data:
+        df.loc[idx, 'option_1'] = fixed_data['option_A']
+    if 'option_B' in fixed_data:
+        df.loc[idx, 'option_2'] = fixed_data['option_B']
+    if 'option_C' in fixed_data:
+        df.loc[idx, 'option_3'] = fixed_data['option_C']
+    if 'option_D' in fixed_data:
+        df.loc[idx, 'option_4'] = fixed_data['option_D']
+    
+    # Update correct answer (only for full regen)
+    if strategy == 'full_regeneration' and 'correct_answer' in fixed_data:
+        df.loc[idx, 'correct_answer'] = fixed_data['correct_answer']
+    
+    # Update explanations
+    if 'option_A_explanation' in fixed_data:
+        df.loc[idx, 'option_1_explanation'] = fixed_data['option_A_explanation']
+    if 'option_B_explanation' in fixed_data:
+        df.loc[idx, 'option_2_explanation'] = fixed_data['option_B_explanation']
+    if 'option_C_explanation' in fixed_data:
+        df.loc[idx, 'option_3_explanation'] = fixed_data['option_C_explanation']
+    if 'option_D_explanation' in fixed_data:
+        df.loc[idx, 'option_4_explanation'] = fixed_data['option_D_explanation']
+    
+    # Add fix metadata
+    df.loc[idx, 'fix_timestamp'] = timestamp or datetime.now().isoformat()
+    df.loc[idx, 'fix_strategy'] = strategy
+    df.loc[idx, 'fix_run_id'] = run_id
+    return True
+
+
 def update_questions_csv(
     question_id: str,
     fixed_data: Dict[str, Any],
@@ -67,52 +147,9 @@ def update_questions_csv(
     try:
         df = pd.read_csv(csv_path)
         
-        # Find the row
-        mask = df['question_id'] == question_id
-        if not mask.any():
-            logger.error(f"Question {question_id} not found in CSV")
+        if not apply_fix_to_dataframe(df, question_id, fixed_data, run_id):
             return False
         
-        idx = df[mask].index[0]
-        strategy = fixed_data.get('fix_strategy', 'unknown')
-        
-        # Update based on strategy
-        if strategy == 'full_regeneration':
-            # Store original question
-            df.loc[idx, 'original_question'] = df.loc[idx, 'question']
-            # Update question
-            if 'question' in fixed_data:
-                df.loc[idx, 'question'] = fixed_data['question']
-        
-        # Update options (for both strategies)
-        if 'option_A' in fixed_data:
-            df.loc[idx, 'option_1'] = fixed_data['option_A']
-        if 'option_B' in fixed_data:
-            df.loc[idx, 'option_2'] = fixed_data['option_B']
-        if 'option_C' in fixed_data:
-            df.loc[idx, 'option_3'] = fixed_data['option_C']
-        if 'option_D' in fixed_data:
-            df.loc[idx, 'option_4'] = fixed_data['option_D']
-        
-        # Update correct answer (only for full regen)
-        if strategy == 'full_regeneration' and 'correct_answer' in fixed_data:
-            df.loc[idx, 'correct_answer'] = fixed_data['correct_answer']
-        
-        # Update explanations
-        if 'option_A_explanation' in fixed_data:
-            df.loc[idx, 'option_1_explanation'] = fixed_data['option_A_explanation']
-        if 'option_B_explanation' in fixed_data:
-            df.loc[idx, 'option_2_explanation'] = fixed_data['option_B_explanation']
-        if 'option_C_explanation' in fixed_data:
-            df.loc[idx, 'option_3_explanation'] = fixed_data['option_C_explanation']
-        if 'option_D_explanation' in fixed_data:
-            df.loc[idx, 'option_4_explanation'] = fixed_data['option_D_explanation']
-        
-        # Add fix metadata
-        df.loc[idx, 'fix_timestamp'] = datetime.now().isoformat()
-        df.loc[idx, 'fix_strategy'] = strategy
-        df.loc[idx, 'fix_run_id'] = run_id
-        
         # Save
         df.to_csv(csv_path, index=False)
         logger.debug(f"Updated question {question_id} in CSV")
@@ -185,69 +222,7 @@ def regenerate_summary_csv(
         with open(merged_json_path, 'r') as f:
             results = json.load(f)
         
-        # Build summary rows
-        rows = []
-        
-        # Define check names for consistent ordering
-        ALL_CHECK_NAMES = [
-            'grammatical_parallel', 'plausibility', 'homogeneity', 
-            'specificity_balance', 'standard_alignment', 'clarity_precision',
-            'single_correct_answer', 'passage_reference', 'length_check',
-            'too_close', 'difficulty_assessment'
-        ]
-        
-        for result in results:
-            checks = result.get('checks', {})
-            
-            # Calculate failed checks
-            failed_checks = [
-                name for name, data in checks.items()
-                if isinstance(data, dict) and data.get('score', 1) == 0
-            ]
-            
-            overall_score = result.get('overall_score', 0)
-            row = {
-                'question_id': result.get('question_id', ''),
-                'article_id': result.get('article_id', ''),
-                'content_hash': result.get('content_hash', ''),
-                'passage_title': result.get('passage_title', ''),
-                'question_preview': result.get('question_preview', ''),
-                'score': f"{overall_score:.0%}",  # Format as percentage
-                'status': '✅' if overall_score >= 0.8 else '❌',  # Use checkmarks
-                'passed_total': f"{result.get('total_checks_passed', 0)}/{result.get('total_checks_run', 0)}",
-                'failed_checks': ', '.join(failed_checks) if failed_checks else '',
-                'run_id': result.get('run_id', '')
-            }
-            
-            # Add individual check scores as checkmarks
-            for check_name in ALL_CHECK_NAMES:
-                check_data = checks.get(check_name, {})
-                if isinstance(check_data, dict):
-                    score = check_data.get('score', '')
-                    if score == 1:
-                        row[check_name] = '✅'
-                    elif score == 0:
-                        row[check_name] = '❌'
-                    else:
-                        row[check_name] = ''  # Not run
-                else:
-                    row[check_name] = ''
-            
-            rows.append(row)
-        
-        # Create DataFrame and save
-        df = pd.DataFrame(rows)
-        
-        # Order columns
-        column_order = [
-            'question_id', 'article_id', 'content_hash', 'passage_title',
-            'question_preview', 'score', 'status', 'passed_total', 'failed_checks', 'run_id'
-        ] + ALL_CHECK_NAMES
-        
-        df = df[[c for c in column_order if c in df.columns]]
-        df.to_csv(csv_path, index=False)
-        
-        logger.info(f"Regenerated summary CSV with {len(rows)} rows")
+        write_summary_csv(results, csv_path)
         return True
         
     except Exception as e:
@@ -255,6 +230,73 @@ def regenerate_summary_csv(
         return False
 
 
+def write_summary_csv(results: List[Dict[str, Any]], csv_path: str) -> None:
+    """Write the summary CSV (one row per QC result, a column per check)."""
+    # Build summary rows
+    rows = []
+    
+    # Define check names for consistent ordering
+    ALL_CHECK_NAMES = [
+        'grammatical_parallel', 'plausibility', 'homogeneity', 
+        'specificity_balance', 'standard_alignment', 'clarity_precision',
+        'single_correct_answer', 'passage_reference', 'length_check',
+        'too_close', 'difficulty_assessment'
+    ]
+    
+    for result in results:
+        checks = result.get('checks', {})
+        
+        # Calculate failed checks
+        failed_checks = [
+            name for name, data in checks.items()
+            if isinstance(data, dict) and data.get('score', 1) == 0
+        ]
+        
+        overall_score = result.get('overall_score', 0)
+        row = {
+            'question_id': result.get('question_id', ''),
+            'article_id': result.get('article_id', ''),
+            'content_hash': result.get('content_hash', ''),
+            'passage_title': result.get('passage_title', ''),
+            'question_preview': result.get('question_preview', ''),
+            'score': f"{overall_score:.0%}",  # Format as percentage
+            'status': '✅' if overall_score >= 0.8 else '❌',  # Use checkmarks
+            'passed_total': f"{result.get('total_checks_passed', 0)}/{result.get('total_checks_run', 0)}",
+            'failed_checks': ', '.join(failed_checks) if failed_checks else '',
+            'run_id': result.get('run_id', '')
+        }
+        
+        # Add individual check scores as checkmarks
+        for check_name in ALL_CHECK_NAMES:
+            check_data = checks.get(check_name, {})
+            if isinstance(check_data, dict):
+                score = check_data.get('score', '')
+                if score == 1:
+                    row[check_name] = '✅'
+                elif score == 0:
+                    row[check_name] = '❌'
+                else:
+                    row[check_name] = ''  # Not run
+            else:
+                row[check_name] = ''
+        
+        rows.append(row)
+    
+    # Create DataFrame and save
+    df = pd.DataFrame(rows)
+    
+    # Order columns
+    column_order = [
+        'question_id', 'article_id', 'content_hash', 'passage_title',
+        'question_preview', 'score', 'status', 'passed_total', 'failed_checks', 'run_id'
+    ] + ALL_CHECK_NAMES
+    
+    df = df[[c for c in column_order if c in df.columns]]
+    df.to_csv(csv_path, index=False)
+    
+    logger.info(f"Regenerated summary CSV with {len(rows)} rows")
+
+
 def regenerate_summary_report(
     merged_json_path: str,
     report_path: str,
@@ -275,57 +317,219 @@ def regenerate_summary_report(
         with open(merged_json_path, 'r') as f:
             results = json.load(f)
         
-        # Calculate stats
-        total = len(results)
-        passed = sum(1 for r in results if r.get('overall_score', 0) >= 0.8)
-        failed = total - passed
-        avg_score = sum(r.get('overall_score', 0) for r in results) / total if total > 0 else 0
+        write_summary_report(results, report_path, run_id)
+        return True
         
-        # Per-article breakdown
-        by_article = {}
-        for r in results:
-            article_id = r.get('article_id', 'unknown')
-            if article_id not in by_article:
-                by_article[article_id] = {'total': 0, 'passed': 0, 'failed': 0}
-            by_article[article_id]['total'] += 1
-            if r.get('overall_score', 0) >= 0.8:
-                by_article[article_id]['passed'] += 1
-            else:
-                by_article[article_id]['failed'] += 1
+    except Exception as e:
+        logger.error(f"Failed to regenerate summary report: {e}")
+        return False
+
+
+def write_summary_report(results: List[Dict[str, Any]], report_path: str, run_id: str) -> None:
+    """Write the summary report (pass rate, per-article breakdown, failing checks)."""
+    # Calculate stats
+    total = len(results)
+    passed = sum(1 for r in results if r.get('overall_score', 0) >= 0.8)
+    failed = total - passed
+    avg_score = sum(r.get('overall_score', 0) for r in results) / total if total > 0 else 0
+    
+    # Per-article breakdown
+    by_article = {}
+    for r in results:
+        article_id = r.get('article_id', 'unknown')
+        if article_id not in by_article:
+            by_article[article_id] = {'total': 0, 'passed': 0, 'failed': 0}
+        by_article[article_id]['total'] += 1
+        if r.get('overall_score', 0) >= 0.8:
+            by_article[article_id]['passed'] += 1
+        else:
+            by_article[article_id]['failed'] += 1
+    
+    # Failed checks summary
+    failed_checks_count = {}
+    for r in results:
+        for check_name, check_data in r.get('checks', {}).items():
+            if isinstance(check_data, dict) and check_data.get('score', 1) == 0:
+                failed_checks_count[check_name] = failed_checks_count.get(check_name, 0) + 1
+    
+    report = {
+        'run_id': run_id,
+        'timestamp': datetime.now().isoformat(),
+        'summary': {
+            'total_questions': total,
+            'passed': passed,
+            'failed': failed,
+            'pass_rate': f"{100 * passed / total:.1f}%" if total > 0 else "0%",
+            'average_score': round(avg_score, 3)
+        },
+        'by_article': by_article,
+        'failed_checks_summary': dict(sorted(
+            failed_checks_count.items(), 
+            key=lambda x: -x[1]
+        ))
+    }
+    
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    logger.info(f"Regenerated summary report")
+
+
+class FixOutputStore:
+    """
+    In-memory question bank and QC results for a fix run, flushed atomically.
+    
+    Edits go to memory (questions indexed by question_id) and to recovery logs:
+    <questions csv>.fixes.jsonl for question edits and the QC results journal
+    (question_qc_merged.journal.jsonl) for QC results. flush() writes only what
+    changed: the CSV when question edits are pending, and the merged JSON plus
+    the summary CSV and report when QC results are pending, each via temp file
+    + rename. A store with no edits leaves every file untouched. A store opened
+    after a crash replays the logged edits and flushes them.
+    
+    Usage:
+        store = FixOutputStore(questions_csv_path, qc_merged_path, run_id)
+        store.apply_fix(question_id, fixed_data)
+        store.update_qc_result(question_id, qc_result)
+        store.close()  # final flush
+    """
+    
+    def __init__(
+        self,
+        questions_csv_path: str,
+        qc_merged_path: str,
+        run_id: str,
+        checkpoint_every: int = 25
+    ):
+        self.questions_csv_path = Path(questions_csv_path)
+        self.qc_merged_path = Path(qc_merged_path)
+        self.run_id = run_id
+        self.checkpoint_every = checkpoint_every
         
-        # Failed checks summary
-        failed_checks_count = {}
-        for r in results:
-            for check_name, check_data in r.get('checks', {}).items():
-                if isinstance(check_data, dict) and check_data.get('score', 1) == 0:
-                    failed_checks_count[check_name] = failed_checks_count.get(check_name, 0) + 1
+        qc_dir = self.qc_merged_path.parent
+        self.summary_csv_path = qc_dir / "question_qc_merged_summary.csv"
+        self.summary_report_path = qc_dir / "summary_report.json"
         
-        report = {
-            'run_id': run_id,
-            'timestamp': datetime.now().isoformat(),
-            'summary': {
-                'total_questions': total,
-                'passed': passed,
-                'failed': failed,
-                'pass_rate': f"{100 * passed / total:.1f}%" if total > 0 else "0%",
-                'average_score': round(avg_score, 3)
-            },
-            'by_article': by_article,
-            'failed_checks_summary': dict(sorted(
-                failed_checks_count.items(), 
-                key=lambda x: -x[1]
-            ))
-        }
+        self.edit_log_path = self.questions_csv_path.with_name(self.questions_csv_path.name + ".fixes.jsonl")
+        repair_jsonl_tail(self.edit_log_path)
+        
+        self.questions_df = pd.read_csv(self.questions_csv_path)
+        self.index = QuestionIndex(self.questions_df)
+        self.qc_journal = QCResultJournal(self.qc_merged_path)
+        
+        recovered = self._replay_edit_log()
+        self._pending_edits = recovered
+        self._pending_qc = self.qc_journal.pending
+        self._edit_log = open(self.edit_log_path, 'a', encoding='utf-8')
+        if recovered or self.qc_journal.pending:
+            logger.info(
+                f"Recovered {recovered} question edits and {self.qc_journal.pending} QC results "
+                f"from an interrupted run"
+            )
+            self.flush()
+    
+    def _replay_edit_log(self) -> int:
+        """Re-apply question edits logged after the last flush. Returns edits replayed."""
+        if not self.edit_log_path.exists():
+            return 0
+        replayed = 0
+        with open(self.edit_log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                idx = self.index.row_label(entry.get('question_id'))
+                if idx is None:
+                    continue
+                # Already in the CSV (crash between the CSV rename and emptying the log)
+                if 'fix_timestamp' in self.questions_df.columns and \
+                        self.questions_df.loc[idx, 'fix_timestamp'] == entry.get('timestamp'):
+                    continue
+                apply_fix_to_dataframe(
+                    self.questions_df, entry['question_id'], entry.get('fixed_data', {}),
+                    entry.get('run_id', self.run_id), idx=idx, timestamp=entry.get('timestamp')
+                )
+                self.index.update(entry['question_id'])
+                replayed += 1
+        return replayed
+    
+    def qc_results(self) -> List[Dict[str, Any]]:
+        """Current QC results (merged file + unflushed updates)."""
+        return self.qc_journal.results()
+    
+    def qc_result(self, question_id: str) -> Optional[Dict[str, Any]]:
+        """Current QC result of one question, or None."""
+        return self.qc_journal.get(question_id)
+    
+    def apply_fix(self, question_id: str, fixed_data: Dict[str, Any]) -> bool:
+        """Log a fix, then apply it to the in-memory questions."""
+        idx = self.index.row_label(question_id)
+        if idx is None:
+            logger.error(f"Question {question_id} not found in CSV")
+            return False
         
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2)
+        timestamp = datetime.now().isoformat()
+        self._edit_log.write(json.dumps({
+            'question_id': question_id,
+            'fixed_data': fixed_data,
+            'run_id': self.run_id,
+            'timestamp': timestamp
+        }, ensure_ascii=False, default=str) + '\n')
+        self._edit_log.flush()
+        os.fsync(self._edit_log.fileno())
         
-        logger.info(f"Regenerated summary report")
+        apply_fix_to_dataframe(self.questions_df, question_id, fixed_data, self.run_id, idx=idx, timestamp=timestamp)
+        self.index.update(question_id)
+        self._pending_edits += 1
+        self._maybe_checkpoint()
         return True
+    
+    def update_qc_result(self, question_id: str, new_qc_result: Dict[str, Any]) -> None:
+        """Replace (or add) a question's QC result."""
+        new_qc_result['question_id'] = question_id
+        self.qc_journal.append([new_qc_result])
+        self._pending_qc += 1
+        self._maybe_checkpoint()
+    
+    def _maybe_checkpoint(self):
+        pending = self._pending_edits + self._pending_qc
+        if self.checkpoint_every and pending >= self.checkpoint_every:
+            logger.info(f"Checkpoint: flushing {pending} pending edits")
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write whatever has pending edits (CSV, merged JSON + summaries), then empty its log."""
+        if self._pending_edits:
+            tmp_path = self.questions_csv_path.with_name(self.questions_csv_path.name + ".tmp")
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                self.questions_df.to_csv(f, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.questions_csv_path)
+            
+            self._edit_log.close()
+            self._edit_log = open(self.edit_log_path, 'w', encoding='utf-8')
+            self._pending_edits = 0
         
-    except Exception as e:
-        logger.error(f"Failed to regenerate summary report: {e}")
-        return False
+        if self._pending_qc:
+            results = self.qc_journal.compact()
+            
+            write_summary_csv(results, str(self.summary_csv_path))
+            write_summary_report(results, str(self.summary_report_path), self.run_id)
+            self._pending_qc = 0
+    
+    def close(self) -> None:
+        """Final flush, then close the logs (removing them if empty)."""
+        self.flush()
+        self._edit_log.close()
+        self.qc_journal.close()
+        self.edit_log_path.unlink(missing_ok=True)
+        if self.qc_journal.path.exists() and self.qc_journal.path.stat().st_size == 0:
+            self.qc_journal.path.unlink()
 
 
 def update_all_outputs(
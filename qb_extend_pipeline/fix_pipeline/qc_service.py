@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+QC Service Module
+
+One long-lived QC analyzer for re-QC of fixed questions during a fix run:
+- OpenAI key discovered and clients created once
+- One QuestionQCAnalyzerV2OpenRouter, so its stats, usage and HTTP
+  connections carry across articles and rounds
+- One semaphore shared by every re-QC in flight (articles are re-QC'd
+  while other articles are still being fixed)
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional
+
+from openai import AsyncOpenAI
+
+from qc_pipeline.utils import (
+    merge_check_results,
+    question_input_fields,
+    stamp_check_fingerprints
+)
+
+logger = logging.getLogger(__name__)
+
+
+def find_openai_key() -> Optional[str]:
+    """OPENAI_API_KEY, else the first of OPENAI_API_KEY_1, OPENAI_API_KEY_2, ..."""
+    openai_key = os.getenv('OPENAI_API_KEY')
+    if openai_key:
+        return openai_key
+    return os.getenv('OPENAI_API_KEY_1')
+
+
+class FixQCService:
+    """
+    QC analyzer, clients and concurrency limit shared by every re-QC of a fix run.
+
+    Usage:
+        service = FixQCService(openrouter_client)
+        results = await service.analyze(questions_full, questions_partial, previous, run_id)
+        ...
+        await service.close()
+    """
+
+    def __init__(self, openrouter_client: AsyncOpenAI, concurrency: int = 10):
+        self.openrouter_client = openrouter_client
+        self.concurrency = concurrency
+        self._analyzer = None
+        self._openai_client: Optional[AsyncOpenAI] = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @property
+    def analyzer(self):
+        """The QuestionQCAnalyzerV2OpenRouter (created on first use)."""
+        if self._analyzer is None:
+            from qc_pipeline.modules.question_qc_v2_openrouter import QuestionQCAnalyzerV2OpenRouter
+
+            # OpenAI key for supplementary checks
+            openai_key = find_openai_key()
+            self._openai_client = AsyncOpenAI(api_key=openai_key) if openai_key else None
+
+            self._analyzer = QuestionQCAnalyzerV2OpenRouter(
+                openrouter_client=self.openrouter_client,
+                openai_client=self._openai_client,
+                skip_openai=(self._openai_client is None)
+            )
+        return self._analyzer
+
+    @property
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """API usage per model of every re-QC so far."""
+        return self._analyzer.usage if self._analyzer is not None else {}
+
+    async def analyze(
+        self,
+        questions_full: List[Dict[str, Any]],
+        questions_partial: List[Dict[str, Any]],
+        previous: Dict[str, Dict[str, Any]],
+        run_id: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Full QC for questions_full; for questions_partial only the checks in
+        their 'rerun_checks', merged into their previous result.
+
+        Returns:
+            QC results, questions_full first
+        """
+        analyzer = self.analyzer
+
+        results = list(await asyncio.gather(*[
+            analyzer.analyze_question(q, self._semaphore) for q in questions_full
+        ]))
+        for q, result in zip(questions_full, results):
+            stamp_check_fingerprints(result.get('checks', {}), question_input_fields(q))
+
+        if questions_partial:
+            partial_results = await asyncio.gather(*[
+                analyzer.analyze_checks(q, q.get('rerun_checks', []), self._semaphore) for q in questions_partial
+            ])
+            for q, partial in zip(questions_partial, partial_results):
+                logger.info(f"  {q['question_id']}: re-ran {', '.join(q['rerun_checks']) or 'no checks'}")
+                results.append(merge_check_results(previous[q['question_id']], partial, q, run_id))
+
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._analyzer.get_stats() if self._analyzer is not None else {}
+
+    async def close(self):
+        """Close the clients this service created (not the OpenRouter client)."""
+        if self._openai_client is not None:
+            await self._openai_client.close()
+            self._openai_client = None
@@ -13,12 +13,23 @@ import asyncio
 from typing import Dict, Any, Optional
 from openai import AsyncOpenAI
 
+from llm_cache import LLMResponseCache, get_llm_cache
+from rate_governor import get_rate_governor_for, governed_create, record_usage
+
 logger = logging.getLogger(__name__)
 
 # OpenRouter configuration
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 OPENROUTER_MODEL = "anthropic/claude-sonnet-4"
 
+# API usage of fix calls in this process: {model: {'calls', 'input_tokens', 'output_tokens'}}
+_fix_usage: Dict[str, Dict[str, int]] = {}
+
+
+def get_fix_usage() -> Dict[str, Dict[str, int]]:
+    """Copy of the API usage of fix calls so far (cache hits are not counted)."""
+    return {model: dict(usage) for model, usage in _fix_usage.items()}
+
 
 def create_openrouter_client(api_key: str) -> AsyncOpenAI:
     """Create an OpenRouter client."""
@@ -190,27 +201,44 @@ async def call_llm(
     """
     Call OpenRouter LLM and parse JSON response.
     
+    Parsed responses are stored in the shared LLM response cache, so
+    re-running the fix pipeline after a crash does not pay for the same
+    prompt twice.
+    
     Returns:
         Parsed JSON dict, or None on failure
     """
+    llm_cache = get_llm_cache()
+    response_format = {"type": "json_object"}
+    cache_key = LLMResponseCache.make_key(
+        model=OPENROUTER_MODEL, prompt=prompt, schema=response_format
+    )
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     for attempt in range(max_retries):
         try:
-            response = await client.chat.completions.create(
+            response = await governed_create(
+                client.chat.completions,
+                get_rate_governor_for(client),
                 model=OPENROUTER_MODEL,
                 max_tokens=2000,
                 messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
+                response_format=response_format,
                 extra_headers={
                     "HTTP-Referer": "https://github.com/playcademy",
                     "X-Title": "Question Fix Pipeline"
                 }
             )
+            record_usage(_fix_usage, OPENROUTER_MODEL, response)
             
             response_text = response.choices[0].message.content
             
             # Parse JSON
             try:
                 result = json.loads(response_text)
+                llm_cache.put(cache_key, result, model=OPENROUTER_MODEL)
                 return result
             except json.JSONDecodeError:
                 # Try to extract JSON from response
@@ -218,6 +246,7 @@ async def call_llm(
                 json_match = re.search(r'\{[\s\S]*\}', response_text)
                 if json_match:
                     result = json.loads(json_match.group())
+                    llm_cache.put(cache_key, result, model=OPENROUTER_MODEL)
                     return result
                 else:
                     logger.warning(f"Failed to parse JSON on attempt {attempt + 1}")
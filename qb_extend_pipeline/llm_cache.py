@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+
+Content-addressed on-disk cache for LLM responses, shared by the generation
+(qb_extender.py), QC (qc_pipeline), fix (fix_pipeline) and rewrite
+(explanation_rewriter.py) stages. Re-running any stage after a crash or a
+config change reuses responses we already paid for instead of re-sending
+the exact same prompt.
+
+Cache key = sha256(model, prompt/messages, schema/tools, temperature, extra).
+Entries live in a single SQLite file and are evicted by:
+- TTL: entries older than ttl_days are ignored and pruned
+- Size: least-recently-used entries are dropped once the cache exceeds max_mb
+
+Configuration (environment variables, all optional):
+    LLM_CACHE_DIR        Cache directory (default: outputs/llm_cache)
+    LLM_CACHE_TTL_DAYS   Entry lifetime in days (default: 30, 0 = never expire)
+    LLM_CACHE_MAX_MB     Size limit in MB (default: 500)
+    LLM_CACHE_DISABLED   Set to 1 to bypass the cache entirely
+
+Each stage also exposes a --no-cache flag.
+
+Usage:
+    # Seed the cache from existing generation logs
+    python llm_cache.py --seed outputs/llm_logs
+
+    # Show cache statistics
+    python llm_cache.py
+
+    # Drop expired entries / everything
+    python llm_cache.py --prune
+    python llm_cache.py --clear
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / "outputs" / "llm_cache"
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_MB = 500
+CACHE_DB_NAME = "llm_cache.sqlite3"
+
+# Fraction of max size to shrink to when evicting, so we don't evict on every put
+EVICTION_TARGET = 0.9
+
+# Passage placeholder written by LLMLogger when storing prompts by hash
+PASSAGE_PLACEHOLDER = re.compile(r'\{\{passage:([0-9a-f]+)\}\}')
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class LLMResponseCache:
+    """
+    Thread-safe, content-addressed cache of LLM responses.
+
+    Values are stored as JSON, so callers can cache either the raw response
+    text or an already-extracted payload (e.g. a tool_use input dict).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_days: Optional[float] = None,
+        max_mb: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.cache_dir = Path(cache_dir or os.getenv("LLM_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        if ttl_days is None:
+            ttl_days = float(os.getenv("LLM_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS))
+        if max_mb is None:
+            max_mb = float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB))
+        if enabled is None:
+            enabled = not _env_flag("LLM_CACHE_DISABLED")
+
+        self.ttl_seconds = ttl_days * 86400 if ttl_days > 0 else None
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+        if self.enabled:
+            self._open()
+
+    def _open(self):
+        """Open (and create if needed) the SQLite backing store."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / CACHE_DB_NAME),
+            check_same_thread=False,
+            timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total_bytes = row[0]
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: Any,
+        schema: Any = None,
+        temperature: Optional[float] = None,
+        **extra: Any
+    ) -> str:
+        """
+        Build a content-addressed cache key.
+
+        Args:
+            model: Model name as sent to the API
+            prompt: Prompt string or messages list
+            schema: Output schema, tools or response_format (anything JSON-serializable)
+            temperature: Sampling temperature (None = provider default)
+            **extra: Any other request parameters that change the output
+        """
+        payload = {
+            'model': model,
+            'prompt': prompt,
+            'schema': schema,
+            'temperature': temperature,
+            'extra': extra or None
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss/expiry."""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._delete_locked(key)
+                self._conn.commit()
+                self._stats['misses'] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self._stats['hits'] += 1
+
+        return json.loads(value)
+
+    def put(self, key: str, value: Any, model: str = "") -> None:
+        """Store a JSON-serializable value under key, evicting LRU entries if needed."""
+        if not self.enabled:
+            return
+
+        serialized = json.dumps(value, ensure_ascii=False)
+        size = len(serialized.encode('utf-8'))
+        now = time.time()
+
+        with self._lock:
+            self._put_locked(key, serialized, size, model, now, now)
+            self._conn.commit()
+            self._stats['writes'] += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+
+    def _put_locked(
+        self,
+        key: str,
+        serialized: str,
+        size: int,
+        model: str,
+        created_at: float,
+        last_access: float
+    ):
+        old = self._conn.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if old:
+            self._total_bytes -= old[0]
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, serialized, size, created_at, last_access)
+        )
+        self._total_bytes += size
+
+    def _delete_locked(self, key: str):
+        row = self._conn.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row:
+            self._total_bytes -= row[0]
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _evict_locked(self):
+        """Drop least-recently-used entries until under EVICTION_TARGET of max size."""
+        target = int(self.max_bytes * EVICTION_TARGET)
+        cursor = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        )
+        to_delete = []
+        freed = 0
+        for key, size in cursor:
+            if self._total_bytes - freed <= target:
+                break
+            to_delete.append((key,))
+            freed += size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+        self._conn.commit()
+        self._total_bytes -= freed
+        self._stats['evictions'] += len(to_delete)
+
+    def prune_expired(self) -> int:
+        """Delete entries older than the TTL. Returns number of entries removed."""
+        if not self.enabled or self.ttl_seconds is None:
+            return 0
+
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (cutoff,)
+            )
+            removed = cursor.rowcount
+            self._conn.commit()
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            self._total_bytes = row[0]
+        return removed
+
+    def clear(self):
+        """Remove every cached entry."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def seed_from_llm_logs(self, log_dir: Path) -> int:
+        """
+        Seed the cache from qb_extender LLM logs (llm_logs_*.jsonl[.gz]).
+
+        Request and response entries are paired by request_id. Prompts stored
+        by hash (LLMLogger prompts_by_hash) are rebuilt from their blob entries. Only successful,
+        non-truncated responses are imported. Keys match those computed by
+        QuestionBankExtender._generate_batch, so re-running the extender on the
+        same input hits the cache for work we already paid for.
+
+        Returns:
+            Number of entries imported
+        """
+        if not self.enabled:
+            return 0
+
+        imported = 0
+        # Shared across files: a request and its response can land in different rotated parts
+        requests: Dict[str, Dict[str, Any]] = {}
+        blobs: Dict[str, str] = {}
+        for log_file in sorted(Path(log_dir).glob("llm_logs_*.jsonl*")):
+            entries = []
+
+            opener = gzip.open if log_file.suffix == '.gz' else open
+            with opener(log_file, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+                    if entry.get('type') == 'blob':
+                        blobs[entry.get('hash')] = entry.get('text', '')
+                        continue
+
+                    if entry.get('type') == 'request':
+                        if 'prompt' not in entry and entry.get('prompt_hash') in blobs:
+                            entry['prompt'] = PASSAGE_PLACEHOLDER.sub(
+                                lambda m: blobs.get(m.group(1), m.group(0)),
+                                blobs[entry['prompt_hash']]
+                            )
+                        if 'system' not in entry and entry.get('system_hash') in blobs:
+                            entry['system'] = json.loads(blobs[entry['system_hash']])
+                        requests[entry.get('request_id')] = entry
+                        continue
+
+                    if entry.get('type') != 'response':
+                        continue
+                    if not entry.get('success') or entry.get('stop_reason') != 'end_turn':
+                        continue
+
+                    request = requests.pop(entry.get('request_id'), None)
+                    if request is None or 'prompt' not in request or not entry.get('response'):
+                        continue
+
+                    schema = (request.get('extra_body') or {}).get('output_format')
+                    prompt = request.get('prompt', '')
+                    if request.get('system'):
+                        # Passage sent as a cached system prompt block
+                        prompt = {'system': request['system'], 'user': prompt}
+                    key = self.make_key(
+                        model=request.get('model', ''),
+                        prompt=prompt,
+                        schema=schema
+                    )
+                    value = {
+                        'text': entry['response'],
+                        'stop_reason': entry['stop_reason']
+                    }
+                    entries.append((key, request.get('model', ''), value))
+
+            if not entries:
+                continue
+
+            now = time.time()
+            with self._lock:
+                for key, model, value in entries:
+                    serialized = json.dumps(value, ensure_ascii=False)
+                    self._put_locked(
+                        key, serialized, len(serialized.encode('utf-8')), model, now, now
+                    )
+                self._conn.commit()
+                if self._total_bytes > self.max_bytes:
+                    self._evict_locked()
+            imported += len(entries)
+
+        return imported
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics (hit/miss counters for this process, size on disk)."""
+        stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['enabled'] = self.enabled
+        stats['size_mb'] = self._total_bytes / (1024 * 1024)
+        if self.enabled:
+            with self._lock:
+                stats['entries'] = self._conn.execute(
+                    "SELECT COUNT(*) FROM responses"
+                ).fetchone()[0]
+        else:
+            stats['entries'] = 0
+        return stats
+
+    def format_stats(self) -> str:
+        """One-line summary suitable for end-of-run reports."""
+        if not self.enabled:
+            return "LLM cache: disabled"
+        stats = self.get_stats()
+        return (
+            f"LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']*100:.1f}% hit rate), "
+            f"{stats['entries']} entries, {stats['size_mb']:.1f} MB"
+        )
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+            self.enabled = False
+
+
+# Global cache instance (shared across all stages in a process)
+_global_cache: Optional[LLMResponseCache] = None
+_global_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get or create the global LLM response cache."""
+    global _global_cache
+    with _global_cache_lock:
+        if _global_cache is None:
+            _global_cache = LLMResponseCache()
+        return _global_cache
+
+
+def configure_llm_cache(
+    enabled: Optional[bool] = None,
+    cache_dir: Optional[Path] = None,
+    ttl_days: Optional[float] = None,
+    max_mb: Optional[float] = None
+) -> LLMResponseCache:
+    """Replace the global cache with one built from explicit settings (e.g. --no-cache)."""
+    global _global_cache
+    with _global_cache_lock:
+        if _global_cache is not None:
+            _global_cache.close()
+        _global_cache = LLMResponseCache(
+            cache_dir=cache_dir,
+            ttl_days=ttl_days,
+            max_mb=max_mb,
+            enabled=enabled
+        )
+        return _global_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Manage the on-disk LLM response cache"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=f"Cache directory (default: {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--seed",
+        metavar="LOG_DIR",
+        help="Seed the cache from llm_logs_*.jsonl[.gz] files in LOG_DIR"
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete entries older than the TTL"
+    )
+    parser.add_argument(
+        "--clear",
+        action="store_true",
+        help="Delete all cached entries"
+    )
+
+    args = parser.parse_args()
+
+    cache = LLMResponseCache(cache_dir=args.cache_dir, enabled=True)
+
+    if args.clear:
+        cache.clear()
+        print("🗑️  Cleared LLM cache")
+    if args.prune:
+        removed = cache.prune_expired()
+        print(f"🧹 Pruned {removed} expired entries")
+    if args.seed:
+        imported = cache.seed_from_llm_logs(Path(args.seed))
+        print(f"🌱 Seeded {imported} responses from {args.seed}")
+
+    stats = cache.get_stats()
+    print(f"📦 {stats['entries']} entries, {stats['size_mb']:.1f} MB in {cache.cache_dir}")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
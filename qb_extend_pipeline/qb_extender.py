@@ -33,11 +33,11 @@ Usage:
         --output outputs/extended_questions.csv \\
         --batch-mode
     
-    # Resume interrupted batch
+    # Resume interrupted batch (comma-separate the IDs of a sharded run)
     python question_bank_extender.py \\
         --input inputs/qti_existing_questions.csv \\
         --output outputs/extended_questions.csv \\
-        --batch-mode --resume-batch msgbatch_xxx
+        --batch-mode --resume-batch msgbatch_xxx,msgbatch_yyy
     
     # Include guiding questions too
     python question_bank_extender.py \\
@@ -60,6 +60,8 @@ Concurrency:
 Batch Mode:
     Uses Claude's Message Batches API for 50% cost reduction.
     - Async processing: Submit batch, poll for completion, retrieve results
+    - Requests are split into shards submitted as they are built; each shard's
+      results are written as soon as it ends, while later shards still run
     - Best for large-scale processing where you can wait for results
     - Can resume interrupted batches with --resume-batch
 """
@@ -67,6 +69,9 @@ Batch Mode:
 import os
 import json
 import csv
+import gzip
+import atexit
+import hashlib
 import argparse
 import time
 import re
@@ -75,14 +80,19 @@ import threading
 import httpx
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue
+from queue import Queue, PriorityQueue, Empty
 import anthropic
 from dotenv import load_dotenv
 import pandas as pd
 
+from llm_cache import LLMResponseCache, get_llm_cache, configure_llm_cache
+from rate_governor import estimate_tokens, get_rate_governor_for, is_rate_limit_error
+from batch_results import BatchResultJournal
+from question_store import QuestionStore
+
 # Load environment variables from .env file in the script's directory
 ENV_FILE = Path(__file__).parent / ".env"
 load_dotenv(ENV_FILE)
@@ -99,6 +109,19 @@ QUIZ_SIBLINGS = 4     # Generate 4 siblings per quiz question
 # Default concurrency settings
 DEFAULT_MAX_WORKERS = 5  # Maximum concurrent workers if more keys available
 
+# Batch mode sharding (API limits are 100,000 requests / 256 MB per batch;
+# smaller shards start finishing sooner, so results processing overlaps the run)
+DEFAULT_SHARD_MAX_REQUESTS = 500
+DEFAULT_SHARD_MAX_MB = 32
+
+# Prompt caching: the article passage goes in a cached system block, and the
+# user prompt points at it instead of repeating the text
+# See: https://platform.claude.com/docs/en/build-with-claude/prompt-caching
+ARTICLE_SYSTEM_INSTRUCTION = (
+    "You are an expert reading assessment writer. The article passage below is "
+    "the source text for every question you write in this conversation."
+)
+
 
 def load_api_keys() -> List[str]:
     """
@@ -400,24 +423,197 @@ SCHEMA_MAP = {
 }
 
 
+def load_prompts() -> Dict[str, str]:
+    """Load prompts indexed by question_type and DOK from JSON file.
+    
+    Returns: Dict mapping 'question_type_dok' (e.g., 'MCQ_2') -> prompt string
+    """
+    prompts = {}
+    if PROMPTS_FILE.exists():
+        with open(PROMPTS_FILE, 'r', encoding='utf-8') as f:
+            prompt_data = json.load(f)
+            for item in prompt_data:
+                # Support both old 'sibling_generation' and new 'variant_generation' function names
+                if item.get('function') in ['variant_generation', 'sibling_generation']:
+                    question_type = item.get('question_type', 'MCQ')
+                    dok = item.get('dok')
+                    key = f"{question_type}_{dok}"
+                    prompts[key] = item.get('prompt', '')
+        print(f"Loaded {len(prompts)} prompts for different question types and DOK levels")
+    else:
+        print(f"WARNING: Prompts file not found at {PROMPTS_FILE}")
+    return prompts
+
+
+def load_ccss_descriptions() -> Dict[str, str]:
+    """Load CCSS standard descriptions from CSV file."""
+    descriptions = {}
+    if CCSS_FILE.exists():
+        with open(CCSS_FILE, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                code = row.get('standard_code', row.get('code', ''))
+                desc = row.get('standard_description', row.get('description', ''))
+                if code and desc:
+                    descriptions[code] = desc
+        print(f"Loaded {len(descriptions)} CCSS descriptions")
+    else:
+        print(f"WARNING: CCSS file not found at {CCSS_FILE}")
+    return descriptions
+
+
+class VariantStreamParser:
+    """
+    Incremental parser for streamed structured output.
+    
+    Yields each object of the "variant_questions" (or legacy "sibling_questions")
+    array as soon as its closing brace arrives, so rows can be written while the
+    rest of the response is still streaming and completed questions survive a
+    max_tokens truncation.
+    """
+    
+    ARRAY_KEY_PATTERN = re.compile(r'"(?:variant_questions|sibling_questions)"\s*:\s*\[')
+    
+    def __init__(self):
+        self._prefix = ""       # Text seen before the array opens
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._current: List[str] = []
+    
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume a chunk of streamed text. Returns objects completed by this chunk."""
+        if self._done:
+            return []
+        
+        if not self._in_array:
+            self._prefix += chunk
+            match = self.ARRAY_KEY_PATTERN.search(self._prefix)
+            if not match:
+                return []
+            chunk = self._prefix[match.end():]
+            self._prefix = ""
+            self._in_array = True
+        
+        completed = []
+        for ch in chunk:
+            if self._depth == 0:
+                # Between array items: only an object start or the array end matter
+                if ch == '{':
+                    self._depth = 1
+                    self._current = [ch]
+                elif ch == ']':
+                    self._done = True
+                    break
+                continue
+            
+            self._current.append(ch)
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            
+            if ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.append(json.loads(''.join(self._current)))
+                    self._current = []
+        
+        return completed
+
+
 class LLMLogger:
-    """Logs all LLM communications with timestamps for traceability. Thread-safe."""
+    """
+    Logs all LLM communications with timestamps for traceability. Thread-safe.
     
-    def __init__(self, log_dir: Path, run_id: str):
+    log_request / log_response only format the entry and put it on a queue;
+    a background writer thread batches queued entries into the JSONL log and
+    the summary file, so workers never block on file I/O.
+    
+    - compress: Write the JSONL log gzip-compressed (each batch is a complete
+      gzip member, so the file stays readable even if the run is killed)
+    - max_file_mb: Rotate to a new part file once the log reaches this size
+    - prompts_by_hash: Store each distinct prompt/passage once as a "blob"
+      entry and reference it by hash from request entries
+    
+    Token usage reported with responses (including prompt cache reads and
+    writes) is accumulated for the end-of-run summary.
+    """
+    
+    # Maximum entries written per batch
+    WRITE_BATCH_SIZE = 200
+    
+    def __init__(
+        self,
+        log_dir: Path,
+        run_id: str,
+        compress: bool = True,
+        max_file_mb: float = 50,
+        prompts_by_hash: bool = False,
+        flush_interval: float = 1.0
+    ):
         self.log_dir = log_dir
         self.run_id = run_id
-        self.log_file = log_dir / f"llm_logs_{run_id}.jsonl"
+        self.compress = compress
+        self.max_file_bytes = int(max_file_mb * 1024 * 1024)
+        self.prompts_by_hash = prompts_by_hash
+        self.flush_interval = flush_interval
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
+        self._part = 1
+        self.log_file = self._log_path(self._part)
+        
         # Also set up a summary log for quick reference
         self.summary_file = log_dir / f"llm_summary_{run_id}.txt"
         
-        # Thread-safety locks
-        self._log_lock = threading.Lock()
-        self._summary_lock = threading.Lock()
+        # Blob hashes already written to the current log part (writer thread only)
+        self._written_blobs: set = set()
+        
+        # Token usage totals across all responses
+        self._usage_lock = threading.Lock()
+        self.usage_totals = {
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_creation_input_tokens': 0,
+            'cache_read_input_tokens': 0
+        }
+        
+        # Background writer
+        self._queue: Queue = Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name=f"llm-logger-{run_id}",
+            daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
         
         print(f"LLM logs will be saved to: {self.log_file}")
     
+    def _log_path(self, part: int) -> Path:
+        """Path of the given log part (part 1 keeps the historical name)."""
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        if part == 1:
+            return self.log_dir / f"llm_logs_{self.run_id}{suffix}"
+        return self.log_dir / f"llm_logs_{self.run_id}_part{part:03d}{suffix}"
+    
+    @staticmethod
+    def _hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+    
     def log_request(
         self,
         request_id: str,
@@ -428,9 +624,11 @@ class LLMLogger:
         article_id: str = "",
         question_category: str = "",
         question_type: str = "",
-        worker_id: int = 0
+        worker_id: int = 0,
+        passage_text: str = "",
+        system: Optional[List[Dict[str, Any]]] = None
     ) -> None:
-        """Log an LLM request. Thread-safe."""
+        """Log an LLM request. Thread-safe, non-blocking."""
         timestamp = datetime.now().isoformat()
         
         log_entry = {
@@ -447,22 +645,40 @@ class LLMLogger:
             "prompt": prompt,
             "prompt_length": len(prompt)
         }
+        if system:
+            log_entry["system"] = system
+        
+        blobs = {}
+        if self.prompts_by_hash:
+            # Passage text repeats across every request for an article: store it once
+            stored_prompt = prompt
+            if passage_text and passage_text in prompt:
+                passage_hash = self._hash_text(passage_text)
+                blobs[passage_hash] = passage_text
+                stored_prompt = prompt.replace(passage_text, f"{{{{passage:{passage_hash}}}}}")
+            prompt_hash = self._hash_text(stored_prompt)
+            blobs[prompt_hash] = stored_prompt
+            del log_entry["prompt"]
+            log_entry["prompt_hash"] = prompt_hash
+            if system:
+                # The cached article prefix repeats for the guiding and quiz call
+                system_text = json.dumps(system, ensure_ascii=False, sort_keys=True)
+                system_hash = self._hash_text(system_text)
+                blobs[system_hash] = system_text
+                del log_entry["system"]
+                log_entry["system_hash"] = system_hash
+        
+        summary = (
+            f"\n{'='*80}\n"
+            f"[{timestamp}] REQUEST {request_id} (Worker {worker_id})\n"
+            f"Article: {article_id} | Category: {question_category} | Type: {question_type}\n"
+            f"Model: {model}\n"
+            f"Prompt length: {len(prompt)} chars\n"
+            f"Headers: {json.dumps(headers)}\n"
+            f"{'='*80}\n"
+        )
         
-        # Write to JSONL file (thread-safe)
-        with self._log_lock:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-        
-        # Write summary (thread-safe)
-        with self._summary_lock:
-            with open(self.summary_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n{'='*80}\n")
-                f.write(f"[{timestamp}] REQUEST {request_id} (Worker {worker_id})\n")
-                f.write(f"Article: {article_id} | Category: {question_category} | Type: {question_type}\n")
-                f.write(f"Model: {model}\n")
-                f.write(f"Prompt length: {len(prompt)} chars\n")
-                f.write(f"Headers: {json.dumps(headers)}\n")
-                f.write(f"{'='*80}\n")
+        self._queue.put((log_entry, blobs, summary))
     
     def log_response(
         self,
@@ -472,11 +688,17 @@ class LLMLogger:
         duration_seconds: float,
         success: bool,
         error_message: str = "",
-        worker_id: int = 0
+        worker_id: int = 0,
+        usage: Optional[Dict[str, int]] = None
     ) -> None:
-        """Log an LLM response. Thread-safe."""
+        """Log an LLM response. Thread-safe, non-blocking."""
         timestamp = datetime.now().isoformat()
         
+        if usage:
+            with self._usage_lock:
+                for field in self.usage_totals:
+                    self.usage_totals[field] += usage.get(field, 0) or 0
+        
         log_entry = {
             "timestamp": timestamp,
             "type": "response",
@@ -489,21 +711,251 @@ class LLMLogger:
             "response": response_text,
             "error_message": error_message
         }
+        if usage:
+            log_entry["usage"] = usage
+        
+        summary = (
+            f"\n[{timestamp}] RESPONSE {request_id} (Worker {worker_id})\n"
+            f"Success: {success} | Stop Reason: {stop_reason} | Duration: {duration_seconds:.2f}s\n"
+            f"Response length: {len(response_text) if response_text else 0} chars\n"
+            + (
+                f"Tokens: {usage.get('input_tokens', 0)} in / {usage.get('output_tokens', 0)} out | "
+                f"Cache read: {usage.get('cache_read_input_tokens', 0)} | "
+                f"Cache write: {usage.get('cache_creation_input_tokens', 0)}\n"
+                if usage else ""
+            )
+            + (f"Error: {error_message}\n" if error_message else "")
+            + f"{'-'*80}\n"
+        )
+        
+        self._queue.put((log_entry, {}, summary))
+    
+    def _writer_loop(self):
+        """Drain the queue in batches and append them to the log files."""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except Empty:
+                continue
+            
+            batch = [item]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            
+            stop = any(entry is None for entry in batch)
+            try:
+                self._write_batch([entry for entry in batch if entry is not None])
+            except Exception as e:
+                print(f"  WARNING: Failed to write LLM logs: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            
+            if stop:
+                return
+    
+    def _write_batch(self, batch: List[Tuple[Dict[str, Any], Dict[str, str], str]]):
+        if not batch:
+            return
         
-        # Write to JSONL file (thread-safe)
-        with self._log_lock:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        # Rotate before writing if the current part is full
+        if self.log_file.exists() and self.log_file.stat().st_size >= self.max_file_bytes:
+            self._part += 1
+            self.log_file = self._log_path(self._part)
+            self._written_blobs = set()
+        
+        lines = []
+        summaries = []
+        for log_entry, blobs, summary in batch:
+            for blob_hash, text in blobs.items():
+                if blob_hash not in self._written_blobs:
+                    self._written_blobs.add(blob_hash)
+                    lines.append(json.dumps(
+                        {"type": "blob", "hash": blob_hash, "text": text},
+                        ensure_ascii=False
+                    ))
+            lines.append(json.dumps(log_entry, ensure_ascii=False))
+            summaries.append(summary)
+        
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        with open(self.log_file, 'ab') as f:
+            f.write(gzip.compress(data) if self.compress else data)
+        
+        with open(self.summary_file, 'a', encoding='utf-8') as f:
+            f.write(''.join(summaries))
+    
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """Token usage totals plus the share of prompt tokens served from the prompt cache."""
+        with self._usage_lock:
+            stats = dict(self.usage_totals)
+        prompt_tokens = (
+            stats['input_tokens']
+            + stats['cache_creation_input_tokens']
+            + stats['cache_read_input_tokens']
+        )
+        stats['cache_hit_rate'] = stats['cache_read_input_tokens'] / prompt_tokens if prompt_tokens else 0.0
+        return stats
+    
+    def format_usage_stats(self) -> str:
+        """One-line token usage summary for end-of-run reports."""
+        stats = self.get_usage_stats()
+        return (
+            f"Tokens: {stats['input_tokens']:,} uncached in, "
+            f"{stats['cache_creation_input_tokens']:,} cache write, "
+            f"{stats['cache_read_input_tokens']:,} cache read "
+            f"({stats['cache_hit_rate']*100:.1f}% of prompt tokens), "
+            f"{stats['output_tokens']:,} out"
+        )
+    
+    def flush(self) -> None:
+        """Block until every queued entry has been written."""
+        self._queue.join()
+    
+    def close(self) -> None:
+        """Flush pending entries and stop the writer thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+
+def expected_sibling_count(
+    questions: List[Dict],
+    include_guiding: bool = False,
+    only_guiding: bool = False
+) -> int:
+    """Number of siblings an article should produce under the given category settings."""
+    expected = 0
+    if not only_guiding:
+        expected += sum(1 for q in questions if q.get('question_category') == 'quiz') * QUIZ_SIBLINGS
+    if include_guiding or only_guiding:
+        expected += sum(1 for q in questions if q.get('question_category') == 'guiding') * GUIDING_SIBLINGS
+    return expected
+
+
+class CompletionManifest:
+    """
+    Sidecar manifest of per-article completion, kept next to the extended output.
+    
+    For every finished article it stores the expected and produced sibling
+    counts and a hash of the article's input questions, and is rewritten
+    atomically (temp file + rename) each time an article finishes. Resume reads
+    only this file instead of the full output CSV, and re-processes articles
+    whose inputs changed or whose counts fall short. Articles are marked
+    in progress before their rows start streaming, so an interrupted article's
+    partial rows are dropped when it is re-processed. Thread-safe.
+    """
+    
+    # Fraction of expected siblings an article needs to count as complete
+    COMPLETION_RATIO = 0.75
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.articles: Dict[str, Dict[str, Any]] = {}
+        self.exists = False
         
-        # Write summary (thread-safe)
-        with self._summary_lock:
-            with open(self.summary_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n[{timestamp}] RESPONSE {request_id} (Worker {worker_id})\n")
-                f.write(f"Success: {success} | Stop Reason: {stop_reason} | Duration: {duration_seconds:.2f}s\n")
-                f.write(f"Response length: {len(response_text) if response_text else 0} chars\n")
-                if error_message:
-                    f.write(f"Error: {error_message}\n")
-                f.write(f"{'-'*80}\n")
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.articles = json.load(f).get('articles', {})
+                self.exists = True
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"  Warning: Could not read completion manifest {self.path}: {e}")
+    
+    @staticmethod
+    def hash_questions(questions: List[Dict]) -> str:
+        """Content hash of an article's input questions (order-independent)."""
+        ordered = sorted(questions, key=lambda q: str(q.get('question_id', '')))
+        canonical = json.dumps(ordered, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+    
+    def status(self, article_id: str, questions: List[Dict], expected: int) -> str:
+        """
+        One of 'complete', 'missing', 'in_progress' (interrupted mid-stream),
+        'changed' (inputs differ) or 'short' (too few siblings).
+        """
+        entry = self.articles.get(article_id)
+        if entry is None:
+            return 'missing'
+        if entry.get('in_progress'):
+            return 'in_progress'
+        if entry.get('input_hash') != self.hash_questions(questions):
+            return 'changed'
+        if entry.get('produced', 0) < expected * self.COMPLETION_RATIO:
+            return 'short'
+        return 'complete'
+    
+    def start(self, article_id: str) -> None:
+        """Mark an article in progress before its rows are written, and persist the manifest."""
+        with self._lock:
+            self.articles[article_id] = {
+                'in_progress': True,
+                'started_at': datetime.now().isoformat()
+            }
+            self._save_locked()
+    
+    def record(self, article_id: str, questions: List[Dict], expected: int, produced: int) -> None:
+        """Record a finished article and persist the manifest."""
+        self.record_many([(article_id, questions, expected, produced)])
+    
+    def record_many(self, entries: List[Tuple[str, List[Dict], int, int]]) -> None:
+        """Record several finished articles with a single write."""
+        if not entries:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            for article_id, questions, expected, produced in entries:
+                self.articles[article_id] = {
+                    'input_hash': self.hash_questions(questions),
+                    'expected': expected,
+                    'produced': produced,
+                    'completed_at': now
+                }
+            self._save_locked()
+    
+    def _save_locked(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'last_updated': datetime.now().isoformat(),
+                'articles': self.articles
+            }, f)
+        os.replace(tmp_path, self.path)
+        self.exists = True
+    
+    def completed_articles(
+        self,
+        articles: Dict[str, List[Dict]],
+        include_guiding: bool = False,
+        only_guiding: bool = False
+    ) -> set:
+        """Articles that are complete for their current inputs; prints why others will run."""
+        completed = set()
+        reasons: Dict[str, int] = {}
+        for article_id, questions in articles.items():
+            expected = expected_sibling_count(questions, include_guiding, only_guiding)
+            state = self.status(article_id, questions, expected)
+            if state == 'complete':
+                completed.add(article_id)
+            elif state != 'missing':
+                reasons[state] = reasons.get(state, 0) + 1
+        
+        if completed:
+            print(f"  Found {len(completed)} completed articles in manifest")
+        if reasons.get('changed'):
+            print(f"  Found {reasons['changed']} articles with changed inputs (will reprocess)")
+        if reasons.get('short'):
+            print(f"  Found {reasons['short']} partially completed articles (will reprocess)")
+        if reasons.get('in_progress'):
+            print(f"  Found {reasons['in_progress']} interrupted articles (will reprocess)")
+        return completed
 
 
 class QuestionBankExtender:
@@ -517,9 +969,34 @@ class QuestionBankExtender:
         run_id: Optional[str] = None,
         include_guiding: bool = False,
         only_guiding: bool = False,
-        worker_id: int = 0
+        worker_id: int = 0,
+        prompts: Optional[Dict[str, str]] = None,
+        ccss_descriptions: Optional[Dict[str, str]] = None,
+        llm_logger: Optional[LLMLogger] = None,
+        log_options: Optional[Dict[str, Any]] = None,
+        prompt_caching: bool = True
     ):
+        """
+        Initialize the extender.
+        
+        Args:
+            api_key: Anthropic API key (one client / connection pool per extender)
+            checkpoint_dir: Directory for checkpoint files
+            log_dir: Directory for LLM logs
+            run_id: Optional run ID (auto-generated if not provided)
+            include_guiding: Include guiding questions
+            only_guiding: Only process guiding questions
+            worker_id: Worker index for concurrent processing
+            prompts: Pre-loaded prompt templates (shared read-only between workers)
+            ccss_descriptions: Pre-loaded CCSS descriptions (shared read-only between workers)
+            llm_logger: Shared thread-safe logger (a new one is created if omitted)
+            log_options: LLMLogger options (compress, max_file_mb, prompts_by_hash)
+            prompt_caching: Send the article passages once as a cached system prompt
+                block shared by the guiding and quiz calls
+        """
         self.client = anthropic.Anthropic(api_key=api_key)
+        # Shared with every worker using this key; paced from the rate limit headers
+        self.rate_governor = get_rate_governor_for(self.client)
         self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
         if self.checkpoint_dir:
             self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
@@ -537,57 +1014,37 @@ class QuestionBankExtender:
         # Set up run ID (used for timestamped outputs)
         self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Set up LLM logger
-        log_path = Path(log_dir) if log_dir else (Path(__file__).parent / "outputs" / "llm_logs")
-        self.llm_logger = LLMLogger(log_path, self.run_id)
+        # Set up LLM logger (reuse a shared one when provided)
+        if llm_logger is not None:
+            self.llm_logger = llm_logger
+        else:
+            log_path = Path(log_dir) if log_dir else (Path(__file__).parent / "outputs" / "llm_logs")
+            self.llm_logger = LLMLogger(log_path, self.run_id, **(log_options or {}))
         self.request_counter = 0
         
+        # Shared on-disk response cache (skips prompts we already paid for)
+        self.llm_cache = get_llm_cache()
+        
+        # Anthropic prompt caching of the per-article passage prefix
+        self.prompt_caching = prompt_caching
+        
         # Thread-safety locks for shared resources
         self._checkpoint_lock = threading.Lock()
         self._counter_lock = threading.Lock()
         
-        # Load DOK-specific prompts
-        self.prompts = self._load_prompts()
+        # Load DOK-specific prompts (or reuse the shared, read-only copy)
+        self.prompts = prompts if prompts is not None else self._load_prompts()
         
-        # Load CCSS descriptions
-        self.ccss_descriptions = self._load_ccss_descriptions()
+        # Load CCSS descriptions (or reuse the shared, read-only copy)
+        self.ccss_descriptions = ccss_descriptions if ccss_descriptions is not None else self._load_ccss_descriptions()
     
     def _load_prompts(self) -> Dict[str, str]:
-        """Load prompts indexed by question_type and DOK from JSON file.
-        
-        Returns: Dict mapping 'question_type_dok' (e.g., 'MCQ_2') -> prompt string
-        """
-        prompts = {}
-        if PROMPTS_FILE.exists():
-            with open(PROMPTS_FILE, 'r', encoding='utf-8') as f:
-                prompt_data = json.load(f)
-                for item in prompt_data:
-                    # Support both old 'sibling_generation' and new 'variant_generation' function names
-                    if item.get('function') in ['variant_generation', 'sibling_generation']:
-                        question_type = item.get('question_type', 'MCQ')
-                        dok = item.get('dok')
-                        key = f"{question_type}_{dok}"
-                        prompts[key] = item.get('prompt', '')
-            print(f"Loaded {len(prompts)} prompts for different question types and DOK levels")
-        else:
-            print(f"WARNING: Prompts file not found at {PROMPTS_FILE}")
-        return prompts
+        """Load prompts indexed by question_type and DOK from JSON file."""
+        return load_prompts()
     
     def _load_ccss_descriptions(self) -> Dict[str, str]:
         """Load CCSS standard descriptions from CSV file."""
-        descriptions = {}
-        if CCSS_FILE.exists():
-            with open(CCSS_FILE, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    code = row.get('standard_code', row.get('code', ''))
-                    desc = row.get('standard_description', row.get('description', ''))
-                    if code and desc:
-                        descriptions[code] = desc
-            print(f"Loaded {len(descriptions)} CCSS descriptions")
-        else:
-            print(f"WARNING: CCSS file not found at {CCSS_FILE}")
-        return descriptions
+        return load_ccss_descriptions()
     
     def _extract_grade_level(self, standard_code: str) -> str:
         """Extract grade level string from CCSS standard code.
@@ -659,7 +1116,8 @@ class QuestionBankExtender:
     def build_generation_prompt_for_question(
         self, 
         question: Dict,
-        num_siblings: int
+        num_siblings: int,
+        passage_in_system: bool = False
     ) -> str:
         """
         Build question-type and DOK-specific prompt for generating sibling questions.
@@ -667,6 +1125,8 @@ class QuestionBankExtender:
         Args:
             question: The original question to create siblings for
             num_siblings: Number of siblings to generate
+            passage_in_system: Reference the cached article passage in the system
+                prompt instead of inlining the passage text
         """
         # Extract question type (default to MCQ)
         question_type = question.get('question_type', 'MCQ').upper()
@@ -718,7 +1178,10 @@ class QuestionBankExtender:
         # Build the prompt with all placeholders filled
         prompt = prompt_template.format(
             grade_level=grade_level,
-            passage_text=question.get('passage_text', ''),
+            passage_text=(
+                self._passage_reference([question]) if passage_in_system
+                else question.get('passage_text', '')
+            ),
             standard_code=standard_code,
             standard_description=standard_description,
             difficulty=question.get('difficulty', 'medium'),
@@ -741,7 +1204,8 @@ class QuestionBankExtender:
         self, 
         questions: List[Dict], 
         question_category: str,
-        num_siblings: int
+        num_siblings: int,
+        passage_in_system: bool = False
     ) -> str:
         """
         Build prompt for generating sibling questions (legacy method for batch processing).
@@ -751,10 +1215,14 @@ class QuestionBankExtender:
             questions: List of existing questions (same category, same article)
             question_category: 'guiding' or 'quiz'
             num_siblings: Number of siblings to generate per question
+            passage_in_system: Reference the cached article passage in the system
+                prompt instead of inlining the passage text
         """
         # If we have DOK-specific prompts and only one question, use the new method
         if len(questions) == 1 and self.prompts:
-            return self.build_generation_prompt_for_question(questions[0], num_siblings)
+            return self.build_generation_prompt_for_question(
+                questions[0], num_siblings, passage_in_system=passage_in_system
+            )
         
         # For multiple questions, build a combined prompt with DIVERSITY focus
         # Get article info from first question
@@ -762,7 +1230,9 @@ class QuestionBankExtender:
         grade = questions[0].get('grade', 3)
         
         # Build passage context
-        if question_category == 'guiding':
+        if passage_in_system:
+            passages_text = self._passage_reference(questions)
+        elif question_category == 'guiding':
             passages_text = ""
             for q in questions:
                 section_num = q.get('section_number', q.get('section_sequence', ''))
@@ -927,19 +1397,76 @@ DOK 3 Requirements for siblings:
 - Make complex inferences or connections"""
         return ""
     
+    @staticmethod
+    def _section_label(question: Dict) -> str:
+        return str(question.get('section_number') or question.get('section_sequence') or '')
+    
+    def _build_article_system_prompt(self, questions: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Build system blocks holding every distinct passage of an article.
+        
+        The passage block carries cache_control, so the guiding and quiz calls
+        for the same article (and retries / re-runs within the cache lifetime)
+        read the passage from the prompt cache instead of paying for it again.
+        Built from all questions of the article so both calls share the same prefix.
+        """
+        sections = []
+        seen = set()
+        for q in questions:
+            passage = q.get('passage_text', '')
+            if passage and passage not in seen:
+                seen.add(passage)
+                sections.append(f"### Section {self._section_label(q)}:\n{passage}")
+        
+        return [
+            {
+                "type": "text",
+                "text": ARTICLE_SYSTEM_INSTRUCTION
+            },
+            {
+                "type": "text",
+                "text": f"""## Article: {questions[0].get('article_title', '') if questions else ''}
+
+{chr(10).join(sections) if sections else "No passage provided"}""",
+                "cache_control": {"type": "ephemeral"}
+            }
+        ]
+    
+    def _passage_reference(self, questions: List[Dict]) -> str:
+        """Pointer used in the user prompt in place of the inlined passage text."""
+        labels = []
+        for q in questions:
+            label = self._section_label(q)
+            if q.get('passage_text') and label not in labels:
+                labels.append(label)
+        if labels:
+            return (f"(The passage is Section {', '.join(labels)} of the article "
+                    f"in the system prompt.)")
+        return "(The passage is the article in the system prompt.)"
+    
     def generate_siblings_for_article(
         self, 
         article_id: str, 
-        questions: List[Dict]
+        questions: List[Dict],
+        on_record: Optional[Callable[[Dict], None]] = None
     ) -> List[Dict]:
         """
         Generate sibling questions for all questions in an article.
         
         Makes separate API calls for guiding and quiz questions.
         Respects the include_guiding and only_guiding settings.
+        
+        Args:
+            article_id: Article being processed
+            questions: Existing questions for the article
+            on_record: Called with each generated record as soon as it is parsed
+                from the stream (e.g. to append it to the output CSV)
         """
         results = []
         
+        # Shared, cached passage prefix for both the guiding and the quiz call
+        system = self._build_article_system_prompt(questions) if self.prompt_caching else None
+        
         # Separate guiding and quiz questions
         guiding_questions = [q for q in questions if q.get('question_category') == 'guiding']
         quiz_questions = [q for q in questions if q.get('question_category') == 'quiz']
@@ -955,7 +1482,9 @@ DOK 3 Requirements for siblings:
                 questions=guiding_questions,
                 question_category='guiding',
                 num_siblings=GUIDING_SIBLINGS,
-                article_id=article_id
+                article_id=article_id,
+                on_record=on_record,
+                system=system
             )
             results.extend(guiding_results)
         elif guiding_questions:
@@ -968,7 +1497,9 @@ DOK 3 Requirements for siblings:
                 questions=quiz_questions,
                 question_category='quiz',
                 num_siblings=QUIZ_SIBLINGS,
-                article_id=article_id
+                article_id=article_id,
+                on_record=on_record,
+                system=system
             )
             results.extend(quiz_results)
         elif quiz_questions:
@@ -981,11 +1512,26 @@ DOK 3 Requirements for siblings:
         questions: List[Dict],
         question_category: str,
         num_siblings: int,
-        article_id: str
+        article_id: str,
+        on_record: Optional[Callable[[Dict], None]] = None,
+        system: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict]:
-        """Generate a batch of sibling questions via API call using structured outputs."""
+        """
+        Generate a batch of sibling questions via API call using structured outputs.
         
-        prompt = self.build_generation_prompt(questions, question_category, num_siblings)
+        The response is parsed incrementally: each variant is turned into a record
+        (and passed to on_record) as soon as it closes in the stream. Variants
+        completed before a max_tokens stop are kept.
+        
+        When system blocks are given (see _build_article_system_prompt), the
+        passage is sent once in the cached system prompt and the user prompt
+        only references it.
+        """
+        
+        prompt = self.build_generation_prompt(
+            questions, question_category, num_siblings,
+            passage_in_system=system is not None
+        )
         
         # Determine question type from first question (assuming batch is same type)
         question_type = questions[0].get('question_type', 'MCQ').upper() if questions else 'MCQ'
@@ -1009,185 +1555,148 @@ DOK 3 Requirements for siblings:
             }
         }
         
-        # Log the request
-        self.llm_logger.log_request(
-            request_id=request_id,
-            prompt=prompt,
+        # Check the response cache (key matches entries seeded from llm_logs)
+        cache_key = LLMResponseCache.make_key(
             model=MODEL,
-            headers=headers,
-            extra_body=extra_body,
-            article_id=article_id,
-            question_category=question_category,
-            question_type=question_type,
-            worker_id=self.worker_id
+            prompt={"system": system, "user": prompt} if system else prompt,
+            schema=extra_body["output_format"]
         )
+        cached = self.llm_cache.get(cache_key)
+        
+        if cached is None:
+            # Log the request
+            self.llm_logger.log_request(
+                request_id=request_id,
+                prompt=prompt,
+                model=MODEL,
+                headers=headers,
+                extra_body=extra_body,
+                article_id=article_id,
+                question_category=question_category,
+                question_type=question_type,
+                worker_id=self.worker_id,
+                passage_text=questions[0].get('passage_text', '') if questions else '',
+                system=system
+            )
         
         start_time = time.time()
+        parser = VariantStreamParser()
+        generated = []
+        max_variants = len(questions) * num_siblings
+        
+        def emit(gen_questions: List[Dict]):
+            for gen_q in gen_questions:
+                index = len(generated)
+                if index >= max_variants:
+                    continue
+                # Each original question gets num_siblings consecutive variants
+                record = self._build_sibling_record(
+                    orig_q=questions[index // num_siblings],
+                    gen_q=gen_q,
+                    sibling_number=index % num_siblings + 1,
+                    question_category=question_category,
+                    question_type=question_type,
+                    article_id=article_id
+                )
+                generated.append(record)
+                if on_record is not None:
+                    on_record(record)
         
         try:
-            # Use the structured outputs beta API with streaming for long requests
-            # See: https://platform.claude.com/docs/en/build-with-claude/structured-outputs
-            # Streaming is required for max_tokens > ~16K to avoid timeout errors
-            
-            collected_text = ""
+            chunks = []
             stop_reason = None
+            usage = None
             
-            # Use raw streaming with beta headers
-            with self.client.messages.stream(
-                model=MODEL,
-                max_tokens=64000,  # Claude Sonnet 4.5 max output
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                extra_headers=headers,
-                extra_body=extra_body
-            ) as stream:
-                for text in stream.text_stream:
-                    collected_text += text
-                # Get final message for stop_reason
-                final_message = stream.get_final_message()
-                stop_reason = final_message.stop_reason
-            
-            duration = time.time() - start_time
-            
-            # Log the response
-            self.llm_logger.log_response(
-                request_id=request_id,
-                response_text=collected_text,
-                stop_reason=stop_reason,
-                duration_seconds=duration,
-                success=True,
-                worker_id=self.worker_id
-            )
+            if cached is not None:
+                chunks.append(cached['text'])
+                stop_reason = cached['stop_reason']
+                emit(parser.feed(cached['text']))
+                print(f"  [Worker {self.worker_id}] ♻️  Cached response for {article_id} ({question_category})")
+            else:
+                # Use the structured outputs beta API with streaming for long requests
+                # See: https://platform.claude.com/docs/en/build-with-claude/structured-outputs
+                # Streaming is required for max_tokens > ~16K to avoid timeout errors
+                
+                stream_kwargs = {}
+                if system:
+                    stream_kwargs['system'] = system
+                
+                # Wait for request / token budget on this API key
+                estimated_input = estimate_tokens(prompt) + estimate_tokens(system)
+                self.rate_governor.acquire_sync(estimated_input)
+                
+                # Use raw streaming with beta headers
+                with self.client.messages.stream(
+                    model=MODEL,
+                    max_tokens=64000,  # Claude Sonnet 4.5 max output
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    extra_headers=headers,
+                    extra_body=extra_body,
+                    **stream_kwargs
+                ) as stream:
+                    for text in stream.text_stream:
+                        chunks.append(text)
+                        emit(parser.feed(text))
+                    # Get final message for stop_reason and token usage
+                    final_message = stream.get_final_message()
+                    stop_reason = final_message.stop_reason
+                    usage = final_message.usage
+                    self.rate_governor.update_from_headers(getattr(stream.response, 'headers', None))
+                
+                self.rate_governor.record_usage(
+                    (getattr(usage, 'input_tokens', 0) or 0)
+                    + (getattr(usage, 'cache_creation_input_tokens', 0) or 0),
+                    getattr(usage, 'output_tokens', 0) or 0,
+                    estimated_input=estimated_input
+                )
+                self.rate_governor.report_success()
+                
+                duration = time.time() - start_time
+                
+                # Log the response
+                self.llm_logger.log_response(
+                    request_id=request_id,
+                    response_text=''.join(chunks),
+                    stop_reason=stop_reason,
+                    duration_seconds=duration,
+                    success=True,
+                    worker_id=self.worker_id,
+                    usage={
+                        'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+                        'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+                        'cache_creation_input_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+                        'cache_read_input_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0
+                    } if usage is not None else None
+                )
             
             # Check for refusal or max_tokens
             if stop_reason == "refusal":
                 print(f"  WARNING: Claude refused the request")
-                return []
+                return generated
             if stop_reason == "max_tokens":
-                print(f"  WARNING: Response truncated due to max_tokens limit")
-                return []
+                print(f"  WARNING: Response truncated due to max_tokens limit "
+                      f"(kept {len(generated)}/{max_variants} completed questions)")
+                return generated
             
-            # Parse the JSON response from collected stream
-            generated = []
-            response_data = json.loads(collected_text)
-            # Support both old "sibling_questions" and new "variant_questions" keys
-            variant_questions = response_data.get("variant_questions", response_data.get("sibling_questions", []))
-            
-            # Map generated questions back to original questions
-            for i, orig_q in enumerate(questions):
-                # Each original question gets num_variants new questions
-                start_idx = i * num_siblings
-                end_idx = start_idx + num_siblings
-                
-                for j, gen_q in enumerate(variant_questions[start_idx:end_idx]):
-                    # Build base record with common metadata
-                    record = {
-                        # Preserve original metadata
-                        'article_id': article_id,
-                        'article_title': orig_q.get('article_title', ''),
-                        'section_id': orig_q.get('section_id', ''),
-                        'section_sequence': orig_q.get('section_sequence', ''),
-                        'question_id': f"{orig_q.get('question_id', '')}_sibling_{j+1}",
-                        'question_category': question_category,
-                        'stimulus_id': orig_q.get('stimulus_id', ''),
-                        'passage_text': orig_q.get('passage_text', ''),
-                        'lexile_level': orig_q.get('lexile_level', ''),
-                        'course': orig_q.get('course', ''),
-                        'module': orig_q.get('module', ''),
-                        'section_number': orig_q.get('section_number', ''),
-                        'question_type': question_type,
-                        
-                        # Preserve metadata from original
-                        'DOK': orig_q.get('DOK', ''),
-                        'difficulty': orig_q.get('difficulty', ''),
-                        'CCSS': orig_q.get('CCSS', ''),
-                        'grade': orig_q.get('grade', 3),
-                        
-                        # Tracking
-                        'parent_question_id': orig_q.get('question_id', ''),
-                        'generation_timestamp': datetime.now().isoformat(),
-                        'differentiation_notes': gen_q.get('differentiation_notes', gen_q.get('template_adaptation', '')),
-                    }
-                    
-                    # Add question-type specific fields
-                    if question_type == 'MCQ':
-                        quality_verification = gen_q.get('quality_verification', {})
-                        record.update({
-                            'question': gen_q.get('question', ''),
-                            'option_1': gen_q.get('option_1', ''),
-                            'option_2': gen_q.get('option_2', ''),
-                            'option_3': gen_q.get('option_3', ''),
-                            'option_4': gen_q.get('option_4', ''),
-                            'correct_answer': gen_q.get('correct_answer', ''),
-                            'option_1_explanation': gen_q.get('option_1_explanation', ''),
-                            'option_2_explanation': gen_q.get('option_2_explanation', ''),
-                            'option_3_explanation': gen_q.get('option_3_explanation', ''),
-                            'option_4_explanation': gen_q.get('option_4_explanation', ''),
-                            'cognitive_process': gen_q.get('cognitive_process', ''),
-                            'homogeneity_check': quality_verification.get('homogeneity_check', ''),
-                            'specificity_check': quality_verification.get('specificity_check', ''),
-                            'length_check': quality_verification.get('length_check', ''),
-                            'semantic_distance_check': quality_verification.get('semantic_distance_check', ''),
-                            'single_correct_check': quality_verification.get('single_correct_check', ''),
-                            'diversity_check': quality_verification.get('diversity_check', quality_verification.get('uniqueness_check', ''))
-                        })
-                    
-                    elif question_type == 'SR':
-                        key_details = gen_q.get('key_details', [])
-                        record.update({
-                            'question': gen_q.get('question', ''),
-                            'expected_response': gen_q.get('expected_response', ''),
-                            'key_details': json.dumps(key_details) if isinstance(key_details, list) else key_details,
-                            'scoring_notes': gen_q.get('scoring_notes', ''),
-                            'dok_justification': gen_q.get('dok_justification', ''),
-                            # Clear MCQ-specific fields
-                            'option_1': '', 'option_2': '', 'option_3': '', 'option_4': '',
-                            'correct_answer': '', 
-                            'option_1_explanation': '', 'option_2_explanation': '',
-                            'option_3_explanation': '', 'option_4_explanation': '',
-                        })
-                    
-                    elif question_type == 'MP':
-                        part_a = gen_q.get('part_a', {})
-                        part_b = gen_q.get('part_b', {})
-                        record.update({
-                            # Part A
-                            'question': part_a.get('question', ''),
-                            'option_1': part_a.get('option_1', ''),
-                            'option_2': part_a.get('option_2', ''),
-                            'option_3': part_a.get('option_3', ''),
-                            'option_4': part_a.get('option_4', ''),
-                            'correct_answer': part_a.get('correct_answer', ''),
-                            'option_1_explanation': part_a.get('option_1_explanation', ''),
-                            'option_2_explanation': part_a.get('option_2_explanation', ''),
-                            'option_3_explanation': part_a.get('option_3_explanation', ''),
-                            'option_4_explanation': part_a.get('option_4_explanation', ''),
-                            'part_a_dok': part_a.get('DOK', ''),
-                            # Part B
-                            'part_b_question': part_b.get('question', ''),
-                            'part_b_option_1': part_b.get('option_1', ''),
-                            'part_b_option_2': part_b.get('option_2', ''),
-                            'part_b_option_3': part_b.get('option_3', ''),
-                            'part_b_option_4': part_b.get('option_4', ''),
-                            'part_b_correct_answer': part_b.get('correct_answer', ''),
-                            'part_b_option_1_explanation': part_b.get('option_1_explanation', ''),
-                            'part_b_option_2_explanation': part_b.get('option_2_explanation', ''),
-                            'part_b_option_3_explanation': part_b.get('option_3_explanation', ''),
-                            'part_b_option_4_explanation': part_b.get('option_4_explanation', ''),
-                            'part_b_dok': part_b.get('DOK', ''),
-                            # Connection info
-                            'connection_rationale': gen_q.get('connection_rationale', ''),
-                            'dok_justification': gen_q.get('dok_justification', ''),
-                            'standard_assessment': gen_q.get('standard_assessment', ''),
-                        })
-                    
-                    generated.append(record)
+            # Validate the full response before caching it
+            collected_text = ''.join(chunks)
+            json.loads(collected_text)
+            if cached is None:
+                self.llm_cache.put(
+                    cache_key,
+                    {'text': collected_text, 'stop_reason': stop_reason},
+                    model=MODEL
+                )
             
             return generated
             
         except Exception as e:
             duration = time.time() - start_time
+            if is_rate_limit_error(e):
+                # Slows every worker sharing this key (honours retry-after)
+                self.rate_governor.report_rate_limit(e)
             
             # Log the error
             self.llm_logger.log_response(
@@ -1201,7 +1710,122 @@ DOK 3 Requirements for siblings:
             )
             
             print(f"  [Worker {self.worker_id}] ERROR generating batch: {e}")
-            return []
+            if generated:
+                print(f"  [Worker {self.worker_id}] Kept {len(generated)} questions completed before the error")
+            return generated
+    
+    def _build_sibling_record(
+        self,
+        orig_q: Dict,
+        gen_q: Dict,
+        sibling_number: int,
+        question_category: str,
+        question_type: str,
+        article_id: str
+    ) -> Dict:
+        """Build an output CSV record for one generated variant."""
+        # Build base record with common metadata
+        record = {
+            # Preserve original metadata
+            'article_id': article_id,
+            'article_title': orig_q.get('article_title', ''),
+            'section_id': orig_q.get('section_id', ''),
+            'section_sequence': orig_q.get('section_sequence', ''),
+            'question_id': f"{orig_q.get('question_id', '')}_sibling_{sibling_number}",
+            'question_category': question_category,
+            'stimulus_id': orig_q.get('stimulus_id', ''),
+            'passage_text': orig_q.get('passage_text', ''),
+            'lexile_level': orig_q.get('lexile_level', ''),
+            'course': orig_q.get('course', ''),
+            'module': orig_q.get('module', ''),
+            'section_number': orig_q.get('section_number', ''),
+            'question_type': question_type,
+            
+            # Preserve metadata from original
+            'DOK': orig_q.get('DOK', ''),
+            'difficulty': orig_q.get('difficulty', ''),
+            'CCSS': orig_q.get('CCSS', ''),
+            'grade': orig_q.get('grade', 3),
+            
+            # Tracking
+            'parent_question_id': orig_q.get('question_id', ''),
+            'generation_timestamp': datetime.now().isoformat(),
+            'differentiation_notes': gen_q.get('differentiation_notes', gen_q.get('template_adaptation', '')),
+        }
+        
+        # Add question-type specific fields
+        if question_type == 'MCQ':
+            quality_verification = gen_q.get('quality_verification', {})
+            record.update({
+                'question': gen_q.get('question', ''),
+                'option_1': gen_q.get('option_1', ''),
+                'option_2': gen_q.get('option_2', ''),
+                'option_3': gen_q.get('option_3', ''),
+                'option_4': gen_q.get('option_4', ''),
+                'correct_answer': gen_q.get('correct_answer', ''),
+                'option_1_explanation': gen_q.get('option_1_explanation', ''),
+                'option_2_explanation': gen_q.get('option_2_explanation', ''),
+                'option_3_explanation': gen_q.get('option_3_explanation', ''),
+                'option_4_explanation': gen_q.get('option_4_explanation', ''),
+                'cognitive_process': gen_q.get('cognitive_process', ''),
+                'homogeneity_check': quality_verification.get('homogeneity_check', ''),
+                'specificity_check': quality_verification.get('specificity_check', ''),
+                'length_check': quality_verification.get('length_check', ''),
+                'semantic_distance_check': quality_verification.get('semantic_distance_check', ''),
+                'single_correct_check': quality_verification.get('single_correct_check', ''),
+                'diversity_check': quality_verification.get('diversity_check', quality_verification.get('uniqueness_check', ''))
+            })
+        
+        elif question_type == 'SR':
+            key_details = gen_q.get('key_details', [])
+            record.update({
+                'question': gen_q.get('question', ''),
+                'expected_response': gen_q.get('expected_response', ''),
+                'key_details': json.dumps(key_details) if isinstance(key_details, list) else key_details,
+                'scoring_notes': gen_q.get('scoring_notes', ''),
+                'dok_justification': gen_q.get('dok_justification', ''),
+                # Clear MCQ-specific fields
+                'option_1': '', 'option_2': '', 'option_3': '', 'option_4': '',
+                'correct_answer': '', 
+                'option_1_explanation': '', 'option_2_explanation': '',
+                'option_3_explanation': '', 'option_4_explanation': '',
+            })
+        
+        elif question_type == 'MP':
+            part_a = gen_q.get('part_a', {})
+            part_b = gen_q.get('part_b', {})
+            record.update({
+                # Part A
+                'question': part_a.get('question', ''),
+                'option_1': part_a.get('option_1', ''),
+                'option_2': part_a.get('option_2', ''),
+                'option_3': part_a.get('option_3', ''),
+                'option_4': part_a.get('option_4', ''),
+                'correct_answer': part_a.get('correct_answer', ''),
+                'option_1_explanation': part_a.get('option_1_explanation', ''),
+                'option_2_explanation': part_a.get('option_2_explanation', ''),
+                'option_3_explanation': part_a.get('option_3_explanation', ''),
+                'option_4_explanation': part_a.get('option_4_explanation', ''),
+                'part_a_dok': part_a.get('DOK', ''),
+                # Part B
+                'part_b_question': part_b.get('question', ''),
+                'part_b_option_1': part_b.get('option_1', ''),
+                'part_b_option_2': part_b.get('option_2', ''),
+                'part_b_option_3': part_b.get('option_3', ''),
+                'part_b_option_4': part_b.get('option_4', ''),
+                'part_b_correct_answer': part_b.get('correct_answer', ''),
+                'part_b_option_1_explanation': part_b.get('option_1_explanation', ''),
+                'part_b_option_2_explanation': part_b.get('option_2_explanation', ''),
+                'part_b_option_3_explanation': part_b.get('option_3_explanation', ''),
+                'part_b_option_4_explanation': part_b.get('option_4_explanation', ''),
+                'part_b_dok': part_b.get('DOK', ''),
+                # Connection info
+                'connection_rationale': gen_q.get('connection_rationale', ''),
+                'dok_justification': gen_q.get('dok_justification', ''),
+                'standard_assessment': gen_q.get('standard_assessment', ''),
+            })
+        
+        return record
     
     def process_all_articles(
         self, 
@@ -1312,16 +1936,17 @@ DOK 3 Requirements for siblings:
                 print(f"  Existing: {guiding_count} guiding + {quiz_count} quiz")
                 print(f"  Expected to generate: {expected} questions")
                 
-                # Generate siblings
+                # Generate siblings, writing each row as soon as it is parsed
+                def write_record(record: Dict):
+                    writer.writerow(record)
+                    f.flush()  # Ensure written to disk
+                
                 start_time = time.time()
-                generated = self.generate_siblings_for_article(article_id, questions)
+                generated = self.generate_siblings_for_article(
+                    article_id, questions, on_record=write_record
+                )
                 elapsed = time.time() - start_time
                 
-                # Write to output
-                for record in generated:
-                    writer.writerow(record)
-                f.flush()  # Ensure written to disk
-                
                 total_generated += len(generated)
                 print(f"  Generated: {len(generated)} questions in {elapsed:.1f}s")
                 
@@ -1333,6 +1958,11 @@ DOK 3 Requirements for siblings:
         
         print(f"\nExtension complete! Generated {total_generated} total questions")
         print(f"Extended questions saved to {extended_file}")
+        print(self.llm_cache.format_stats())
+        print(self.llm_logger.format_usage_stats())
+        
+        # Flush queued log entries
+        self.llm_logger.close()
         
         # Now combine with original questions
         combined_file = self._combine_questions(
@@ -1436,8 +2066,11 @@ class ConcurrentQuestionBankExtender:
     """
     Orchestrates concurrent question generation using multiple API keys.
     
-    Each API key gets its own worker that processes articles sequentially.
-    Multiple workers run in parallel, each with its own API key.
+    Each API key gets one long-lived worker (one client / connection pool per key)
+    that pulls articles from a shared priority queue and processes them sequentially.
+    Articles are ordered longest-expected-first, so whichever key frees up next
+    takes the next biggest article and slow articles don't leave keys idle.
+    Prompts and CCSS descriptions are loaded once and shared read-only.
     """
     
     def __init__(
@@ -1448,7 +2081,9 @@ class ConcurrentQuestionBankExtender:
         run_id: Optional[str] = None,
         include_guiding: bool = False,
         only_guiding: bool = False,
-        max_workers: Optional[int] = None
+        max_workers: Optional[int] = None,
+        log_options: Optional[Dict[str, Any]] = None,
+        prompt_caching: bool = True
     ):
         """
         Initialize concurrent extender with multiple API keys.
@@ -1461,6 +2096,8 @@ class ConcurrentQuestionBankExtender:
             include_guiding: Include guiding questions
             only_guiding: Only process guiding questions
             max_workers: Maximum number of concurrent workers (defaults to number of keys)
+            log_options: LLMLogger options (compress, max_file_mb, prompts_by_hash)
+            prompt_caching: Send the article passages once as a cached system prompt block
         """
         if not api_keys:
             raise ValueError("At least one API key is required")
@@ -1477,6 +2114,7 @@ class ConcurrentQuestionBankExtender:
         self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
         self.include_guiding = include_guiding
         self.only_guiding = only_guiding
+        self.prompt_caching = prompt_caching
         
         # Thread-safe shared state
         self._processed_articles = set()
@@ -1492,12 +2130,48 @@ class ConcurrentQuestionBankExtender:
         self._article_questions: List[int] = []  # Track questions per article
         self._failed_articles: List[str] = []  # Track failed articles
         self._start_time = 0.0
+        self._worker_articles: Dict[int, int] = {}  # Articles handled per worker (key)
+        self._worker_busy_time: Dict[int, float] = {}  # Seconds spent on articles per worker (key)
+        
+        # Per-article completion manifest (opened next to the output file)
+        self._manifest: Optional[CompletionManifest] = None
+        
+        # Shared LLM logger (thread-safe, writes from a background thread)
+        self.llm_logger = LLMLogger(self.log_dir, self.run_id, **(log_options or {}))
+        
+        # Prompts and CCSS descriptions are loaded once and shared read-only by all workers
+        self.prompts = load_prompts()
+        self.ccss_descriptions = load_ccss_descriptions()
         
-        # Shared LLM logger (already thread-safe)
-        self.llm_logger = LLMLogger(self.log_dir, self.run_id)
+        # Long-lived worker pool: one extender (client + connection pool) per API key
+        self._workers: List[QuestionBankExtender] = []
         
         print(f"Initialized concurrent extender with {self.num_workers} workers")
     
+    def _get_workers(self) -> List[QuestionBankExtender]:
+        """
+        Build the worker pool on first use.
+        
+        Each worker owns one Anthropic client for its API key, so the HTTP connection
+        pool and TLS sessions are reused across every article that worker handles.
+        """
+        if not self._workers:
+            for worker_id in range(self.num_workers):
+                self._workers.append(QuestionBankExtender(
+                    api_key=self.api_keys[worker_id],
+                    checkpoint_dir=str(self.checkpoint_dir),
+                    log_dir=str(self.log_dir),
+                    run_id=self.run_id,
+                    include_guiding=self.include_guiding,
+                    only_guiding=self.only_guiding,
+                    worker_id=worker_id,
+                    prompts=self.prompts,
+                    ccss_descriptions=self.ccss_descriptions,
+                    llm_logger=self.llm_logger,
+                    prompt_caching=self.prompt_caching
+                ))
+        return self._workers
+    
     def _load_checkpoint(self) -> set:
         """Load processed articles from checkpoint."""
         checkpoint_file = self.checkpoint_dir / 'progress.json'
@@ -1508,56 +2182,42 @@ class ConcurrentQuestionBankExtender:
                 return processed
         return set()
     
-    def _load_completed_from_output(self, output_file: Path, articles: Dict[str, List[Dict]]) -> set:
-        """
-        Load completed articles by checking the output file.
-        An article is considered complete if it has the expected number of generated questions.
-        """
-        completed = set()
-        partial = set()
-        
+    def _scan_output_counts(self, output_file: Path) -> Dict[str, int]:
+        """Count generated questions per article by reading the full output file (pre-manifest runs)."""
         if not output_file.exists():
-            return completed
-        
+            return {}
         try:
-            df = pd.read_csv(output_file)
-            if df.empty:
-                return completed
-            
-            # Count questions per article in output
-            output_counts = df.groupby('article_id').size().to_dict()
-            
-            # For each article in output, check if it's complete
-            for article_id, count in output_counts.items():
-                if article_id not in articles:
-                    continue
-                
-                # Calculate expected questions for this article
-                questions = articles[article_id]
-                quiz_questions = [q for q in questions if q.get('question_category') == 'quiz']
-                guiding_questions = [q for q in questions if q.get('question_category') == 'guiding']
-                
-                expected = 0
-                if not self.only_guiding:
-                    expected += len(quiz_questions) * 4  # 4 siblings per quiz question
-                if self.include_guiding or self.only_guiding:
-                    expected += len(guiding_questions) * 4
-                
-                # Allow some tolerance (at least 75% complete)
-                if count >= expected * 0.75:
-                    completed.add(article_id)
-                else:
-                    partial.add(article_id)
-            
-            if completed:
-                print(f"  Found {len(completed)} completed articles in output file")
-            if partial:
-                print(f"  Found {len(partial)} partially completed articles (will reprocess)")
-                
+            df = pd.read_csv(output_file, usecols=['article_id'])
+            return df.groupby('article_id').size().to_dict()
         except Exception as e:
             print(f"  Warning: Could not read output file: {e}")
+            return {}
+    
+    def _load_completed_from_output(self, output_file: Path, articles: Dict[str, List[Dict]]) -> set:
+        """
+        Load completed articles from the completion manifest next to the output file.
         
-        return completed
+        Outputs written before the manifest existed are scanned once to seed it.
+        An article is complete if its inputs are unchanged and it has at least
+        75% of the expected number of generated questions.
+        """
+        self._manifest = CompletionManifest(output_file.with_suffix('.manifest.json'))
+        
+        if not self._manifest.exists and output_file.exists():
+            print(f"  No completion manifest yet, seeding it from {output_file}...")
+            output_counts = self._scan_output_counts(output_file)
+            self._manifest.record_many([
+                (
+                    article_id,
+                    articles[article_id],
+                    expected_sibling_count(articles[article_id], self.include_guiding, self.only_guiding),
+                    count
+                )
+                for article_id, count in output_counts.items()
+                if article_id in articles
+            ])
+        
+        return self._manifest.completed_articles(articles, self.include_guiding, self.only_guiding)
     
     def _save_checkpoint(self, article_id: str) -> None:
         """Save checkpoint after processing an article. Thread-safe."""
@@ -1571,51 +2231,155 @@ class ConcurrentQuestionBankExtender:
                     'num_workers': self.num_workers
                 }, f, indent=2)
     
-    def _worker_process_article(
+    def _drop_article_rows(self, output_file: Path, article_ids: List[str]) -> int:
+        """
+        Remove the rows of articles about to be reprocessed from the output file.
+
+        Changed, short or interrupted articles are regenerated with the same deterministic
+        sibling IDs, so their old rows would otherwise stay next to the new ones.
+        
+        Returns: Number of rows removed
+        """
+        if not output_file.exists():
+            return 0
+        
+        drop_ids = set(article_ids)
+        dropped = 0
+        tmp_path = output_file.with_name(output_file.name + '.tmp')
+        with open(output_file, 'r', newline='', encoding='utf-8') as src, \
+                open(tmp_path, 'w', newline='', encoding='utf-8') as dst:
+            reader = csv.DictReader(src)
+            writer = csv.DictWriter(dst, fieldnames=reader.fieldnames or [])
+            writer.writeheader()
+            for row in reader:
+                if row.get('article_id') in drop_ids:
+                    dropped += 1
+                else:
+                    writer.writerow(row)
+        
+        if dropped:
+            os.replace(tmp_path, output_file)
+        else:
+            tmp_path.unlink()
+        return dropped
+    
+    def _estimate_article_cost(self, questions: List[Dict]) -> int:
+        """
+        Estimate relative generation cost of an article for scheduling.
+        
+        Cost = sum over processed questions of siblings x passage length, i.e.
+        question count x siblings x passage length for a uniform article.
+        """
+        process_guiding = self.only_guiding or self.include_guiding
+        process_quiz = not self.only_guiding
+        
+        cost = 0
+        for q in questions:
+            category = q.get('question_category')
+            if category == 'quiz' and process_quiz:
+                siblings = QUIZ_SIBLINGS
+            elif category == 'guiding' and process_guiding:
+                siblings = GUIDING_SIBLINGS
+            else:
+                continue
+            cost += siblings * max(1, len(q.get('passage_text', '') or ''))
+        return cost
+    
+    def _build_article_queue(
         self,
-        worker_id: int,
-        api_key: str,
+        article_ids: List[str],
+        articles: Dict[str, List[Dict]]
+    ) -> PriorityQueue:
+        """
+        Build the shared work queue, ordered longest-expected-first.
+        
+        Entries are (-cost, sequence, article_id); the sequence keeps input order
+        for ties. One (inf, ..., None) stop sentinel per worker sorts last.
+        """
+        article_queue: PriorityQueue = PriorityQueue()
+        for seq, article_id in enumerate(article_ids):
+            cost = self._estimate_article_cost(articles[article_id])
+            article_queue.put((-cost, seq, article_id))
+        for i in range(self.num_workers):
+            article_queue.put((float('inf'), len(article_ids) + i, None))
+        return article_queue
+    
+    def _worker_loop(
+        self,
+        worker: QuestionBankExtender,
+        article_queue: PriorityQueue,
+        articles: Dict[str, List[Dict]],
+        output_file: Path,
+        fieldnames: List[str]
+    ) -> int:
+        """
+        Long-lived worker: pull the next most expensive article from the shared
+        queue whenever this key is free, until the stop sentinel is reached.
+        
+        Returns: Number of questions generated by this worker
+        """
+        generated_total = 0
+        while True:
+            _, _, article_id = article_queue.get()
+            if article_id is None:
+                break
+            start_time = time.time()
+            generated_total += self._worker_process_article(
+                worker,
+                article_id,
+                articles[article_id],
+                output_file,
+                fieldnames
+            )
+            with self._progress_lock:
+                self._worker_articles[worker.worker_id] = self._worker_articles.get(worker.worker_id, 0) + 1
+                self._worker_busy_time[worker.worker_id] = (
+                    self._worker_busy_time.get(worker.worker_id, 0.0) + time.time() - start_time
+                )
+        return generated_total
+    
+    def _worker_process_article(
+        self,
+        worker: QuestionBankExtender,
         article_id: str,
         questions: List[Dict],
         output_file: Path,
         fieldnames: List[str]
     ) -> int:
         """
-        Worker function to process a single article.
+        Process a single article with a pooled worker.
         
         Returns: Number of questions generated
         """
-        # Create a worker-specific extender with its own API client
-        # Share the same LLM logger (it's thread-safe)
-        worker = QuestionBankExtender(
-            api_key=api_key,
-            checkpoint_dir=str(self.checkpoint_dir),
-            log_dir=str(self.log_dir),
-            run_id=self.run_id,
-            include_guiding=self.include_guiding,
-            only_guiding=self.only_guiding,
-            worker_id=worker_id
-        )
-        # Share the thread-safe logger
-        worker.llm_logger = self.llm_logger
-        
         guiding_count = sum(1 for q in questions if q.get('question_category') == 'guiding')
         quiz_count = sum(1 for q in questions if q.get('question_category') == 'quiz')
         
-        try:
-            start_time = time.time()
-            generated = worker.generate_siblings_for_article(article_id, questions)
-            elapsed = time.time() - start_time
-            
-            # Write to output (thread-safe)
+        # Write each row as soon as it is parsed from the stream (thread-safe)
+        def write_record(record: Dict):
             with self._output_lock:
                 with open(output_file, 'a', newline='', encoding='utf-8') as f:
                     writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    for record in generated:
-                        writer.writerow(record)
+                    writer.writerow(record)
+        
+        if self._manifest is not None:
+            self._manifest.start(article_id)
+        
+        try:
+            start_time = time.time()
+            generated = worker.generate_siblings_for_article(
+                article_id, questions, on_record=write_record
+            )
+            elapsed = time.time() - start_time
             
-            # Save checkpoint
+            # Save checkpoint and record the article in the completion manifest
             self._save_checkpoint(article_id)
+            if self._manifest is not None:
+                self._manifest.record(
+                    article_id,
+                    questions,
+                    expected_sibling_count(questions, self.include_guiding, self.only_guiding),
+                    len(generated)
+                )
             
             # Update progress
             with self._progress_lock:
@@ -1695,8 +2459,13 @@ class ConcurrentQuestionBankExtender:
         print(f"\nChecking for previously completed work...")
         output_completed = self._load_completed_from_output(extended_file, articles)
         
-        # Combine both sources - an article is complete if in either
-        already_completed = checkpoint_completed | output_completed
+        if self._manifest.exists:
+            # The manifest tracks inputs and counts per article; the checkpoint
+            # only lists article IDs, so it cannot tell changed or short articles
+            already_completed = output_completed
+        else:
+            # Combine both sources - an article is complete if in either
+            already_completed = checkpoint_completed | output_completed
         
         # Update checkpoint with output file completions
         self._processed_articles = already_completed
@@ -1704,8 +2473,17 @@ class ConcurrentQuestionBankExtender:
         # Get all article IDs in order
         all_article_ids = list(articles.keys())
         
-        # Find articles that still need processing
-        remaining_ids = [aid for aid in all_article_ids if aid not in already_completed]
+        # Find articles that still need processing; only changed, short or
+        # interrupted articles have old rows in the output that must be dropped
+        remaining_ids = []
+        stale_ids = set()
+        for aid in all_article_ids:
+            if aid in already_completed:
+                continue
+            remaining_ids.append(aid)
+            expected = expected_sibling_count(articles[aid], self.include_guiding, self.only_guiding)
+            if self._manifest.status(aid, articles[aid], expected) in ('changed', 'short', 'in_progress'):
+                stale_ids.add(aid)
         
         # Apply limit to remaining articles
         if limit > 0:
@@ -1737,6 +2515,11 @@ class ConcurrentQuestionBankExtender:
         print(f"\n📁 OUTPUT FILE: {extended_file}")
         if extended_file.exists():
             print(f"  (appending to existing file)")
+            drop_ids = [aid for aid in article_ids if aid in stale_ids]
+            if drop_ids:
+                dropped = self._drop_article_rows(extended_file, drop_ids)
+                if dropped:
+                    print(f"  Removed {dropped} previous rows of articles being reprocessed")
         
         # Define fieldnames
         fieldnames = [
@@ -1778,34 +2561,37 @@ class ConcurrentQuestionBankExtender:
         start_time = time.time()
         self._start_time = start_time
         
+        # Feed articles to the long-lived workers through a shared priority queue
+        # (longest expected article first; each free key pulls the next one)
+        workers = self._get_workers()
+        article_queue = self._build_article_queue(article_ids, articles)
+        
         with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
-            # Submit tasks - round-robin distribute articles to workers
             futures = {}
-            for i, article_id in enumerate(article_ids):
-                worker_id = i % self.num_workers
-                api_key = self.api_keys[worker_id]
-                
+            for worker in workers:
                 future = executor.submit(
-                    self._worker_process_article,
-                    worker_id,
-                    api_key,
-                    article_id,
-                    articles[article_id],
+                    self._worker_loop,
+                    worker,
+                    article_queue,
+                    articles,
                     extended_file,
                     fieldnames
                 )
-                futures[future] = article_id
+                futures[future] = worker.worker_id
             
-            # Wait for all tasks to complete
+            # Wait for all workers to drain the queue
             for future in as_completed(futures):
-                article_id = futures[future]
+                worker_id = futures[future]
                 try:
                     future.result()
                 except Exception as e:
-                    print(f"ERROR: Article {article_id} failed: {e}")
+                    print(f"ERROR: Worker {worker_id} failed: {e}")
         
         total_time = time.time() - start_time
         
+        # Flush queued log entries
+        self.llm_logger.close()
+        
         # Calculate detailed stats
         avg_time = total_time / max(1, self._completed_articles)
         avg_questions = self._total_generated / max(1, self._completed_articles)
@@ -1856,6 +2642,32 @@ class ConcurrentQuestionBankExtender:
             print(f"  Fastest article:     {format_time(min_time)}")
             print(f"  Slowest article:     {format_time(max_time)}")
         
+        if self._worker_articles:
+            print(f"\n🔑 KEY USAGE")
+            print(f"{'─'*40}")
+            for worker_id in sorted(self._worker_articles):
+                busy = self._worker_busy_time.get(worker_id, 0.0)
+                utilization = busy / total_time * 100 if total_time > 0 else 0
+                print(f"  Key {worker_id + 1}: {self._worker_articles[worker_id]} articles | "
+                      f"busy {format_time(busy)} ({utilization:.0f}%)")
+        
+        cache_stats = get_llm_cache().get_stats()
+        if cache_stats['enabled']:
+            print(f"\n♻️  RESPONSE CACHE")
+            print(f"{'─'*40}")
+            print(f"  Hits:                {cache_stats['hits']}")
+            print(f"  Misses:              {cache_stats['misses']}")
+            print(f"  Hit rate:            {cache_stats['hit_rate']*100:.1f}%")
+        
+        usage_stats = self.llm_logger.get_usage_stats()
+        if self.prompt_caching:
+            print(f"\n🧠 PROMPT CACHE")
+            print(f"{'─'*40}")
+            print(f"  Cache writes:        {usage_stats['cache_creation_input_tokens']:,} tokens")
+            print(f"  Cache reads:         {usage_stats['cache_read_input_tokens']:,} tokens")
+            print(f"  Uncached input:      {usage_stats['input_tokens']:,} tokens")
+            print(f"  Read share:          {usage_stats['cache_hit_rate']*100:.1f}% of prompt tokens")
+        
         print(f"\n📁 OUTPUT")
         print(f"{'─'*40}")
         print(f"  Extended: {extended_file}")
@@ -1891,6 +2703,9 @@ class ConcurrentQuestionBankExtender:
         print(f"\n📦 COMBINING FILES")
         print(f"{'─'*40}")
         extended_df = pd.read_csv(extended_csv)
+        # Outputs written before reprocessed articles were cleared can hold
+        # stale rows for the same question_id; the last one is the newest
+        extended_df = extended_df.drop_duplicates(subset='question_id', keep='last')
         
         parent_ids = extended_df['parent_question_id'].dropna().unique()
         
@@ -1933,16 +2748,47 @@ class BatchQuestionBankExtender:
     """
     Batch processing mode using Claude's Message Batches API.
     
-    Provides 50% cost reduction by submitting all requests as a single batch.
-    Asynchronous processing - submit batch, poll for completion, retrieve results.
+    Provides 50% cost reduction vs the standard API.
+    Requests are split into count- and size-bounded shards, each submitted as its
+    own batch as soon as it is built. All shards are polled together with adaptive
+    backoff, and each shard's results are retrieved and written as soon as it ends,
+    so total wall-clock time tracks the slowest shard rather than the sum.
     
     Best for large-scale processing where you can wait for results.
     """
     
     # Batch API polling settings
-    POLL_INTERVAL = 30  # seconds between status checks
+    POLL_INTERVAL = 30  # seconds between status checks (reset to this on progress)
+    MAX_POLL_INTERVAL = 300  # backoff ceiling while nothing changes
+    POLL_BACKOFF = 1.5  # interval multiplier after a poll with no progress
     MAX_POLL_TIME = 86400  # 24 hours max wait time
     
+    # Columns of the extended output file
+    OUTPUT_FIELDNAMES = [
+        'article_id', 'article_title', 'section_id', 'section_sequence',
+        'question_id', 'question_category', 'stimulus_id',
+        'passage_text', 'lexile_level', 'course', 'module', 'section_number',
+        'question', 'question_type',
+        'option_1', 'option_2', 'option_3', 'option_4',
+        'correct_answer',
+        'option_1_explanation', 'option_2_explanation',
+        'option_3_explanation', 'option_4_explanation',
+        'DOK', 'difficulty', 'CCSS', 'grade',
+        'parent_question_id', 'generation_timestamp',
+        'differentiation_notes', 'cognitive_process',
+        'homogeneity_check', 'specificity_check', 'length_check',
+        'semantic_distance_check', 'single_correct_check', 'diversity_check',
+        'expected_response', 'key_details', 'scoring_notes', 'dok_justification',
+        'part_a_dok',
+        'part_b_question',
+        'part_b_option_1', 'part_b_option_2', 'part_b_option_3', 'part_b_option_4',
+        'part_b_correct_answer',
+        'part_b_option_1_explanation', 'part_b_option_2_explanation',
+        'part_b_option_3_explanation', 'part_b_option_4_explanation',
+        'part_b_dok',
+        'connection_rationale', 'standard_assessment'
+    ]
+    
     def __init__(
         self,
         api_key: str,
@@ -1950,7 +2796,9 @@ class BatchQuestionBankExtender:
         log_dir: Optional[str] = None,
         run_id: Optional[str] = None,
         include_guiding: bool = False,
-        only_guiding: bool = False
+        only_guiding: bool = False,
+        shard_max_requests: int = DEFAULT_SHARD_MAX_REQUESTS,
+        shard_max_mb: float = DEFAULT_SHARD_MAX_MB
     ):
         """
         Initialize batch extender.
@@ -1962,6 +2810,8 @@ class BatchQuestionBankExtender:
             run_id: Optional run ID (auto-generated if not provided)
             include_guiding: Include guiding questions
             only_guiding: Only process guiding questions
+            shard_max_requests: Maximum requests per submitted batch
+            shard_max_mb: Maximum serialized size of a submitted batch in MB
         """
         self.api_key = api_key
         self.client = anthropic.Anthropic(api_key=api_key)
@@ -1979,6 +2829,8 @@ class BatchQuestionBankExtender:
         self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
         self.include_guiding = include_guiding
         self.only_guiding = only_guiding
+        self.shard_max_requests = shard_max_requests
+        self.shard_max_bytes = int(shard_max_mb * 1024 * 1024)
         
         # Load prompts and CCSS
         self.prompts = self._load_prompts()
@@ -1987,6 +2839,10 @@ class BatchQuestionBankExtender:
         # Track processed articles
         self._processed_articles = set()
         
+        # Keyed output store and completion manifest (opened per output file)
+        self._store: Optional[QuestionStore] = None
+        self._manifest: Optional[CompletionManifest] = None
+        
         print(f"Initialized batch extender")
         print(f"  Batch data: {self.batch_data_dir}")
         print(f"  Cost savings: 50% vs standard API")
@@ -2211,62 +3067,99 @@ DOK 3 Requirements:
         return prompt
     
     def _load_completed_from_output(self, output_file: Path, articles: Dict[str, List[Dict]]) -> set:
-        """Load completed articles by checking the output file and combined file."""
-        completed = set()
+        """
+        Load completed articles from the completion manifest next to the output file.
+        
+        Outputs written before the manifest existed are seeded from the
+        per-article counts in the question store.
+        """
+        self._manifest = CompletionManifest(output_file.with_suffix('.manifest.json'))
+        
+        if not self._manifest.exists:
+            output_counts = self._get_store(output_file).article_counts()
+            if output_counts:
+                print(f"  No completion manifest yet, seeding it from {self._store.db_path}...")
+                self._record_articles(
+                    [aid for aid in output_counts if aid in articles], articles, output_counts
+                )
+        
+        return self._manifest.completed_articles(articles, self.include_guiding, self.only_guiding)
+    
+    def _record_articles(
+        self,
+        article_ids: List[str],
+        articles: Dict[str, List[Dict]],
+        output_counts: Dict[str, int]
+    ) -> None:
+        """Record finished articles and their produced counts in the completion manifest."""
+        self._manifest.record_many([
+            (
+                article_id,
+                articles[article_id],
+                expected_sibling_count(articles[article_id], self.include_guiding, self.only_guiding),
+                output_counts.get(article_id, 0)
+            )
+            for article_id in article_ids
+        ])
+    
+    def _build_article_requests(
+        self,
+        article_id: str,
+        questions: List[Dict]
+    ) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """
+        Build batch requests for one article.
         
-        # Check multiple possible output files
-        files_to_check = [output_file]
+        Returns:
+            Tuple of (batch_requests, request_metadata) for this article
+        """
+        batch_requests = []
+        request_metadata = {}
         
-        # Also check combined file
-        combined_file = output_file.parent / "qb_extended_combined.csv"
-        if combined_file.exists():
-            files_to_check.append(combined_file)
+        # Separate guiding and quiz questions
+        guiding_questions = [q for q in questions if q.get('question_category') == 'guiding']
+        quiz_questions = [q for q in questions if q.get('question_category') == 'quiz']
         
-        # Check extended file variant
-        extended_file = output_file.parent / f"{output_file.stem}_extended.csv"
-        if extended_file.exists() and extended_file not in files_to_check:
-            files_to_check.append(extended_file)
+        process_guiding = self.only_guiding or self.include_guiding
+        process_quiz = not self.only_guiding
         
-        for check_file in files_to_check:
-            if not check_file.exists():
-                continue
-            
-            try:
-                df = pd.read_csv(check_file)
-                if df.empty:
-                    continue
+        categories = []
+        if guiding_questions and process_guiding:
+            categories.append(('guiding', guiding_questions, GUIDING_SIBLINGS))
+        if quiz_questions and process_quiz:
+            categories.append(('quiz', quiz_questions, QUIZ_SIBLINGS))
+        
+        for question_category, category_questions, num_siblings in categories:
+            for i, question in enumerate(category_questions):
+                custom_id = f"{article_id}__{question_category}__{question.get('question_id', i)}"
+                prompt = self._build_prompt_for_question(question, num_siblings)
+                question_type = question.get('question_type', 'MCQ').upper()
+                if question_type not in SCHEMA_MAP:
+                    question_type = 'MCQ'
                 
-                # Check for extended questions (have parent_question_id)
-                if 'parent_question_id' in df.columns:
-                    extended_df = df[df['parent_question_id'].notna()]
-                    if not extended_df.empty:
-                        output_counts = extended_df.groupby('article_id').size().to_dict()
-                    else:
-                        output_counts = {}
-                else:
-                    output_counts = df.groupby('article_id').size().to_dict()
+                # Build tool definition for structured output
+                tool_def = self._build_tool_for_question_type(question_type, num_siblings)
                 
-                for article_id, count in output_counts.items():
-                    if article_id not in articles:
-                        continue
-                    
-                    questions = articles[article_id]
-                    quiz_questions = [q for q in questions if q.get('question_category') == 'quiz']
-                    guiding_questions = [q for q in questions if q.get('question_category') == 'guiding']
-                    
-                    expected = 0
-                    if not self.only_guiding:
-                        expected += len(quiz_questions) * QUIZ_SIBLINGS
-                    if self.include_guiding or self.only_guiding:
-                        expected += len(guiding_questions) * GUIDING_SIBLINGS
-                    
-                    if count >= expected * 0.75:
-                        completed.add(article_id)
-                        
-            except Exception as e:
-                print(f"  Warning: Could not read {check_file}: {e}")
+                batch_requests.append({
+                    "custom_id": custom_id,
+                    "params": {
+                        "model": MODEL,
+                        "max_tokens": 16384,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "tools": [tool_def],
+                        "tool_choice": {"type": "tool", "name": tool_def["name"]}
+                    }
+                })
+                
+                request_metadata[custom_id] = {
+                    "article_id": article_id,
+                    "question_category": question_category,
+                    "question_type": question_type,
+                    "num_siblings": num_siblings,
+                    "original_question": question
+                }
         
-        return completed
+        return batch_requests, request_metadata
     
     def _build_batch_requests(
         self, 
@@ -2288,89 +3181,63 @@ DOK 3 Requirements:
             if article_id in completed_articles:
                 continue
             
-            # Separate guiding and quiz questions
-            guiding_questions = [q for q in questions if q.get('question_category') == 'guiding']
-            quiz_questions = [q for q in questions if q.get('question_category') == 'quiz']
-            
-            process_guiding = self.only_guiding or self.include_guiding
-            process_quiz = not self.only_guiding
+            article_requests, article_metadata = self._build_article_requests(article_id, questions)
+            batch_requests.extend(article_requests)
+            request_metadata.update(article_metadata)
+        
+        return batch_requests, request_metadata
+    
+    def _iter_request_shards(
+        self,
+        articles: Dict[str, List[Dict]]
+    ) -> Iterator[Tuple[List[Dict], Dict[str, Dict]]]:
+        """
+        Build batch requests lazily and yield them in shards.
+        
+        A shard is closed before it would exceed shard_max_requests or
+        shard_max_bytes (serialized size). Articles are never split across
+        shards, so every article's output lands with a single shard.
+        
+        Yields:
+            Tuple of (batch_requests, request_metadata) per shard
+        """
+        shard_requests: List[Dict] = []
+        shard_metadata: Dict[str, Dict] = {}
+        shard_bytes = 0
+        
+        for article_id, questions in articles.items():
+            article_requests, article_metadata = self._build_article_requests(article_id, questions)
+            if not article_requests:
+                continue
+            article_bytes = sum(len(json.dumps(r, ensure_ascii=False).encode('utf-8')) for r in article_requests)
             
-            # Build requests for guiding questions
-            if guiding_questions and process_guiding:
-                for i, question in enumerate(guiding_questions):
-                    custom_id = f"{article_id}__guiding__{question.get('question_id', i)}"
-                    prompt = self._build_prompt_for_question(question, GUIDING_SIBLINGS)
-                    question_type = question.get('question_type', 'MCQ').upper()
-                    if question_type not in SCHEMA_MAP:
-                        question_type = 'MCQ'
-                    
-                    # Build tool definition for structured output
-                    tool_def = self._build_tool_for_question_type(question_type, GUIDING_SIBLINGS)
-                    
-                    batch_requests.append({
-                        "custom_id": custom_id,
-                        "params": {
-                            "model": MODEL,
-                            "max_tokens": 16384,
-                            "messages": [{"role": "user", "content": prompt}],
-                            "tools": [tool_def],
-                            "tool_choice": {"type": "tool", "name": tool_def["name"]}
-                        }
-                    })
-                    
-                    request_metadata[custom_id] = {
-                        "article_id": article_id,
-                        "question_category": "guiding",
-                        "question_type": question_type,
-                        "num_siblings": GUIDING_SIBLINGS,
-                        "original_question": question
-                    }
+            if shard_requests and (
+                len(shard_requests) + len(article_requests) > self.shard_max_requests
+                or shard_bytes + article_bytes > self.shard_max_bytes
+            ):
+                yield shard_requests, shard_metadata
+                shard_requests, shard_metadata, shard_bytes = [], {}, 0
             
-            # Build requests for quiz questions
-            if quiz_questions and process_quiz:
-                for i, question in enumerate(quiz_questions):
-                    custom_id = f"{article_id}__quiz__{question.get('question_id', i)}"
-                    prompt = self._build_prompt_for_question(question, QUIZ_SIBLINGS)
-                    question_type = question.get('question_type', 'MCQ').upper()
-                    if question_type not in SCHEMA_MAP:
-                        question_type = 'MCQ'
-                    
-                    # Build tool definition for structured output
-                    tool_def = self._build_tool_for_question_type(question_type, QUIZ_SIBLINGS)
-                    
-                    batch_requests.append({
-                        "custom_id": custom_id,
-                        "params": {
-                            "model": MODEL,
-                            "max_tokens": 16384,
-                            "messages": [{"role": "user", "content": prompt}],
-                            "tools": [tool_def],
-                            "tool_choice": {"type": "tool", "name": tool_def["name"]}
-                        }
-                    })
-                    
-                    request_metadata[custom_id] = {
-                        "article_id": article_id,
-                        "question_category": "quiz",
-                        "question_type": question_type,
-                        "num_siblings": QUIZ_SIBLINGS,
-                        "original_question": question
-                    }
+            shard_requests.extend(article_requests)
+            shard_metadata.update(article_metadata)
+            shard_bytes += article_bytes
         
-        return batch_requests, request_metadata
+        if shard_requests:
+            yield shard_requests, shard_metadata
     
-    def _submit_batch(self, batch_requests: List[Dict]) -> str:
+    def _submit_batch(self, batch_requests: List[Dict], shard_index: int = 1) -> str:
         """
         Submit batch to Claude API.
         
         Returns: batch_id
         """
-        print(f"\nSubmitting batch with {len(batch_requests)} requests...")
+        print(f"\nSubmitting shard {shard_index} with {len(batch_requests)} requests...")
         
-        # Save batch requests for debugging/recovery
-        requests_file = self.batch_data_dir / f"batch_requests_{self.run_id}.json"
-        with open(requests_file, 'w') as f:
-            json.dump(batch_requests, f, indent=2)
+        # Save batch requests for debugging/recovery (one request per line)
+        requests_file = self.batch_data_dir / f"batch_requests_{self.run_id}_shard{shard_index:03d}.jsonl"
+        with open(requests_file, 'w', encoding='utf-8') as f:
+            for request in batch_requests:
+                f.write(json.dumps(request, ensure_ascii=False) + '\n')
         print(f"  Saved batch requests to {requests_file}")
         
         # Submit batch
@@ -2386,6 +3253,7 @@ DOK 3 Requirements:
             json.dump({
                 "batch_id": batch_id,
                 "run_id": self.run_id,
+                "shard_index": shard_index,
                 "created_at": datetime.now().isoformat(),
                 "num_requests": len(batch_requests),
                 "status": batch.processing_status
@@ -2393,395 +3261,463 @@ DOK 3 Requirements:
         
         return batch_id
     
+    def _get_batch_status(self, batch_id: str) -> Dict:
+        """Fetch the current status and request counts of a batch."""
+        batch = self.client.messages.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        
+        succeeded = counts.succeeded if counts else 0
+        errored = counts.errored if counts else 0
+        canceled = counts.canceled if counts else 0
+        expired = counts.expired if counts else 0
+        processing = counts.processing if counts else 0
+        
+        return {
+            "status": batch.processing_status,
+            "succeeded": succeeded,
+            "errored": errored,
+            "canceled": canceled,
+            "expired": expired,
+            "processing": processing,
+            "total": succeeded + errored + canceled + expired + processing
+        }
+    
     def _poll_batch(self, batch_id: str) -> Dict:
         """
         Poll batch until completion.
         
         Returns: Final batch status
         """
-        start_time = time.time()
+        final_status = {}
         
-        while True:
-            elapsed = time.time() - start_time
+        def on_ended(ended_id: str, status: Dict):
+            final_status.update(status)
+        
+        self._poll_shards([batch_id], on_ended)
+        return final_status
+    
+    def _poll_shards(
+        self,
+        batch_ids: List[str],
+        on_ended: Callable[[str, Dict], None],
+        submit_next: Optional[Callable[[], Optional[str]]] = None
+    ) -> None:
+        """
+        Poll several batches together until all have ended.
+        
+        on_ended(batch_id, status) is called as soon as each batch ends, so its
+        results are processed while the others are still running. If submit_next
+        is given, it is called between polls to submit the next shard (returning
+        its batch_id, or None once every shard is submitted).
+        
+        The wait between polls starts at POLL_INTERVAL, grows by POLL_BACKOFF
+        (up to MAX_POLL_INTERVAL) while no batch makes progress, and resets as
+        soon as any request counts change.
+        """
+        pending = list(batch_ids)
+        last_done: Dict[str, int] = {}
+        interval = self.POLL_INTERVAL
+        start_time = time.time()
+        last_poll = start_time
+        
+        while pending or submit_next is not None:
+            # Submit the next shard first so the API starts on it right away
+            if submit_next is not None:
+                next_id = submit_next()
+                if next_id is None:
+                    submit_next = None
+                else:
+                    pending.append(next_id)
+                    # Keep submitting; poll in between only once a check is due
+                    if time.time() - last_poll < interval:
+                        continue
             
+            elapsed = time.time() - start_time
             if elapsed > self.MAX_POLL_TIME:
-                raise TimeoutError(f"Batch {batch_id} did not complete within {self.MAX_POLL_TIME}s")
-            
-            batch = self.client.messages.batches.retrieve(batch_id)
-            status = batch.processing_status
-            
-            # Calculate counts
-            succeeded = batch.request_counts.succeeded if batch.request_counts else 0
-            errored = batch.request_counts.errored if batch.request_counts else 0
-            canceled = batch.request_counts.canceled if batch.request_counts else 0
-            expired = batch.request_counts.expired if batch.request_counts else 0
-            processing = batch.request_counts.processing if batch.request_counts else 0
-            total = succeeded + errored + canceled + expired + processing
+                raise TimeoutError(
+                    f"Batches {', '.join(pending)} did not complete within {self.MAX_POLL_TIME}s"
+                )
             
-            print(f"  Batch {batch_id} status: {status} (elapsed: {elapsed:.0f}s)")
-            print(f"    Succeeded: {succeeded}, Processing: {processing}, Errored: {errored}")
+            progressed = False
+            for batch_id in list(pending):
+                status = self._get_batch_status(batch_id)
+                done = status['total'] - status['processing']
+                if done != last_done.get(batch_id, 0):
+                    progressed = True
+                last_done[batch_id] = done
+                
+                print(f"  Batch {batch_id} status: {status['status']} (elapsed: {elapsed:.0f}s)")
+                print(f"    Succeeded: {status['succeeded']}, Processing: {status['processing']}, "
+                      f"Errored: {status['errored']}")
+                
+                if status['status'] == "ended":
+                    progressed = True
+                    pending.remove(batch_id)
+                    status['elapsed'] = time.time() - start_time
+                    print(f"  Batch {batch_id} completed in {status['elapsed']:.0f}s")
+                    on_ended(batch_id, status)
             
-            if status == "ended":
-                print(f"  Batch completed in {elapsed:.0f}s")
-                return {
-                    "status": status,
-                    "succeeded": succeeded,
-                    "errored": errored,
-                    "canceled": canceled,
-                    "expired": expired,
-                    "total": total,
-                    "elapsed": elapsed
-                }
+            last_poll = time.time()
+            if not pending and submit_next is None:
+                return
             
-            print(f"  Waiting {self.POLL_INTERVAL}s before next check...")
-            time.sleep(self.POLL_INTERVAL)
+            interval = self.POLL_INTERVAL if progressed else min(
+                interval * self.POLL_BACKOFF, self.MAX_POLL_INTERVAL
+            )
+            if submit_next is None:
+                print(f"  {len(pending)} batch(es) running, waiting {interval:.0f}s before next check...")
+                time.sleep(interval)
+    
+    @staticmethod
+    def _serialize_batch_result(result) -> Dict[str, Any]:
+        """Convert an SDK batch result into a JSON-serializable dict."""
+        result_type = result.result.type if result.result else "error"
+        serialized = {"custom_id": result.custom_id, "result_type": result_type}
+        
+        message = getattr(result.result, 'message', None) if result.result else None
+        if message is not None:
+            content = []
+            for block in message.content or []:
+                if getattr(block, 'type', None) == 'tool_use':
+                    content.append({"type": "tool_use", "name": block.name, "input": block.input})
+                elif hasattr(block, 'text'):
+                    content.append({"type": "text", "text": block.text})
+            serialized["content"] = content
+            serialized["stop_reason"] = message.stop_reason
+        
+        error = getattr(result.result, 'error', None) if result.result else None
+        if error is not None:
+            serialized["error"] = str(error)
+        
+        return serialized
     
-    def _retrieve_results(self, batch_id: str) -> List[Dict]:
+    def _retrieve_results(
+        self,
+        batch_id: str,
+        on_result: Callable[[Dict[str, Any]], None]
+    ) -> int:
         """
-        Retrieve results from completed batch.
+        Stream results from a completed batch.
         
-        Returns: List of result objects
+        Each result is serialized, passed to on_result (which parses it and
+        writes its records) and then appended to batch_results_{batch_id}.jsonl.
+        That file is also the resume cursor: if retrieval crashes, the next call
+        skips every custom_id already in it.
+        
+        Returns: Number of results processed in this call
         """
         print(f"\nRetrieving results for batch {batch_id}...")
         
-        results = []
-        for result in self.client.messages.batches.results(batch_id):
-            results.append({
-                "custom_id": result.custom_id,
-                "result_type": result.result.type if result.result else "error",
-                "message": result.result.message if result.result and hasattr(result.result, 'message') else None,
-                "error": result.result.error if result.result and hasattr(result.result, 'error') else None
-            })
+        journal = BatchResultJournal(self.batch_data_dir / f"batch_results_{batch_id}.jsonl")
+        if len(journal):
+            print(f"  Resuming after {journal.last_custom_id} ({len(journal)} results already processed)")
         
-        print(f"  Retrieved {len(results)} results")
-        
-        # Save results
-        results_file = self.batch_data_dir / f"batch_results_{batch_id}.json"
-        with open(results_file, 'w') as f:
-            # Convert to serializable format
-            serializable_results = []
-            for r in results:
-                sr = {"custom_id": r["custom_id"], "result_type": r["result_type"]}
-                if r["message"]:
-                    sr["content"] = r["message"].content[0].text if r["message"].content else ""
-                    sr["stop_reason"] = r["message"].stop_reason
-                if r["error"]:
-                    sr["error"] = str(r["error"])
-                serializable_results.append(sr)
-            json.dump(serializable_results, f, indent=2)
-        print(f"  Saved results to {results_file}")
+        def process(result) -> Dict[str, Any]:
+            serialized = self._serialize_batch_result(result)
+            on_result(serialized)
+            return serialized
         
-        return results
+        processed = journal.consume(self.client.messages.batches.results(batch_id), process)
+        
+        print(f"  Retrieved {processed} results")
+        print(f"  Saved results to {journal.path}")
+        
+        return processed
     
-    def _parse_batch_results(
-        self, 
-        results: List[Dict], 
+    def _process_batch_results(
+        self,
+        batch_id: str,
+        request_metadata: Dict[str, Dict],
+        store: QuestionStore
+    ) -> int:
+        """
+        Retrieve a batch and upsert each result's records into the store as it arrives.
+        
+        Returns: Number of new question records stored
+        """
+        counts = {"succeeded": 0, "failed": 0, "written": 0}
+        
+        def on_result(result: Dict[str, Any]):
+            records = self._parse_batch_result(result, request_metadata)
+            if records is None:
+                counts["failed"] += 1
+                return
+            counts["succeeded"] += 1
+            counts["written"] += store.upsert_many(records)
+        
+        self._retrieve_results(batch_id, on_result)
+        
+        print(f"\n  Parsed {counts['succeeded']} successful results, {counts['failed']} failures")
+        print(f"  Stored {counts['written']} new extended questions in {store.db_path}")
+        
+        return counts["written"]
+    
+    def _parse_batch_result(
+        self,
+        result: Dict[str, Any],
         request_metadata: Dict[str, Dict]
-    ) -> List[Dict]:
+    ) -> Optional[List[Dict]]:
         """
-        Parse batch results and create output records.
+        Parse one serialized batch result into output records.
         
-        Returns: List of generated question records
+        Returns: List of generated question records, or None if the request failed
         """
-        generated_records = []
-        succeeded = 0
-        failed = 0
+        custom_id = result["custom_id"]
         
-        for result in results:
-            custom_id = result["custom_id"]
-            
-            if custom_id not in request_metadata:
-                print(f"  Warning: Unknown custom_id {custom_id}")
-                continue
+        if custom_id not in request_metadata:
+            print(f"  Warning: Unknown custom_id {custom_id}")
+            return None
+        
+        metadata = request_metadata[custom_id]
+        original_question = metadata["original_question"]
+        article_id = metadata["article_id"]
+        question_category = metadata["question_category"]
+        question_type = metadata["question_type"]
+        num_siblings = metadata["num_siblings"]
+        
+        if result["result_type"] != "succeeded":
+            print(f"  Failed: {custom_id} - {result.get('error', 'Unknown error')}")
+            return None
+        
+        generated_records = []
+        try:
+            # Parse tool use response
+            content = result.get("content")
+            if not content:
+                return None
             
-            metadata = request_metadata[custom_id]
-            original_question = metadata["original_question"]
-            article_id = metadata["article_id"]
-            question_category = metadata["question_category"]
-            question_type = metadata["question_type"]
-            num_siblings = metadata["num_siblings"]
+            # Find tool use block in content
+            variant_questions = []
+            for block in content:
+                if block.get('type') == 'tool_use':
+                    # Tool use response - get input
+                    tool_input = block.get('input') or {}
+                    variant_questions = tool_input.get("variant_questions", [])
+                    break
+                elif 'text' in block:
+                    # Text response fallback - try to parse JSON
+                    try:
+                        response_data = json.loads(block['text'])
+                        variant_questions = response_data.get("variant_questions", response_data.get("sibling_questions", []))
+                        break
+                    except:
+                        pass
             
-            if result["result_type"] != "succeeded":
-                failed += 1
-                print(f"  Failed: {custom_id} - {result.get('error', 'Unknown error')}")
-                continue
+            if not variant_questions:
+                print(f"  Warning: No variant questions in response for {custom_id}")
+                return None
             
-            try:
-                # Parse tool use response
-                message = result["message"]
-                if not message or not message.content:
-                    failed += 1
-                    continue
-                
-                # Find tool use block in content
-                variant_questions = []
-                for block in message.content:
-                    if hasattr(block, 'type') and block.type == 'tool_use':
-                        # Tool use response - get input
-                        tool_input = block.input if hasattr(block, 'input') else {}
-                        variant_questions = tool_input.get("variant_questions", [])
-                        break
-                    elif hasattr(block, 'text'):
-                        # Text response fallback - try to parse JSON
-                        try:
-                            response_data = json.loads(block.text)
-                            variant_questions = response_data.get("variant_questions", response_data.get("sibling_questions", []))
-                            break
-                        except:
-                            pass
-                
-                if not variant_questions:
-                    failed += 1
-                    print(f"  Warning: No variant questions in response for {custom_id}")
-                    continue
-                
-                # Create records for each generated question
-                for j, gen_q in enumerate(variant_questions[:num_siblings]):
-                    record = {
-                        'article_id': article_id,
-                        'article_title': original_question.get('article_title', ''),
-                        'section_id': original_question.get('section_id', ''),
-                        'section_sequence': original_question.get('section_sequence', ''),
-                        'question_id': f"{original_question.get('question_id', '')}__sibling_{j+1}",
-                        'question_category': question_category,
-                        'stimulus_id': original_question.get('stimulus_id', ''),
-                        'passage_text': original_question.get('passage_text', ''),
-                        'lexile_level': original_question.get('lexile_level', ''),
-                        'course': original_question.get('course', ''),
-                        'module': original_question.get('module', ''),
-                        'section_number': original_question.get('section_number', ''),
-                        'question_type': question_type,
-                        'DOK': original_question.get('DOK', ''),
-                        'difficulty': original_question.get('difficulty', ''),
-                        'CCSS': original_question.get('CCSS', ''),
-                        'grade': original_question.get('grade', 3),
-                        'parent_question_id': original_question.get('question_id', ''),
-                        'generation_timestamp': datetime.now().isoformat(),
-                        'differentiation_notes': gen_q.get('differentiation_notes', ''),
-                    }
-                    
-                    # Add question-type specific fields
-                    if question_type == 'MCQ':
-                        quality_verification = gen_q.get('quality_verification', {})
-                        record.update({
-                            'question': gen_q.get('question', ''),
-                            'option_1': gen_q.get('option_1', ''),
-                            'option_2': gen_q.get('option_2', ''),
-                            'option_3': gen_q.get('option_3', ''),
-                            'option_4': gen_q.get('option_4', ''),
-                            'correct_answer': gen_q.get('correct_answer', ''),
-                            'option_1_explanation': gen_q.get('option_1_explanation', ''),
-                            'option_2_explanation': gen_q.get('option_2_explanation', ''),
-                            'option_3_explanation': gen_q.get('option_3_explanation', ''),
-                            'option_4_explanation': gen_q.get('option_4_explanation', ''),
-                            'homogeneity_check': quality_verification.get('homogeneity_check', ''),
-                            'specificity_check': quality_verification.get('specificity_check', ''),
-                            'length_check': quality_verification.get('length_check', ''),
-                            'semantic_distance_check': quality_verification.get('semantic_distance_check', ''),
-                            'single_correct_check': quality_verification.get('single_correct_check', ''),
-                            'diversity_check': quality_verification.get('diversity_check', ''),
-                        })
-                    elif question_type == 'SR':
-                        key_details = gen_q.get('key_details', [])
-                        record.update({
-                            'question': gen_q.get('question', ''),
-                            'expected_response': gen_q.get('expected_response', ''),
-                            'key_details': json.dumps(key_details) if isinstance(key_details, list) else key_details,
-                            'scoring_notes': gen_q.get('scoring_notes', ''),
-                            'dok_justification': gen_q.get('dok_justification', ''),
-                        })
-                    elif question_type == 'MP':
-                        part_a = gen_q.get('part_a', {})
-                        part_b = gen_q.get('part_b', {})
-                        record.update({
-                            'question': part_a.get('question', ''),
-                            'option_1': part_a.get('option_1', ''),
-                            'option_2': part_a.get('option_2', ''),
-                            'option_3': part_a.get('option_3', ''),
-                            'option_4': part_a.get('option_4', ''),
-                            'correct_answer': part_a.get('correct_answer', ''),
-                            'option_1_explanation': part_a.get('option_1_explanation', ''),
-                            'option_2_explanation': part_a.get('option_2_explanation', ''),
-                            'option_3_explanation': part_a.get('option_3_explanation', ''),
-                            'option_4_explanation': part_a.get('option_4_explanation', ''),
-                            'part_a_dok': part_a.get('DOK', ''),
-                            'part_b_question': part_b.get('question', ''),
-                            'part_b_option_1': part_b.get('option_1', ''),
-                            'part_b_option_2': part_b.get('option_2', ''),
-                            'part_b_option_3': part_b.get('option_3', ''),
-                            'part_b_option_4': part_b.get('option_4', ''),
-                            'part_b_correct_answer': part_b.get('correct_answer', ''),
-                            'part_b_option_1_explanation': part_b.get('option_1_explanation', ''),
-                            'part_b_option_2_explanation': part_b.get('option_2_explanation', ''),
-                            'part_b_option_3_explanation': part_b.get('option_3_explanation', ''),
-                            'part_b_option_4_explanation': part_b.get('option_4_explanation', ''),
-                            'part_b_dok': part_b.get('DOK', ''),
-                            'connection_rationale': gen_q.get('connection_rationale', ''),
-                            'standard_assessment': gen_q.get('standard_assessment', ''),
-                        })
-                    
-                    generated_records.append(record)
+            # Create records for each generated question
+            for j, gen_q in enumerate(variant_questions[:num_siblings]):
+                record = {
+                    'article_id': article_id,
+                    'article_title': original_question.get('article_title', ''),
+                    'section_id': original_question.get('section_id', ''),
+                    'section_sequence': original_question.get('section_sequence', ''),
+                    'question_id': f"{original_question.get('question_id', '')}__sibling_{j+1}",
+                    'question_category': question_category,
+                    'stimulus_id': original_question.get('stimulus_id', ''),
+                    'passage_text': original_question.get('passage_text', ''),
+                    'lexile_level': original_question.get('lexile_level', ''),
+                    'course': original_question.get('course', ''),
+                    'module': original_question.get('module', ''),
+                    'section_number': original_question.get('section_number', ''),
+                    'question_type': question_type,
+                    'DOK': original_question.get('DOK', ''),
+                    'difficulty': original_question.get('difficulty', ''),
+                    'CCSS': original_question.get('CCSS', ''),
+                    'grade': original_question.get('grade', 3),
+                    'parent_question_id': original_question.get('question_id', ''),
+                    'generation_timestamp': datetime.now().isoformat(),
+                    'differentiation_notes': gen_q.get('differentiation_notes', ''),
+                }
                 
-                succeeded += 1
+                # Add question-type specific fields
+                if question_type == 'MCQ':
+                    quality_verification = gen_q.get('quality_verification', {})
+                    record.update({
+                        'question': gen_q.get('question', ''),
+                        'option_1': gen_q.get('option_1', ''),
+                        'option_2': gen_q.get('option_2', ''),
+                        'option_3': gen_q.get('option_3', ''),
+                        'option_4': gen_q.get('option_4', ''),
+                        'correct_answer': gen_q.get('correct_answer', ''),
+                        'option_1_explanation': gen_q.get('option_1_explanation', ''),
+                        'option_2_explanation': gen_q.get('option_2_explanation', ''),
+                        'option_3_explanation': gen_q.get('option_3_explanation', ''),
+                        'option_4_explanation': gen_q.get('option_4_explanation', ''),
+                        'homogeneity_check': quality_verification.get('homogeneity_check', ''),
+                        'specificity_check': quality_verification.get('specificity_check', ''),
+                        'length_check': quality_verification.get('length_check', ''),
+                        'semantic_distance_check': quality_verification.get('semantic_distance_check', ''),
+                        'single_correct_check': quality_verification.get('single_correct_check', ''),
+                        'diversity_check': quality_verification.get('diversity_check', ''),
+                    })
+                elif question_type == 'SR':
+                    key_details = gen_q.get('key_details', [])
+                    record.update({
+                        'question': gen_q.get('question', ''),
+                        'expected_response': gen_q.get('expected_response', ''),
+                        'key_details': json.dumps(key_details) if isinstance(key_details, list) else key_details,
+                        'scoring_notes': gen_q.get('scoring_notes', ''),
+                        'dok_justification': gen_q.get('dok_justification', ''),
+                    })
+                elif question_type == 'MP':
+                    part_a = gen_q.get('part_a', {})
+                    part_b = gen_q.get('part_b', {})
+                    record.update({
+                        'question': part_a.get('question', ''),
+                        'option_1': part_a.get('option_1', ''),
+                        'option_2': part_a.get('option_2', ''),
+                        'option_3': part_a.get('option_3', ''),
+                        'option_4': part_a.get('option_4', ''),
+                        'correct_answer': part_a.get('correct_answer', ''),
+                        'option_1_explanation': part_a.get('option_1_explanation', ''),
+                        'option_2_explanation': part_a.get('option_2_explanation', ''),
+                        'option_3_explanation': part_a.get('option_3_explanation', ''),
+                        'option_4_explanation': part_a.get('option_4_explanation', ''),
+                        'part_a_dok': part_a.get('DOK', ''),
+                        'part_b_question': part_b.get('question', ''),
+                        'part_b_option_1': part_b.get('option_1', ''),
+                        'part_b_option_2': part_b.get('option_2', ''),
+                        'part_b_option_3': part_b.get('option_3', ''),
+                        'part_b_option_4': part_b.get('option_4', ''),
+                        'part_b_correct_answer': part_b.get('correct_answer', ''),
+                        'part_b_option_1_explanation': part_b.get('option_1_explanation', ''),
+                        'part_b_option_2_explanation': part_b.get('option_2_explanation', ''),
+                        'part_b_option_3_explanation': part_b.get('option_3_explanation', ''),
+                        'part_b_option_4_explanation': part_b.get('option_4_explanation', ''),
+                        'part_b_dok': part_b.get('DOK', ''),
+                        'connection_rationale': gen_q.get('connection_rationale', ''),
+                        'standard_assessment': gen_q.get('standard_assessment', ''),
+                    })
                 
-            except Exception as e:
-                failed += 1
-                print(f"  Error parsing {custom_id}: {e}")
-        
-        print(f"\n  Parsed {succeeded} successful results, {failed} failures")
-        print(f"  Generated {len(generated_records)} question records")
+                generated_records.append(record)
+            
+        except Exception as e:
+            print(f"  Error parsing {custom_id}: {e}")
+            return None
         
         return generated_records
     
     def resume_batch(self, batch_id: str, articles: Dict[str, List[Dict]], output_file: Path) -> str:
         """
-        Resume processing from an existing batch.
+        Resume processing from existing batches.
         
         Args:
-            batch_id: The batch ID to resume
+            batch_id: The batch ID to resume (comma-separated IDs for a sharded run)
             articles: All articles data (for metadata)
             output_file: Output file path
             
         Returns: Path to combined output file
         """
+        batch_ids = [b.strip() for b in batch_id.split(',') if b.strip()]
+        
         print(f"\n{'='*60}")
-        print(f"RESUMING BATCH: {batch_id}")
+        print(f"RESUMING BATCH: {', '.join(batch_ids)}")
         print(f"{'='*60}\n")
         
         # Rebuild request metadata from saved file
         requests_file = None
-        for f in self.batch_data_dir.glob("batch_requests_*.json"):
+        for f in self.batch_data_dir.glob("batch_requests_*.json*"):
             requests_file = f
             break
         
         if not requests_file:
             raise ValueError(f"Cannot find batch requests file for batch {batch_id}")
         
-        # Build metadata (need to rebuild since we don't save it)
+        # Build metadata (need to rebuild since we don't save it).
+        # custom_ids are deterministic, so one map covers every shard.
         completed_articles = self._load_completed_from_output(output_file, articles)
         _, request_metadata = self._build_batch_requests(articles, completed_articles)
         
-        # Poll for completion
-        status = self._poll_batch(batch_id)
-        
-        # Retrieve and parse results
-        results = self._retrieve_results(batch_id)
-        records = self._parse_batch_results(results, request_metadata)
-        
-        # Write output
-        return self._write_output(records, output_file, articles)
-    
-    def _write_output(
-        self, 
-        records: List[Dict], 
-        output_file: Path,
-        original_articles: Dict[str, List[Dict]]
-    ) -> str:
-        """Write generated records to output file and create combined file."""
+        store = self._get_store(output_file)
         
-        fieldnames = [
-            'article_id', 'article_title', 'section_id', 'section_sequence',
-            'question_id', 'question_category', 'stimulus_id',
-            'passage_text', 'lexile_level', 'course', 'module', 'section_number',
-            'question', 'question_type',
-            'option_1', 'option_2', 'option_3', 'option_4',
-            'correct_answer',
-            'option_1_explanation', 'option_2_explanation',
-            'option_3_explanation', 'option_4_explanation',
-            'DOK', 'difficulty', 'CCSS', 'grade',
-            'parent_question_id', 'generation_timestamp',
-            'differentiation_notes', 'cognitive_process',
-            'homogeneity_check', 'specificity_check', 'length_check',
-            'semantic_distance_check', 'single_correct_check', 'diversity_check',
-            'expected_response', 'key_details', 'scoring_notes', 'dok_justification',
-            'part_a_dok',
-            'part_b_question',
-            'part_b_option_1', 'part_b_option_2', 'part_b_option_3', 'part_b_option_4',
-            'part_b_correct_answer',
-            'part_b_option_1_explanation', 'part_b_option_2_explanation',
-            'part_b_option_3_explanation', 'part_b_option_4_explanation',
-            'part_b_dok',
-            'connection_rationale', 'standard_assessment'
-        ]
+        def on_ended(ended_id: str, status: Dict):
+            # Retrieve each batch as soon as it ends, storing records as they arrive
+            self._process_batch_results(ended_id, request_metadata, store)
         
-        # Write extended questions - append to existing if file exists
-        output_file.parent.mkdir(parents=True, exist_ok=True)
+        self._poll_shards(batch_ids, on_ended)
         
-        # Load existing records if file exists
-        existing_records = []
-        if output_file.exists():
-            try:
-                existing_df = pd.read_csv(output_file)
-                existing_records = existing_df.to_dict('records')
-                print(f"  Found {len(existing_records)} existing records in {output_file}")
-            except Exception as e:
-                print(f"  Warning: Could not read existing file: {e}")
+        resumed_articles = {meta["article_id"] for meta in request_metadata.values()}
+        self._record_articles(sorted(resumed_articles), articles, store.article_counts())
         
-        # Combine existing and new records, avoiding duplicates by question_id
-        existing_ids = {r.get('question_id') for r in existing_records}
-        new_records = [r for r in records if r.get('question_id') not in existing_ids]
-        all_records = existing_records + new_records
+        return self._export_outputs(output_file, articles)
+    
+    def _get_store(self, output_file: Path) -> QuestionStore:
+        """
+        Open the question store that backs output_file ({stem}.sqlite3 next to it).
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for record in all_records:
-                writer.writerow(record)
+        An extended CSV written before the store existed is imported once.
+        """
+        db_path = output_file.with_suffix('.sqlite3')
+        if self._store is not None and self._store.db_path == db_path:
+            return self._store
+        
+        store = QuestionStore(db_path)
+        if store.count() == 0 and output_file.exists():
+            imported = store.import_csv(output_file)
+            print(f"  Imported {imported} existing records from {output_file} into {db_path}")
+        self._store = store
+        return store
+    
+    def _export_outputs(self, output_file: Path, original_articles: Dict[str, List[Dict]]) -> str:
+        """Export the extended CSV and the combined file from the store."""
+        store = self._get_store(output_file)
+        if store.count() == 0:
+            return ""
         
-        print(f"\n  Saved {len(all_records)} total extended questions to {output_file}")
-        print(f"    ({len(existing_records)} existing + {len(new_records)} new)")
+        written = store.export_csv(output_file, self.OUTPUT_FIELDNAMES)
+        print(f"\n  Exported {written} extended questions to {output_file}")
         
-        # Create combined file
-        return self._combine_questions(str(output_file), original_articles, str(output_file.parent))
+        return self._combine_questions(store, original_articles, str(output_file.parent))
     
     def _combine_questions(
         self, 
-        extended_csv: str, 
+        store: QuestionStore, 
         original_articles: Dict[str, List[Dict]],
         output_dir: str
     ) -> str:
-        """Combine original and extended questions."""
+        """
+        Combine original and extended questions.
+        
+        Written one article at a time from the store (article_id index), so
+        memory stays bounded by the largest article rather than the whole file.
+        """
         print(f"\n📦 COMBINING FILES")
         print(f"{'─'*40}")
         
-        extended_df = pd.read_csv(extended_csv)
-        parent_ids = extended_df['parent_question_id'].dropna().unique()
-        
-        # Build original dataframe from articles
-        original_records = []
-        for questions in original_articles.values():
-            for q in questions:
-                if q.get('question_id') in parent_ids:
-                    original_records.append(q)
-        
-        original_df = pd.DataFrame(original_records)
-        
-        # Add missing columns
-        for col in extended_df.columns:
-            if col not in original_df.columns:
-                original_df[col] = ''
-        
-        original_df['question_source'] = 'original'
-        extended_df['question_source'] = 'extended'
-        
-        all_columns = list(extended_df.columns) + ['question_source']
-        all_columns = list(dict.fromkeys(all_columns))
-        
-        original_df = original_df.reindex(columns=all_columns)
-        extended_df = extended_df.reindex(columns=all_columns)
-        
-        combined_df = pd.concat([original_df, extended_df], ignore_index=True)
-        combined_df = combined_df.sort_values(
-            by=['article_id', 'section_sequence', 'question_id'],
-            key=lambda x: x.astype(str)
-        ).reset_index(drop=True)
+        parent_ids = store.parent_ids()
+        counts = {"original": 0, "extended": 0}
+        
+        def sort_key(record: Dict) -> Tuple[str, str]:
+            return (str(record.get('section_sequence', '')), str(record.get('question_id', '')))
+        
+        def combined_records() -> Iterator[Dict]:
+            for article_id in store.article_ids():
+                originals = [
+                    dict(q, question_source='original')
+                    for q in original_articles.get(article_id, [])
+                    if q.get('question_id') in parent_ids
+                ]
+                extended = [
+                    dict(r, question_source='extended')
+                    for r in store.get_article(article_id)
+                ]
+                counts["original"] += len(originals)
+                counts["extended"] += len(extended)
+                yield from sorted(originals + extended, key=sort_key)
         
         combined_file = Path(output_dir) / f"qb_extended_combined.csv"
-        combined_df.to_csv(combined_file, index=False)
+        total = store.export_csv(
+            combined_file,
+            self.OUTPUT_FIELDNAMES + ['question_source'],
+            records=combined_records()
+        )
         
-        print(f"  Original questions: {len(original_df)}")
-        print(f"  Extended questions: {len(extended_df)}")
-        print(f"  Combined total:     {len(combined_df)}")
+        print(f"  Original questions: {counts['original']}")
+        print(f"  Extended questions: {counts['extended']}")
+        print(f"  Combined total:     {total}")
         print(f"  Combined: {combined_file}")
         
         return str(combined_file)
@@ -2857,21 +3793,26 @@ DOK 3 Requirements:
         if resume_batch_id:
             return self.resume_batch(resume_batch_id, articles, extended_file)
         
-        # Build batch requests
-        print(f"\nBuilding batch requests...")
-        batch_requests, request_metadata = self._build_batch_requests(articles_to_process, set())
-        print(f"  Created {len(batch_requests)} batch requests")
-        
-        if not batch_requests:
-            print("\n✓ No requests to process!")
-            return ""
-        
-        # Save metadata for resume capability
+        # Build, submit and process shards in a pipeline: each shard is submitted
+        # as soon as it is built, and its results are written as soon as it ends
+        print(f"\nBuilding and submitting batch shards "
+              f"(up to {self.shard_max_requests} requests / "
+              f"{self.shard_max_bytes / (1024 * 1024):.0f} MB each)...")
+        shard_iter = self._iter_request_shards(articles_to_process)
+        shards: Dict[str, Dict[str, Any]] = {}
+        store = self._get_store(extended_file)
         metadata_file = self.batch_data_dir / f"batch_metadata_{self.run_id}.json"
-        with open(metadata_file, 'w') as f:
-            # Save serializable version
-            serializable_metadata = {}
-            for k, v in request_metadata.items():
+        shards_file = self.batch_data_dir / f"batch_shards_{self.run_id}.json"
+        serializable_metadata = {}
+        
+        def submit_next() -> Optional[str]:
+            try:
+                shard_requests, shard_metadata = next(shard_iter)
+            except StopIteration:
+                return None
+            
+            # Save metadata for resume capability
+            for k, v in shard_metadata.items():
                 serializable_metadata[k] = {
                     "article_id": v["article_id"],
                     "question_category": v["question_category"],
@@ -2879,38 +3820,65 @@ DOK 3 Requirements:
                     "num_siblings": v["num_siblings"],
                     "original_question_id": v["original_question"].get("question_id", "")
                 }
-            json.dump(serializable_metadata, f, indent=2)
-        
-        # Submit batch
-        batch_id = self._submit_batch(batch_requests)
-        
-        print(f"\n📋 BATCH SUBMITTED")
-        print(f"{'─'*40}")
-        print(f"  Batch ID: {batch_id}")
-        print(f"  Requests: {len(batch_requests)}")
-        print(f"  To resume: --batch-mode --resume-batch {batch_id}")
+            with open(metadata_file, 'w') as f:
+                json.dump(serializable_metadata, f)
+            
+            shard_index = len(shards) + 1
+            batch_id = self._submit_batch(shard_requests, shard_index)
+            shards[batch_id] = {
+                "index": shard_index,
+                "num_requests": len(shard_requests),
+                "metadata": shard_metadata,
+                "records": 0
+            }
+            
+            with open(shards_file, 'w') as f:
+                json.dump({
+                    "run_id": self.run_id,
+                    "batch_ids": list(shards.keys())
+                }, f, indent=2)
+            print(f"  To resume: --batch-mode --resume-batch {','.join(shards.keys())}")
+            return batch_id
+        
+        def on_ended(batch_id: str, status: Dict):
+            shard = shards[batch_id]
+            shard["status"] = status
+            shard["records"] = self._process_batch_results(
+                batch_id, shard["metadata"], store
+            )
+            shard_articles = sorted({meta["article_id"] for meta in shard["metadata"].values()})
+            self._record_articles(shard_articles, articles, store.article_counts())
+            shard["metadata"] = None  # no longer needed once written
+            print(f"  ✓ Shard {shard['index']} done: {shard['records']} questions written")
         
-        # Poll for completion
         start_time = time.time()
-        status = self._poll_batch(batch_id)
+        self._poll_shards([], on_ended, submit_next=submit_next)
         total_time = time.time() - start_time
         
-        # Retrieve and parse results
-        results = self._retrieve_results(batch_id)
-        records = self._parse_batch_results(results, request_metadata)
+        if not shards:
+            print("\n✓ No requests to process!")
+            return ""
+        
+        # Export the extended CSV and combined file once all shards are stored
+        combined_file = self._export_outputs(extended_file, articles)
         
-        # Write output
-        combined_file = self._write_output(records, extended_file, articles)
+        succeeded = sum(shard["status"]["succeeded"] for shard in shards.values())
+        total = sum(shard["status"]["total"] for shard in shards.values())
+        generated = sum(shard["records"] for shard in shards.values())
+        slowest = max(shard["status"]["elapsed"] for shard in shards.values())
         
         print(f"\n{'='*60}")
         print(f"  BATCH PROCESSING COMPLETE")
         print(f"{'='*60}")
         print(f"\n📊 RESULTS")
         print(f"{'─'*40}")
-        print(f"  Batch ID:            {batch_id}")
-        print(f"  Total time:          {total_time:.0f}s")
-        print(f"  Requests processed:  {status['succeeded']}/{status['total']}")
-        print(f"  Questions generated: {len(records)}")
+        print(f"  Shards:              {len(shards)}")
+        for batch_id, shard in shards.items():
+            print(f"    {shard['index']:>3}. {batch_id}: {shard['status']['succeeded']}/"
+                  f"{shard['num_requests']} requests in {shard['status']['elapsed']:.0f}s")
+        print(f"  Total time:          {total_time:.0f}s (slowest shard ended at {slowest:.0f}s)")
+        print(f"  Requests processed:  {succeeded}/{total}")
+        print(f"  Questions generated: {generated}")
         print(f"  Cost savings:        50%")
         print(f"\n📁 OUTPUT")
         print(f"{'─'*40}")
@@ -3031,6 +3999,22 @@ Configuration:
         default=None,
         help='Directory for LLM communication logs (default: outputs/llm_logs)'
     )
+    parser.add_argument(
+        '--no-log-compress',
+        action='store_true',
+        help='Write plain .jsonl LLM logs instead of gzip-compressed .jsonl.gz'
+    )
+    parser.add_argument(
+        '--log-max-mb',
+        type=float,
+        default=None,
+        help='Rotate the LLM log to a new part file after this many MB (default: 50)'
+    )
+    parser.add_argument(
+        '--log-prompts-by-hash',
+        action='store_true',
+        help='Store each distinct prompt/passage once in the LLM log and reference it by hash'
+    )
     parser.add_argument(
         '--config',
         default=None,
@@ -3056,11 +4040,30 @@ Configuration:
         '--resume-batch',
         type=str,
         default=None,
-        help='Resume a previously submitted batch by ID (use with --batch-mode)'
+        help='Resume previously submitted batch(es) by ID, comma-separated for sharded runs (use with --batch-mode)'
+    )
+    parser.add_argument(
+        '--batch-shard-size',
+        type=int,
+        default=None,
+        help=f'Maximum requests per batch shard (default: {DEFAULT_SHARD_MAX_REQUESTS})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk LLM response cache (always call the API)'
+    )
+    parser.add_argument(
+        '--no-prompt-cache',
+        action='store_true',
+        help='Inline passages in each user prompt instead of a cached system prompt block'
     )
     
     args = parser.parse_args()
     
+    if args.no_cache:
+        configure_llm_cache(enabled=False)
+    
     # Load config file
     if args.config:
         global CONFIG_FILE
@@ -3071,10 +4074,18 @@ Configuration:
     include_guiding = args.include_guiding or config.get('include_guiding', False)
     only_guiding = args.only_guiding or config.get('only_guiding', False)
     log_dir = args.log_dir or config.get('log_dir', None)
+    log_options = {
+        'compress': not args.no_log_compress and config.get('log_compress', True),
+        'max_file_mb': args.log_max_mb or config.get('log_max_mb', 50),
+        'prompts_by_hash': args.log_prompts_by_hash or config.get('log_prompts_by_hash', False)
+    }
+    prompt_caching = not args.no_prompt_cache and config.get('prompt_caching', True)
     concurrent = args.concurrent or config.get('concurrent', False)
     max_workers = args.max_workers or config.get('max_workers', DEFAULT_MAX_WORKERS)
     batch_mode = args.batch_mode or config.get('batch_mode', False)
     resume_batch = args.resume_batch
+    batch_shard_size = args.batch_shard_size or config.get('batch_shard_size', DEFAULT_SHARD_MAX_REQUESTS)
+    batch_shard_mb = config.get('batch_shard_mb', DEFAULT_SHARD_MAX_MB)
     
     # Validate mutually exclusive options
     if include_guiding and only_guiding:
@@ -3105,7 +4116,9 @@ Configuration:
             checkpoint_dir=args.checkpoint,
             log_dir=log_dir,
             include_guiding=include_guiding,
-            only_guiding=only_guiding
+            only_guiding=only_guiding,
+            shard_max_requests=batch_shard_size,
+            shard_max_mb=batch_shard_mb
         )
         
         extender.process_all_articles_batch(
@@ -3141,7 +4154,9 @@ Configuration:
             log_dir=log_dir,
             include_guiding=include_guiding,
             only_guiding=only_guiding,
-            max_workers=min(max_workers, 10)  # Cap at 10 workers
+            max_workers=min(max_workers, 10),  # Cap at 10 workers
+            log_options=log_options,
+            prompt_caching=prompt_caching
         )
         
         extender.process_all_articles_concurrent(
@@ -3169,7 +4184,9 @@ Configuration:
             checkpoint_dir=args.checkpoint,
             log_dir=log_dir,
             include_guiding=include_guiding,
-            only_guiding=only_guiding
+            only_guiding=only_guiding,
+            log_options=log_options,
+            prompt_caching=prompt_caching
         )
         
         extender.process_all_articles(
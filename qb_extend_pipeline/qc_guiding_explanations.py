@@ -22,6 +22,8 @@ load_dotenv(SCRIPT_DIR / ".env")
 
 from openai import AsyncOpenAI
 
+from rate_governor import get_rate_governor_for, governed_create
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -45,6 +47,7 @@ class GuidingExplanationQC:
     
     def __init__(self, client: AsyncOpenAI, model: str = DEFAULT_MODEL):
         self.client = client
+        self.rate_governor = get_rate_governor_for(client)
         self.model = model
         self.stats = {'processed': 0, 'errors': 0}
     
@@ -105,7 +108,9 @@ Respond with JSON only:
             
             for attempt in range(MAX_RETRIES):
                 try:
-                    response = await self.client.chat.completions.create(
+                    response = await governed_create(
+                        self.client.chat.completions,
+                        self.rate_governor,
                         model=self.model,
                         messages=[{"role": "user", "content": prompt}],
                         response_format={"type": "json_object"},
@@ -10,6 +10,7 @@ from .explanation_qc_v2 import ExplanationQCAnalyzerV2
 
 # V3 - Batch API analyzers (50% cost reduction, async processing)
 from .question_qc_v3_batch import QuestionQCAnalyzerV3Batch
+from .explanation_qc_v3_batch import ExplanationQCAnalyzerV3Batch
 
 __all__ = [
     # V1
@@ -20,5 +21,6 @@ __all__ = [
     "ExplanationQCAnalyzerV2",
     # V3
     "QuestionQCAnalyzerV3Batch",
+    "ExplanationQCAnalyzerV3Batch",
 ]
 
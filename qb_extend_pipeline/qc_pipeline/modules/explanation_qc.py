@@ -14,6 +14,7 @@ from typing import Dict, Any, List, Optional, Tuple
 from openai import AsyncOpenAI
 
 from ..utils import load_prompts, parse_json_response, fill_prompt_variables, clamp_grade_to_band
+from rate_governor import get_rate_governor_for, governed_create
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,7 @@ class ExplanationQCAnalyzer:
             model: OpenAI model to use
         """
         self.client = client
+        self.rate_governor = get_rate_governor_for(client)
         self.model = model
         self.prompts = load_prompts()
 
@@ -103,7 +105,9 @@ class ExplanationQCAnalyzer:
             filled_prompt += f"\n\nReturn JSON with fields check_id (must be '{check_id}'), passed (boolean), reason (string)."
 
             # Call API
-            response = await self.client.chat.completions.create(
+            response = await governed_create(
+                self.client.chat.completions,
+                self.rate_governor,
                 model=self.model,
                 messages=[
                     {"role": "user", "content": filled_prompt}
@@ -15,6 +15,9 @@ from typing import Dict, Any, List, Optional, Tuple
 
 from openai import AsyncOpenAI
 
+from llm_cache import LLMResponseCache, get_llm_cache
+from rate_governor import get_rate_governor_for, governed_create, is_rate_limit_error
+
 from ..utils import clamp_grade_to_band
 
 logger = logging.getLogger(__name__)
@@ -30,6 +33,8 @@ class ExplanationQCAnalyzerV2:
     def __init__(self, client: AsyncOpenAI, model: str = "gpt-4-turbo"):
         self.client = client
         self.model = model
+        self.llm_cache = get_llm_cache()
+        self.rate_governor = get_rate_governor_for(client)
 
         # Check definitions
         self.correct_checks = [
@@ -236,16 +241,28 @@ Respond with JSON:
             )
             expected_checks = self.distractor_checks + self.all_checks
 
+        response_format = {"type": "json_object"}
+        cache_key = LLMResponseCache.make_key(
+            model=self.model, prompt=prompt, schema=response_format
+        )
+
         for attempt in range(MAX_RETRIES):
             try:
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"}
-                )
+                response_text = self.llm_cache.get(cache_key)
+                from_cache = response_text is not None
+                if not from_cache:
+                    response = await governed_create(
+                        self.client.chat.completions,
+                        self.rate_governor,
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                        response_format=response_format
+                    )
+                    response_text = response.choices[0].message.content
 
-                response_text = response.choices[0].message.content
                 data = json.loads(response_text)
+                if not from_cache:
+                    self.llm_cache.put(cache_key, response_text, model=self.model)
 
                 results = {}
                 for check_name in expected_checks:
@@ -260,8 +277,7 @@ Respond with JSON:
                 return results
 
             except Exception as e:
-                error_str = str(e)
-                if '429' in error_str or 'rate' in error_str.lower():
+                if is_rate_limit_error(e):
                     delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
                     logger.warning(f"Rate limit, retrying in {delay:.1f}s")
                     await asyncio.sleep(delay)
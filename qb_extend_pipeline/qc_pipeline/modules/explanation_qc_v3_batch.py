@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Explanation Quality Control Module V3 - Batch Processing
+
+QCs all four answer-option explanations of a question in one Message Batches
+API request (50% of standard pricing), reusing the question V3 machinery:
+- Requests grouped by passage, with the explanation rubric and the passage in
+  cached system blocks (only the question and its explanations vary)
+- submit_batch / poll_batch_status / resume_batch by batch ID
+- Results streamed to batch_results_{batch_id}.jsonl as they arrive
+
+Each request returns one record per option ({question_id}_{letter}), in the
+same format as the V2 OpenRouter explanation QC, so results merge into
+explanation_qc_merged.json with the same completion rules.
+
+Reference: https://platform.claude.com/docs/en/build-with-claude/batch-processing
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import anthropic
+
+from .question_qc_v3_batch import QuestionQCAnalyzerV3Batch
+from ..utils import clamp_grade_to_band
+
+logger = logging.getLogger(__name__)
+
+OPTION_LABELS = ['A', 'B', 'C', 'D']
+
+# Checks per explanation (same names as the V2 explanation QC)
+CORRECT_OPTION_CHECKS = [
+    'correctness_explanation',
+    'textual_evidence',
+    'tone',
+    'conciseness',
+    'grade_appropriateness'
+]
+WRONG_OPTION_CHECKS = [
+    'specific_error',
+    'misconception_diagnosis',
+    'correct_guidance',
+    'tone',
+    'conciseness',
+    'grade_appropriateness'
+]
+
+EXPLANATION_TOOL_NAME = "submit_explanation_qc_results"
+
+# Stable, cacheable system prompt (the grade band is in the user message)
+EXPLANATION_QC_SYSTEM_PROMPT = """You are a QC expert evaluating reading comprehension feedback: the explanation a student sees after choosing each answer option.
+
+## Checks for the CORRECT answer's explanation:
+1. **correctness_explanation**: Does it clearly explain WHY this is correct?
+2. **textual_evidence**: Does it cite specific passage text?
+3. **tone**: Is it encouraging and appropriate?
+4. **conciseness**: Is it clear and not too long?
+5. **grade_appropriateness**: Is language appropriate for the grade band?
+
+## Checks for each WRONG answer's explanation:
+1. **specific_error**: Does it explain WHY this specific answer is wrong?
+2. **misconception_diagnosis**: Does it explain the thinking error?
+3. **correct_guidance**: Does it point toward the correct answer?
+4. **tone**: Is it supportive and not discouraging?
+5. **conciseness**: Is it clear and not too verbose?
+6. **grade_appropriateness**: Is language appropriate for the grade band?
+
+Score each check as 0 (fail) or 1 (pass) with a short reason."""
+
+_CHECK_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "enum": [0, 1]},
+        "reason": {"type": "string"}
+    },
+    "required": ["score", "reason"]
+}
+
+
+def build_explanation_tools(correct_answer: str) -> List[Dict[str, Any]]:
+    """Tool whose input is keyed by option letter, with the checks for that option's role."""
+    properties = {}
+    for letter in OPTION_LABELS:
+        checks = CORRECT_OPTION_CHECKS if letter == correct_answer else WRONG_OPTION_CHECKS
+        properties[letter] = {
+            "type": "object",
+            "properties": {check: _CHECK_RESULT_SCHEMA for check in checks},
+            "required": checks
+        }
+    return [{
+        "name": EXPLANATION_TOOL_NAME,
+        "description": "Submit explanation QC results for every answer option, keyed by option letter",
+        "input_schema": {
+            "type": "object",
+            "properties": properties,
+            "required": OPTION_LABELS
+        }
+    }]
+
+
+class ExplanationQCAnalyzerV3Batch(QuestionQCAnalyzerV3Batch):
+    """
+    Batch-based explanation QC analyzer using Claude's Message Batches API.
+
+    One request per question covers its four explanations. Question items are
+    the dicts built for explanation QC (question_id, question, correct_answer,
+    passage, options, explanations, grade).
+
+    Usage:
+        analyzer = ExplanationQCAnalyzerV3Batch(client, model, output_dir)
+        results = analyzer.analyze_batch(questions)
+    """
+
+    def __init__(
+        self,
+        claude_client: anthropic.Anthropic,  # Sync client for batch API
+        claude_model: str = "claude-sonnet-4-5-20250929",
+        output_dir: Optional[Path] = None
+    ):
+        super().__init__(claude_client, claude_model, output_dir, group_size=1)
+
+    def _build_system_prompt_with_passage(self, passage_text: str) -> List[Dict[str, Any]]:
+        """Rubric, then passage, each cached so questions on one passage share the prefix."""
+        return [
+            {
+                "type": "text",
+                "text": EXPLANATION_QC_SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"}
+            },
+            {
+                "type": "text",
+                "text": f"""## Passage for Reference:
+
+{passage_text[:8000] if passage_text else "No passage provided"}""",
+                "cache_control": {"type": "ephemeral"}
+            }
+        ]
+
+    def _build_explanation_prompt(self, question: Dict[str, Any]) -> str:
+        """Per-question user prompt: the question, its options and their explanations."""
+        options = question.get('options', {})
+        explanations = question.get('explanations', {})
+        correct_answer = question.get('correct_answer', '')
+        try:
+            grade_band = clamp_grade_to_band(int(question.get('grade') or 3))
+        except (TypeError, ValueError):
+            grade_band = clamp_grade_to_band(3)
+
+        return f"""Evaluate the explanation for EACH answer option of this question for {grade_band} students.
+
+## Question: {question.get('question', '')}
+## Correct Answer: {correct_answer}
+
+## Answer Choices:
+A) {options.get('A', '')}
+B) {options.get('B', '')}
+C) {options.get('C', '')}
+D) {options.get('D', '')}
+
+## Explanations to Evaluate:
+A) {explanations.get('A', '')}
+B) {explanations.get('B', '')}
+C) {explanations.get('C', '')}
+D) {explanations.get('D', '')}
+
+Option {correct_answer} is correct: use the correct-answer checks for it and the wrong-answer checks for the others."""
+
+    def create_batch_requests(
+        self,
+        questions: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Create one request per question (custom_id eqc_{question_id}).
+
+        Returns:
+            Tuple of (batch_requests, question_map)
+        """
+        batch_requests = []
+        question_map = {}
+
+        # Group by passage for caching efficiency (first 500 chars identify it)
+        grouped = defaultdict(list)
+        for q in questions:
+            passage = str(q.get('passage', '') or '')
+            grouped[passage[:500] if passage else "no_passage"].append(q)
+        logger.info(f"Grouped {len(questions)} questions into {len(grouped)} passage groups")
+
+        for passage_questions in grouped.values():
+            system_prompt = self._build_system_prompt_with_passage(str(passage_questions[0].get('passage', '') or ''))
+
+            for q in passage_questions:
+                custom_id = f"eqc_{q.get('question_id', f'Q{len(batch_requests)+1}')}"
+                batch_requests.append({
+                    "custom_id": custom_id,
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": 3000,
+                        "system": system_prompt,
+                        "tools": build_explanation_tools(str(q.get('correct_answer', ''))),
+                        "tool_choice": {"type": "tool", "name": EXPLANATION_TOOL_NAME},
+                        "messages": [{"role": "user", "content": self._build_explanation_prompt(q)}]
+                    }
+                })
+                question_map[custom_id] = q
+
+        return batch_requests, question_map
+
+    def _process_batch_result(
+        self,
+        result: Any,
+        question_map: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Turn one batch result into {'group': [one record per option]}."""
+        custom_id = result.custom_id
+        question = question_map.get(custom_id, {})
+        question_id = question.get('question_id', custom_id.replace('eqc_', '', 1))
+
+        if result.result.type != "succeeded":
+            if result.result.type == "errored":
+                error = result.result.error
+                logger.error(f"Request {custom_id} errored: {error.type} - {error.message}")
+                message = f"{error.type}: {error.message}"
+            else:
+                logger.warning(f"Request {custom_id} {result.result.type}")
+                message = f"Request {result.result.type}"
+            return {'group': [
+                self._build_option_error(question_id, question, letter, message, result.result.type)
+                for letter in OPTION_LABELS
+            ]}
+
+        tool_input = {}
+        for block in result.result.message.content:
+            if block.type == "tool_use" and block.name == EXPLANATION_TOOL_NAME:
+                tool_input = block.input if isinstance(block.input, dict) else {}
+                break
+
+        return {'group': [
+            self._build_option_record(question_id, question, letter, tool_input.get(letter))
+            for letter in OPTION_LABELS
+        ]}
+
+    def _build_option_record(
+        self,
+        question_id: str,
+        question: Dict[str, Any],
+        letter: str,
+        option_data: Any
+    ) -> Dict[str, Any]:
+        """One explanation's result (same shape as the V2 OpenRouter explanation QC)."""
+        if not isinstance(option_data, dict):
+            return self._build_option_error(question_id, question, letter, 'No output for option', 'succeeded')
+
+        checks = {
+            name: {'passed': check.get('score', 0) == 1, 'reason': check.get('reason', '')}
+            for name, check in option_data.items() if isinstance(check, dict)
+        }
+        total_passed = sum(1 for c in checks.values() if c['passed'])
+        total_checks = len(checks)
+
+        return {
+            'question_id': f"{question_id}_{letter}",
+            'original_question_id': question_id,
+            'option_label': letter,
+            'is_correct': letter == question.get('correct_answer', ''),
+            'overall_score': (total_passed / total_checks) if total_checks > 0 else 0,
+            'total_checks_passed': total_passed,
+            'total_checks_run': total_checks,
+            'checks': checks,
+            'batch_result': 'succeeded',
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _build_option_error(
+        self,
+        question_id: str,
+        question: Dict[str, Any],
+        letter: str,
+        error: str,
+        batch_result: str
+    ) -> Dict[str, Any]:
+        return {
+            'question_id': f"{question_id}_{letter}",
+            'original_question_id': question_id,
+            'option_label': letter,
+            'is_correct': letter == question.get('correct_answer', ''),
+            'overall_score': 0,
+            'total_checks_passed': 0,
+            'total_checks_run': 0,
+            'checks': {},
+            'error': error,
+            'batch_result': batch_result,
+            'timestamp': datetime.now().isoformat()
+        }
@@ -8,7 +8,6 @@ Comprehensive validation of multiple-choice questions across all quality dimensi
 import asyncio
 import logging
 import random
-import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
@@ -17,6 +16,7 @@ import anthropic
 from openai import AsyncOpenAI
 
 from ..utils import load_prompts, parse_xml_response, parse_json_response, fill_prompt_variables
+from rate_governor import get_rate_governor_for, governed_create, is_rate_limit_error
 
 logger = logging.getLogger(__name__)
 
@@ -24,28 +24,9 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = 5
 BASE_DELAY = 1.0  # Base delay in seconds
 MAX_DELAY = 30.0  # Maximum delay between retries
-MIN_REQUEST_INTERVAL = 0.3  # Minimum time between requests (300ms) - increased to avoid rate limits
 BETWEEN_CHECK_DELAY = 0.5  # Delay between checks (500ms)
 
 
-class RateLimiter:
-    """Simple rate limiter to prevent hitting API rate limits."""
-    
-    def __init__(self, min_interval: float = MIN_REQUEST_INTERVAL):
-        self.min_interval = min_interval
-        self.last_request_time = 0
-        self._lock = asyncio.Lock()
-    
-    async def acquire(self):
-        """Wait if necessary to respect rate limits."""
-        async with self._lock:
-            now = time.time()
-            time_since_last = now - self.last_request_time
-            if time_since_last < self.min_interval:
-                await asyncio.sleep(self.min_interval - time_since_last)
-            self.last_request_time = time.time()
-
-
 class QuestionQCAnalyzer:
     """Analyzes question quality across all dimensions."""
 
@@ -74,7 +55,9 @@ class QuestionQCAnalyzer:
         self.prompts = load_prompts()
         self.examples_df = examples_df
         self.skip_openai = skip_openai
-        self.rate_limiter = RateLimiter()
+        # Shared per-key rate governors (paced from the providers' rate limit headers)
+        self.claude_governor = get_rate_governor_for(claude_client)
+        self.openai_governor = get_rate_governor_for(self.openai_client) if self.openai_client else None
 
         # Define check lists
         self.distractor_checks = [
@@ -137,10 +120,9 @@ class QuestionQCAnalyzer:
         last_error = None
         for attempt in range(MAX_RETRIES):
             try:
-                # Rate limit
-                await self.rate_limiter.acquire()
-                
-                response = await self.claude_client.messages.create(
+                response = await governed_create(
+                    self.claude_client.messages,
+                    self.claude_governor,
                     model=self.claude_model,
                     max_tokens=500,
                     temperature=self.temperature,
@@ -186,12 +168,11 @@ class QuestionQCAnalyzer:
         last_error = None
         for attempt in range(MAX_RETRIES):
             try:
-                # Rate limit
-                await self.rate_limiter.acquire()
-
                 # Handle too_close check (JSON response)
                 if check_name == 'too_close':
-                    response = await self.openai_client.chat.completions.create(
+                    response = await governed_create(
+                        self.openai_client.chat.completions,
+                        self.openai_governor,
                         model=self.openai_model,
                         messages=[{"role": "user", "content": filled_prompt}],
                         response_format={"type": "json_object"}
@@ -239,7 +220,9 @@ Benchmark Grade {grade} Questions:
 
 {prompt_config['prompt']}"""
 
-                    response = await self.openai_client.chat.completions.create(
+                    response = await governed_create(
+                        self.openai_client.chat.completions,
+                        self.openai_governor,
                         model=self.openai_model,
                         messages=[{"role": "user", "content": full_prompt}]
                     )
@@ -255,9 +238,8 @@ Benchmark Grade {grade} Questions:
                 return 0, f"Unknown OpenAI check: {check_name}"
 
             except Exception as e:
-                error_str = str(e)
                 # Check for rate limit or quota errors
-                if '429' in error_str or 'rate' in error_str.lower() or 'quota' in error_str.lower():
+                if is_rate_limit_error(e) or 'quota' in str(e).lower():
                     last_error = e
                     delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
                     logger.warning(f"Rate limit hit for OpenAI '{check_name}', retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Cascading Question QC
+
+Runs cheap checks first and only sends questions that can still pass to the
+full (expensive) rubric:
+
+    Stage 1 - local (no API):
+        length_check          Answer choice lengths balanced
+        distinct_options      No duplicate / near-duplicate options       (blocking)
+        answer_in_options     Correct answer is one of the options        (blocking)
+        unique_question       Not an exact duplicate of a sibling         (blocking)
+        explanations_present  Every option has an explanation (if the input has them)
+
+    Stage 2 - cheap model (optional):
+        grammatical_parallel, homogeneity, specificity_balance on a small
+        model, with a confidence per check. These only look at the options,
+        so the passage is not sent.
+
+    Stage 3 - full QC:
+        QuestionQCAnalyzerV2 (8 Claude checks + OpenAI checks). Its results
+        replace the cheap-model checks.
+
+A question stops early when a blocking local check fails, or when the
+failures found so far among the checks the full analyzer scores (length_check
+plus confident cheap-model failures) already put it below the pass threshold
+whatever the remaining checks say. Low-confidence (borderline) failures are
+escalated. Screened-out results carry cascade_stage 'local' or 'cheap' and are
+scored over the full analyzer's checks (skipped ones earn no credit), so they
+always fail; the other local checks stay in their checks unscored. Escalated
+ones carry cascade_stage 'full' and are scored exactly as the full analyzer
+scores them, with the local checks it does not run kept apart in cascade_checks.
+
+Usage:
+    full = QuestionQCAnalyzerV2(claude_client, openai_client)
+    cascade = QuestionQCCascade(full, cheap_client=claude_client)
+    results = await cascade.analyze_batch(questions, concurrency=5)
+    cascade.get_cascade_stats()
+"""
+
+import asyncio
+import difflib
+import logging
+import random
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import anthropic
+
+from llm_cache import LLMResponseCache
+from rate_governor import estimate_cost_usd, get_rate_governor_for, governed_create, usage_tokens
+from .question_qc_v2 import BASE_DELAY, MAX_DELAY, MAX_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# Same threshold as calculate_pass_rate / the fix pipeline
+PASS_THRESHOLD = 0.8
+
+DEFAULT_CHEAP_MODEL = "claude-haiku-4-5"
+
+# Cheap-model failures at or above this confidence count as failures; below it they are borderline
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
+# Option pairs at least this similar (after normalization) count as near-duplicates
+NEAR_DUPLICATE_RATIO = 0.9
+
+LOCAL_CHECKS = ['length_check', 'distinct_options', 'answer_in_options', 'unique_question', 'explanations_present']
+BLOCKING_CHECKS = {'distinct_options', 'answer_in_options', 'unique_question'}
+# Local checks the full analyzer also runs and scores
+SCORED_LOCAL_CHECKS = {'length_check'}
+CHEAP_CHECKS = ['grammatical_parallel', 'homogeneity', 'specificity_balance']
+
+CASCADE_STAGES = ['local', 'cheap']
+
+CHEAP_QC_SCHEMA = {
+    "type": "object",
+    "properties": {
+        check: {
+            "type": "object",
+            "properties": {
+                "score": {"type": "integer", "enum": [0, 1]},
+                "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+                "reasoning": {"type": "string"}
+            },
+            "required": ["score", "confidence", "reasoning"]
+        }
+        for check in CHEAP_CHECKS
+    },
+    "required": CHEAP_CHECKS
+}
+
+
+def _normalize(text: Any) -> str:
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', str(text or '').lower())).strip()
+
+
+def _check(score: int, response: str, category: str) -> Dict[str, Any]:
+    return {'score': score, 'response': response, 'category': category}
+
+
+class QuestionQCCascade:
+    """
+    Local -> cheap model -> full QC cascade around a QuestionQCAnalyzerV2.
+
+    Exposes the same analyze_batch / analyze_batch_openai_only interface as
+    the analyzer it wraps, so QCPipelineV2 can use either.
+    """
+
+    def __init__(
+        self,
+        full_analyzer: Any,
+        cheap_client: Optional[anthropic.AsyncAnthropic] = None,
+        cheap_model: str = DEFAULT_CHEAP_MODEL,
+        stages: Optional[List[str]] = None,
+        confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD
+    ):
+        """
+        Args:
+            full_analyzer: Analyzer for the full rubric (stage 3), V2 or V2 OpenRouter
+            cheap_client: Anthropic client for the cheap model (None disables stage 2)
+            cheap_model: Small model for the easy checks
+            stages: Pre-screen stages to run, subset of ['local', 'cheap'] (default: both)
+            confidence_threshold: Minimum confidence for a cheap-model failure to count
+        """
+        self.full_analyzer = full_analyzer
+        self.stages = set(stages if stages is not None else CASCADE_STAGES)
+        if 'cheap' in self.stages and cheap_client is None:
+            logger.warning("Cascade: no Anthropic client for the cheap model - skipping the cheap stage")
+            self.stages.discard('cheap')
+        self.cheap_client = cheap_client
+        self.cheap_model = cheap_model
+        self.confidence_threshold = confidence_threshold
+        self.cheap_governor = get_rate_governor_for(cheap_client) if cheap_client else None
+        self.llm_cache = full_analyzer.llm_cache
+
+        # First question_id seen per question fingerprint (for unique_question)
+        self._seen: Dict[Tuple[str, ...], str] = {}
+
+        self._stats = {
+            'total': 0,
+            'local': {'in': 0, 'screened_out': 0},
+            'cheap': {'in': 0, 'screened_out': 0, 'borderline': 0, 'calls': 0,
+                      'input_tokens': 0, 'output_tokens': 0},
+            'full': {'in': 0}
+        }
+        self._full_usage: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Stage 1: local checks
+    # ------------------------------------------------------------------
+
+    def _run_local_checks(self, question_item: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        question_data = question_item.get('structured_content', {})
+        choices = {k: v for k, v in question_data.get('choices', {}).items() if str(v or '').strip()}
+        correct_answer = question_data.get('correct_answer', '')
+        results = {}
+
+        score, response = self.full_analyzer._run_length_check(question_data)
+        results['length_check'] = _check(score, response, 'distractor')
+
+        duplicates = []
+        keys = sorted(choices)
+        for i, a in enumerate(keys):
+            for b in keys[i + 1:]:
+                ratio = difflib.SequenceMatcher(None, _normalize(choices[a]), _normalize(choices[b])).ratio()
+                if ratio >= NEAR_DUPLICATE_RATIO:
+                    duplicates.append(f"{a}/{b}" + ("" if ratio == 1.0 else f" ({ratio:.0%} similar)"))
+        results['distinct_options'] = _check(
+            0 if duplicates else 1,
+            f"Duplicate options: {', '.join(duplicates)}" if duplicates else "All options are distinct",
+            'distractor'
+        )
+
+        if correct_answer in choices:
+            results['answer_in_options'] = _check(1, f"Correct answer {correct_answer} is an option", 'question')
+        else:
+            results['answer_in_options'] = _check(
+                0, f"Correct answer '{correct_answer}' is not one of the options ({', '.join(keys) or 'none'})", 'question'
+            )
+
+        fingerprint = (
+            str(question_item.get('article_id', '')),
+            _normalize(question_data.get('question', '')),
+            *sorted(_normalize(v) for v in choices.values())
+        )
+        question_id = question_item.get('question_id', 'unknown')
+        first_id = self._seen.setdefault(fingerprint, question_id)
+        if first_id != question_id:
+            results['unique_question'] = _check(0, f"Exact duplicate of {first_id}", 'question')
+        else:
+            results['unique_question'] = _check(1, "No duplicate sibling", 'question')
+
+        explanations = question_item.get('explanations') or {}
+        if explanations:
+            missing = sorted(k for k, v in explanations.items() if not str(v or '').strip())
+            results['explanations_present'] = _check(
+                0 if missing else 1,
+                f"Missing explanations for options: {', '.join(missing)}" if missing else "Every option has an explanation",
+                'distractor'
+            )
+
+        return results
+
+    # ------------------------------------------------------------------
+    # Stage 2: cheap model
+    # ------------------------------------------------------------------
+
+    def _build_cheap_prompt(self, question_data: Dict[str, Any]) -> str:
+        choices = question_data.get('choices', {})
+        return f"""You are a quality control expert for reading comprehension assessment items. Evaluate ONLY the answer choices of this multiple-choice question.
+
+## Question:
+{question_data.get('question', '')}
+
+## Answer Choices:
+A) {choices.get('A', '')}
+B) {choices.get('B', '')}
+C) {choices.get('C', '')}
+D) {choices.get('D', '')}
+
+## Correct Answer: {question_data.get('correct_answer', '')}
+
+## Checks:
+
+### grammatical_parallel
+Do all answer choices follow the same grammatical pattern/structure?
+- PASS (1): All choices have consistent grammatical structure
+- FAIL (0): Choices have inconsistent structures
+
+### homogeneity
+Do all choices belong to the same conceptual category?
+- PASS (1): All choices are the same type of answer
+- FAIL (0): Choices span different categories
+
+### specificity_balance
+Are all choices at similar levels of detail/specificity (including length)?
+- PASS (1): Similar levels of detail across choices
+- FAIL (0): Significant differences in specificity
+
+For each check give a score, your confidence in that score (0.0-1.0), and brief reasoning."""
+
+    async def _run_cheap_checks(self, question_data: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Run the easy checks on the cheap model. Returns None if the call fails (escalate)."""
+        prompt = self._build_cheap_prompt(question_data)
+        tools = [{
+            "name": "submit_qc_results",
+            "description": "Submit quality control check results",
+            "input_schema": CHEAP_QC_SCHEMA
+        }]
+        cache_key = LLMResponseCache.make_key(model=self.cheap_model, prompt=prompt, schema=tools)
+        tool_input = self.llm_cache.get(cache_key)
+
+        if tool_input is None:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    response = await governed_create(
+                        self.cheap_client.messages,
+                        self.cheap_governor,
+                        model=self.cheap_model,
+                        max_tokens=800,
+                        tools=tools,
+                        tool_choice={"type": "tool", "name": "submit_qc_results"},
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                    input_tokens, output_tokens = usage_tokens(response)
+                    self._stats['cheap']['calls'] += 1
+                    self._stats['cheap']['input_tokens'] += input_tokens
+                    self._stats['cheap']['output_tokens'] += output_tokens
+                    tool_input = next(
+                        (block.input for block in response.content
+                         if block.type == "tool_use" and block.name == "submit_qc_results"),
+                        None
+                    )
+                    break
+                except anthropic.RateLimitError:
+                    delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
+                    logger.warning(f"Cheap model rate limit, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                except Exception as e:
+                    logger.error(f"Error in cheap-model checks: {e}")
+                    return None
+
+        if not isinstance(tool_input, dict) or not all(
+            isinstance(tool_input.get(check), dict) and tool_input[check].get('score') in (0, 1)
+            for check in CHEAP_CHECKS
+        ):
+            return None
+
+        self.llm_cache.put(cache_key, tool_input, model=self.cheap_model)
+        return {
+            check: {
+                'score': tool_input[check]['score'],
+                'confidence': float(tool_input[check].get('confidence', 0) or 0),
+                'response': tool_input[check].get('reasoning', 'No reasoning provided'),
+                'category': 'distractor',
+                'model': self.cheap_model
+            }
+            for check in CHEAP_CHECKS
+        }
+
+    # ------------------------------------------------------------------
+    # Cascade
+    # ------------------------------------------------------------------
+
+    def _expected_total_checks(self, question_item: Dict[str, Any]) -> int:
+        """Checks the full analyzer scores for this question (Claude + OpenAI + length_check for MCQ)."""
+        runs_openai = self.full_analyzer.openai_client and not getattr(self.full_analyzer, 'skip_openai', False)
+        openai_checks = 2 if runs_openai else 0
+        return 8 + openai_checks + len(self._scored_local_checks(question_item))
+
+    def _scored_local_checks(self, question_item: Dict[str, Any]) -> set:
+        """Local checks the full analyzer also scores (it runs length_check on MCQs only)."""
+        return SCORED_LOCAL_CHECKS if question_item.get('question_type', 'MCQ').upper() == 'MCQ' else set()
+
+    def _cannot_pass(self, failures: int, total: int) -> bool:
+        return total > 0 and (total - failures) / total < PASS_THRESHOLD
+
+    def _screened_result(
+        self,
+        question_item: Dict[str, Any],
+        checks: Dict[str, Dict[str, Any]],
+        stage: str
+    ) -> Dict[str, Any]:
+        scored_local = self._scored_local_checks(question_item)
+        scored = [c for name, c in checks.items() if name in scored_local or name in CHEAP_CHECKS]
+        total_score = sum(c['score'] for c in scored)
+        expected_checks = self._expected_total_checks(question_item)
+        return {
+            'question_id': question_item.get('question_id', 'unknown'),
+            'question_type': question_item.get('question_type', 'MCQ'),
+            'overall_score': total_score / expected_checks,
+            'total_checks_passed': total_score,
+            'total_checks_run': len(scored),
+            'total_checks_expected': expected_checks,
+            'checks': checks,
+            'cascade_stage': stage,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    async def _screen(
+        self,
+        question_item: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Run the pre-screen stages for one question.
+
+        Returns:
+            (screened-out result or None, local checks to attach to the full result)
+        """
+        if 'structured_content' not in question_item:
+            return None, {}
+
+        total = self._expected_total_checks(question_item)
+        local_checks = self._run_local_checks(question_item) if 'local' in self.stages else {}
+        scored_failures = []
+        if local_checks:
+            self._stats['local']['in'] += 1
+            local_failures = [name for name, c in local_checks.items() if c['score'] == 0]
+            scored_failures = [name for name in local_failures if name in self._scored_local_checks(question_item)]
+            if set(local_failures) & BLOCKING_CHECKS or self._cannot_pass(len(scored_failures), total):
+                self._stats['local']['screened_out'] += 1
+                logger.info(f"Cascade: {question_item.get('question_id')} screened out locally ({', '.join(local_failures)})")
+                return self._screened_result(question_item, local_checks, 'local'), local_checks
+
+        if 'cheap' in self.stages:
+            self._stats['cheap']['in'] += 1
+            async with semaphore:
+                cheap_checks = await self._run_cheap_checks(question_item['structured_content'])
+            if cheap_checks:
+                confident = [n for n, c in cheap_checks.items() if c['score'] == 0 and c['confidence'] >= self.confidence_threshold]
+                borderline = [n for n, c in cheap_checks.items() if c['score'] == 0 and c['confidence'] < self.confidence_threshold]
+                if borderline:
+                    self._stats['cheap']['borderline'] += 1
+                if confident and self._cannot_pass(len(scored_failures) + len(confident), total):
+                    self._stats['cheap']['screened_out'] += 1
+                    logger.info(f"Cascade: {question_item.get('question_id')} screened out by {self.cheap_model} ({', '.join(confident)})")
+                    return self._screened_result(question_item, {**local_checks, **cheap_checks}, 'cheap'), local_checks
+
+        return None, local_checks
+
+    async def analyze_batch(
+        self,
+        questions: List[Dict[str, Any]],
+        concurrency: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Pre-screen, then run the full analyzer on the questions that can still pass."""
+        semaphore = asyncio.Semaphore(concurrency)
+        self._stats['total'] += len(questions)
+
+        screened = await asyncio.gather(*[self._screen(q, semaphore) for q in questions])
+
+        results: Dict[str, Dict[str, Any]] = {}
+        escalate = []
+        local_by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for question_item, (result, local_checks) in zip(questions, screened):
+            question_id = question_item.get('question_id', 'unknown')
+            if result is not None:
+                results[question_id] = result
+            else:
+                escalate.append(question_item)
+                local_by_id[question_id] = local_checks
+
+        if escalate:
+            self._stats['full']['in'] += len(escalate)
+            before = {model: dict(u) for model, u in getattr(self.full_analyzer, 'usage', {}).items()}
+            for result in await self.full_analyzer.analyze_batch(escalate, concurrency):
+                # Pre-screen checks stay out of the score so the verdict matches no cascade
+                checks = result.get('checks', {})
+                result['cascade_checks'] = {
+                    name: check for name, check in local_by_id.get(result['question_id'], {}).items()
+                    if name not in checks
+                }
+                result['cascade_stage'] = 'full'
+                results[result['question_id']] = result
+            self._add_full_usage(before)
+
+        return [results[q.get('question_id', 'unknown')] for q in questions]
+
+    def _add_full_usage(self, before: Dict[str, Dict[str, int]]) -> None:
+        for model, usage in getattr(self.full_analyzer, 'usage', {}).items():
+            totals = self._full_usage.setdefault(model, {'calls': 0, 'input_tokens': 0, 'output_tokens': 0})
+            for key in totals:
+                totals[key] += usage[key] - before.get(model, {}).get(key, 0)
+
+    async def analyze_batch_openai_only(
+        self,
+        questions: List[Dict[str, Any]],
+        concurrency: int = 5
+    ) -> List[Dict[str, Any]]:
+        return await self.full_analyzer.analyze_batch_openai_only(questions, concurrency)
+
+    async def analyze_batch_checks(
+        self,
+        questions: List[Dict[str, Any]],
+        concurrency: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-run each question's stale checks ('rerun_checks' on the item).
+
+        Stale local checks are recomputed here; the rest go to the full analyzer.
+        """
+        local_by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        remote = []
+        for question_item in questions:
+            rerun = question_item.get('rerun_checks', [])
+            stale_local = [c for c in rerun if c in LOCAL_CHECKS]
+            if stale_local:
+                local_checks = self._run_local_checks(question_item)
+                local_by_id[question_item.get('question_id', 'unknown')] = {
+                    c: local_checks[c] for c in stale_local if c in local_checks
+                }
+            if any(c not in LOCAL_CHECKS for c in rerun):
+                remote.append({**question_item, 'rerun_checks': [c for c in rerun if c not in LOCAL_CHECKS]})
+
+        remote_by_id = {}
+        if remote:
+            before = {model: dict(u) for model, u in getattr(self.full_analyzer, 'usage', {}).items()}
+            for result in await self.full_analyzer.analyze_batch_checks(remote, concurrency):
+                remote_by_id[result['question_id']] = result
+            self._add_full_usage(before)
+
+        results = []
+        for question_item in questions:
+            question_id = question_item.get('question_id', 'unknown')
+            result = remote_by_id.get(question_id) or {'question_id': question_id, 'checks': {}}
+            result['checks'] = {**local_by_id.get(question_id, {}), **result.get('checks', {})}
+            results.append(result)
+        return results
+
+    def get_cascade_stats(self) -> Dict[str, Any]:
+        """Per-stage pass-through rates, API usage and estimated cost saved vs. no cascade."""
+        local, cheap, full = self._stats['local'], self._stats['cheap'], self._stats['full']
+
+        def rate(stage: Dict[str, int]) -> Optional[float]:
+            return (stage['in'] - stage['screened_out']) / stage['in'] if stage['in'] else None
+
+        screened_out = local['screened_out'] + cheap['screened_out']
+
+        cheap_cost = estimate_cost_usd(self.cheap_model, cheap['input_tokens'], cheap['output_tokens']) or 0.0
+        full_costs = [
+            estimate_cost_usd(model, u['input_tokens'], u['output_tokens'])
+            for model, u in self._full_usage.items()
+        ]
+        full_tokens = sum(u['input_tokens'] + u['output_tokens'] for u in self._full_usage.values())
+
+        avg_full_cost = None
+        if full['in'] and full_costs and None not in full_costs:
+            avg_full_cost = sum(full_costs) / full['in']
+
+        return {
+            'stages': sorted(self.stages, key=CASCADE_STAGES.index),
+            'total_questions': self._stats['total'],
+            'local': {**local, 'pass_through_rate': rate(local)},
+            'cheap': {**cheap, 'model': self.cheap_model, 'pass_through_rate': rate(cheap),
+                      'cost_usd': round(cheap_cost, 4)},
+            'full': {**full, 'usage': self._full_usage},
+            'screened_out': screened_out,
+            'full_calls_avoided_rate': screened_out / self._stats['total'] if self._stats['total'] else None,
+            'estimated_full_tokens_avoided': (
+                round(screened_out * full_tokens / full['in']) if full['in'] else None
+            ),
+            'estimated_cost_saved_usd': (
+                round(screened_out * avg_full_cost - cheap_cost, 4) if avg_full_cost is not None else None
+            )
+        }
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Passage-Grouped Question QC
+
+Helpers for QC'ing several questions about the same passage in one Claude
+call. The extended bank has the parent plus its siblings for every quiz item,
+all on one passage, so sending the passage and the 8-check rubric once per
+group instead of once per question removes most of the repeated input tokens.
+
+The group tool schema is keyed by question_id (each value is the per-question
+check schema). Output that fails validation for a question is re-run with a
+per-question call by the caller.
+
+Used by QuestionQCAnalyzerV2 (real-time) and QuestionQCAnalyzerV3Batch
+(Message Batches API) when group_size > 1.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .question_qc_v2 import CLAUDE_CHECKS, CLAUDE_QC_RUBRIC, CLAUDE_QC_SCHEMA
+
+# Default questions per grouped call (parent + siblings of one quiz item)
+DEFAULT_GROUP_SIZE = 5
+
+GROUP_TOOL_NAME = "submit_group_qc_results"
+
+# Output tokens budgeted per question in a grouped call (same as a single call)
+MAX_TOKENS_PER_QUESTION = 2000
+MAX_GROUP_TOKENS = 16000
+
+DISTRACTOR_CHECKS = {'grammatical_parallel', 'plausibility', 'homogeneity', 'specificity_balance'}
+
+
+def group_questions_by_passage(
+    questions: List[Dict[str, Any]],
+    group_size: int
+) -> List[List[Dict[str, Any]]]:
+    """
+    Split questions into groups that share a passage, at most group_size each.
+
+    Groups keep the input order of their first question. Questions without
+    structured_content are returned as groups of one.
+    """
+    by_passage: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+    groups: List[List[Dict[str, Any]]] = []
+    for q in questions:
+        if 'structured_content' not in q:
+            groups.append([q])
+            continue
+        by_passage.setdefault(q.get('passage_text', '') or '', []).append(q)
+
+    for passage_questions in by_passage.values():
+        for i in range(0, len(passage_questions), max(1, group_size)):
+            groups.append(passage_questions[i:i + group_size])
+    return groups
+
+
+def build_group_tools(question_ids: List[str]) -> List[Dict[str, Any]]:
+    """Tool definition whose input is keyed by question_id."""
+    return [{
+        "name": GROUP_TOOL_NAME,
+        "description": "Submit quality control check results for every question, keyed by question_id",
+        "input_schema": {
+            "type": "object",
+            "properties": {question_id: CLAUDE_QC_SCHEMA for question_id in question_ids},
+            "required": list(question_ids)
+        }
+    }]
+
+
+def group_max_tokens(num_questions: int) -> int:
+    return min(MAX_GROUP_TOKENS, MAX_TOKENS_PER_QUESTION * num_questions)
+
+
+def _format_question(question_item: Dict[str, Any]) -> str:
+    question_data = question_item.get('structured_content', {})
+    choices = question_data.get('choices', {})
+    return f"""## Question ID: {question_item.get('question_id', '')}
+
+### Question:
+{question_data.get('question', '')}
+
+### Answer Choices:
+A) {choices.get('A', '')}
+B) {choices.get('B', '')}
+C) {choices.get('C', '')}
+D) {choices.get('D', '')}
+
+### Correct Answer: {question_data.get('correct_answer', '')}
+
+### Metadata:
+- Standard: {question_data.get('CCSS', '')} - {question_data.get('CCSS_description', '')}
+- DOK Level: {question_data.get('DOK', '')}
+- Grade: {question_item.get('grade') or 'Not specified'}"""
+
+
+def build_group_prompt(
+    question_items: List[Dict[str, Any]],
+    passage_text: Optional[str] = None,
+    include_rubric: bool = True
+) -> str:
+    """
+    Build one prompt evaluating every question in the group on all Claude checks.
+
+    Args:
+        question_items: Questions sharing a passage
+        passage_text: Passage to include inline (None when it is sent as a cached system block)
+        include_rubric: Include the check rubric (False when it is in the cached system prompt)
+    """
+    passage_section = ""
+    if passage_text is not None:
+        passage_section = f"""## Passage:
+{passage_text[:3000] if passage_text else "No passage provided"}
+
+"""
+    rubric_section = f"""
+
+---
+
+{CLAUDE_QC_RUBRIC}""" if include_rubric else ""
+    questions_section = "\n\n---\n\n".join(_format_question(q) for q in question_items)
+    question_ids = ", ".join(str(q.get('question_id', '')) for q in question_items)
+
+    return f"""Analyze each of the following {len(question_items)} multiple-choice questions about the same passage and evaluate EVERY question on ALL of the quality checks. Judge each question on its own.
+
+{passage_section}{questions_section}{rubric_section}
+
+---
+
+Submit one entry per question, keyed by question ID ({question_ids})."""
+
+
+def validate_group_output(
+    tool_input: Any,
+    question_ids: List[str]
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Split grouped tool output into valid per-question check inputs and failures.
+
+    Returns:
+        (valid, invalid_ids) where valid maps question_id to its raw check dict
+    """
+    valid: Dict[str, Dict[str, Any]] = {}
+    invalid: List[str] = []
+    if not isinstance(tool_input, dict):
+        return valid, list(question_ids)
+
+    for question_id in question_ids:
+        checks = tool_input.get(question_id)
+        ok = isinstance(checks, dict) and all(
+            isinstance(checks.get(check), dict) and checks[check].get('score') in (0, 1)
+            for check in CLAUDE_CHECKS
+        )
+        if ok:
+            valid[question_id] = checks
+        else:
+            invalid.append(question_id)
+    return valid, invalid
+
+
+def parse_check_results(checks: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Convert one question's raw check dict into per-check results."""
+    return {
+        check_name: {
+            'score': checks.get(check_name, {}).get('score', 0),
+            'response': checks.get(check_name, {}).get('reasoning', 'No reasoning provided'),
+            'category': 'distractor' if check_name in DISTRACTOR_CHECKS else 'question'
+        }
+        for check_name in CLAUDE_CHECKS
+    }
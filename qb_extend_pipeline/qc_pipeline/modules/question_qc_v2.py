@@ -22,6 +22,9 @@ import pandas as pd
 import anthropic
 from openai import AsyncOpenAI
 
+from llm_cache import LLMResponseCache, get_llm_cache
+from rate_governor import get_rate_governor_for, governed_create, is_rate_limit_error, record_usage
+
 logger = logging.getLogger(__name__)
 
 # Rate limiting configuration
@@ -120,6 +123,68 @@ CLAUDE_QC_SCHEMA = {
 }
 
 
+# Rubric for the Claude checks (shared by per-question, grouped and OpenRouter prompts)
+CLAUDE_QC_RUBRIC = """## Quality Checks to Evaluate:
+
+### 1. grammatical_parallel
+Do all answer choices follow the same grammatical pattern/structure?
+- PASS (1): All choices have consistent grammatical structure
+- FAIL (0): Choices have inconsistent structures
+
+### 2. plausibility
+Are all INCORRECT choices believable distractors (not obviously wrong)?
+- PASS (1): All distractors are plausible
+- FAIL (0): Any distractor is obviously wrong or unrelated
+
+### 3. homogeneity
+Do all choices belong to the same conceptual category?
+- PASS (1): All choices are the same type of answer
+- FAIL (0): Choices span different categories
+
+### 4. specificity_balance
+Are all choices at similar levels of detail/specificity?
+- PASS (1): Similar levels of detail across choices
+- FAIL (0): Significant differences in specificity
+
+### 5. standard_alignment
+Does the question properly assess its assigned learning standard (see the question metadata)?
+- PASS (1): Question directly assesses the standard
+- FAIL (0): Question assesses a different skill
+
+### 6. clarity_precision
+Is the question clearly written and unambiguous?
+- PASS (1): Clear, precise, one interpretation
+- FAIL (0): Ambiguous, confusing, or unclear
+
+### 7. single_correct_answer
+Is there exactly one defensibly correct answer?
+- PASS (1): One clear correct answer
+- FAIL (0): Multiple answers could be correct, or none
+
+### 8. passage_reference
+Are any specific passage references (paragraph numbers, quotes, etc.) accurate?
+- PASS (1): All references are accurate OR no specific references made
+- FAIL (0): Any reference is inaccurate
+"""
+
+
+def _subset_schema(checks: List[str]) -> Dict[str, Any]:
+    """CLAUDE_QC_SCHEMA narrowed to the given checks."""
+    return {
+        "type": "object",
+        "properties": {check: CLAUDE_QC_SCHEMA["properties"][check] for check in checks},
+        "required": list(checks)
+    }
+
+
+# Stable, cacheable system prompt: everything except the passage and the question
+CLAUDE_QC_SYSTEM_PROMPT = f"""You are a quality control expert for reading comprehension assessment items.
+
+You will be given a passage and multiple-choice questions about it. Evaluate each question on ALL of the quality checks listed below.
+
+{CLAUDE_QC_RUBRIC}"""
+
+
 class QuestionQCAnalyzerV2:
     """Optimized question QC analyzer using batched structured output."""
 
@@ -130,7 +195,8 @@ class QuestionQCAnalyzerV2:
         claude_model: str = "claude-sonnet-4-5-20250929",
         openai_model: str = "gpt-4-turbo",
         examples_df: Optional[pd.DataFrame] = None,
-        skip_openai: bool = False
+        skip_openai: bool = False,
+        group_size: int = 1
     ):
         self.claude_client = claude_client
         self.openai_client = openai_client if not skip_openai else None
@@ -138,27 +204,59 @@ class QuestionQCAnalyzerV2:
         self.openai_model = openai_model
         self.examples_df = examples_df
         self.skip_openai = skip_openai
+        # Questions per passage-grouped Claude call (1 = one call per question)
+        self.group_size = max(1, group_size)
+        self.llm_cache = get_llm_cache()
+        # API usage per model: {model: {'calls', 'input_tokens', 'output_tokens'}}
+        self.usage: Dict[str, Dict[str, int]] = {}
+
+        # Shared per-key rate governors (paced from the providers' rate limit headers)
+        self.claude_governor = get_rate_governor_for(claude_client) if claude_client else None
+        self.openai_governor = get_rate_governor_for(self.openai_client) if self.openai_client else None
+
+    def _build_claude_system(self, passage_text: str) -> List[Dict[str, Any]]:
+        """
+        Cacheable prefix for the Claude checks: rubric, then passage.
+
+        The rubric block is identical for every question and the passage block
+        for every question on that passage, so each carries a cache breakpoint.
+        """
+        return [
+            {
+                "type": "text",
+                "text": CLAUDE_QC_SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"}
+            },
+            {
+                "type": "text",
+                "text": f"""## Passage:
+{passage_text[:3000] if passage_text else "No passage provided"}""",
+                "cache_control": {"type": "ephemeral"}
+            }
+        ]
 
     def _build_claude_batch_prompt(
         self,
         question_data: Dict[str, Any],
         passage_text: str,
-        grade: Optional[int] = None
-    ) -> str:
-        """Build a single prompt for all Claude-based checks."""
+        grade: Optional[int] = None,
+        checks: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Build the request for all Claude-based checks (or only `checks`).
+
+        Returns:
+            (system blocks with the cached rubric + passage, per-question user prompt)
+        """
         choices = question_data.get('choices', {})
         question = question_data.get('question', '')
         correct_answer = question_data.get('correct_answer', '')
         standard_code = question_data.get('CCSS', '')
         standard_description = question_data.get('CCSS_description', '')
         dok = question_data.get('DOK', '')
+        scope = "ALL of the quality checks" if not checks else f"ONLY these quality checks: {', '.join(checks)}"
 
-        prompt = f"""You are a quality control expert for reading comprehension assessment items.
-
-Analyze the following multiple-choice question and evaluate it on ALL of the quality checks listed below.
-
-## Passage:
-{passage_text[:3000] if passage_text else "No passage provided"}
+        prompt = f"""Analyze the following multiple-choice question about the passage and evaluate it on {scope}.
 
 ## Question:
 {question}
@@ -176,55 +274,9 @@ D) {choices.get('D', '')}
 - DOK Level: {dok}
 - Grade: {grade or 'Not specified'}
 
----
-
-## Quality Checks to Evaluate:
-
-### 1. grammatical_parallel
-Do all answer choices follow the same grammatical pattern/structure?
-- PASS (1): All choices have consistent grammatical structure
-- FAIL (0): Choices have inconsistent structures
-
-### 2. plausibility
-Are all INCORRECT choices believable distractors (not obviously wrong)?
-- PASS (1): All distractors are plausible
-- FAIL (0): Any distractor is obviously wrong or unrelated
-
-### 3. homogeneity
-Do all choices belong to the same conceptual category?
-- PASS (1): All choices are the same type of answer
-- FAIL (0): Choices span different categories
-
-### 4. specificity_balance
-Are all choices at similar levels of detail/specificity?
-- PASS (1): Similar levels of detail across choices
-- FAIL (0): Significant differences in specificity
-
-### 5. standard_alignment
-Does this question properly assess the assigned learning standard ({standard_code})?
-- PASS (1): Question directly assesses the standard
-- FAIL (0): Question assesses a different skill
-
-### 6. clarity_precision
-Is the question clearly written and unambiguous?
-- PASS (1): Clear, precise, one interpretation
-- FAIL (0): Ambiguous, confusing, or unclear
-
-### 7. single_correct_answer
-Is there exactly one defensibly correct answer?
-- PASS (1): One clear correct answer
-- FAIL (0): Multiple answers could be correct, or none
-
-### 8. passage_reference
-Are any specific passage references (paragraph numbers, quotes, etc.) accurate?
-- PASS (1): All references are accurate OR no specific references made
-- FAIL (0): Any reference is inaccurate
-
----
-
 Evaluate each check and provide your assessment."""
 
-        return prompt
+        return self._build_claude_system(passage_text), prompt
 
     def _build_openai_batch_prompt(
         self,
@@ -295,42 +347,54 @@ Respond with JSON:
         self,
         question_data: Dict[str, Any],
         passage_text: str,
-        grade: Optional[int] = None
+        grade: Optional[int] = None,
+        checks: Optional[List[str]] = None
     ) -> Dict[str, Dict[str, Any]]:
-        """Run all Claude checks in a single API call using structured output."""
-        prompt = self._build_claude_batch_prompt(question_data, passage_text, grade)
+        """
+        Run all Claude checks in a single API call using structured output.
+
+        With `checks`, only that subset is requested (the tool schema is narrowed;
+        the cached system prompt is unchanged).
+        """
+        checks = [c for c in CLAUDE_CHECKS if c in checks] if checks else None
+        system, prompt = self._build_claude_batch_prompt(question_data, passage_text, grade, checks)
+        check_names = checks or CLAUDE_CHECKS
 
         tools = [{
             "name": "submit_qc_results",
             "description": "Submit quality control check results for all checks",
-            "input_schema": CLAUDE_QC_SCHEMA
+            "input_schema": _subset_schema(checks) if checks else CLAUDE_QC_SCHEMA
         }]
 
+        cache_key = LLMResponseCache.make_key(
+            model=self.claude_model, prompt=[system, prompt], schema=tools
+        )
+        cached_input = self.llm_cache.get(cache_key)
+        if cached_input is not None:
+            return self._parse_claude_tool_input(cached_input, check_names)
+
         for attempt in range(MAX_RETRIES):
             try:
-                response = await self.claude_client.messages.create(
+                response = await governed_create(
+                    self.claude_client.messages,
+                    self.claude_governor,
                     model=self.claude_model,
                     max_tokens=2000,
+                    system=system,
                     tools=tools,
                     tool_choice={"type": "tool", "name": "submit_qc_results"},
                     messages=[{"role": "user", "content": prompt}]
                 )
+                record_usage(self.usage, self.claude_model, response)
 
                 # Extract structured output
                 for block in response.content:
                     if block.type == "tool_use" and block.name == "submit_qc_results":
-                        results = {}
-                        for check_name in CLAUDE_CHECKS:
-                            check_data = block.input.get(check_name, {})
-                            results[check_name] = {
-                                'score': check_data.get('score', 0),
-                                'response': check_data.get('reasoning', 'No reasoning provided'),
-                                'category': 'distractor' if check_name in ['grammatical_parallel', 'plausibility', 'homogeneity', 'specificity_balance'] else 'question'
-                            }
-                        return results
+                        self.llm_cache.put(cache_key, block.input, model=self.claude_model)
+                        return self._parse_claude_tool_input(block.input, check_names)
 
                 # Fallback if no tool use found
-                return {check: {'score': 0, 'response': 'No structured output', 'category': 'unknown'} for check in CLAUDE_CHECKS}
+                return {check: {'score': 0, 'response': 'No structured output', 'category': 'unknown'} for check in check_names}
 
             except anthropic.RateLimitError as e:
                 delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
@@ -338,9 +402,105 @@ Respond with JSON:
                 await asyncio.sleep(delay)
             except Exception as e:
                 logger.error(f"Error in Claude batch: {e}")
-                return {check: {'score': 0, 'response': f'Error: {str(e)}', 'category': 'unknown'} for check in CLAUDE_CHECKS}
+                return {check: {'score': 0, 'response': f'Error: {str(e)}', 'category': 'unknown'} for check in check_names}
+
+        return {check: {'score': 0, 'response': 'Max retries exceeded', 'category': 'unknown'} for check in check_names}
+
+    async def _run_claude_group(
+        self,
+        question_items: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Run all Claude checks for several questions on one passage in a single call.
+
+        The tool input is keyed by question_id. Questions whose entry fails
+        validation (or the whole group, if the call fails) are re-run with the
+        per-question _run_claude_batch call.
 
-        return {check: {'score': 0, 'response': 'Max retries exceeded', 'category': 'unknown'} for check in CLAUDE_CHECKS}
+        Returns:
+            question_id -> per-check results
+        """
+        from .question_qc_group import (
+            GROUP_TOOL_NAME, build_group_prompt, build_group_tools,
+            group_max_tokens, parse_check_results, validate_group_output
+        )
+
+        question_ids = [str(q.get('question_id', '')) for q in question_items]
+        system = self._build_claude_system(question_items[0].get('passage_text', ''))
+        prompt = build_group_prompt(question_items, include_rubric=False)
+        tools = build_group_tools(question_ids)
+
+        cache_key = LLMResponseCache.make_key(
+            model=self.claude_model, prompt=[system, prompt], schema=tools
+        )
+        tool_input = self.llm_cache.get(cache_key)
+
+        if tool_input is None:
+            for attempt in range(MAX_RETRIES):
+                try:
+                    response = await governed_create(
+                        self.claude_client.messages,
+                        self.claude_governor,
+                        model=self.claude_model,
+                        max_tokens=group_max_tokens(len(question_items)),
+                        system=system,
+                        tools=tools,
+                        tool_choice={"type": "tool", "name": GROUP_TOOL_NAME},
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                    record_usage(self.usage, self.claude_model, response)
+                    for block in response.content:
+                        if block.type == "tool_use" and block.name == GROUP_TOOL_NAME:
+                            tool_input = block.input
+                            break
+                    break
+                except anthropic.RateLimitError:
+                    delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
+                    logger.warning(f"Rate limit, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                    await asyncio.sleep(delay)
+                except Exception as e:
+                    logger.error(f"Error in Claude group call: {e}")
+                    break
+
+        valid, invalid = validate_group_output(tool_input, question_ids)
+        if not invalid:
+            self.llm_cache.put(cache_key, tool_input, model=self.claude_model)
+
+        results = {qid: parse_check_results(checks) for qid, checks in valid.items()}
+
+        if invalid:
+            logger.warning(
+                f"Group output invalid for {len(invalid)}/{len(question_ids)} questions, "
+                f"falling back to per-question calls"
+            )
+            items_by_id = {str(q.get('question_id', '')): q for q in question_items}
+            fallback = await asyncio.gather(*[
+                self._run_claude_batch(
+                    items_by_id[qid]['structured_content'],
+                    items_by_id[qid].get('passage_text', ''),
+                    items_by_id[qid].get('grade')
+                )
+                for qid in invalid
+            ])
+            results.update(zip(invalid, fallback))
+
+        return results
+
+    def _parse_claude_tool_input(
+        self,
+        tool_input: Dict[str, Any],
+        check_names: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Convert submit_qc_results tool input into per-check results."""
+        results = {}
+        for check_name in check_names or CLAUDE_CHECKS:
+            check_data = tool_input.get(check_name, {})
+            results[check_name] = {
+                'score': check_data.get('score', 0),
+                'response': check_data.get('reasoning', 'No reasoning provided'),
+                'category': 'distractor' if check_name in ['grammatical_parallel', 'plausibility', 'homogeneity', 'specificity_balance'] else 'question'
+            }
+        return results
 
     async def _run_openai_batch(
         self,
@@ -353,17 +513,29 @@ Respond with JSON:
             return {}
 
         prompt = self._build_openai_batch_prompt(question_data, passage_text, grade)
+        response_format = {"type": "json_object"}
+        cache_key = LLMResponseCache.make_key(
+            model=self.openai_model, prompt=prompt, schema=response_format
+        )
 
         for attempt in range(MAX_RETRIES):
             try:
-                response = await self.openai_client.chat.completions.create(
-                    model=self.openai_model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"}
-                )
+                response_text = self.llm_cache.get(cache_key)
+                from_cache = response_text is not None
+                if not from_cache:
+                    response = await governed_create(
+                        self.openai_client.chat.completions,
+                        self.openai_governor,
+                        model=self.openai_model,
+                        messages=[{"role": "user", "content": prompt}],
+                        response_format=response_format
+                    )
+                    record_usage(self.usage, self.openai_model, response)
+                    response_text = response.choices[0].message.content
 
-                response_text = response.choices[0].message.content
                 data = json.loads(response_text)
+                if not from_cache:
+                    self.llm_cache.put(cache_key, response_text, model=self.openai_model)
 
                 results = {}
                 
@@ -388,8 +560,7 @@ Respond with JSON:
                 return results
 
             except Exception as e:
-                error_str = str(e)
-                if '429' in error_str or 'rate' in error_str.lower():
+                if is_rate_limit_error(e):
                     delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
                     logger.warning(f"OpenAI rate limit, retrying in {delay:.1f}s")
                     await asyncio.sleep(delay)
@@ -459,13 +630,14 @@ Respond with JSON:
     async def analyze_question(
         self,
         question_item: Dict[str, Any],
-        semaphore: Optional[asyncio.Semaphore] = None
+        semaphore: Optional[asyncio.Semaphore] = None,
+        claude_results: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Analyze a single question with batched API calls.
         
         Only 2 API calls total:
-        - 1 Claude call for 8 checks
+        - 1 Claude call for 8 checks (skipped when claude_results come from a group call)
         - 1 OpenAI call for 2 checks (if enabled)
         """
         async with semaphore if semaphore else asyncio.Semaphore(1):
@@ -490,7 +662,8 @@ Respond with JSON:
             results = {}
 
             # Run Claude batch (1 API call for 8 checks)
-            claude_results = await self._run_claude_batch(question_data, passage_text, grade)
+            if claude_results is None:
+                claude_results = await self._run_claude_batch(question_data, passage_text, grade)
             results.update(claude_results)
 
             # Run OpenAI batch (1 API call for 2 checks)
@@ -531,8 +704,41 @@ Respond with JSON:
     ) -> List[Dict[str, Any]]:
         """Analyze a batch of questions with controlled concurrency."""
         semaphore = asyncio.Semaphore(concurrency)
-        tasks = [self.analyze_question(q, semaphore) for q in questions]
-        return await asyncio.gather(*tasks)
+        if self.group_size <= 1:
+            tasks = [self.analyze_question(q, semaphore) for q in questions]
+            return await asyncio.gather(*tasks)
+
+        from .question_qc_group import group_questions_by_passage
+
+        groups = group_questions_by_passage(questions, self.group_size)
+        group_results = await asyncio.gather(*[self.analyze_group(g, semaphore) for g in groups])
+
+        # Return in input order
+        by_id = {r['question_id']: r for results in group_results for r in results}
+        return [by_id[q.get('question_id', 'unknown')] for q in questions]
+
+    async def analyze_group(
+        self,
+        question_items: List[Dict[str, Any]],
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze questions that share a passage with one Claude call for the group.
+
+        OpenAI and length checks still run per question.
+        """
+        if len(question_items) == 1 or any('structured_content' not in q for q in question_items):
+            return list(await asyncio.gather(*[self.analyze_question(q, semaphore) for q in question_items]))
+
+        async with semaphore if semaphore else asyncio.Semaphore(1):
+            logger.info(f"Analyzing group of {len(question_items)} questions (passage-grouped mode)")
+            claude_results = await self._run_claude_group(question_items)
+
+        tasks = [
+            self.analyze_question(q, semaphore, claude_results=claude_results.get(str(q.get('question_id', ''))))
+            for q in question_items
+        ]
+        return list(await asyncio.gather(*tasks))
 
     async def analyze_openai_only(
         self,
@@ -598,4 +804,73 @@ Respond with JSON:
         
         semaphore = asyncio.Semaphore(concurrency)
         tasks = [self.analyze_openai_only(q, semaphore) for q in questions]
-        return await asyncio.gather(*tasks)
\ No newline at end of file
+        return await asyncio.gather(*tasks)
+
+    async def analyze_checks(
+        self,
+        question_item: Dict[str, Any],
+        checks: List[str],
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-run only the given checks for a question.
+
+        Used when a question was edited and only some checks' inputs changed
+        (see CHECK_INPUT_FIELDS in utils). The Claude call is skipped when no
+        Claude check is stale, and the OpenAI call when no OpenAI check is.
+        Returns partial results that should be merged with the existing result.
+        """
+        async with semaphore if semaphore else asyncio.Semaphore(1):
+            question_id = question_item.get('question_id', 'unknown')
+            passage_text = question_item.get('passage_text', '')
+            grade = question_item.get('grade')
+
+            if 'structured_content' not in question_item:
+                logger.warning(f"No structured_content for {question_id}")
+                return {
+                    'question_id': question_id,
+                    'checks': {},
+                    'error': 'No structured_content provided'
+                }
+
+            question_data = question_item['structured_content']
+            logger.debug(f"Re-running checks for {question_id}: {', '.join(checks)}")
+
+            results = {}
+
+            claude_checks = [c for c in CLAUDE_CHECKS if c in checks]
+            if claude_checks:
+                results.update(await self._run_claude_batch(question_data, passage_text, grade, claude_checks))
+
+            if self.openai_client and any(c in checks for c in OPENAI_CHECKS):
+                openai_results = await self._run_openai_batch(question_data, passage_text, grade)
+                results.update({k: v for k, v in openai_results.items() if k in checks})
+
+            if 'length_check' in checks:
+                score, response = self._run_length_check(question_data)
+                results['length_check'] = {
+                    'score': score,
+                    'response': response,
+                    'category': 'distractor'
+                }
+
+            return {
+                'question_id': question_id,
+                'checks': results,
+                'timestamp': datetime.now().isoformat()
+            }
+
+    async def analyze_batch_checks(
+        self,
+        questions: List[Dict[str, Any]],
+        concurrency: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-run only the stale checks for a batch of questions.
+
+        Each question item carries its stale check names in 'rerun_checks'.
+        Returns partial results that should be merged with existing results.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = [self.analyze_checks(q, q.get('rerun_checks', []), semaphore) for q in questions]
+        return await asyncio.gather(*tasks)
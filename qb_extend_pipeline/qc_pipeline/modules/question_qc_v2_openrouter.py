@@ -20,7 +20,6 @@ import asyncio
 import logging
 import random
 import json
-import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 from collections import deque
@@ -28,6 +27,10 @@ import pandas as pd
 
 from openai import AsyncOpenAI
 
+from llm_cache import LLMResponseCache, get_llm_cache
+from rate_governor import get_rate_governor_for, governed_create, is_rate_limit_error, record_usage
+from .question_qc_v2 import CLAUDE_QC_SYSTEM_PROMPT
+
 logger = logging.getLogger(__name__)
 
 # Rate limiting configuration - optimized for OpenRouter
@@ -38,110 +41,6 @@ JITTER_FACTOR = 0.3  # Add randomness to avoid thundering herd
 
 # OpenRouter specific settings
 OPENROUTER_REQUESTS_PER_MINUTE = 20  # Default rate limit
-OPENROUTER_BURST_SIZE = 5  # Allow small bursts
-
-
-class TokenBucketRateLimiter:
-    """
-    Token bucket rate limiter for smooth request distribution.
-    
-    Allows bursting while maintaining average rate over time.
-    """
-    
-    def __init__(self, rate_per_minute: int = 20, burst_size: int = 5):
-        self.rate_per_second = rate_per_minute / 60.0
-        self.max_tokens = burst_size
-        self.tokens = burst_size  # Start with full bucket
-        self.last_update = time.monotonic()
-        self._lock = asyncio.Lock()
-    
-    async def acquire(self):
-        """Wait until a token is available, then consume it."""
-        async with self._lock:
-            now = time.monotonic()
-            # Add tokens based on elapsed time
-            elapsed = now - self.last_update
-            self.tokens = min(self.max_tokens, self.tokens + elapsed * self.rate_per_second)
-            self.last_update = now
-            
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return
-            
-            # Calculate wait time for next token
-            wait_time = (1 - self.tokens) / self.rate_per_second
-            
-        # Wait outside the lock
-        if wait_time > 0:
-            logger.debug(f"Rate limiter: waiting {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
-            
-        async with self._lock:
-            self.tokens = 0  # Consume the token we waited for
-            self.last_update = time.monotonic()
-
-
-class AdaptiveRateLimiter:
-    """
-    Adaptive rate limiter that adjusts based on API responses.
-    
-    Increases delay when hitting rate limits, decreases when successful.
-    """
-    
-    def __init__(self, initial_rate: int = 20, min_rate: int = 5, max_rate: int = 50):
-        self.current_rate = initial_rate
-        self.min_rate = min_rate
-        self.max_rate = max_rate
-        self.bucket = TokenBucketRateLimiter(initial_rate, burst_size=5)
-        self._lock = asyncio.Lock()
-        self._consecutive_successes = 0
-        self._consecutive_failures = 0
-    
-    async def acquire(self):
-        """Acquire a token from the rate limiter."""
-        await self.bucket.acquire()
-    
-    async def report_success(self):
-        """Report a successful request - may increase rate."""
-        async with self._lock:
-            self._consecutive_successes += 1
-            self._consecutive_failures = 0
-            
-            # After 10 consecutive successes, try increasing rate
-            if self._consecutive_successes >= 10 and self.current_rate < self.max_rate:
-                self.current_rate = min(self.max_rate, int(self.current_rate * 1.2))
-                self.bucket = TokenBucketRateLimiter(self.current_rate, burst_size=5)
-                logger.info(f"Rate limiter: increased rate to {self.current_rate}/min")
-                self._consecutive_successes = 0
-    
-    async def report_rate_limit(self):
-        """Report a rate limit hit - decrease rate."""
-        async with self._lock:
-            self._consecutive_failures += 1
-            self._consecutive_successes = 0
-            
-            # Decrease rate on rate limit
-            self.current_rate = max(self.min_rate, int(self.current_rate * 0.7))
-            self.bucket = TokenBucketRateLimiter(self.current_rate, burst_size=3)
-            logger.warning(f"Rate limiter: decreased rate to {self.current_rate}/min after rate limit")
-
-
-# Global rate limiter instance (shared across all requests)
-_global_rate_limiter: Optional[AdaptiveRateLimiter] = None
-
-
-def get_rate_limiter(initial_rate: int = 20) -> AdaptiveRateLimiter:
-    """Get or create the global rate limiter."""
-    global _global_rate_limiter
-    if _global_rate_limiter is None:
-        _global_rate_limiter = AdaptiveRateLimiter(initial_rate=initial_rate)
-    return _global_rate_limiter
-
-
-def reset_rate_limiter():
-    """Reset the global rate limiter (useful between runs)."""
-    global _global_rate_limiter
-    _global_rate_limiter = None
 
 
 # Claude checks to batch
@@ -162,6 +61,19 @@ OPENAI_CHECKS = [
     'difficulty_assessment'
 ]
 
+# Output format for the Claude checks (appended to the cached system prompt)
+JSON_RESPONSE_INSTRUCTIONS = """
+---
+
+Respond with a JSON object containing your assessment for each check. Each check should have a "score" (0 or 1) and "reasoning" (string explanation).
+
+Example format:
+{
+  "grammatical_parallel": {"score": 1, "reasoning": "All choices follow parallel structure..."},
+  "plausibility": {"score": 0, "reasoning": "Option D is obviously wrong..."},
+  ...
+}"""
+
 # Default OpenAI model via OpenRouter
 DEFAULT_OPENAI_MODEL = "openai/gpt-4o"  # GPT-4o via OpenRouter for speed + unified billing
 
@@ -241,38 +153,47 @@ class QuestionQCAnalyzerV2OpenRouter:
         else:
             self.openai_client = openai_client if not skip_openai else None
         
-        # Initialize rate limiter with custom rate
-        reset_rate_limiter()  # Reset for fresh start
-        self.rate_limiter = get_rate_limiter(initial_rate)
+        # Shared rate governor for this OpenRouter key (also paces GPT calls routed through it)
+        self.rate_governor = get_rate_governor_for(openrouter_client, rpm=initial_rate)
+        self.openai_governor = get_rate_governor_for(self.openai_client) if self.openai_client else None
         
         # Stats tracking
         self._stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'rate_limit_hits': 0,
-            'errors': 0
+            'errors': 0,
+            'cache_hits': 0
         }
+        
+        # Shared on-disk response cache
+        self.llm_cache = get_llm_cache()
+        # API usage per model: {model: {'calls', 'input_tokens', 'output_tokens'}}
+        self.usage: Dict[str, Dict[str, int]] = {}
 
     def _build_claude_batch_prompt(
         self,
         question_data: Dict[str, Any],
         passage_text: str,
-        grade: Optional[int] = None
-    ) -> str:
-        """Build a single prompt for all Claude-based checks."""
+        grade: Optional[int] = None,
+        checks: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the messages for all Claude-based checks (or only `checks`).
+
+        The system message (rubric + JSON format, then passage) is a stable
+        prefix with cache_control hints, which OpenRouter passes through to
+        Anthropic; the user message holds only the question.
+        """
         choices = question_data.get('choices', {})
         question = question_data.get('question', '')
         correct_answer = question_data.get('correct_answer', '')
         standard_code = question_data.get('CCSS', '')
         standard_description = question_data.get('CCSS_description', '')
         dok = question_data.get('DOK', '')
+        scope = "ALL of the quality checks" if not checks else f"ONLY these quality checks: {', '.join(checks)}"
 
-        prompt = f"""You are a quality control expert for reading comprehension assessment items.
-
-Analyze the following multiple-choice question and evaluate it on ALL of the quality checks listed below.
-
-## Passage:
-{passage_text[:3000] if passage_text else "No passage provided"}
+        prompt = f"""Analyze the following multiple-choice question about the passage and evaluate it on {scope}.
 
 ## Question:
 {question}
@@ -288,64 +209,27 @@ D) {choices.get('D', '')}
 ## Metadata:
 - Standard: {standard_code} - {standard_description}
 - DOK Level: {dok}
-- Grade: {grade or 'Not specified'}
-
----
-
-## Quality Checks to Evaluate:
-
-### 1. grammatical_parallel
-Do all answer choices follow the same grammatical pattern/structure?
-- PASS (1): All choices have consistent grammatical structure
-- FAIL (0): Choices have inconsistent structures
-
-### 2. plausibility
-Are all INCORRECT choices believable distractors (not obviously wrong)?
-- PASS (1): All distractors are plausible
-- FAIL (0): Any distractor is obviously wrong or unrelated
-
-### 3. homogeneity
-Do all choices belong to the same conceptual category?
-- PASS (1): All choices are the same type of answer
-- FAIL (0): Choices span different categories
-
-### 4. specificity_balance
-Are all choices at similar levels of detail/specificity?
-- PASS (1): Similar levels of detail across choices
-- FAIL (0): Significant differences in specificity
-
-### 5. standard_alignment
-Does this question properly assess the assigned learning standard ({standard_code})?
-- PASS (1): Question directly assesses the standard
-- FAIL (0): Question assesses a different skill
-
-### 6. clarity_precision
-Is the question clearly written and unambiguous?
-- PASS (1): Clear, precise, one interpretation
-- FAIL (0): Ambiguous, confusing, or unclear
-
-### 7. single_correct_answer
-Is there exactly one defensibly correct answer?
-- PASS (1): One clear correct answer
-- FAIL (0): Multiple answers could be correct, or none
-
-### 8. passage_reference
-Are any specific passage references (paragraph numbers, quotes, etc.) accurate?
-- PASS (1): All references are accurate OR no specific references made
-- FAIL (0): Any reference is inaccurate
-
----
-
-Respond with a JSON object containing your assessment for each check. Each check should have a "score" (0 or 1) and "reasoning" (string explanation).
-
-Example format:
-{{
-  "grammatical_parallel": {{"score": 1, "reasoning": "All choices follow parallel structure..."}},
-  "plausibility": {{"score": 0, "reasoning": "Option D is obviously wrong..."}},
-  ...
-}}"""
-
-        return prompt
+- Grade: {grade or 'Not specified'}"""
+
+        return [
+            {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": CLAUDE_QC_SYSTEM_PROMPT + JSON_RESPONSE_INSTRUCTIONS,
+                        "cache_control": {"type": "ephemeral"}
+                    },
+                    {
+                        "type": "text",
+                        "text": f"""## Passage:
+{passage_text[:3000] if passage_text else "No passage provided"}""",
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ]
+            },
+            {"role": "user", "content": prompt}
+        ]
 
     def _build_openai_batch_prompt(
         self,
@@ -413,37 +297,51 @@ Respond with JSON:
         self,
         question_data: Dict[str, Any],
         passage_text: str,
-        grade: Optional[int] = None
+        grade: Optional[int] = None,
+        checks: Optional[List[str]] = None
     ) -> Dict[str, Dict[str, Any]]:
         """
-        Run all Claude checks via OpenRouter API (OpenAI-compatible).
+        Run all Claude checks (or only `checks`) via OpenRouter API (OpenAI-compatible).
         
         Features:
         - Adaptive rate limiting
         - Exponential backoff with jitter
         - Automatic retry on transient errors
         """
-        prompt = self._build_claude_batch_prompt(question_data, passage_text, grade)
+        checks = [c for c in CLAUDE_CHECKS if c in checks] if checks else None
+        check_names = checks or CLAUDE_CHECKS
+        messages = self._build_claude_batch_prompt(question_data, passage_text, grade, checks)
         self._stats['total_requests'] += 1
+        response_format = {"type": "json_object"}
+        cache_key = LLMResponseCache.make_key(
+            model=self.claude_model, prompt=messages, schema=response_format
+        )
 
         for attempt in range(MAX_RETRIES):
             try:
-                # Acquire rate limit token before making request
-                await self.rate_limiter.acquire()
-                
-                # Use OpenAI-compatible API via OpenRouter
-                response = await self.openrouter_client.chat.completions.create(
-                    model=self.claude_model,
-                    max_tokens=2000,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"},
-                    extra_headers={
-                        "HTTP-Referer": "https://github.com/playcademy",  # For OpenRouter stats
-                        "X-Title": "QC Pipeline V2 - High Priority"  # For OpenRouter dashboard
-                    }
-                )
+                response_text = self.llm_cache.get(cache_key)
+                from_cache = response_text is not None
+                if from_cache:
+                    self._stats['cache_hits'] += 1
+                else:
+                    # Use OpenAI-compatible API via OpenRouter
+                    response = await governed_create(
+                        self.openrouter_client.chat.completions,
+                        self.rate_governor,
+                        model=self.claude_model,
+                        max_tokens=2000,
+                        messages=messages,
+                        response_format=response_format,
+                        # Ask OpenRouter for detailed usage (includes cached prompt tokens)
+                        extra_body={"usage": {"include": True}},
+                        extra_headers={
+                            "HTTP-Referer": "https://github.com/playcademy",  # For OpenRouter stats
+                            "X-Title": "QC Pipeline V2 - High Priority"  # For OpenRouter dashboard
+                        }
+                    )
+                    record_usage(self.usage, self.claude_model, response)
 
-                response_text = response.choices[0].message.content
+                    response_text = response.choices[0].message.content
                 
                 try:
                     data = json.loads(response_text)
@@ -459,7 +357,7 @@ Respond with JSON:
 
                 # Parse results
                 results = {}
-                for check_name in CLAUDE_CHECKS:
+                for check_name in check_names:
                     check_data = data.get(check_name, {})
                     if isinstance(check_data, dict):
                         results[check_name] = {
@@ -474,8 +372,8 @@ Respond with JSON:
                             'category': 'unknown'
                         }
                 
-                # Report success to rate limiter (may increase rate)
-                await self.rate_limiter.report_success()
+                if not from_cache:
+                    self.llm_cache.put(cache_key, response_text, model=self.claude_model)
                 self._stats['successful_requests'] += 1
                 
                 return results
@@ -483,23 +381,16 @@ Respond with JSON:
             except Exception as e:
                 error_str = str(e).lower()
                 
-                # Check for rate limit errors
-                is_rate_limit = '429' in str(e) or 'rate' in error_str or 'limit' in error_str or 'too many' in error_str
-                
-                if is_rate_limit:
+                if is_rate_limit_error(e):
                     self._stats['rate_limit_hits'] += 1
-                    
-                    # Report to rate limiter (will decrease rate)
-                    await self.rate_limiter.report_rate_limit()
-                    
-                    # Exponential backoff with jitter
-                    base_delay = BASE_DELAY * (2 ** attempt)
-                    jitter = base_delay * JITTER_FACTOR * random.random()
-                    delay = min(base_delay + jitter, MAX_DELAY)
-                    
-                    logger.warning(f"Rate limit hit, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES}, current rate: {self.rate_limiter.current_rate}/min)")
+
+                    # The governor has already recorded the hit (retry-after / lower rate);
+                    # add jitter so concurrent retries don't line up
+                    delay = min(BASE_DELAY * (2 ** attempt) * JITTER_FACTOR * random.random(), MAX_DELAY)
+
+                    logger.warning(f"Rate limit hit, retrying (attempt {attempt + 1}/{MAX_RETRIES}, current rate: {self.rate_governor.current_rate:.0f}/min)")
                     await asyncio.sleep(delay)
-                    
+
                 elif 'timeout' in error_str or 'connection' in error_str:
                     # Transient errors - retry with shorter delay
                     delay = BASE_DELAY * (attempt + 1) + random.uniform(0, 1)
@@ -510,10 +401,10 @@ Respond with JSON:
                     # Non-retryable error
                     self._stats['errors'] += 1
                     logger.error(f"Error in OpenRouter Claude batch: {e}")
-                    return {check: {'score': 0, 'response': f'Error: {str(e)}', 'category': 'unknown'} for check in CLAUDE_CHECKS}
+                    return {check: {'score': 0, 'response': f'Error: {str(e)}', 'category': 'unknown'} for check in check_names}
 
         self._stats['errors'] += 1
-        return {check: {'score': 0, 'response': 'Max retries exceeded', 'category': 'unknown'} for check in CLAUDE_CHECKS}
+        return {check: {'score': 0, 'response': 'Max retries exceeded', 'category': 'unknown'} for check in check_names}
 
     async def _run_openai_batch(
         self,
@@ -532,30 +423,40 @@ Respond with JSON:
 
         prompt = self._build_openai_batch_prompt(question_data, passage_text, grade)
         self._stats['total_requests'] += 1
+        response_format = {"type": "json_object"}
+        cache_key = LLMResponseCache.make_key(
+            model=self.openai_model, prompt=prompt, schema=response_format
+        )
 
         for attempt in range(MAX_RETRIES):
             try:
-                # Use same rate limiter for unified throughput control
-                if self.use_openrouter_for_openai:
-                    await self.rate_limiter.acquire()
-                
-                # Build request - add OpenRouter headers if using OpenRouter
-                extra_kwargs = {}
-                if self.use_openrouter_for_openai:
-                    extra_kwargs['extra_headers'] = {
-                        "HTTP-Referer": "https://github.com/playcademy",
-                        "X-Title": "QC Pipeline V2 - GPT Checks"
-                    }
-                
-                response = await self.openai_client.chat.completions.create(
-                    model=self.openai_model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"},
-                    max_tokens=1000,  # GPT checks need less tokens
-                    **extra_kwargs
-                )
-
-                response_text = response.choices[0].message.content
+                response_text = self.llm_cache.get(cache_key)
+                from_cache = response_text is not None
+                if from_cache:
+                    self._stats['cache_hits'] += 1
+                else:
+                    # Build request - add OpenRouter headers if using OpenRouter
+                    extra_kwargs = {}
+                    if self.use_openrouter_for_openai:
+                        extra_kwargs['extra_headers'] = {
+                            "HTTP-Referer": "https://github.com/playcademy",
+                            "X-Title": "QC Pipeline V2 - GPT Checks"
+                        }
+
+                    # Routed through OpenRouter, this shares the governor with the Claude checks
+                    response = await governed_create(
+                        self.openai_client.chat.completions,
+                        self.openai_governor,
+                        model=self.openai_model,
+                        messages=[{"role": "user", "content": prompt}],
+                        response_format=response_format,
+                        max_tokens=1000,  # GPT checks need less tokens
+                        **extra_kwargs
+                    )
+                    record_usage(self.usage, self.openai_model, response)
+
+                    response_text = response.choices[0].message.content
+
                 data = json.loads(response_text)
 
                 results = {}
@@ -580,18 +481,15 @@ Respond with JSON:
 
                 # Track success for adaptive rate limiting
                 self._stats['successful_requests'] += 1
-                if self.use_openrouter_for_openai:
-                    await self.rate_limiter.report_success()
+                if not from_cache:
+                    self.llm_cache.put(cache_key, response_text, model=self.openai_model)
                 
                 return results
 
             except Exception as e:
-                error_str = str(e)
-                if '429' in error_str or 'rate' in error_str.lower():
+                if is_rate_limit_error(e):
                     self._stats['rate_limit_hits'] += 1
-                    if self.use_openrouter_for_openai:
-                        await self.rate_limiter.report_rate_limit()
-                    delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, JITTER_FACTOR), MAX_DELAY)
+                    delay = min(BASE_DELAY * (2 ** attempt) * JITTER_FACTOR * random.random(), MAX_DELAY)
                     logger.warning(f"GPT rate limit (attempt {attempt + 1}), retrying in {delay:.1f}s")
                     await asyncio.sleep(delay)
                 else:
@@ -752,7 +650,7 @@ Respond with JSON:
         
         # Log stats after batch
         logger.info(f"Batch complete - Stats: {self._stats}")
-        logger.info(f"Final rate: {self.rate_limiter.current_rate}/min")
+        logger.info(f"Final rate: {self.rate_governor.current_rate:.0f}/min")
         
         return results
     
@@ -760,7 +658,8 @@ Respond with JSON:
         """Get processing statistics."""
         return {
             **self._stats,
-            'current_rate_per_min': self.rate_limiter.current_rate,
+            'current_rate_per_min': self.rate_governor.current_rate,
+            'rate_governor': self.rate_governor.get_stats(),
             'success_rate': (
                 self._stats['successful_requests'] / self._stats['total_requests'] 
                 if self._stats['total_requests'] > 0 else 0
@@ -826,3 +725,69 @@ Respond with JSON:
         tasks = [self.analyze_openai_only(q, semaphore) for q in questions]
         return await asyncio.gather(*tasks)
 
+
+    async def analyze_checks(
+        self,
+        question_item: Dict[str, Any],
+        checks: List[str],
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-run only the given checks for a question.
+
+        Used when only some checks' inputs changed after an edit. Returns
+        partial results that should be merged with the existing result.
+        """
+        async with semaphore if semaphore else asyncio.Semaphore(1):
+            question_id = question_item.get('question_id', 'unknown')
+            passage_text = question_item.get('passage_text', '')
+            grade = question_item.get('grade')
+
+            if 'structured_content' not in question_item:
+                logger.warning(f"No structured_content for {question_id}")
+                return {
+                    'question_id': question_id,
+                    'checks': {},
+                    'error': 'No structured_content provided'
+                }
+
+            question_data = question_item['structured_content']
+            logger.debug(f"Re-running checks for {question_id}: {', '.join(checks)}")
+
+            results = {}
+
+            claude_checks = [c for c in CLAUDE_CHECKS if c in checks]
+            if claude_checks:
+                results.update(await self._run_claude_batch_via_openrouter(
+                    question_data, passage_text, grade, claude_checks
+                ))
+
+            if self.openai_client and any(c in checks for c in OPENAI_CHECKS):
+                openai_results = await self._run_openai_batch(question_data, passage_text, grade)
+                results.update({k: v for k, v in openai_results.items() if k in checks})
+
+            if 'length_check' in checks:
+                score, response = self._run_length_check(question_data)
+                results['length_check'] = {
+                    'score': score,
+                    'response': response,
+                    'category': 'distractor'
+                }
+
+            return {
+                'question_id': question_id,
+                'checks': results,
+                'provider': 'openrouter',
+                'timestamp': datetime.now().isoformat()
+            }
+
+    async def analyze_batch_checks(
+        self,
+        questions: List[Dict[str, Any]],
+        concurrency: int = 25
+    ) -> List[Dict[str, Any]]:
+        """Re-run each question's stale checks ('rerun_checks' on the item)."""
+        effective_concurrency = min(concurrency, self.max_concurrent)
+        semaphore = asyncio.Semaphore(effective_concurrency)
+        tasks = [self.analyze_checks(q, q.get('rerun_checks', []), semaphore) for q in questions]
+        return await asyncio.gather(*tasks)
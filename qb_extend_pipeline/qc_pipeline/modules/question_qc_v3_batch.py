@@ -6,22 +6,34 @@ Uses Claude's Message Batches API for:
 - 50% cost reduction on all API calls
 - Higher throughput for large-scale QC
 - Prompt caching to share article/passage text across questions
+- Optional passage grouping: one request QCs up to group_size questions on
+  the same passage, with a per-question follow-up batch for any question
+  whose grouped output fails validation
+- Optional chunking: whole passage groups packed into several batches that
+  are polled together, with each chunk's results handed back as it ends
 
 Reference: https://platform.claude.com/docs/en/build-with-claude/batch-processing
 """
 
 import asyncio
+import hashlib
 import logging
 import json
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Callable
 from collections import defaultdict
 import pandas as pd
 
 import anthropic
 
+from batch_results import BatchResultJournal
+from .question_qc_group import (
+    GROUP_TOOL_NAME, build_group_prompt, build_group_tools, group_max_tokens,
+    group_questions_by_passage, parse_check_results, validate_group_output
+)
+
 logger = logging.getLogger(__name__)
 
 # Batch API configuration
@@ -78,18 +90,21 @@ class QuestionQCAnalyzerV3Batch:
         self,
         claude_client: anthropic.Anthropic,  # Sync client for batch API
         claude_model: str = "claude-sonnet-4-5-20250929",
-        output_dir: Optional[Path] = None
+        output_dir: Optional[Path] = None,
+        group_size: int = 1
     ):
         """
         Initialize the batch QC analyzer.
-        
+
         Args:
             claude_client: Synchronous Anthropic client (batch API uses sync)
             claude_model: Claude model to use
             output_dir: Directory to save batch results
+            group_size: Questions per passage-grouped request (1 = one request per question)
         """
         self.client = claude_client
         self.model = claude_model
+        self.group_size = max(1, group_size)
         self.output_dir = output_dir or Path("./batch_results")
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -230,13 +245,19 @@ Use this passage to evaluate questions about it. The passage content is shared a
         """
         Create batch requests for all questions.
         
-        Groups questions by passage to maximize cache hits.
-        
+        Groups questions by passage to maximize cache hits. With group_size > 1,
+        questions on the same passage share one request (custom_id qcg_ plus a
+        hash of its question_ids) whose question_map entry is
+        {'group': [question, ...]}.
+
         Returns:
             Tuple of (batch_requests, question_map)
             - batch_requests: List of requests for the Batch API
             - question_map: Map of custom_id to question data for result processing
         """
+        if self.group_size > 1:
+            return self._create_group_requests(questions)
+
         batch_requests = []
         question_map = {}
         
@@ -282,6 +303,66 @@ Use this passage to evaluate questions about it. The passage content is shared a
         
         return batch_requests, question_map
 
+    def _create_group_requests(
+        self,
+        questions: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Create one request per passage group of up to group_size questions."""
+        batch_requests = []
+        question_map = {}
+
+        groups = group_questions_by_passage(questions, self.group_size)
+        logger.info(
+            f"Grouped {len(questions)} questions into {len(groups)} requests "
+            f"(up to {self.group_size} questions per passage)"
+        )
+
+        singles = [group[0] for group in groups if len(group) == 1]
+        for group in groups:
+            if len(group) == 1:
+                continue
+
+            question_ids = [str(q.get('question_id', '')) for q in group]
+            custom_id = self._group_custom_id(question_ids)
+            passage_text = group[0].get('passage_text', '')
+
+            batch_requests.append({
+                "custom_id": custom_id,
+                "params": {
+                    "model": self.model,
+                    "max_tokens": group_max_tokens(len(group)),
+                    "system": self._build_system_prompt_with_passage(passage_text),
+                    "tools": build_group_tools(question_ids),
+                    "tool_choice": {"type": "tool", "name": GROUP_TOOL_NAME},
+                    "messages": [{"role": "user", "content": build_group_prompt(group)}]
+                }
+            })
+            question_map[custom_id] = {'group': group}
+
+        if singles:
+            single_requests, single_map = self.create_single_requests(singles)
+            batch_requests.extend(single_requests)
+            question_map.update(single_map)
+
+        return batch_requests, question_map
+
+    @staticmethod
+    def _group_custom_id(question_ids: List[str]) -> str:
+        """custom_id of a group request, derived from its questions (not its position)."""
+        digest = hashlib.sha256("\n".join(sorted(question_ids)).encode()).hexdigest()
+        return f"qcg_{digest[:16]}"
+
+    def create_single_requests(
+        self,
+        questions: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Per-question requests regardless of group_size (also used for group fallbacks)."""
+        group_size, self.group_size = self.group_size, 1
+        try:
+            return self.create_batch_requests(questions)
+        finally:
+            self.group_size = group_size
+
     def submit_batch(self, batch_requests: List[Dict[str, Any]]) -> str:
         """
         Submit a batch of requests to the Message Batches API.
@@ -335,34 +416,46 @@ Use this passage to evaluate questions about it. The passage content is shared a
                 logger.error(f"Batch {batch_id} timed out after {BATCH_MAX_WAIT_TIME}s")
                 raise TimeoutError(f"Batch processing exceeded {BATCH_MAX_WAIT_TIME}s")
             
-            batch = self.client.messages.batches.retrieve(batch_id)
-            status = batch.processing_status
-            
-            logger.info(f"Batch {batch_id} status: {status} (elapsed: {elapsed:.0f}s)")
-            
-            if status == "ended":
+            status = self._check_batch_status(batch_id, elapsed)
+            if status is not None:
                 logger.info(f"Batch completed in {elapsed:.0f}s")
-                return {
-                    "id": batch.id,
-                    "status": status,
-                    "request_counts": {
-                        "succeeded": batch.request_counts.succeeded,
-                        "errored": batch.request_counts.errored,
-                        "canceled": batch.request_counts.canceled,
-                        "expired": batch.request_counts.expired,
-                        "processing": batch.request_counts.processing
-                    },
-                    "created_at": batch.created_at,
-                    "ended_at": batch.ended_at
-                }
-            
-            if status == "canceled":
-                raise RuntimeError(f"Batch {batch_id} was canceled")
+                return status
             
             # Wait before next poll
             logger.info(f"Waiting {BATCH_POLL_INTERVAL}s before next status check...")
             time.sleep(BATCH_POLL_INTERVAL)
 
+    def _check_batch_status(self, batch_id: str, elapsed: float) -> Optional[Dict[str, Any]]:
+        """
+        Check a batch once.
+        
+        Returns:
+            Status dict once the batch has ended, None while it is still processing
+        """
+        batch = self.client.messages.batches.retrieve(batch_id)
+        status = batch.processing_status
+        
+        logger.info(f"Batch {batch_id} status: {status} (elapsed: {elapsed:.0f}s)")
+        
+        if status == "canceled":
+            raise RuntimeError(f"Batch {batch_id} was canceled")
+        if status != "ended":
+            return None
+        
+        return {
+            "id": batch.id,
+            "status": status,
+            "request_counts": {
+                "succeeded": batch.request_counts.succeeded,
+                "errored": batch.request_counts.errored,
+                "canceled": batch.request_counts.canceled,
+                "expired": batch.request_counts.expired,
+                "processing": batch.request_counts.processing
+            },
+            "created_at": batch.created_at,
+            "ended_at": batch.ended_at
+        }
+
     def retrieve_batch_results(
         self,
         batch_id: str,
@@ -371,6 +464,10 @@ Use this passage to evaluate questions about it. The passage content is shared a
         """
         Retrieve and process batch results.
         
+        Results are streamed: each one is processed as it arrives and appended
+        to batch_results_{batch_id}.jsonl. If retrieval is interrupted, the next
+        call continues after the last custom_id already in that file.
+        
         Args:
             batch_id: The completed batch ID
             question_map: Map of custom_id to original question data
@@ -380,109 +477,179 @@ Use this passage to evaluate questions about it. The passage content is shared a
         """
         logger.info(f"Retrieving results for batch {batch_id}...")
         
-        results = []
+        journal = BatchResultJournal(self.output_dir / f"batch_results_{batch_id}.jsonl")
+        if len(journal):
+            logger.info(
+                f"Resuming after {journal.last_custom_id} "
+                f"({len(journal)} results already retrieved)"
+            )
         
         # Stream results from the batch
-        for result in self.client.messages.batches.results(batch_id):
-            custom_id = result.custom_id
-            question_data = question_map.get(custom_id, {})
-            question_id = question_data.get('question_id', custom_id.replace('qc_', ''))
-            
-            if result.result.type == "succeeded":
-                # Parse the tool use response
-                message = result.result.message
-                check_results = {}
-                
-                for block in message.content:
-                    if block.type == "tool_use" and block.name == "submit_qc_results":
-                        for check_name in CLAUDE_CHECKS:
-                            check_data = block.input.get(check_name, {})
-                            # Handle case where check_data is a string or unexpected type
-                            if isinstance(check_data, dict):
-                                score = check_data.get('score', 0)
-                                reasoning = check_data.get('reasoning', 'No reasoning')
-                            else:
-                                # Fallback for malformed response
-                                score = 0
-                                reasoning = str(check_data) if check_data else 'No response'
-                            check_results[check_name] = {
-                                'score': score,
-                                'response': reasoning,
-                                'category': 'distractor' if check_name in ['grammatical_parallel', 'plausibility', 'homogeneity', 'specificity_balance'] else 'question'
-                            }
-                        break
-                
-                # Add length check (local, no API)
-                structured_content = question_data.get('structured_content', {})
-                length_score, length_response = self._run_length_check(structured_content)
-                check_results['length_check'] = {
-                    'score': length_score,
-                    'response': length_response,
-                    'category': 'distractor'
-                }
-                
-                # Calculate overall score
-                total_score = sum(r['score'] for r in check_results.values())
-                total_checks = len(check_results)
-                overall_score = (total_score / total_checks) if total_checks > 0 else 0
-                
-                results.append({
-                    'question_id': question_id,
-                    'article_id': question_data.get('article_id', ''),
-                    'content_hash': question_data.get('content_hash', ''),
-                    'question_type': question_data.get('question_type', 'MCQ'),
-                    'passage_title': question_data.get('passage_title', ''),
-                    'question_preview': question_data.get('question_preview', ''),
-                    'correct_answer': question_data.get('structured_content', {}).get('correct_answer', ''),
-                    'ccss': question_data.get('structured_content', {}).get('CCSS', ''),
-                    'dok': question_data.get('structured_content', {}).get('DOK', ''),
-                    'overall_score': overall_score,
-                    'total_checks_passed': total_score,
-                    'total_checks_run': total_checks,
-                    'checks': check_results,
-                    'batch_result': 'succeeded',
-                    'timestamp': datetime.now().isoformat()
-                })
-                
-            elif result.result.type == "errored":
-                error = result.result.error
-                logger.error(f"Request {custom_id} errored: {error.type} - {error.message}")
-                results.append({
-                    'question_id': question_id,
-                    'article_id': question_data.get('article_id', ''),
-                    'overall_score': 0,
-                    'error': f"{error.type}: {error.message}",
-                    'batch_result': 'errored',
-                    'checks': {},
-                    'timestamp': datetime.now().isoformat()
-                })
-                
-            elif result.result.type == "expired":
-                logger.warning(f"Request {custom_id} expired")
-                results.append({
-                    'question_id': question_id,
-                    'article_id': question_data.get('article_id', ''),
-                    'overall_score': 0,
-                    'error': 'Request expired',
-                    'batch_result': 'expired',
-                    'checks': {},
-                    'timestamp': datetime.now().isoformat()
-                })
-                
-            elif result.result.type == "canceled":
-                results.append({
-                    'question_id': question_id,
-                    'article_id': question_data.get('article_id', ''),
-                    'overall_score': 0,
-                    'error': 'Request canceled',
-                    'batch_result': 'canceled',
-                    'checks': {},
-                    'timestamp': datetime.now().isoformat()
-                })
-        
-        logger.info(f"Retrieved {len(results)} results")
+        new_count = journal.consume(
+            self.client.messages.batches.results(batch_id),
+            lambda result: self._process_batch_result(result, question_map)
+        )
+        
+        results = []
+        for _, record in journal.iter_records():
+            if record and 'group' in record:
+                results.extend(record['group'])
+            elif record:
+                results.append(record)
+        logger.info(f"Retrieved {len(results)} results ({new_count} new) -> {journal.path}")
         return results
 
+    def _process_batch_result(
+        self,
+        result: Any,
+        question_map: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Turn one batch result into a QC result record ({'group': [records]} for group requests)."""
+        custom_id = result.custom_id
+        question_data = question_map.get(custom_id, {})
+        if 'group' in question_data:
+            return {'group': self._process_group_result(result, question_data['group'])}
+
+        question_id = question_data.get('question_id', custom_id.replace('qc_', ''))
+        
+        if result.result.type == "succeeded":
+            # Parse the tool use response
+            message = result.result.message
+            check_results = {}
+            
+            for block in message.content:
+                if block.type == "tool_use" and block.name == "submit_qc_results":
+                    for check_name in CLAUDE_CHECKS:
+                        check_data = block.input.get(check_name, {})
+                        # Handle case where check_data is a string or unexpected type
+                        if isinstance(check_data, dict):
+                            score = check_data.get('score', 0)
+                            reasoning = check_data.get('reasoning', 'No reasoning')
+                        else:
+                            # Fallback for malformed response
+                            score = 0
+                            reasoning = str(check_data) if check_data else 'No response'
+                        check_results[check_name] = {
+                            'score': score,
+                            'response': reasoning,
+                            'category': 'distractor' if check_name in ['grammatical_parallel', 'plausibility', 'homogeneity', 'specificity_balance'] else 'question'
+                        }
+                    break
+            
+            return self._build_result_record(question_id, question_data, check_results)
+            
+        elif result.result.type == "errored":
+            error = result.result.error
+            logger.error(f"Request {custom_id} errored: {error.type} - {error.message}")
+            return self._build_error_record(question_id, question_data, f"{error.type}: {error.message}", 'errored')
+            
+        elif result.result.type == "expired":
+            logger.warning(f"Request {custom_id} expired")
+            return self._build_error_record(question_id, question_data, 'Request expired', 'expired')
+            
+        elif result.result.type == "canceled":
+            return self._build_error_record(question_id, question_data, 'Request canceled', 'canceled')
+
+    def _process_group_result(
+        self,
+        result: Any,
+        group: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Split one group result into per-question records.
+
+        Questions whose entry fails validation get a 'group_invalid' record
+        so they can be re-run per question (see _run_group_fallbacks).
+        """
+        question_ids = [str(q.get('question_id', '')) for q in group]
+
+        if result.result.type != "succeeded":
+            return [
+                self._process_batch_result(result, {result.custom_id: q})
+                for q in group
+            ]
+
+        tool_input = None
+        for block in result.result.message.content:
+            if block.type == "tool_use" and block.name == GROUP_TOOL_NAME:
+                tool_input = block.input
+                break
+
+        valid, invalid = validate_group_output(tool_input, question_ids)
+        if invalid:
+            logger.warning(
+                f"Request {result.custom_id}: group output invalid for "
+                f"{len(invalid)}/{len(question_ids)} questions"
+            )
+
+        records = []
+        for question_id, question_data in zip(question_ids, group):
+            if question_id in valid:
+                records.append(self._build_result_record(
+                    question_id, question_data, parse_check_results(valid[question_id])
+                ))
+            else:
+                records.append(self._build_error_record(
+                    question_id, question_data, 'Group output failed validation', 'group_invalid'
+                ))
+        return records
+
+    def _build_result_record(
+        self,
+        question_id: str,
+        question_data: Dict[str, Any],
+        check_results: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Add the local length check and overall score to parsed Claude checks."""
+        # Add length check (local, no API)
+        structured_content = question_data.get('structured_content', {})
+        length_score, length_response = self._run_length_check(structured_content)
+        check_results['length_check'] = {
+            'score': length_score,
+            'response': length_response,
+            'category': 'distractor'
+        }
+        
+        # Calculate overall score
+        total_score = sum(r['score'] for r in check_results.values())
+        total_checks = len(check_results)
+        overall_score = (total_score / total_checks) if total_checks > 0 else 0
+        
+        return {
+            'question_id': question_id,
+            'article_id': question_data.get('article_id', ''),
+            'content_hash': question_data.get('content_hash', ''),
+            'question_type': question_data.get('question_type', 'MCQ'),
+            'passage_title': question_data.get('passage_title', ''),
+            'question_preview': question_data.get('question_preview', ''),
+            'correct_answer': question_data.get('structured_content', {}).get('correct_answer', ''),
+            'ccss': question_data.get('structured_content', {}).get('CCSS', ''),
+            'dok': question_data.get('structured_content', {}).get('DOK', ''),
+            'overall_score': overall_score,
+            'total_checks_passed': total_score,
+            'total_checks_run': total_checks,
+            'checks': check_results,
+            'batch_result': 'succeeded',
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _build_error_record(
+        self,
+        question_id: str,
+        question_data: Dict[str, Any],
+        error: str,
+        batch_result: str
+    ) -> Dict[str, Any]:
+        return {
+            'question_id': question_id,
+            'article_id': question_data.get('article_id', ''),
+            'overall_score': 0,
+            'error': error,
+            'batch_result': batch_result,
+            'checks': {},
+            'timestamp': datetime.now().isoformat()
+        }
+
     def _run_length_check(self, question_data: Dict[str, Any]) -> Tuple[int, str]:
         """Check if answer choice lengths are balanced (local, no API)."""
         try:
@@ -576,13 +743,7 @@ Use this passage to evaluate questions about it. The passage content is shared a
         
         # Save batch ID for recovery
         if save_results:
-            batch_info_file = self.output_dir / f"batch_info_{batch_id}.json"
-            with open(batch_info_file, 'w') as f:
-                json.dump({
-                    "batch_id": batch_id,
-                    "num_requests": len(batch_requests),
-                    "submitted_at": datetime.now().isoformat()
-                }, f, indent=2)
+            self._save_batch_info(batch_id, question_map)
         
         # Step 3: Poll for completion
         batch_status = self.poll_batch_status(batch_id)
@@ -590,6 +751,9 @@ Use this passage to evaluate questions about it. The passage content is shared a
         # Step 4: Retrieve results
         results = self.retrieve_batch_results(batch_id, question_map)
         
+        # Step 5: Re-run questions whose grouped output failed validation
+        results = self._run_group_fallbacks(results, questions)
+        
         elapsed = time.time() - start_time
         
         # Calculate stats
@@ -606,15 +770,132 @@ Use this passage to evaluate questions about it. The passage content is shared a
         logger.info(f"Throughput: {len(questions) / elapsed:.1f} questions/sec")
         logger.info(f"Cost savings: 50% vs standard API")
         
-        # Save final results
-        if save_results:
-            results_file = self.output_dir / f"batch_results_{batch_id}.json"
-            with open(results_file, 'w') as f:
-                json.dump(results, f, indent=2)
-            logger.info(f"Saved results to {results_file}")
-        
+        # Results were journaled to batch_results_{batch_id}.jsonl as they arrived
         return results
 
+    def _chunk_questions_by_passage(
+        self,
+        questions: List[Dict[str, Any]],
+        chunk_size: int
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Pack whole passage groups into chunks of about chunk_size questions.
+        
+        A passage group is never split, so its requests share one batch (and
+        the prompt cache); a group larger than chunk_size gets its own chunk.
+        """
+        chunks = []
+        current = []
+        for passage_questions in self._group_questions_by_passage(questions).values():
+            if current and len(current) + len(passage_questions) > chunk_size:
+                chunks.append(current)
+                current = []
+            current.extend(passage_questions)
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def analyze_batch_chunked(
+        self,
+        questions: List[Dict[str, Any]],
+        chunk_size: int,
+        on_chunk_complete: Optional[Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]] = None,
+        save_results: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze questions as several batches polled together.
+        
+        Passage groups are packed into chunks of about chunk_size questions and
+        every chunk is submitted up front. One loop then polls all pending
+        batches; as soon as a batch ends, its results are retrieved and passed
+        to on_chunk_complete(results, chunk_questions), so early chunks can be
+        merged while stragglers are still processing. A chunk with invalid
+        group output gets a per-question follow-up batch, polled in the same
+        loop, and is handed back once that ends.
+        
+        Args:
+            questions: List of question items to analyze
+            chunk_size: Approximate number of questions per batch
+            on_chunk_complete: Called with each chunk's results as it ends
+            save_results: Whether to save batch info files for recovery
+            
+        Returns:
+            List of QC results for all chunks
+        """
+        if not questions:
+            return []
+        
+        chunks = self._chunk_questions_by_passage(questions, max(1, chunk_size))
+        logger.info(f"Starting chunked batch QC: {len(questions)} questions in {len(chunks)} batches")
+        
+        start_time = time.time()
+        
+        # Submit every chunk up front so they process server-side in parallel
+        # batch_id -> (chunk_questions, question_map, chunk results awaiting this
+        # follow-up batch, or None for the chunk's own batch)
+        pending = {}
+        for i, chunk in enumerate(chunks, 1):
+            batch_requests, question_map = self.create_batch_requests(chunk)
+            batch_id = self.submit_batch(batch_requests)
+            pending[batch_id] = (chunk, question_map, None)
+            
+            # Save batch ID for recovery (resume one chunk with --batch-id)
+            if save_results:
+                self._save_batch_info(batch_id, question_map, chunk=i, num_chunks=len(chunks))
+        
+        # Poll all pending batches on one schedule
+        all_results = []
+        chunks_done = 0
+        while pending:
+            elapsed = time.time() - start_time
+            if elapsed > BATCH_MAX_WAIT_TIME:
+                logger.error(f"{len(pending)} batches timed out after {BATCH_MAX_WAIT_TIME}s")
+                raise TimeoutError(f"Batch processing exceeded {BATCH_MAX_WAIT_TIME}s")
+            
+            for batch_id in list(pending):
+                if self._check_batch_status(batch_id, elapsed) is None:
+                    continue
+                
+                chunk, question_map, chunk_results = pending.pop(batch_id)
+                batch_results = self.retrieve_batch_results(batch_id, question_map)
+                if chunk_results is None:
+                    fallback = self._submit_group_fallbacks(batch_results, chunk)
+                    if fallback is not None:
+                        fallback_id, fallback_map = fallback
+                        pending[fallback_id] = (chunk, fallback_map, batch_results)
+                        logger.info(f"Batch {batch_id} ended after {elapsed:.0f}s, follow-up batch {fallback_id} submitted")
+                        continue
+                    results = batch_results
+                else:
+                    results = self._apply_group_fallbacks(chunk_results, batch_results)
+
+                all_results.extend(results)
+                chunks_done += 1
+                logger.info(
+                    f"Batch {batch_id} ended after {elapsed:.0f}s: {len(results)} results "
+                    f"({chunks_done}/{len(chunks)} chunks done)"
+                )
+                
+                if on_chunk_complete:
+                    on_chunk_complete(results, chunk)
+            
+            if pending:
+                logger.info(f"{len(pending)} batches still processing, waiting {BATCH_POLL_INTERVAL}s...")
+                time.sleep(BATCH_POLL_INTERVAL)
+        
+        elapsed = time.time() - start_time
+        succeeded = sum(1 for r in all_results if r.get('batch_result') == 'succeeded')
+        
+        logger.info(f"\n{'='*60}")
+        logger.info(f"CHUNKED BATCH QC COMPLETE")
+        logger.info(f"{'='*60}")
+        logger.info(f"Total questions: {len(questions)} in {len(chunks)} batches")
+        logger.info(f"Succeeded: {succeeded}")
+        logger.info(f"Failed/Expired: {len(all_results) - succeeded}")
+        logger.info(f"Total time: {elapsed:.0f}s")
+        
+        return all_results
+
     def resume_batch(self, batch_id: str, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Resume processing a previously submitted batch.
@@ -630,12 +911,113 @@ Use this passage to evaluate questions about it. The passage content is shared a
         """
         logger.info(f"Resuming batch {batch_id}...")
         
-        # Recreate question map
-        _, question_map = self.create_batch_requests(questions)
+        # Map custom_ids back to questions as submitted; without a batch info
+        # file, regroup (only exact when questions match the submitted set)
+        question_map = self._load_question_map(batch_id, questions)
+        if question_map is None:
+            logger.warning(f"No request map in batch_info_{batch_id}.json, regrouping questions")
+            _, question_map = self.create_batch_requests(questions)
         
         # Poll for completion (in case it's still processing)
         batch_status = self.poll_batch_status(batch_id)
         
         # Retrieve results
-        return self.retrieve_batch_results(batch_id, question_map)
+        results = self.retrieve_batch_results(batch_id, question_map)
+        return self._run_group_fallbacks(results, questions)
+
+    def _save_batch_info(self, batch_id: str, question_map: Dict[str, Dict[str, Any]], **extra):
+        """
+        Save batch_info_{batch_id}.json for recovery, including which
+        question_ids each custom_id covers so resume_batch can map results
+        back however the questions were grouped or chunked.
+        """
+        requests = {
+            custom_id: [str(q.get('question_id', '')) for q in entry.get('group', [entry])]
+            for custom_id, entry in question_map.items()
+        }
+        batch_info_file = self.output_dir / f"batch_info_{batch_id}.json"
+        with open(batch_info_file, 'w') as f:
+            json.dump({
+                "batch_id": batch_id,
+                **extra,
+                "num_requests": len(question_map),
+                "question_ids": [qid for ids in requests.values() for qid in ids],
+                "requests": requests,
+                "submitted_at": datetime.now().isoformat()
+            }, f, indent=2)
+
+    def _load_question_map(
+        self,
+        batch_id: str,
+        questions: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Rebuild a submitted batch's question_map from its batch info file, if saved."""
+        batch_info_file = self.output_dir / f"batch_info_{batch_id}.json"
+        if not batch_info_file.exists():
+            return None
+        with open(batch_info_file) as f:
+            requests = json.load(f).get('requests')
+        if requests is None:
+            return None
+
+        by_id = {str(q.get('question_id', '')): q for q in questions}
+        question_map = {}
+        for custom_id, question_ids in requests.items():
+            missing = [qid for qid in question_ids if qid not in by_id]
+            if missing:
+                logger.warning(f"{custom_id}: questions not in input: {', '.join(missing)}")
+                continue
+            if custom_id.startswith('qcg_'):
+                question_map[custom_id] = {'group': [by_id[qid] for qid in question_ids]}
+            else:
+                question_map[custom_id] = by_id[question_ids[0]]
+        return question_map
+
+    def _run_group_fallbacks(
+        self,
+        results: List[Dict[str, Any]],
+        questions: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-run 'group_invalid' questions as a per-question follow-up batch.
+
+        Returns results with the placeholders replaced by the follow-up records.
+        """
+        fallback = self._submit_group_fallbacks(results, questions)
+        if fallback is None:
+            return results
+
+        batch_id, question_map = fallback
+        self.poll_batch_status(batch_id)
+        return self._apply_group_fallbacks(results, self.retrieve_batch_results(batch_id, question_map))
+
+    def _submit_group_fallbacks(
+        self,
+        results: List[Dict[str, Any]],
+        questions: List[Dict[str, Any]]
+    ) -> Optional[Tuple[str, Dict[str, Dict[str, Any]]]]:
+        """
+        Submit the per-question follow-up batch for 'group_invalid' results.
+
+        Returns:
+            (batch_id, question_map) of the follow-up batch, or None if not needed
+        """
+        invalid_ids = {r['question_id'] for r in results if r.get('batch_result') == 'group_invalid'}
+        if not invalid_ids:
+            return None
+
+        fallback_questions = [q for q in questions if str(q.get('question_id', '')) in invalid_ids]
+        logger.info(f"Re-running {len(fallback_questions)} questions with invalid group output per question")
+
+        batch_requests, question_map = self.create_single_requests(fallback_questions)
+        return self.submit_batch(batch_requests), question_map
+
+    def _apply_group_fallbacks(
+        self,
+        results: List[Dict[str, Any]],
+        fallback_results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Replace 'group_invalid' placeholders with their follow-up records."""
+        by_id = {r['question_id']: r for r in fallback_results}
+        return [by_id.get(r['question_id'], r) for r in results]
 
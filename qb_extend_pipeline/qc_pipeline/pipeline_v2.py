@@ -65,12 +65,20 @@ from openai import AsyncOpenAI
 from qc_pipeline.modules.question_qc_v2 import QuestionQCAnalyzerV2
 from qc_pipeline.modules.question_qc_v2_openrouter import QuestionQCAnalyzerV2OpenRouter
 from qc_pipeline.modules.explanation_qc_v2 import ExplanationQCAnalyzerV2
+from qc_pipeline.modules.question_qc_cascade import DEFAULT_CHEAP_MODEL, DEFAULT_CONFIDENCE_THRESHOLD, QuestionQCCascade
+from llm_cache import LLMResponseCache, get_llm_cache, configure_llm_cache
+from qc_pipeline.results_journal import QCResultJournal
+from qc_pipeline.question_items import build_question_items
+from rate_governor import get_all_stats, get_rate_governor_for, governed_create, is_rate_limit_error
 from qc_pipeline.utils import (
     validate_env_vars, 
     calculate_pass_rate,
-    compute_content_hash,
-    truncate_text,
-    extract_passage_title,
+    explanation_input_fields,
+    find_stale_checks,
+    merge_check_results,
+    question_input_fields,
+    stamp_check_fingerprints,
+    EXPLANATION_INPUT_FIELDS,
     get_run_id,
     archive_old_runs,
     get_failed_checks_list
@@ -165,6 +173,9 @@ class QCPipelineV2:
         self.run_id = get_run_id()
         logger.info(f"Run ID: {self.run_id}")
 
+        # Shared on-disk LLM response cache (disabled with --no-cache)
+        self.llm_cache = get_llm_cache()
+
         skip_openai = getattr(args, 'skip_openai', False)
         provider = getattr(args, 'provider', 'anthropic')
         
@@ -270,11 +281,24 @@ class QCPipelineV2:
                     claude_model=args.claude_model,
                     openai_model=args.openai_model,
                     examples_df=examples_df,
-                    skip_openai=skip_openai
+                    skip_openai=skip_openai,
+                    group_size=args.qc_group_size
                 )
             else:
                 self.question_qc = None
 
+        # Optional local -> cheap model -> full QC cascade around the question analyzer
+        cascade = getattr(args, 'cascade', 'off')
+        if self.question_qc is not None and cascade != 'off':
+            self.question_qc = QuestionQCCascade(
+                self.question_qc,
+                cheap_client=self.claude_client,
+                cheap_model=args.cascade_model,
+                stages=['local'] if cascade == 'local' else ['local', 'cheap'],
+                confidence_threshold=args.cascade_confidence
+            )
+            logger.info(f"Cascade QC: {', '.join(sorted(self.question_qc.stages))} pre-screen before full QC")
+
         if args.mode in ['explanations', 'both']:
             if provider == 'openrouter':
                 # Use OpenRouter for explanation QC (batched, 1 call per question)
@@ -300,6 +324,7 @@ class QCPipelineV2:
         self._existing_results_map: Dict[str, Dict[str, Any]] = {}
         self._hash_map: Dict[str, str] = {}  # For content change detection (like V3)
         self._run_stats: Dict[str, Any] = {}  # For richer summary reports (like V3)
+        self._journals: Dict[str, QCResultJournal] = {}  # Append-only result journals by qc_type
 
     def _get_results_file(self, qc_type: str) -> Path:
         """Get the path to the results file for a given QC type."""
@@ -319,6 +344,22 @@ class QCPipelineV2:
         """Get the path for current run's output file (like V3)."""
         return self.runs_dir / f"qc_run_{self.run_id}{suffix}"
 
+    def _get_journal(self, qc_type: str = 'question') -> QCResultJournal:
+        """Get the results journal next to the merged file for a QC type."""
+        if qc_type not in self._journals:
+            self._journals[qc_type] = QCResultJournal(self._get_merged_file(qc_type))
+        return self._journals[qc_type]
+
+    def _compact_results(self):
+        """Fold the result journals into the merged files."""
+        for qc_type, journal in self._journals.items():
+            pending = journal.pending
+            journal.compact()
+            journal.close()
+            if pending:
+                logger.info(f"Compacted {pending} journaled {qc_type} results into {journal.merged_path}")
+        self._journals = {}
+
     # Check names by provider - for QUESTION QC
     CLAUDE_CHECKS = {
         'grammatical_parallel', 'plausibility', 'homogeneity', 'specificity_balance',
@@ -345,6 +386,10 @@ class QCPipelineV2:
             - needs_openai_ids: Questions that have Claude checks but missing OpenAI checks
             - results_map: Map of question_id to result for merging
             - hash_map: Map of question_id to content_hash for change detection
+
+        Check results carry per-check input fingerprints; run_question_qc compares
+        them with the current inputs to re-run only stale checks (content_hash is
+        the fallback for results written before fingerprints).
         """
         fully_completed_ids = set()
         needs_openai_ids = set()
@@ -352,18 +397,18 @@ class QCPipelineV2:
         results_map = {}
         hash_map = {}  # For content change detection (like V3)
         
-        # Try merged file first (like V3), then fall back to legacy file
+        # Merged file + journal (like V3), then fall back to legacy file
         # Use qc_type to get the correct file (question vs explanation)
-        results_file = self._get_merged_file(qc_type)
-        if not results_file.exists():
-            results_file = self._get_results_file(qc_type)
+        results = self._get_journal(qc_type).results()
+        results_file = self._get_results_file(qc_type)
         
-        if not results_file.exists():
+        if not results and not results_file.exists():
             return fully_completed_ids, existing_results, needs_openai_ids, results_map, hash_map
         
         try:
-            with open(results_file, 'r') as f:
-                results = json.load(f)
+            if not results:
+                with open(results_file, 'r') as f:
+                    results = json.load(f)
             
             for result in results:
                 item_id = result.get('question_id', '')
@@ -390,7 +435,10 @@ class QCPipelineV2:
                     has_local = 'length_check' in check_names
                     
                     # Determine status
-                    if has_claude and has_openai and has_local:
+                    if result.get('cascade_stage') in ('local', 'cheap'):
+                        # Screened out by the cascade; re-run only if the content changes
+                        fully_completed_ids.add(item_id)
+                    elif has_claude and has_openai and has_local:
                         fully_completed_ids.add(item_id)
                     elif has_claude and not has_openai:
                         # Has Claude checks but missing OpenAI - can run just OpenAI
@@ -408,33 +456,10 @@ class QCPipelineV2:
         return fully_completed_ids, existing_results, needs_openai_ids, results_map, hash_map
 
     def _save_results_incrementally(self, new_results: List[Dict[str, Any]], qc_type: str):
-        """Save results incrementally to the merged output file (like V3)."""
-        # Use merged file as primary (like V3) - use qc_type for correct file
-        results_file = self._get_merged_file(qc_type)
-        
-        # Load existing results
-        existing_results = []
-        if results_file.exists():
-            try:
-                with open(results_file, 'r') as f:
-                    existing_results = json.load(f)
-            except:
-                pass
-        
-        # Create a map of existing results by question_id
-        results_map = {r.get('question_id'): r for r in existing_results}
-        
-        # Update/add new results
-        for result in new_results:
-            q_id = result.get('question_id')
-            results_map[q_id] = result
-        
-        # Save all results to merged file
-        all_results = list(results_map.values())
-        with open(results_file, 'w') as f:
-            json.dump(all_results, f, indent=2)
-        
-        return all_results
+        """Append results to the journal for qc_type (compacted into the merged file at the end)."""
+        journal = self._get_journal(qc_type)
+        journal.append(new_results)
+        return journal.results()
 
     def load_input_data(self) -> pd.DataFrame:
         logger.info(f"Loading input data from {self.args.input}")
@@ -505,83 +530,61 @@ class QCPipelineV2:
         )
 
         questions_full = []  # Need all checks
-        questions_openai_only = []  # Only need OpenAI checks
+        questions_partial = []  # Only need some checks (stale or missing)
         skipped_complete = 0
         skipped_has_claude = 0
         rerun_modified = 0
+        openai_available = bool(self.openai_client) and not skip_openai
         
-        for i, row in df.iterrows():
-            question_id = str(row.get('question_id') or row.get('item_id', f'Q{i+1}'))
-            
-            choices = {
-                'A': str(row.get('option_1') or row.get('choice_A', '') or ''),
-                'B': str(row.get('option_2') or row.get('choice_B', '') or ''),
-                'C': str(row.get('option_3') or row.get('choice_C', '') or ''),
-                'D': str(row.get('option_4') or row.get('choice_D', '') or '')
-            }
-            
-            question_text = str(row.get('question', '') or '')
-            correct_answer = str(row.get('correct_answer', '') or '')
-            
-            # Compute content hash for change detection (like V3)
-            content_hash = compute_content_hash(question_text, choices, correct_answer)
-            
-            # Check if question exists and if content has changed (like V3)
-            existing_hash = self._hash_map.get(question_id, '')
-            content_changed = existing_hash and existing_hash != content_hash
-            
-            if content_changed:
-                logger.info(f"  ⚠️ Question {question_id} content changed - will re-run QC")
-                rerun_modified += 1
-                # Remove from completed sets so it gets processed
-                self._completed_question_ids.discard(question_id)
-                needs_openai_ids.discard(question_id)
-            
-            # Skip if fully completed AND content unchanged
-            if question_id in self._completed_question_ids and not content_changed:
-                skipped_complete += 1
+        # Enriched question items (like V3), built column-wise
+        for question_item in build_question_items(df, self.run_id, include_explanations=True):
+            question_id = question_item['question_id']
+            content_hash = question_item['content_hash']
+
+            existing = self._existing_results_map.get(question_id)
+            if existing is None:
+                questions_full.append(question_item)
                 continue
-            
-            # Skip if already has Claude checks (only needs OpenAI) AND content unchanged
-            if question_id in needs_openai_ids and not content_changed:
-                skipped_has_claude += 1
-                # Still need to add to questions_openai_only if OpenAI is enabled
-                if not skip_openai and self.openai_client:
-                    pass  # Will handle below
-                else:
+
+            # Checks whose input fingerprint no longer matches (None for results
+            # written before per-check fingerprints: fall back to content_hash)
+            stale = find_stale_checks(existing.get('checks', {}), question_input_fields(question_item))
+            if stale is None:
+                existing_hash = self._hash_map.get(question_id, '')
+                if existing_hash and existing_hash != content_hash:
+                    logger.info(f"  ⚠️ Question {question_id} content changed - will re-run QC")
+                    rerun_modified += 1
+                    questions_full.append(question_item)
                     continue
+                stale = []
+            elif stale:
+                logger.info(f"  ⚠️ Question {question_id} inputs changed - will re-run {', '.join(stale)}")
+                rerun_modified += 1
 
-            structured_content = {
-                'question': question_text,
-                'choices': choices,
-                'correct_answer': correct_answer,
-                'CCSS': str(row.get('CCSS', '') or ''),
-                'CCSS_description': str(row.get('CCSS_description', '') or ''),
-                'DOK': row.get('DOK', '')
-            }
+            if question_id in self._completed_question_ids:
+                if stale and existing.get('cascade_stage') in ('local', 'cheap'):
+                    # Screened out before the full checks ran; screen again from scratch
+                    questions_full.append(question_item)
+                    continue
+                rerun = stale
+            elif question_id in needs_openai_ids:
+                # Has Claude checks but missing OpenAI - can run just OpenAI (plus anything stale)
+                rerun = stale + [c for c in sorted(self.OPENAI_CHECKS) if c not in stale]
+            else:
+                questions_full.append(question_item)
+                continue
 
-            passage = str(row.get('passage_text') or row.get('passage') or row.get('stimulus', '') or '')
+            if not openai_available:
+                rerun = [c for c in rerun if c not in self.OPENAI_CHECKS]
+            if not rerun:
+                if question_id in needs_openai_ids:
+                    skipped_has_claude += 1
+                else:
+                    skipped_complete += 1
+                continue
 
-            # Enriched question item (like V3)
-            question_item = {
-                'question_id': question_id,
-                'article_id': str(row.get('article_id', '') or ''),
-                'content_hash': content_hash,
-                'question_type': row.get('question_type', 'MCQ'),
-                'passage_text': passage,
-                'passage_title': extract_passage_title(passage, max_length=50),
-                'question_preview': truncate_text(question_text, max_length=60),
-                'grade': row.get('grade'),
-                'structured_content': structured_content,
-                'run_id': self.run_id
-            }
-            
-            # Check if this question only needs OpenAI checks
-            if question_id in needs_openai_ids and not skip_openai and self.openai_client and not content_changed:
-                questions_openai_only.append(question_item)
-            elif question_id not in needs_openai_ids or content_changed:
-                questions_full.append(question_item)
-            # else: already has Claude, skip_openai is True, so skip
+            question_item['rerun_checks'] = rerun
+            questions_partial.append(question_item)
         
         # Store stats for summary report (like V3)
         self._run_stats = {
@@ -590,7 +593,7 @@ class QCPipelineV2:
             'skipped_has_claude': skipped_has_claude,
             'rerun_modified': rerun_modified,
             'need_full_checks': len(questions_full),
-            'need_openai_only': len(questions_openai_only)
+            'need_partial_checks': len(questions_partial)
         }
 
         logger.info(f"\n📋 PROGRESS STATUS")
@@ -600,9 +603,9 @@ class QCPipelineV2:
         if rerun_modified > 0:
             logger.info(f"  ⚠️ Modified (re-run):  {rerun_modified}")
         logger.info(f"  Need all checks:      {len(questions_full)}")
-        logger.info(f"  Need OpenAI only:     {len(questions_openai_only)}")
+        logger.info(f"  Need some checks:     {len(questions_partial)}")
 
-        if not questions_full and not questions_openai_only:
+        if not questions_full and not questions_partial:
             logger.info("\n✓ All questions already processed!")
             return self._existing_results
 
@@ -624,14 +627,16 @@ class QCPipelineV2:
                 batch_results = await self.question_qc.analyze_batch(batch_questions, self.args.concurrency)
                 
                 # Add enriched fields to results (like V3)
+                batch_by_id = {q['question_id']: q for q in batch_questions}
                 for r in batch_results:
-                    q_match = next((q for q in batch_questions if q['question_id'] == r.get('question_id')), {})
+                    q_match = batch_by_id.get(r.get('question_id'), {})
                     if q_match:
                         r['article_id'] = q_match.get('article_id', '')
                         r['content_hash'] = q_match.get('content_hash', '')
                         r['passage_title'] = q_match.get('passage_title', '')
                         r['question_preview'] = q_match.get('question_preview', '')
                         r['run_id'] = self.run_id
+                        stamp_check_fingerprints(r.get('checks', {}), question_input_fields(q_match))
                 
                 all_new_results.extend(batch_results)
                 
@@ -639,58 +644,35 @@ class QCPipelineV2:
                 all_results = self._save_results_incrementally(batch_results, 'question')
                 logger.info(f"  ✓ Saved {len(batch_results)} results (total: {len(all_results)})")
 
-        # Process questions needing only OpenAI checks
-        if questions_openai_only and self.openai_client:
-            logger.info(f"\nProcessing {len(questions_openai_only)} questions with OpenAI checks only...")
-            logger.info(f"Expected API calls: ~{len(questions_openai_only)} (1 per question)")
+        # Process questions needing only some checks
+        if questions_partial:
+            logger.info(f"\nProcessing {len(questions_partial)} questions with stale or missing checks only...")
             
-            for batch_start in range(0, len(questions_openai_only), batch_size):
-                batch_end = min(batch_start + batch_size, len(questions_openai_only))
-                batch_questions = questions_openai_only[batch_start:batch_end]
+            for batch_start in range(0, len(questions_partial), batch_size):
+                batch_end = min(batch_start + batch_size, len(questions_partial))
+                batch_questions = questions_partial[batch_start:batch_end]
                 
-                logger.info(f"\n  Processing OpenAI batch {batch_start+1}-{batch_end} of {len(questions_openai_only)}...")
+                logger.info(f"\n  Processing partial batch {batch_start+1}-{batch_end} of {len(questions_partial)}...")
                 
-                # Run only OpenAI checks and merge with existing results
-                openai_results = await self.question_qc.analyze_batch_openai_only(batch_questions, self.args.concurrency)
+                # Run only the stale checks and merge with existing results
+                partial_results = await self.question_qc.analyze_batch_checks(batch_questions, self.args.concurrency)
                 
-                # Merge with existing Claude results
-                for openai_result in openai_results:
-                    q_id = openai_result.get('question_id')
+                merged_results = []
+                batch_by_id = {q['question_id']: q for q in batch_questions}
+                for partial_result in partial_results:
+                    q_id = partial_result.get('question_id')
                     if q_id in self._existing_results_map:
-                        # Merge checks
-                        existing = self._existing_results_map[q_id]
-                        merged_checks = existing.get('checks', {}).copy()
-                        merged_checks.update(openai_result.get('checks', {}))
-                        
-                        # Recalculate scores
-                        passed = sum(1 for c in merged_checks.values() if c.get('score', 0) == 1)
-                        total = len(merged_checks)
-                        
-                        # Find matching question for enriched fields
-                        q_match = next((q for q in batch_questions if q['question_id'] == q_id), {})
-                        
-                        merged_result = {
-                            **existing,
-                            'checks': merged_checks,
-                            'total_checks_run': total,
-                            'total_checks_passed': passed,
-                            'overall_score': passed / total if total > 0 else 0,
-                            # Add enriched fields (like V3)
-                            'article_id': q_match.get('article_id', existing.get('article_id', '')),
-                            'content_hash': q_match.get('content_hash', existing.get('content_hash', '')),
-                            'passage_title': q_match.get('passage_title', existing.get('passage_title', '')),
-                            'question_preview': q_match.get('question_preview', existing.get('question_preview', '')),
-                            'run_id': self.run_id
-                        }
-                        all_new_results.append(merged_result)
+                        q_match = batch_by_id.get(q_id, {})
+                        merged_result = merge_check_results(
+                            self._existing_results_map[q_id], partial_result, q_match, self.run_id
+                        )
+                        merged_results.append(merged_result)
                         self._existing_results_map[q_id] = merged_result
+                all_new_results.extend(merged_results)
                 
                 # Save incrementally
-                all_results = self._save_results_incrementally(
-                    [self._existing_results_map[q.get('question_id')] for q in batch_questions if q.get('question_id') in self._existing_results_map],
-                    'question'
-                )
-                logger.info(f"  ✓ Merged OpenAI checks for {len(batch_questions)} questions")
+                all_results = self._save_results_incrementally(merged_results, 'question')
+                logger.info(f"  ✓ Merged re-run checks for {len(merged_results)} questions")
 
         elapsed = (datetime.now() - start_time).total_seconds()
 
@@ -701,7 +683,7 @@ class QCPipelineV2:
         results_map = {r.get('question_id'): r for r in all_results}
         all_results = list(results_map.values())
 
-        total_processed = len(questions_full) + len(questions_openai_only)
+        total_processed = len(questions_full) + len(questions_partial)
         if total_processed > 0 and elapsed > 0:
             logger.info(f"\nCompleted in {elapsed:.1f}s ({total_processed / elapsed:.1f} questions/sec)")
         else:
@@ -819,22 +801,33 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
             correct_answer = question_data.get('correct_answer', '')
             
             prompt = self._build_explanation_qc_prompt(question_data, grade)
+            response_format = {"type": "json_object"}
+            cache_key = LLMResponseCache.make_key(
+                model=self.explanation_qc_model, prompt=prompt, schema=response_format
+            )
             
             for attempt in range(8):  # MAX_RETRIES
                 try:
-                    response = await self.explanation_qc_client.chat.completions.create(
-                        model=self.explanation_qc_model,
-                        max_tokens=2000,
-                        messages=[{"role": "user", "content": prompt}],
-                        response_format={"type": "json_object"},
-                        extra_headers={
-                            "HTTP-Referer": "https://github.com/playcademy",
-                            "X-Title": "Explanation QC V2"
-                        }
-                    )
+                    response_text = self.llm_cache.get(cache_key)
+                    from_cache = response_text is not None
+                    if not from_cache:
+                        response = await governed_create(
+                            self.explanation_qc_client.chat.completions,
+                            get_rate_governor_for(self.explanation_qc_client),
+                            model=self.explanation_qc_model,
+                            max_tokens=2000,
+                            messages=[{"role": "user", "content": prompt}],
+                            response_format=response_format,
+                            extra_headers={
+                                "HTTP-Referer": "https://github.com/playcademy",
+                                "X-Title": "Explanation QC V2"
+                            }
+                        )
+                        response_text = response.choices[0].message.content
                     
-                    response_text = response.choices[0].message.content
                     data = json.loads(response_text)
+                    if not from_cache:
+                        self.llm_cache.put(cache_key, response_text, model=self.explanation_qc_model)
                     
                     # Convert to individual explanation results
                     results = []
@@ -867,8 +860,7 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
                 except json.JSONDecodeError as e:
                     logger.warning(f"JSON parse error for {question_id}: {e}")
                 except Exception as e:
-                    error_str = str(e)
-                    if '429' in error_str or 'rate' in error_str.lower():
+                    if is_rate_limit_error(e):
                         delay = min(0.5 * (2 ** attempt) + random.uniform(0, 0.3), 60.0)
                         logger.warning(f"Rate limit for {question_id}, retry in {delay:.1f}s")
                         await asyncio.sleep(delay)
@@ -904,16 +896,9 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
         logger.info("=" * 60)
 
         # Load completed explanations from output
-        (completed_ids, existing_results, _, _, _) = self._load_completed_from_output(
+        (completed_ids, existing_results, _, existing_map, _) = self._load_completed_from_output(
             'explanation', self.EXPECTED_EXPLANATION_CHECKS
         )
-        # Convert to set of question IDs (not explanation IDs) for OpenRouter mode
-        completed_question_ids = set()
-        for eid in completed_ids:
-            # Extract question_id from "quiz_302005_A" -> "quiz_302005"
-            parts = eid.rsplit('_', 1)
-            if len(parts) == 2 and len(parts[1]) == 1:
-                completed_question_ids.add(parts[0])
 
         explanation_cols = [col for col in df.columns if 'explanation' in col.lower()]
         if not explanation_cols:
@@ -923,15 +908,11 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
         # Build question-level data for OpenRouter mode
         questions_to_process = []
         skipped_questions = 0
+        rerun_modified = 0
         
         for i, row in df.iterrows():
             question_id = str(row.get('question_id') or row.get('item_id', f'Q{i+1}'))
             
-            # Skip if already completed (for OpenRouter, check at question level)
-            if use_openrouter and question_id in completed_question_ids:
-                skipped_questions += 1
-                continue
-            
             correct_answer = row.get('correct_answer', '')
             passage = row.get('passage_text') or row.get('passage') or row.get('stimulus', '')
             
@@ -942,7 +923,7 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
                 options[letter] = row.get(f'option_{j}', '')
                 explanations[letter] = row.get(f'option_{j}_explanation', '')
             
-            questions_to_process.append({
+            question_data = {
                 'question_id': question_id,
                 'question': row.get('question', ''),
                 'correct_answer': correct_answer,
@@ -950,7 +931,32 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
                 'options': options,
                 'explanations': explanations,
                 'grade': row.get('grade', 3)
-            })
+            }
+
+            # Explanations to (re-)run: missing, or any input (passage, question,
+            # options, the explanation itself, grade) changed since the last QC
+            pending = []
+            for letter in ['A', 'B', 'C', 'D']:
+                eid = f"{question_id}_{letter}"
+                if eid not in completed_ids:
+                    pending.append(letter)
+                    continue
+                stale = find_stale_checks(
+                    existing_map[eid].get('checks', {}),
+                    explanation_input_fields(question_data, letter),
+                    EXPLANATION_INPUT_FIELDS
+                )
+                if stale:
+                    pending.append(letter)
+            if not pending:
+                skipped_questions += 1
+                continue
+            if any(f"{question_id}_{letter}" in completed_ids for letter in pending):
+                rerun_modified += 1
+                logger.info(f"  ⚠️ Explanations changed for {question_id} ({', '.join(pending)}) - will re-run QC")
+
+            question_data['pending_options'] = pending
+            questions_to_process.append(question_data)
 
         if not questions_to_process:
             if skipped_questions > 0:
@@ -962,13 +968,15 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
         logger.info(f"\n📋 PROGRESS STATUS")
         logger.info(f"{'─'*40}")
         logger.info(f"  Already completed:  {skipped_questions} questions")
+        if rerun_modified > 0:
+            logger.info(f"  ⚠️ Modified (re-run): {rerun_modified} questions")
         logger.info(f"  To process:         {len(questions_to_process)} questions")
         
         if use_openrouter:
             logger.info(f"\nProcessing {len(questions_to_process)} questions (4 explanations each)")
             logger.info(f"Expected API calls: ~{len(questions_to_process)} (1 per question)")
         else:
-            total_explanations = len(questions_to_process) * 4
+            total_explanations = sum(len(q['pending_options']) for q in questions_to_process)
             logger.info(f"\nProcessing {total_explanations} explanations")
             logger.info(f"Expected API calls: ~{total_explanations} (1 per explanation)")
 
@@ -991,7 +999,15 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
                 batch_results_nested = await asyncio.gather(*tasks)
                 
                 # Flatten results (each question returns 4 results)
-                batch_results = [r for results in batch_results_nested for r in results]
+                batch_results = []
+                for q, results in zip(batch, batch_results_nested):
+                    for r in results:
+                        stamp_check_fingerprints(
+                            r.get('checks', {}),
+                            explanation_input_fields(q, r.get('option_label', '')),
+                            field_names=EXPLANATION_INPUT_FIELDS
+                        )
+                        batch_results.append(r)
                 all_new_results.extend(batch_results)
                 
                 # Save incrementally
@@ -1000,8 +1016,10 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
         else:
             # Legacy mode: use ExplanationQCAnalyzerV2 (1 call per explanation)
             explanations = []
+            explanation_fields = {}
             for q in questions_to_process:
-                for letter in ['A', 'B', 'C', 'D']:
+                for letter in q['pending_options']:
+                    explanation_fields[f"{q['question_id']}_{letter}"] = explanation_input_fields(q, letter)
                     explanations.append({
                         'question_id': f"{q['question_id']}_{letter}",
                         'original_question_id': q['question_id'],
@@ -1023,6 +1041,10 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
                 logger.info(f"\n  Processing batch {batch_start+1}-{batch_end} of {len(explanations)}...")
                 
                 batch_results = await self.explanation_qc.analyze_batch(batch_explanations, self.args.concurrency)
+                for r in batch_results:
+                    fields = explanation_fields.get(r.get('question_id', ''))
+                    if fields is not None:
+                        stamp_check_fingerprints(r.get('checks', {}), fields, field_names=EXPLANATION_INPUT_FIELDS)
                 all_new_results.extend(batch_results)
                 
                 all_results = self._save_results_incrementally(batch_results, 'explanation')
@@ -1030,10 +1052,10 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
 
         elapsed = (datetime.now() - start_time).total_seconds()
 
-        # Combine with existing results
-        all_results = existing_results + all_new_results
+        # Combine with existing results (keep latest per explanation)
+        all_results = list({r.get('question_id'): r for r in existing_results + all_new_results}.values())
 
-        total_items = len(questions_to_process) if use_openrouter else len(questions_to_process) * 4
+        total_items = len(questions_to_process) if use_openrouter else total_explanations
         logger.info(f"\nCompleted in {elapsed:.1f}s ({total_items / elapsed:.1f} items/sec)")
 
         output_file = self.output_dir / f"explanation_qc_v2_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -1069,11 +1091,14 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
         question_results = []
         explanation_results = []
 
-        if self.args.mode in ['questions', 'both']:
-            question_results = await self.run_question_qc(df)
+        try:
+            if self.args.mode in ['questions', 'both']:
+                question_results = await self.run_question_qc(df)
 
-        if self.args.mode in ['explanations', 'both']:
-            explanation_results = await self.run_explanation_qc(df)
+            if self.args.mode in ['explanations', 'both']:
+                explanation_results = await self.run_explanation_qc(df)
+        finally:
+            self._compact_results()
 
         total_elapsed = (datetime.now() - start_time).total_seconds()
 
@@ -1083,6 +1108,7 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
         logger.info("PIPELINE COMPLETED")
         logger.info("=" * 60)
         logger.info(f"Total time: {total_elapsed:.1f}s")
+        logger.info(self.llm_cache.format_stats())
         logger.info(f"Results saved to {self.output_dir}")
 
     def _create_summary_report(self, question_results, explanation_results, elapsed):
@@ -1139,9 +1165,20 @@ For wrong answers, include specific_error, misconception_diagnosis, and correct_
             },
             
             'question_qc': stats,
-            'explanation_qc': calculate_pass_rate(explanation_results) if explanation_results else None
+            'explanation_qc': calculate_pass_rate(explanation_results) if explanation_results else None,
+            'llm_cache': self.llm_cache.get_stats(),
+            # Token usage per provider key, including prompt-cache reads/writes
+            'rate_governors': get_all_stats()
         }
 
+        if isinstance(self.question_qc, QuestionQCCascade):
+            summary['cascade'] = self.question_qc.get_cascade_stats()
+            cascade = summary['cascade']
+            logger.info(
+                f"Cascade: {cascade['screened_out']}/{cascade['total_questions']} questions screened out "
+                f"before full QC (estimated saving: ${cascade['estimated_cost_saved_usd'] or 0:.2f})"
+            )
+
         # Save to runs folder with timestamp (like V3)
         run_report_file = self._get_run_file("_report.json")
         with open(run_report_file, 'w') as f:
@@ -1313,6 +1350,9 @@ class ConcurrentQCPipelineV2:
         self._hash_map: Dict[str, str] = {}  # For content change detection (like V3)
         self._run_stats: Dict[str, Any] = {}  # For richer summary reports (like V3)
         
+        # Append-only journal next to the merged file (thread-safe, one line per question)
+        self._journal = QCResultJournal(self._get_merged_file())
+        
         logger.info(f"Initialized concurrent QC pipeline with {self.num_workers} workers")
 
     def _get_results_file(self) -> Path:
@@ -1334,17 +1374,17 @@ class ConcurrentQCPipelineV2:
         results_map = {}
         hash_map = {}
         
-        # Try merged file first (like V3) - this is for question QC
-        results_file = self._get_merged_file('question')
-        if not results_file.exists():
-            results_file = self._get_results_file()
+        # Merged file + journal first (like V3) - this is for question QC
+        results = self._journal.results()
+        results_file = self._get_results_file()
         
-        if not results_file.exists():
+        if not results and not results_file.exists():
             return completed_ids, existing_results, results_map, hash_map
         
         try:
-            with open(results_file, 'r') as f:
-                results = json.load(f)
+            if not results:
+                with open(results_file, 'r') as f:
+                    results = json.load(f)
             
             for result in results:
                 question_id = result.get('question_id', '')
@@ -1374,31 +1414,9 @@ class ConcurrentQCPipelineV2:
         return completed_ids, existing_results, results_map, hash_map
 
     def _save_results_thread_safe(self, new_results: List[Dict[str, Any]]):
-        """Save results in a thread-safe manner to merged file (like V3)."""
-        with self._output_lock:
-            # Use merged file as primary (like V3) - this is for question QC
-            results_file = self._get_merged_file('question')
-            
-            # Load existing
-            existing = []
-            if results_file.exists():
-                try:
-                    with open(results_file, 'r') as f:
-                        existing = json.load(f)
-                except:
-                    pass
-            
-            # Merge
-            results_map = {r.get('question_id'): r for r in existing}
-            for result in new_results:
-                results_map[result.get('question_id')] = result
-            
-            # Save
-            all_results = list(results_map.values())
-            with open(results_file, 'w') as f:
-                json.dump(all_results, f, indent=2)
-            
-            return all_results
+        """Journal results (thread-safe); compacted into the merged file by the final report."""
+        self._journal.append(new_results)
+        return self._journal.results()
 
     def _worker_process_batch(
         self,
@@ -1408,13 +1426,22 @@ class ConcurrentQCPipelineV2:
         """
         Worker function to process a batch of questions.
         
-        Each worker gets its own API clients with dedicated keys.
+        Each worker thread runs one event loop for its whole slice, with its own
+        API clients and up to --concurrency questions in flight on its keys.
         """
+        return asyncio.run(self._worker_process_batch_async(worker_id, questions))
+
+    async def _worker_process_batch_async(
+        self,
+        worker_id: int,
+        questions: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Analyze a worker's slice concurrently on one long-lived loop."""
         # Get API keys for this worker
         anthropic_key = self.anthropic_keys[worker_id % len(self.anthropic_keys)]
         openai_key = self.openai_keys[worker_id % len(self.openai_keys)] if self.openai_keys and not self.skip_openai else None
         
-        # Create worker-specific clients
+        # Create worker-specific clients (bound to this worker's loop, reused for the whole slice)
         claude_client = anthropic.AsyncAnthropic(api_key=anthropic_key)
         openai_client = AsyncOpenAI(api_key=openai_key) if openai_key else None
         
@@ -1429,25 +1456,38 @@ class ConcurrentQCPipelineV2:
         )
         
         results = []
+        # Per-key limit on in-flight questions; the rate governor paces the requests themselves
+        semaphore = asyncio.Semaphore(max(1, getattr(self.args, 'concurrency', 5)))
         
-        for question in questions:
+        async def process(question: Dict[str, Any]):
             q_id = question.get('question_id', '')
             
             try:
-                start_time = time.time()
-                
-                # Run async analysis in sync context
-                result = asyncio.run(analyzer.analyze_question(question))
+                async with semaphore:
+                    start_time = time.time()
+                    if question.get('rerun_checks'):
+                        partial = await analyzer.analyze_checks(question, question['rerun_checks'])
+                    else:
+                        result = await analyzer.analyze_question(question)
                 
-                # Add enriched fields to result (like V3)
-                result['article_id'] = question.get('article_id', '')
-                result['content_hash'] = question.get('content_hash', '')
-                result['passage_title'] = question.get('passage_title', '')
-                result['question_preview'] = question.get('question_preview', '')
-                result['run_id'] = question.get('run_id', self.run_id)
+                if question.get('rerun_checks'):
+                    # Merge the re-run checks into the existing result (enriches it too)
+                    result = merge_check_results(
+                        self._existing_results_map.get(q_id, {}), partial, question,
+                        question.get('run_id', self.run_id)
+                    )
+                else:
+                    # Add enriched fields to result (like V3)
+                    result['article_id'] = question.get('article_id', '')
+                    result['content_hash'] = question.get('content_hash', '')
+                    result['passage_title'] = question.get('passage_title', '')
+                    result['question_preview'] = question.get('question_preview', '')
+                    result['run_id'] = question.get('run_id', self.run_id)
+                    stamp_check_fingerprints(result.get('checks', {}), question_input_fields(question))
                 
                 elapsed = time.time() - start_time
                 results.append(result)
+                self._save_results_thread_safe([result])
                 
                 # Update progress
                 with self._progress_lock:
@@ -1465,18 +1505,18 @@ class ConcurrentQCPipelineV2:
                         f"Progress: {self._completed_questions}/{self._total_questions} [{progress:.0f}%] | "
                         f"ETA: {eta:.0f}s"
                     )
-                
-                # Save incrementally every 10 questions
-                if len(results) % 10 == 0:
-                    self._save_results_thread_safe(results)
                     
             except Exception as e:
                 logger.error(f"[Worker {worker_id}] ✗ {q_id}: {e}")
                 with self._progress_lock:
                     self._failed_questions.append(q_id)
         
-        # Final save for this batch
-        self._save_results_thread_safe(results)
+        try:
+            await asyncio.gather(*(process(q) for q in questions))
+        finally:
+            await claude_client.close()
+            if openai_client is not None:
+                await openai_client.close()
         
         return results
 
@@ -1530,64 +1570,47 @@ class ConcurrentQCPipelineV2:
         return df
 
     def prepare_questions(self, df: pd.DataFrame, completed_ids: Set[str]) -> List[Dict[str, Any]]:
-        """Prepare questions, skipping completed ones and detecting modified questions (like V3)."""
+        """
+        Prepare questions, skipping completed ones and detecting modified questions (like V3).
+
+        Completed questions whose inputs changed get 'rerun_checks' with only
+        the checks whose input fingerprint no longer matches.
+        """
         questions = []
         skipped_complete = 0
         rerun_modified = 0
-        
-        for i, row in df.iterrows():
-            question_id = str(row.get('question_id') or row.get('item_id', f'Q{i+1}'))
-            
-            choices = {
-                'A': str(row.get('option_1') or row.get('choice_A', '') or ''),
-                'B': str(row.get('option_2') or row.get('choice_B', '') or ''),
-                'C': str(row.get('option_3') or row.get('choice_C', '') or ''),
-                'D': str(row.get('option_4') or row.get('choice_D', '') or '')
-            }
-            
-            question_text = str(row.get('question', '') or '')
-            correct_answer = str(row.get('correct_answer', '') or '')
-            
-            # Compute content hash for change detection (like V3)
-            content_hash = compute_content_hash(question_text, choices, correct_answer)
-            
-            # Check if question exists and if content has changed (like V3)
-            existing_hash = self._hash_map.get(question_id, '')
-            content_changed = existing_hash and existing_hash != content_hash
-            
-            if content_changed:
-                logger.info(f"  ⚠️ Question {question_id} content changed - will re-run QC")
-                rerun_modified += 1
-                completed_ids.discard(question_id)
-            
-            if question_id in completed_ids and not content_changed:
-                skipped_complete += 1
-                continue
+        rerun_partial = 0
+        
+        # Enriched question items (like V3), built column-wise
+        for question_item in build_question_items(df, self.run_id):
+            question_id = question_item['question_id']
+            content_hash = question_item['content_hash']
+
+            if question_id in completed_ids:
+                existing = self._existing_results_map.get(question_id, {})
+                stale = find_stale_checks(existing.get('checks', {}), question_input_fields(question_item))
+                if stale is None:
+                    # Result predates per-check fingerprints: fall back to content_hash
+                    existing_hash = self._hash_map.get(question_id, '')
+                    if existing_hash and existing_hash != content_hash:
+                        logger.info(f"  ⚠️ Question {question_id} content changed - will re-run QC")
+                        rerun_modified += 1
+                        questions.append(question_item)
+                    else:
+                        skipped_complete += 1
+                    continue
 
-            structured_content = {
-                'question': question_text,
-                'choices': choices,
-                'correct_answer': correct_answer,
-                'CCSS': str(row.get('CCSS', '') or ''),
-                'CCSS_description': str(row.get('CCSS_description', '') or ''),
-                'DOK': row.get('DOK', '')
-            }
+                if self.skip_openai or not self.openai_keys:
+                    stale = [c for c in stale if c not in self.OPENAI_CHECKS]
+                if not stale:
+                    skipped_complete += 1
+                    continue
 
-            passage = str(row.get('passage_text') or row.get('passage') or row.get('stimulus', '') or '')
+                logger.info(f"  ⚠️ Question {question_id} inputs changed - will re-run {', '.join(stale)}")
+                rerun_modified += 1
+                rerun_partial += 1
+                question_item['rerun_checks'] = stale
 
-            # Enriched question item (like V3)
-            question_item = {
-                'question_id': question_id,
-                'article_id': str(row.get('article_id', '') or ''),
-                'content_hash': content_hash,
-                'question_type': row.get('question_type', 'MCQ'),
-                'passage_text': passage,
-                'passage_title': extract_passage_title(passage, max_length=50),
-                'question_preview': truncate_text(question_text, max_length=60),
-                'grade': row.get('grade'),
-                'structured_content': structured_content,
-                'run_id': self.run_id
-            }
             questions.append(question_item)
         
         # Store stats for summary report (like V3)
@@ -1595,6 +1618,7 @@ class ConcurrentQCPipelineV2:
             'total_in_input': len(df),
             'skipped_complete': skipped_complete,
             'rerun_modified': rerun_modified,
+            'rerun_partial': rerun_partial,
             'need_processing': len(questions)
         }
 
@@ -1603,7 +1627,7 @@ class ConcurrentQCPipelineV2:
         logger.info(f"  Total in input:     {len(df)}")
         logger.info(f"  Already completed:  {skipped_complete}")
         if rerun_modified > 0:
-            logger.info(f"  ⚠️ Modified (re-run): {rerun_modified}")
+            logger.info(f"  ⚠️ Modified (re-run): {rerun_modified} ({rerun_partial} stale checks only)")
         logger.info(f"  To process:         {len(questions)}")
 
         return questions
@@ -1649,7 +1673,7 @@ class ConcurrentQCPipelineV2:
                 worker_batches.append((i, batch))
 
         logger.info(f"\n{'─'*60}")
-        logger.info(f"Starting {len(worker_batches)} workers...")
+        logger.info(f"Starting {len(worker_batches)} workers ({getattr(self.args, 'concurrency', 5)} concurrent questions each)...")
         logger.info(f"{'─'*60}")
 
         # Process concurrently
@@ -1668,8 +1692,8 @@ class ConcurrentQCPipelineV2:
                 except Exception as e:
                     logger.error(f"Worker {worker_id} failed: {e}")
 
-        # Combine with existing
-        final_results = self._existing_results + all_results
+        # Combine with existing (keep latest per question_id)
+        final_results = list({r.get('question_id'): r for r in self._existing_results + all_results}.values())
         
         # Create final report
         self._create_final_report(final_results)
@@ -1683,12 +1707,9 @@ class ConcurrentQCPipelineV2:
             if 'run_id' not in r:
                 r['run_id'] = self.run_id
 
-        # Save to merged file (like V3) - this is for question QC
-        merged_file = self._get_merged_file('question')
-        results_map = {r.get('question_id'): r for r in results}
-        with open(merged_file, 'w') as f:
-            json.dump(list(results_map.values()), f, indent=2)
-        logger.info(f"Saved to merged file: {merged_file}")
+        # Fold the journal into the merged file (like V3) - this is for question QC
+        self._journal.compact()
+        logger.info(f"Saved to merged file: {self._get_merged_file()}")
 
         # Save to runs folder (like V3)
         run_file = self._get_run_file(".json")
@@ -1742,6 +1763,8 @@ class ConcurrentQCPipelineV2:
             if self._completed_questions > 0:
                 logger.info(f"  Questions/sec:  {self._completed_questions / total_elapsed:.2f}")
         
+        logger.info(f"\n♻️  {get_llm_cache().format_stats()}")
+        
         if self._failed_questions:
             logger.info(f"\n⚠️  FAILED ({len(self._failed_questions)})")
             for q in self._failed_questions[:10]:
@@ -1942,6 +1965,8 @@ Concurrency:
     parser.add_argument("--concurrency", type=int, default=5, help="Max concurrent API calls per worker")
     parser.add_argument("--limit", type=int, default=0, help="Process only first N questions (0 = all)")
     parser.add_argument("--batch-size", type=int, default=50, help="Questions per batch for incremental saves")
+    parser.add_argument("--qc-group-size", type=int, default=1,
+                       help="QC up to N questions on the same passage in one Claude call (default: 1 = per question; anthropic provider)")
     
     # Article filtering
     parser.add_argument("--article-id", help="Process only questions from this specific article ID")
@@ -1967,7 +1992,25 @@ Concurrency:
     parser.add_argument("--concurrent", action="store_true", help="Enable concurrent processing with multiple API keys")
     parser.add_argument("--max-workers", type=int, default=None, help="Maximum number of concurrent workers")
 
+    # Cascade options
+    parser.add_argument("--cascade", choices=['off', 'local', 'cheap'], default='off',
+                       help="Pre-screen before full QC: 'local' checks only, or local + a cheap model (default: off)")
+    parser.add_argument("--cascade-model", default=DEFAULT_CHEAP_MODEL,
+                       help=f"Cheap model for the cascade pre-screen (default: {DEFAULT_CHEAP_MODEL})")
+    parser.add_argument("--cascade-confidence", type=float, default=DEFAULT_CONFIDENCE_THRESHOLD,
+                       help="Minimum confidence for a cheap-model failure to skip full QC (lower = borderline, escalated)")
+
+    # Cache options
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk LLM response cache (always call the API)")
+
     args = parser.parse_args()
+
+    if args.concurrent and args.cascade != 'off':
+        # Concurrent workers QC each question on its own with a plain analyzer
+        parser.error("--cascade is not supported with --concurrent")
+
+    if args.no_cache:
+        configure_llm_cache(enabled=False)
     
     # Handle --direct-openai flag (disables OpenRouter for GPT)
     if getattr(args, 'direct_openai', False):
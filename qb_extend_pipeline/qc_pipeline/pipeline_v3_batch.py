@@ -26,6 +26,9 @@ Usage:
 
   # Resume a previously submitted batch
   python pipeline_v3_batch.py --resume --batch-id msgbatch_xxx --input questions.csv --output results/
+
+  # Explanation QC via the batch API (or --mode both)
+  python pipeline_v3_batch.py --input questions.csv --output results/ --mode explanations
 """
 
 import argparse
@@ -35,7 +38,9 @@ import json
 import logging
 import os
 import sys
+import threading
 import time
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Set, Optional
@@ -46,15 +51,19 @@ import anthropic
 from openai import AsyncOpenAI
 
 from qc_pipeline.modules.question_qc_v3_batch import QuestionQCAnalyzerV3Batch
+from qc_pipeline.modules.explanation_qc_v3_batch import ExplanationQCAnalyzerV3Batch
 from qc_pipeline.modules.question_qc_v2 import QuestionQCAnalyzerV2
+from qc_pipeline.results_journal import QCResultJournal
+from qc_pipeline.question_items import build_explanation_items, build_question_items
 from qc_pipeline.utils import (
     calculate_pass_rate,
-    compute_content_hash,
-    truncate_text,
-    extract_passage_title,
     get_run_id,
     archive_old_runs,
-    get_failed_checks_list
+    get_failed_checks_list,
+    explanation_input_fields,
+    find_stale_checks,
+    stamp_check_fingerprints,
+    EXPLANATION_INPUT_FIELDS
 )
 
 # Load environment from .env file in the script's directory
@@ -139,6 +148,11 @@ class QCPipelineV3Batch:
     }
     OPENAI_CHECKS = {'too_close', 'difficulty_assessment'}
     LOCAL_CHECKS = {'length_check'}
+    EXPLANATION_CHECKS = {
+        'correctness_explanation', 'textual_evidence',  # For correct answers
+        'specific_error', 'misconception_diagnosis', 'correct_guidance',  # For wrong answers
+        'tone', 'conciseness', 'grade_appropriateness'  # Common checks
+    }
 
     def __init__(self, args: argparse.Namespace):
         self.args = args
@@ -178,8 +192,18 @@ class QCPipelineV3Batch:
         self.question_qc = QuestionQCAnalyzerV3Batch(
             claude_client=self.claude_client,
             claude_model=args.claude_model,
-            output_dir=self.output_dir / "batch_data"
+            output_dir=self.output_dir / "batch_data",
+            group_size=args.qc_group_size
         )
+
+        mode = getattr(args, 'mode', 'questions')
+        self.explanation_qc = None
+        if mode in ('explanations', 'both'):
+            self.explanation_qc = ExplanationQCAnalyzerV3Batch(
+                claude_client=self.claude_client,
+                claude_model=args.claude_model,
+                output_dir=self.output_dir / "batch_data"
+            )
         
         # Create V2 analyzer for OpenAI-only checks
         if self.openai_client:
@@ -192,12 +216,20 @@ class QCPipelineV3Batch:
             )
         else:
             self.openai_analyzer = None
+        # Event loop (on its own thread) that every OpenAI check of the run
+        # uses, so the client's pooled connections stay on one loop
+        self._openai_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._openai_thread: Optional[threading.Thread] = None
 
         # Track completed questions
         self._completed_question_ids: Set[str] = set()
         self._needs_openai_ids: Set[str] = set()
         self._existing_results: List[Dict[str, Any]] = []
         self._existing_results_map: Dict[str, Dict[str, Any]] = {}
+        
+        # Append-only journal next to the merged file (compacted at the end of the run)
+        self._journal = QCResultJournal(self._get_merged_file())
+        self._explanation_journal = QCResultJournal(self.output_dir / "explanation_qc_merged.json")
 
     def _get_merged_file(self) -> Path:
         """Get the path to the merged results file."""
@@ -224,15 +256,12 @@ class QCPipelineV3Batch:
         existing_results = []
         results_map = {}
         hash_map = {}  # Track content hashes
-        results_file = self._get_merged_file()
+        results = self._journal.results()
         
-        if not results_file.exists():
+        if not results:
             return fully_completed_ids, existing_results, needs_openai_ids, results_map, hash_map
         
         try:
-            with open(results_file, 'r') as f:
-                results = json.load(f)
-            
             for result in results:
                 question_id = result.get('question_id', '')
                 checks = result.get('checks', {})
@@ -268,32 +297,9 @@ class QCPipelineV3Batch:
         return fully_completed_ids, existing_results, needs_openai_ids, results_map, hash_map
 
     def _save_results_incrementally(self, new_results: List[Dict[str, Any]]):
-        """Save results incrementally to the merged output file."""
-        results_file = self._get_merged_file()
-        
-        # Load existing results
-        existing_results = []
-        if results_file.exists():
-            try:
-                with open(results_file, 'r') as f:
-                    existing_results = json.load(f)
-            except:
-                pass
-        
-        # Create a map of existing results by question_id
-        results_map = {r.get('question_id'): r for r in existing_results}
-        
-        # Update/add new results
-        for result in new_results:
-            q_id = result.get('question_id')
-            results_map[q_id] = result
-        
-        # Save all results
-        all_results = list(results_map.values())
-        with open(results_file, 'w') as f:
-            json.dump(all_results, f, indent=2)
-        
-        return all_results
+        """Append results to the journal (compacted into the merged file at the end of the run)."""
+        self._journal.append(new_results)
+        return self._journal.results()
 
     def load_input_data(self) -> pd.DataFrame:
         logger.info(f"Loading input data from {self.args.input}")
@@ -350,21 +356,14 @@ class QCPipelineV3Batch:
         skipped_unchanged = 0
         rerun_modified = 0
         
-        for i, row in df.iterrows():
-            question_id = str(row.get('question_id') or row.get('item_id', f'Q{i+1}'))
-            
-            choices = {
-                'A': str(row.get('option_1') or row.get('choice_A', '') or ''),
-                'B': str(row.get('option_2') or row.get('choice_B', '') or ''),
-                'C': str(row.get('option_3') or row.get('choice_C', '') or ''),
-                'D': str(row.get('option_4') or row.get('choice_D', '') or '')
-            }
-            
-            question_text = str(row.get('question', '') or '')
-            correct_answer = str(row.get('correct_answer', '') or '')
-            
-            # Compute content hash for change detection
-            content_hash = compute_content_hash(question_text, choices, correct_answer)
+        # Question items for every row, built column-wise; kept by ID for result
+        # enrichment and the OpenAI-only top-ups
+        all_items = build_question_items(df, self.run_id)
+        self._question_items_by_id = {q['question_id']: q for q in all_items}
+
+        for question_item in all_items:
+            question_id = question_item['question_id']
+            content_hash = question_item['content_hash']
             
             # Check if question exists and if content has changed
             existing_hash = self._hash_map.get(question_id, '')
@@ -388,29 +387,6 @@ class QCPipelineV3Batch:
                 skipped_has_claude += 1
                 continue
 
-            structured_content = {
-                'question': question_text,
-                'choices': choices,
-                'correct_answer': correct_answer,
-                'CCSS': str(row.get('CCSS', '') or ''),
-                'CCSS_description': str(row.get('CCSS_description', '') or ''),
-                'DOK': row.get('DOK', '')
-            }
-
-            passage = str(row.get('passage_text') or row.get('passage') or row.get('stimulus', '') or '')
-
-            question_item = {
-                'question_id': question_id,
-                'article_id': str(row.get('article_id', '') or ''),
-                'content_hash': content_hash,
-                'question_type': row.get('question_type', 'MCQ'),
-                'passage_text': passage,
-                'passage_title': extract_passage_title(passage, max_length=50),
-                'question_preview': truncate_text(question_text, max_length=60),
-                'grade': row.get('grade'),
-                'structured_content': structured_content,
-                'run_id': self.run_id
-            }
             questions.append(question_item)
 
         if skip_completed:
@@ -446,25 +422,41 @@ class QCPipelineV3Batch:
         logger.info(f"Expected cost: 50% of standard API pricing")
 
         start_time = time.time()
+        chunk_size = getattr(self.args, 'batch_chunk_size', 0)
         
-        results = self.question_qc.analyze_batch(questions, save_results=True)
+        if chunk_size and chunk_size < len(questions):
+            # Chunks are merged (and get their OpenAI checks) as each one ends.
+            # The checks run on the OpenAI loop; their results are merged and
+            # journaled here on the main thread, as they finish.
+            run_openai = bool(self.openai_client) and not getattr(self.args, 'skip_openai', False)
+            openai_futures: List[Future] = []
+
+            def merge_finished_openai(wait: bool = False):
+                for future in list(openai_futures):
+                    if wait or future.done():
+                        openai_futures.remove(future)
+                        self._merge_openai_results(future.result())
+
+            def on_chunk_complete(chunk_results, chunk_questions):
+                self._merge_batch_results(chunk_results, chunk_questions)
+                if run_openai:
+                    logger.info(f"  Starting OpenAI checks for {len(chunk_questions)} questions from finished batch")
+                    openai_futures.append(self._submit_openai_checks(chunk_questions))
+                merge_finished_openai()
+                self._create_summary_report(self._journal.results(), time.time() - start_time)
+
+            results = self.question_qc.analyze_batch_chunked(
+                questions, chunk_size, on_chunk_complete=on_chunk_complete
+            )
+            merge_finished_openai(wait=True)
+            self._openai_checks_done = run_openai
+            all_results = self._journal.results()
+        else:
+            results = self.question_qc.analyze_batch(questions, save_results=True)
+            all_results = self._merge_batch_results(results, questions)
         
         elapsed = time.time() - start_time
 
-        # Add run_id and additional fields to results
-        for r in results:
-            r['run_id'] = self.run_id
-            # Find matching question to get passage_title and question_preview
-            q_match = next((q for q in questions if q['question_id'] == r.get('question_id')), {})
-            if q_match:
-                r['passage_title'] = q_match.get('passage_title', '')
-                r['question_preview'] = q_match.get('question_preview', '')
-                r['content_hash'] = q_match.get('content_hash', '')
-
-        # Save to merged file (for checkpointing)
-        all_results = self._save_results_incrementally(results)
-        logger.info(f"  ✓ Saved {len(results)} new results to merged file (total: {len(all_results)})")
-
         logger.info(f"\nCompleted in {elapsed:.1f}s ({len(questions) / elapsed:.1f} questions/sec)")
 
         # Save current run to runs folder
@@ -488,6 +480,29 @@ class QCPipelineV3Batch:
 
         return all_results
 
+    def _merge_batch_results(self, results: List[Dict[str, Any]], questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add run metadata to batch results and journal them; returns all results so far."""
+        questions_by_id = {q['question_id']: q for q in questions}
+        for r in results:
+            r['run_id'] = self.run_id
+            # Find matching question to get passage_title and question_preview
+            q_match = questions_by_id.get(r.get('question_id'))
+            if q_match:
+                r['passage_title'] = q_match.get('passage_title', '')
+                r['question_preview'] = q_match.get('question_preview', '')
+                r['content_hash'] = q_match.get('content_hash', '')
+            # OpenAI checks for these questions merge into this result
+            self._existing_results_map[r.get('question_id')] = r
+
+        # Save to merged file (for checkpointing)
+        all_results = self._save_results_incrementally(results)
+        stats = calculate_pass_rate(all_results)
+        logger.info(
+            f"  ✓ Saved {len(results)} new results to merged file (total: {len(all_results)}, "
+            f"pass rate so far: {stats['pass_rate']:.1%})"
+        )
+        return all_results
+
     def resume_batch(self, batch_id: str, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         logger.info("\n" + "=" * 60)
         logger.info(f"RESUMING BATCH {batch_id}")
@@ -519,7 +534,30 @@ class QCPipelineV3Batch:
 
         return results
 
-    async def _run_openai_checks(self, questions_needing_openai: List[Dict[str, Any]]) -> None:
+    def _submit_openai_checks(self, questions: List[Dict[str, Any]]) -> Future:
+        """Start OpenAI-only checks on the run's OpenAI loop (started on first use)."""
+        if self._openai_loop is None:
+            self._openai_loop = asyncio.new_event_loop()
+            self._openai_thread = threading.Thread(
+                target=self._openai_loop.run_forever, name="openai-checks", daemon=True
+            )
+            self._openai_thread.start()
+        return asyncio.run_coroutine_threadsafe(
+            self.openai_analyzer.analyze_batch_openai_only(questions, concurrency=5),
+            self._openai_loop
+        )
+
+    def _close_openai_loop(self):
+        """Close the OpenAI client on its loop, then stop the loop thread."""
+        if self._openai_loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.openai_client.close(), self._openai_loop).result()
+        self._openai_loop.call_soon_threadsafe(self._openai_loop.stop)
+        self._openai_thread.join()
+        self._openai_loop.close()
+        self._openai_loop = None
+
+    def _run_openai_checks(self, questions_needing_openai: List[Dict[str, Any]]) -> None:
         """Run OpenAI checks for questions that already have Claude checks."""
         if not self.openai_analyzer or not questions_needing_openai:
             return
@@ -532,15 +570,16 @@ class QCPipelineV3Batch:
         start_time = time.time()
         
         # Run OpenAI checks only
-        openai_results = await self.openai_analyzer.analyze_batch_openai_only(
-            questions_needing_openai, 
-            concurrency=5
-        )
+        openai_results = self._submit_openai_checks(questions_needing_openai).result()
         
         elapsed = time.time() - start_time
-        
+        merged_count = self._merge_openai_results(openai_results)
+        logger.info(f"Merged OpenAI checks for {merged_count} questions in {elapsed:.1f}s")
+
+    def _merge_openai_results(self, openai_results: List[Dict[str, Any]]) -> int:
+        """Merge OpenAI checks into the existing results and journal them; returns how many merged."""
         # Merge OpenAI results with existing Claude results
-        merged_count = 0
+        merged_results = []
         for openai_result in openai_results:
             q_id = openai_result.get('question_id')
             if q_id in self._existing_results_map:
@@ -557,12 +596,130 @@ class QCPipelineV3Batch:
                 existing['total_checks_run'] = total
                 existing['total_checks_passed'] = passed
                 existing['overall_score'] = passed / total if total > 0 else 0
-                merged_count += 1
-        
-        # Save merged results
-        self._save_results_incrementally(list(self._existing_results_map.values()))
+                merged_results.append(existing)
         
-        logger.info(f"Merged OpenAI checks for {merged_count} questions in {elapsed:.1f}s")
+        # Journal only the results that changed
+        self._save_results_incrementally(merged_results)
+        return len(merged_results)
+
+    def _load_completed_explanations(self) -> tuple[Set[str], Dict[str, Dict[str, Any]]]:
+        """
+        Load completed explanation IDs ({question_id}_{letter}) from explanation_qc_merged.json.
+
+        Same completion rule as V2: at least 3 explanation checks present.
+        """
+        completed_ids = set()
+        results_map = {}
+        for result in self._explanation_journal.results():
+            item_id = result.get('question_id', '')
+            results_map[item_id] = result
+            if len(set(result.get('checks', {}).keys()) & self.EXPLANATION_CHECKS) >= 3:
+                completed_ids.add(item_id)
+        if completed_ids:
+            logger.info(f"  Found {len(completed_ids)} completed explanation results")
+        return completed_ids, results_map
+
+    def prepare_explanation_questions(self, df: pd.DataFrame, skip_completed: bool = True) -> List[Dict[str, Any]]:
+        """
+        Build explanation QC items (one per question, covering options A-D).
+
+        A question is skipped when all four explanations are complete and none
+        of their inputs changed since the last QC (per-check fingerprints).
+        """
+        completed_ids, existing_map = self._load_completed_explanations()
+        questions = []
+        skipped_complete = 0
+        rerun_modified = 0
+
+        for question_data in build_explanation_items(df):
+            question_id = question_data['question_id']
+
+            if skip_completed:
+                # One batch request covers all four explanations, so any missing
+                # or stale explanation re-runs the whole question
+                pending = [
+                    letter for letter in ['A', 'B', 'C', 'D']
+                    if f"{question_id}_{letter}" not in completed_ids
+                    or find_stale_checks(
+                        existing_map[f"{question_id}_{letter}"].get('checks', {}),
+                        explanation_input_fields(question_data, letter),
+                        EXPLANATION_INPUT_FIELDS
+                    )
+                ]
+                if not pending:
+                    skipped_complete += 1
+                    continue
+                if any(f"{question_id}_{letter}" in completed_ids for letter in pending):
+                    rerun_modified += 1
+                    logger.info(f"  ⚠️ Explanations changed for {question_id} ({', '.join(pending)}) - will re-run QC")
+
+            questions.append(question_data)
+
+        if skip_completed:
+            logger.info(f"\n📋 EXPLANATION PROGRESS STATUS")
+            logger.info(f"{'─'*40}")
+            logger.info(f"  Total in input:       {len(df)}")
+            logger.info(f"  Fully completed:      {skipped_complete}")
+            if rerun_modified > 0:
+                logger.info(f"  ⚠️ Modified (re-run):  {rerun_modified}")
+            logger.info(f"  Need Claude batch:    {len(questions)}")
+
+        return questions
+
+    def run_explanation_batch_qc(self, questions: List[Dict[str, Any]], batch_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run (or resume) the explanation batch and journal the per-option results."""
+        logger.info("\n" + "=" * 60)
+        if batch_id:
+            logger.info(f"RESUMING EXPLANATION BATCH {batch_id}")
+        else:
+            logger.info("RUNNING EXPLANATION QC (BATCH V3 WITH CHECKPOINTING)")
+        logger.info("=" * 60)
+
+        if not questions:
+            logger.info("\n✓ All explanations already processed!")
+            return self._explanation_journal.results()
+
+        start_time = time.time()
+
+        if batch_id:
+            results = self.explanation_qc.resume_batch(batch_id, questions)
+        else:
+            logger.info(f"Processing {len(questions)} questions (4 explanations each) via Message Batches API")
+            results = self.explanation_qc.analyze_batch(questions, save_results=True)
+
+        elapsed = time.time() - start_time
+
+        questions_by_id = {q['question_id']: q for q in questions}
+        for r in results:
+            r['run_id'] = self.run_id
+            q_match = questions_by_id.get(r.get('original_question_id'))
+            if q_match:
+                stamp_check_fingerprints(
+                    r.get('checks', {}),
+                    explanation_input_fields(q_match, r.get('option_label', '')),
+                    field_names=EXPLANATION_INPUT_FIELDS
+                )
+
+        self._explanation_journal.append(results)
+        all_results = self._explanation_journal.results()
+        logger.info(f"  ✓ Saved {len(results)} explanation results (total: {len(all_results)})")
+
+        run_file = self._get_run_file("_explanations.json")
+        with open(run_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Saved explanation run results to {run_file}")
+
+        self._explanation_journal.compact()
+
+        stats = calculate_pass_rate(results)
+        logger.info(f"\nExplanation QC Summary:")
+        logger.info(f"  Total: {stats['total']}")
+        logger.info(f"  Passed: {stats['passed']} ({stats['pass_rate']:.1%})")
+        logger.info(f"  Failed: {stats['failed']}")
+        logger.info(f"  Average Score: {stats['average_score']:.2f}")
+        logger.info(f"  Time: {elapsed:.1f}s")
+
+        return all_results
 
     def run(self):
         logger.info("=" * 60)
@@ -577,6 +734,53 @@ class QCPipelineV3Batch:
             logger.info(f"OpenAI: Enabled for supplementary checks")
         else:
             logger.info(f"OpenAI: Disabled (no API key)")
+        mode = getattr(self.args, 'mode', 'questions')
+        logger.info(f"Mode: {mode}")
+
+        start_time = time.time()
+
+        try:
+            if mode in ('questions', 'both'):
+                self.run_question_qc()
+        finally:
+            self._close_openai_loop()
+
+        if mode in ('explanations', 'both'):
+            df = self.load_input_data()
+            explanation_batch_id = self._resume_batch_id('explanations')
+            if explanation_batch_id:
+                # For resume, map results back onto every question
+                questions = self.prepare_explanation_questions(df, skip_completed=False)
+                self.run_explanation_batch_qc(questions, batch_id=explanation_batch_id)
+            else:
+                self.run_explanation_batch_qc(self.prepare_explanation_questions(df))
+
+        total_elapsed = time.time() - start_time
+
+        logger.info("\n" + "=" * 60)
+        logger.info("BATCH PIPELINE COMPLETED")
+        logger.info("=" * 60)
+        logger.info(f"Total time: {total_elapsed:.1f}s")
+        logger.info(f"Results saved to {self.output_dir}")
+
+    def _resume_batch_id(self, qc_type: str) -> Optional[str]:
+        """
+        Batch to resume for 'questions' or 'explanations', if any.
+
+        --batch-id is the question batch, except with --mode explanations;
+        --explanation-batch-id is always the explanation batch.
+        """
+        if not self.args.resume:
+            return None
+        explanation_batch_id = getattr(self.args, 'explanation_batch_id', None)
+        if getattr(self.args, 'mode', 'questions') == 'explanations':
+            return explanation_batch_id or self.args.batch_id
+        if qc_type == 'explanations':
+            return explanation_batch_id
+        return self.args.batch_id
+
+    def run_question_qc(self):
+        """Question QC: OpenAI top-ups for existing results, then the Claude batch."""
         logger.info(f"\n📁 Checking for existing results in merged file...")
 
         # Load completed questions from output - now returns 5 values including hash_map
@@ -594,62 +798,41 @@ class QCPipelineV3Batch:
         # Prepare questions that need only OpenAI checks
         questions_needing_openai = []
         if self.openai_client and self._needs_openai_ids:
-            for i, row in df.iterrows():
-                question_id = str(row.get('question_id') or row.get('item_id', f'Q{i+1}'))
-                if question_id in self._needs_openai_ids:
-                    choices = {
-                        'A': row.get('option_1') or row.get('choice_A', ''),
-                        'B': row.get('option_2') or row.get('choice_B', ''),
-                        'C': row.get('option_3') or row.get('choice_C', ''),
-                        'D': row.get('option_4') or row.get('choice_D', '')
-                    }
-                    structured_content = {
-                        'question': row.get('question', ''),
-                        'choices': choices,
-                        'correct_answer': row.get('correct_answer', ''),
-                        'CCSS': row.get('CCSS', ''),
-                        'CCSS_description': row.get('CCSS_description', ''),
-                        'DOK': row.get('DOK', '')
-                    }
-                    passage = row.get('passage_text') or row.get('passage') or row.get('stimulus', '')
-                    questions_needing_openai.append({
-                        'question_id': question_id,
-                        'question_type': row.get('question_type', 'MCQ'),
-                        'passage_text': passage,
-                        'grade': row.get('grade'),
-                        'structured_content': structured_content
-                    })
+            questions_needing_openai = [
+                q for question_id, q in self._question_items_by_id.items()
+                if question_id in self._needs_openai_ids
+            ]
 
         start_time = time.time()
 
         # First, run OpenAI checks for questions that already have Claude results
         if questions_needing_openai:
-            asyncio.run(self._run_openai_checks(questions_needing_openai))
+            self._run_openai_checks(questions_needing_openai)
 
-        if self.args.resume and self.args.batch_id:
+        question_batch_id = self._resume_batch_id('questions')
+        if question_batch_id:
             # For resume, we need all questions (not just incomplete ones)
             all_questions = self.prepare_questions(df, skip_completed=False)
-            results = self.resume_batch(self.args.batch_id, all_questions)
+            results = self.resume_batch(question_batch_id, all_questions)
         elif questions:
             # Run Claude batch for questions needing Claude checks
             results = self.run_batch_qc(questions)
             
             # After Claude batch completes, run OpenAI checks for these questions too
+            # (chunked runs already ran them as each batch ended)
             skip_openai = getattr(self.args, 'skip_openai', False)
-            if not skip_openai and self.openai_client and questions:
+            if getattr(self, '_openai_checks_done', False):
+                results = self._journal.results()
+                run_file = self._get_run_file(".json")
+                self._create_readable_csv(results, run_file)
+                logger.info("Regenerated CSVs with OpenAI check results")
+            elif not skip_openai and self.openai_client and questions:
                 logger.info(f"\nRunning OpenAI checks for {len(questions)} newly processed questions...")
                 
-                # Update the results map with newly processed Claude results
-                for r in results:
-                    self._existing_results_map[r.get('question_id')] = r
+                self._run_openai_checks(questions)
                 
-                asyncio.run(self._run_openai_checks(questions))
-                
-                # Reload all results from merged file after OpenAI merge
-                merged_file = self._get_merged_file()
-                if merged_file.exists():
-                    with open(merged_file, 'r') as f:
-                        results = json.load(f)
+                # Reload all results (merged file + journal) after OpenAI merge
+                results = self._journal.results()
                 
                 # Regenerate CSVs with complete results (including OpenAI checks)
                 run_file = self._get_run_file(".json")
@@ -671,13 +854,10 @@ class QCPipelineV3Batch:
 
         total_elapsed = time.time() - start_time
 
-        self._create_summary_report(results, total_elapsed)
+        # Fold the journal into the merged file
+        self._journal.compact()
 
-        logger.info("\n" + "=" * 60)
-        logger.info("BATCH PIPELINE COMPLETED")
-        logger.info("=" * 60)
-        logger.info(f"Total time: {total_elapsed:.1f}s")
-        logger.info(f"Results saved to {self.output_dir}")
+        self._create_summary_report(results, total_elapsed)
 
     def _create_summary_report(self, results: List[Dict[str, Any]], elapsed: float):
         """Create detailed summary report with per-article breakdown."""
@@ -858,6 +1038,12 @@ Examples:
     parser.add_argument("--output", required=True, help="Output directory for results")
     parser.add_argument("--limit", type=int, default=0, help="Process only first N questions (0 = all)")
     parser.add_argument("--claude-model", default="claude-sonnet-4-5-20250929", help="Claude model")
+    parser.add_argument("--mode", choices=["questions", "explanations", "both"], default="questions",
+                       help="QC mode (default: questions)")
+    parser.add_argument("--qc-group-size", type=int, default=1,
+                       help="QC up to N questions on the same passage per batch request (default: 1 = per question)")
+    parser.add_argument("--batch-chunk-size", type=int, default=500,
+                       help="Split into batches of ~N questions (whole passages) polled together; 0 = one batch (default: 500)")
     
     # Article filtering
     parser.add_argument("--article-id", help="Process only questions from this specific article ID")
@@ -869,10 +1055,16 @@ Examples:
     # Resume options
     parser.add_argument("--resume", action="store_true", help="Resume a previously submitted batch")
     parser.add_argument("--batch-id", help="Batch ID to resume (use with --resume)")
+    parser.add_argument("--explanation-batch-id",
+                       help="Explanation batch ID to resume with --mode both (use with --resume)")
 
     args = parser.parse_args()
 
-    if args.resume and not args.batch_id:
+    if args.resume and not (args.batch_id or args.explanation_batch_id):
+        parser.error("--batch-id or --explanation-batch-id is required when using --resume")
+    if args.explanation_batch_id and args.mode == "questions":
+        parser.error("--explanation-batch-id needs --mode explanations or --mode both")
+    if args.resume and args.mode == "questions" and not args.batch_id:
         parser.error("--batch-id is required when using --resume")
 
     try:
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Question Item Preparation
+
+Builds the question items the V2 and V3 QC pipelines send to the analyzers
+(question_id, content_hash, passage_title, structured_content, ...) from the
+input DataFrame column by column instead of with df.iterrows():
+- Column fallbacks (option_1 / choice_A, passage_text / passage / stimulus)
+  are coalesced per column
+- Content hashes are computed in one pass over the stem, option and answer columns
+- Passage titles are extracted once per unique passage
+
+Usage:
+    items = build_question_items(df, run_id)
+    items_by_id = {q['question_id']: q for q in items}
+    explanation_items = build_explanation_items(df)
+
+    # Benchmark pre-flight time against the row-by-row preparation
+    python -m qc_pipeline.question_items --rows 50000
+    python -m qc_pipeline.question_items --input outputs/qb_extended_combined.csv
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from qc_pipeline.utils import compute_content_hash, extract_passage_title, truncate_text
+
+OPTION_COLUMNS = {
+    'A': ('option_1', 'choice_A'),
+    'B': ('option_2', 'choice_B'),
+    'C': ('option_3', 'choice_C'),
+    'D': ('option_4', 'choice_D')
+}
+PASSAGE_COLUMNS = ('passage_text', 'passage', 'stimulus')
+
+
+def _coalesce(df: pd.DataFrame, columns: Sequence[str], default: Any) -> pd.Series:
+    """Column-wise `row.get(a) or row.get(b) or default` over the columns that exist."""
+    result = default if isinstance(default, pd.Series) else pd.Series([default] * len(df), index=df.index, dtype=object)
+    for column in reversed(columns):
+        if column in df.columns:
+            values = df[column].astype(object)
+            result = values.where(values.map(bool), result)
+    return result
+
+
+def _column(df: pd.DataFrame, column: str, default: Any) -> List[Any]:
+    """Raw column values (`row.get(column, default)`), as Python objects."""
+    if column not in df.columns:
+        return [default] * len(df)
+    return df[column].astype(object).tolist()
+
+
+def _text(df: pd.DataFrame, columns: Sequence[str]) -> List[str]:
+    """`str(row.get(a) or row.get(b) or '')` for every row."""
+    return _coalesce(df, columns, '').map(str).tolist()
+
+
+def _explanation_columns(df: pd.DataFrame) -> Dict[str, str]:
+    """Explanation column per option letter (option_1_explanation or option_A_explanation)."""
+    columns = {}
+    for n, letter in enumerate('ABCD', 1):
+        for column in (f'option_{n}_explanation', f'option_{letter}_explanation'):
+            if column in df.columns:
+                columns[letter] = column
+                break
+    return columns
+
+
+def build_question_items(
+    df: pd.DataFrame,
+    run_id: Optional[str] = None,
+    include_explanations: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Build QC question items for every row of the input, in row order.
+
+    Args:
+        df: Input dataframe (one question per row)
+        run_id: Run ID stored on each item
+        include_explanations: Add per-option 'explanations' keyed A-D
+            ({} when the input has no explanation columns)
+
+    Returns:
+        List of question item dicts
+    """
+    if df.empty:
+        return []
+
+    fallback_ids = pd.Series([f'Q{i+1}' for i in df.index], index=df.index, dtype=object)
+    question_ids = _coalesce(df, ('question_id', 'item_id'), fallback_ids).map(str).tolist()
+    question_texts = _text(df, ('question',))
+    correct_answers = _text(df, ('correct_answer',))
+    options = {letter: _text(df, columns) for letter, columns in OPTION_COLUMNS.items()}
+    passages = _text(df, PASSAGE_COLUMNS)
+    article_ids = _text(df, ('article_id',))
+    ccss = _text(df, ('CCSS',))
+    ccss_descriptions = _text(df, ('CCSS_description',))
+    dok = _column(df, 'DOK', '')
+    question_types = _column(df, 'question_type', 'MCQ')
+    grades = _column(df, 'grade', None)
+
+    choices_per_row = [
+        {letter: options[letter][i] for letter in 'ABCD'}
+        for i in range(len(df))
+    ]
+    content_hashes = [
+        compute_content_hash(question_text, choices, correct_answer)
+        for question_text, choices, correct_answer in zip(question_texts, choices_per_row, correct_answers)
+    ]
+    passage_titles = {passage: extract_passage_title(passage, max_length=50) for passage in set(passages)}
+
+    explanation_values = {}
+    if include_explanations:
+        for letter, column in _explanation_columns(df).items():
+            values = df[column].astype(object)
+            explanation_values[letter] = values.where(values.notna(), '').map(str).tolist()
+
+    items = []
+    for i, question_id in enumerate(question_ids):
+        item = {
+            'question_id': question_id,
+            'article_id': article_ids[i],
+            'content_hash': content_hashes[i],
+            'question_type': question_types[i],
+            'passage_text': passages[i],
+            'passage_title': passage_titles[passages[i]],
+            'question_preview': truncate_text(question_texts[i], max_length=60),
+            'grade': grades[i],
+            'structured_content': {
+                'question': question_texts[i],
+                'choices': choices_per_row[i],
+                'correct_answer': correct_answers[i],
+                'CCSS': ccss[i],
+                'CCSS_description': ccss_descriptions[i],
+                'DOK': dok[i]
+            }
+        }
+        if include_explanations:
+            item['explanations'] = {letter: values[i] for letter, values in explanation_values.items()}
+        item['run_id'] = run_id
+        items.append(item)
+    return items
+
+
+def build_explanation_items(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Build explanation QC items (one per question, covering options A-D), in row order.
+
+    Same column fallbacks as build_question_items, including option_N_explanation
+    or option_A_explanation; missing explanations are ''. Grade defaults to 3
+    when the input has no grade column.
+    """
+    has_grade = 'grade' in df.columns
+    return [
+        {
+            'question_id': item['question_id'],
+            'question': item['structured_content']['question'],
+            'correct_answer': item['structured_content']['correct_answer'],
+            'passage': item['passage_text'],
+            'options': item['structured_content']['choices'],
+            'explanations': {letter: item['explanations'].get(letter, '') for letter in 'ABCD'},
+            'grade': item['grade'] if has_grade else 3
+        }
+        for item in build_question_items(df, include_explanations=True)
+    ]
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def _build_question_items_rowwise(df: pd.DataFrame, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """The previous df.iterrows() preparation, kept as the benchmark baseline."""
+    items = []
+    for i, row in df.iterrows():
+        question_id = str(row.get('question_id') or row.get('item_id', f'Q{i+1}'))
+        choices = {
+            'A': str(row.get('option_1') or row.get('choice_A', '') or ''),
+            'B': str(row.get('option_2') or row.get('choice_B', '') or ''),
+            'C': str(row.get('option_3') or row.get('choice_C', '') or ''),
+            'D': str(row.get('option_4') or row.get('choice_D', '') or '')
+        }
+        question_text = str(row.get('question', '') or '')
+        correct_answer = str(row.get('correct_answer', '') or '')
+        passage = str(row.get('passage_text') or row.get('passage') or row.get('stimulus', '') or '')
+        items.append({
+            'question_id': question_id,
+            'article_id': str(row.get('article_id', '') or ''),
+            'content_hash': compute_content_hash(question_text, choices, correct_answer),
+            'question_type': row.get('question_type', 'MCQ'),
+            'passage_text': passage,
+            'passage_title': extract_passage_title(passage, max_length=50),
+            'question_preview': truncate_text(question_text, max_length=60),
+            'grade': row.get('grade'),
+            'structured_content': {
+                'question': question_text,
+                'choices': choices,
+                'correct_answer': correct_answer,
+                'CCSS': str(row.get('CCSS', '') or ''),
+                'CCSS_description': str(row.get('CCSS_description', '') or ''),
+                'DOK': row.get('DOK', '')
+            },
+            'run_id': run_id
+        })
+    return items
+
+
+def _synthetic_bank(rows: int, questions_per_passage: int = 8) -> pd.DataFrame:
+    """Question bank shaped like qb_extended_combined.csv (~3KB passages)."""
+    passage_body = "The river bends past the old mill, where the town kept its grain. " * 45
+    records = []
+    for i in range(rows):
+        article = i // questions_per_passage
+        records.append({
+            'question_id': f'q{i}',
+            'article_id': f'article_{article}',
+            'passage_text': f"Passage {article}\n{passage_body}",
+            'question': f"According to the passage, why did the town build mill number {i}?",
+            'option_1': f'To store grain {i}',
+            'option_2': 'To grind flour for the market',
+            'option_3': 'To power the new factory',
+            'option_4': 'To slow the river during floods',
+            'correct_answer': 'ABCD'[i % 4],
+            'CCSS': 'RI.4.1',
+            'CCSS_description': 'Refer to details and examples in a text',
+            'DOK': 2,
+            'grade': 4
+        })
+    return pd.DataFrame(records)
+
+
+def _normalized(items: List[Dict[str, Any]]) -> str:
+    return json.dumps(items, sort_keys=True, default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark QC question preparation (columnar vs df.iterrows)"
+    )
+    parser.add_argument("--input", help="Question CSV to benchmark (default: synthetic bank)")
+    parser.add_argument("--rows", type=int, default=20000, help="Synthetic bank size (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input) if args.input else _synthetic_bank(args.rows)
+    passages = df[[c for c in PASSAGE_COLUMNS if c in df.columns]].astype(str).agg(''.join, axis=1).nunique()
+    print(f"📊 {len(df)} questions, {passages} unique passages")
+
+    timings = {}
+    outputs = {}
+    for name, build in (('iterrows', _build_question_items_rowwise), ('columnar', build_question_items)):
+        best = float('inf')
+        for _ in range(max(1, args.repeat)):
+            start = time.perf_counter()
+            outputs[name] = build(df, 'bench')
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+        print(f"⏱️  {name:<9} {best:7.3f}s ({len(df) / best:,.0f} questions/sec)")
+
+    print(f"🚀 Speedup: {timings['iterrows'] / timings['columnar']:.1f}x")
+    if _normalized(outputs['iterrows']) == _normalized(outputs['columnar']):
+        print("✅ Items identical")
+    else:
+        print("❌ Items differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+QC Results Journal
+
+Append-only JSONL journal for QC results, used by QCPipelineV2,
+ConcurrentQCPipelineV2 and BatchQCPipelineV3 instead of re-reading and
+rewriting the whole merged JSON after every batch.
+
+Files (next to the merged file):
+    question_qc_merged.json            Compacted view (what dashboards and the fix pipeline read)
+    question_qc_merged.journal.jsonl   One line per finished question since the last compaction
+
+Loading reads the merged file, then replays the journal with last-write-wins
+per question_id. Compaction writes the merged view to a temp file, fsyncs it,
+renames it over the merged file and only then empties the journal, so a run
+killed at any point leaves either the old or the new merged file plus a
+journal that replays cleanly on top of it.
+
+Usage:
+    # Compact every journal in a results directory
+    python -m qc_pipeline.results_journal outputs/qc_results
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from batch_results import repair_jsonl_tail
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+# fsync the journal at most this often (seconds); lines are flushed to the OS on every append
+FSYNC_INTERVAL = 1.0
+
+
+def journal_path_for(merged_path: Path) -> Path:
+    merged_path = Path(merged_path)
+    return merged_path.with_name(merged_path.stem + JOURNAL_SUFFIX)
+
+
+class QCResultJournal:
+    """
+    Thread-safe append-only journal of QC results keyed by question_id.
+
+    Usage:
+        journal = QCResultJournal(output_dir / "question_qc_merged.json")
+        journal.append(batch_results)
+        ...
+        journal.compact()
+    """
+
+    def __init__(self, merged_path: Path):
+        self.merged_path = Path(merged_path)
+        self.path = journal_path_for(self.merged_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._pending = 0
+        self._last_fsync = time.monotonic()
+
+        repair_jsonl_tail(self.path)
+        self._load()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self):
+        """Merged file first, then journal lines (last write wins per question_id)."""
+        if self.merged_path.exists():
+            try:
+                with open(self.merged_path, 'r') as f:
+                    for result in json.load(f):
+                        self._results[result.get('question_id')] = result
+            except (json.JSONDecodeError, OSError):
+                pass
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        result = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._pending += 1
+                    self._results[result.get('question_id')] = result
+
+    @property
+    def pending(self) -> int:
+        """Journal lines not yet folded into the merged file."""
+        return self._pending
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, question_id: str) -> Optional[Dict[str, Any]]:
+        """Current result for one question, or None."""
+        with self._lock:
+            return self._results.get(question_id)
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Current view of every result (merged file + journal)."""
+        with self._lock:
+            return list(self._results.values())
+
+    def append(self, results: Iterable[Dict[str, Any]]) -> None:
+        """Journal finished results, one line each."""
+        with self._lock:
+            for result in results:
+                self._file.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+                self._results[result.get('question_id')] = result
+                self._pending += 1
+            self._file.flush()
+            now = time.monotonic()
+            if now - self._last_fsync >= FSYNC_INTERVAL:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+    def compact(self) -> List[Dict[str, Any]]:
+        """Fold the journal into the merged file (atomic rename), then empty the journal."""
+        with self._lock:
+            all_results = list(self._results.values())
+            if not self._pending and self.merged_path.exists():
+                return all_results
+
+            tmp_path = self.merged_path.with_name(self.merged_path.name + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(all_results, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.merged_path)
+
+            self._file.close()
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._pending = 0
+            self._last_fsync = time.monotonic()
+            return all_results
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+
+def compact_results(merged_path: Path) -> int:
+    """Compact the journal next to merged_path, if there is one. Returns lines folded in."""
+    if not journal_path_for(merged_path).exists():
+        return 0
+    journal = QCResultJournal(merged_path)
+    folded = journal.pending
+    journal.compact()
+    journal.close()
+    return folded
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compact QC result journals into their merged JSON files"
+    )
+    parser.add_argument("results_dir", help="QC output directory (e.g. outputs/qc_results)")
+    args = parser.parse_args()
+
+    for journal_file in sorted(Path(args.results_dir).glob(f"*{JOURNAL_SUFFIX}")):
+        merged_path = journal_file.with_name(journal_file.name[:-len(JOURNAL_SUFFIX)] + ".json")
+        folded = compact_results(merged_path)
+        print(f"🗜️  {merged_path.name}: folded {folded} journal lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,229 @@ def compute_content_hash(question_text: str, options: Dict[str, str], correct_an
     return hashlib.sha256(content_str.encode()).hexdigest()[:12]
 
 
+# =============================================================================
+# PER-CHECK INPUT FINGERPRINTS
+# =============================================================================
+
+# Input fields each question check depends on. A check's fingerprint covers
+# exactly these fields, so an edit only invalidates the checks that read it:
+#   passage      - passage text
+#   stem         - question text
+#   answer       - correct answer key and its text
+#   distractors  - text of the incorrect options
+#   explanations - per-option explanations
+#   standard     - CCSS code, CCSS description and DOK
+#   grade        - target grade
+# Splitting the options into answer and distractors means a distractor-only
+# fix leaves standard_alignment, clarity_precision and passage_reference alone.
+CHECK_INPUT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    # Claude checks
+    'grammatical_parallel': ('answer', 'distractors'),
+    'plausibility': ('passage', 'stem', 'answer', 'distractors'),
+    'homogeneity': ('answer', 'distractors'),
+    'specificity_balance': ('answer', 'distractors'),
+    'standard_alignment': ('stem', 'answer', 'standard', 'grade'),
+    'clarity_precision': ('stem',),
+    'single_correct_answer': ('passage', 'stem', 'answer', 'distractors'),
+    'passage_reference': ('passage', 'stem', 'answer'),
+    # OpenAI checks
+    'too_close': ('passage', 'stem', 'answer', 'distractors'),
+    'difficulty_assessment': ('passage', 'stem', 'answer', 'distractors', 'grade'),
+    # Local checks
+    'length_check': ('answer', 'distractors'),
+    'distinct_options': ('answer', 'distractors'),
+    'answer_in_options': ('answer',),
+    'unique_question': ('stem', 'answer', 'distractors'),
+    'explanations_present': ('explanations',),
+}
+
+# Checks not listed above are assumed to depend on every field
+ALL_INPUT_FIELDS: Tuple[str, ...] = ('passage', 'stem', 'answer', 'distractors', 'explanations', 'standard', 'grade')
+
+# Every explanation check reads the same inputs (one option's explanation in context)
+EXPLANATION_INPUT_FIELDS: Tuple[str, ...] = ('passage', 'stem', 'answer', 'distractors', 'explanation', 'grade')
+
+
+def _fingerprint_value(value: Any) -> str:
+    """Normalize a field value (None/NaN -> '', 3.0 -> '3') before hashing."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ""
+        if value.is_integer():
+            value = int(value)
+    return str(value).strip()
+
+
+def _option_fields(choices: Dict[str, Any], correct_answer: Any) -> Dict[str, Any]:
+    """Split options into the answer (key + text) and the distractors."""
+    correct = _fingerprint_value(correct_answer)
+    return {
+        'answer': [correct, _fingerprint_value(choices.get(correct))],
+        'distractors': {k: _fingerprint_value(v) for k, v in sorted(choices.items()) if k != correct}
+    }
+
+
+def question_input_fields(question_item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the fingerprintable fields of a question QC item.
+
+    Args:
+        question_item: Item with structured_content, passage_text, grade and
+            (optionally) explanations, as passed to the question analyzers
+
+    Returns:
+        Dict of field name to normalized value
+    """
+    question_data = question_item.get('structured_content', {}) or {}
+    choices = question_data.get('choices', {}) or {}
+    explanations = question_item.get('explanations') or {}
+    return {
+        'passage': _fingerprint_value(question_item.get('passage_text')),
+        'stem': _fingerprint_value(question_data.get('question')),
+        **_option_fields(choices, question_data.get('correct_answer')),
+        'explanations': {k: _fingerprint_value(v) for k, v in sorted(explanations.items())},
+        'standard': [
+            _fingerprint_value(question_data.get('CCSS')),
+            _fingerprint_value(question_data.get('CCSS_description')),
+            _fingerprint_value(question_data.get('DOK'))
+        ],
+        'grade': _fingerprint_value(question_item.get('grade'))
+    }
+
+
+def explanation_input_fields(question_data: Dict[str, Any], option_label: str) -> Dict[str, Any]:
+    """
+    Extract the fingerprintable fields of one option's explanation.
+
+    Args:
+        question_data: Explanation QC question dict (question, passage, options,
+            explanations, correct_answer, grade)
+        option_label: Option letter (A-D)
+    """
+    options = question_data.get('options', {}) or {}
+    return {
+        'passage': _fingerprint_value(question_data.get('passage')),
+        'stem': _fingerprint_value(question_data.get('question')),
+        **_option_fields(options, question_data.get('correct_answer')),
+        'explanation': _fingerprint_value((question_data.get('explanations') or {}).get(option_label)),
+        'grade': _fingerprint_value(question_data.get('grade'))
+    }
+
+
+def compute_input_fingerprint(fields: Dict[str, Any], field_names: Tuple[str, ...]) -> str:
+    """12-character fingerprint of the named fields (like compute_content_hash)."""
+    content = {name: fields.get(name, "") for name in field_names}
+    content_str = json.dumps(content, sort_keys=True)
+    return hashlib.sha256(content_str.encode()).hexdigest()[:12]
+
+
+def compute_check_fingerprint(check_name: str, fields: Dict[str, Any]) -> str:
+    """Fingerprint of exactly the inputs check_name depends on."""
+    return compute_input_fingerprint(fields, CHECK_INPUT_FIELDS.get(check_name, ALL_INPUT_FIELDS))
+
+
+def stamp_check_fingerprints(
+    checks: Dict[str, Dict[str, Any]],
+    fields: Dict[str, Any],
+    check_names: Optional[List[str]] = None,
+    field_names: Optional[Tuple[str, ...]] = None
+) -> None:
+    """
+    Store each check's input fingerprint in its result (in place).
+
+    Args:
+        checks: check_name -> check result
+        fields: Output of question_input_fields / explanation_input_fields
+        check_names: Only stamp these checks (default: all)
+        field_names: Use these fields for every check instead of CHECK_INPUT_FIELDS
+    """
+    shared = compute_input_fingerprint(fields, field_names) if field_names else None
+    for check_name, check in checks.items():
+        if check_names is not None and check_name not in check_names:
+            continue
+        if isinstance(check, dict):
+            check['input_fingerprint'] = shared or compute_check_fingerprint(check_name, fields)
+
+
+def find_stale_checks(
+    checks: Dict[str, Dict[str, Any]],
+    fields: Dict[str, Any],
+    field_names: Optional[Tuple[str, ...]] = None
+) -> Optional[List[str]]:
+    """
+    Checks whose stored input fingerprint no longer matches the current inputs.
+
+    Args:
+        checks: check_name -> check result (as stamped by stamp_check_fingerprints)
+        fields: Current inputs (question_input_fields / explanation_input_fields)
+        field_names: Fields shared by every check (as passed when stamping)
+
+    Returns:
+        Stale check names (empty if every check is up to date), or None when
+        the result predates per-check fingerprints
+    """
+    if not checks or not all(isinstance(c, dict) and c.get('input_fingerprint') for c in checks.values()):
+        return None
+    shared = compute_input_fingerprint(fields, field_names) if field_names else None
+    return [
+        check_name for check_name, check in checks.items()
+        if check['input_fingerprint'] != (shared or compute_check_fingerprint(check_name, fields))
+    ]
+
+
+def merge_check_results(
+    existing: Dict[str, Any],
+    partial: Dict[str, Any],
+    question_item: Dict[str, Any],
+    run_id: str
+) -> Dict[str, Any]:
+    """
+    Merge re-run checks into an existing question result and recompute its scores.
+
+    Re-run checks get fresh input fingerprints; kept checks keep theirs (checks
+    without one are stamped from the current inputs). Re-requested checks the
+    analyzer did not return count as failed rather than keeping a stale verdict
+    or dropping out of the score; they keep their old fingerprint, so they are
+    requested again next time.
+    """
+    rerun = set(question_item.get('rerun_checks', []))
+    new_checks = partial.get('checks', {})
+    merged_checks = {name: dict(check) for name, check in existing.get('checks', {}).items()}
+    for name in rerun:
+        if name in merged_checks and name not in new_checks:
+            merged_checks[name].update({
+                'score': 0,
+                'response': 'Not re-run after its inputs changed (previous verdict is stale)'
+            })
+    merged_checks.update({name: dict(check) for name, check in new_checks.items()})
+    stamp_check_fingerprints(
+        merged_checks,
+        question_input_fields(question_item),
+        check_names=[name for name, check in merged_checks.items() if name in new_checks or not check.get('input_fingerprint')]
+    )
+
+    # Recalculate scores
+    passed = sum(1 for c in merged_checks.values() if c.get('score', 0) == 1)
+    total = len(merged_checks)
+
+    return {
+        **existing,
+        'checks': merged_checks,
+        'total_checks_run': total,
+        'total_checks_passed': passed,
+        'overall_score': passed / total if total > 0 else 0,
+        # Add enriched fields (like V3)
+        'article_id': question_item.get('article_id', existing.get('article_id', '')),
+        'content_hash': question_item.get('content_hash', existing.get('content_hash', '')),
+        'passage_title': question_item.get('passage_title', existing.get('passage_title', '')),
+        'question_preview': question_item.get('question_preview', existing.get('question_preview', '')),
+        'run_id': run_id,
+        'timestamp': partial.get('timestamp', existing.get('timestamp'))
+    }
+
+
 # =============================================================================
 # TEXT TRUNCATION HELPERS
 # =============================================================================
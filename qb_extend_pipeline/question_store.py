@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Question Store
+
+SQLite-backed store for generated (extended) questions, keyed by question_id.
+Batch mode writes every generated record here with batched upserts; the
+extended CSV and the combined file are exports generated from the store, so
+resumes and partial re-runs cost O(new rows) instead of re-reading and
+rewriting every CSV row.
+
+Schema:
+    questions(question_id PRIMARY KEY, article_id, parent_question_id,
+              question_category, data, updated_at)
+    Indexes on article_id and parent_question_id.
+
+`data` holds the full record as JSON, so the store does not need to change
+when output columns are added.
+"""
+
+import csv
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+# Rows per transaction for bulk upserts
+UPSERT_BATCH_SIZE = 1000
+
+
+class QuestionStore:
+    """
+    Thread-safe keyed store of extended question records.
+
+    Usage:
+        store = QuestionStore(Path("outputs/extended_questions.sqlite3"))
+        store.upsert_many(records)
+        store.export_csv(Path("outputs/extended_questions.csv"), fieldnames)
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS questions (
+                question_id TEXT PRIMARY KEY,
+                article_id TEXT,
+                parent_question_id TEXT,
+                question_category TEXT,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_questions_article ON questions(article_id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_questions_parent ON questions(parent_question_id)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        """Normalize key columns (CSV imports give NaN/'' for missing values)."""
+        if value is None:
+            return None
+        text = str(value)
+        return text if text and text.lower() != 'nan' else None
+
+    def upsert_many(self, records: Iterable[Dict[str, Any]], batch_size: int = UPSERT_BATCH_SIZE) -> int:
+        """
+        Insert or replace records keyed by question_id, batch_size rows per transaction.
+
+        Returns:
+            Number of question_ids that were not in the store before
+        """
+        new_rows = 0
+        batch: List[Dict[str, Any]] = []
+
+        def flush():
+            nonlocal new_rows
+            if not batch:
+                return
+            now = time.time()
+            rows = [
+                (
+                    str(r.get('question_id')),
+                    self._text(r.get('article_id')),
+                    self._text(r.get('parent_question_id')),
+                    self._text(r.get('question_category')),
+                    json.dumps(r, ensure_ascii=False, default=str),
+                    now
+                )
+                for r in batch
+            ]
+            with self._lock:
+                with self._conn:
+                    ids = [row[0] for row in rows]
+                    existing = self._existing_ids_locked(ids)
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO questions "
+                        "(question_id, article_id, parent_question_id, question_category, data, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+                new_rows += len(set(ids) - existing)
+            batch.clear()
+
+        for record in records:
+            if not self._text(record.get('question_id')):
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+        return new_rows
+
+    def _existing_ids_locked(self, ids: List[str]) -> Set[str]:
+        existing: Set[str] = set()
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            existing.update(
+                row[0] for row in self._conn.execute(
+                    f"SELECT question_id FROM questions WHERE question_id IN ({placeholders})", chunk
+                )
+            )
+        return existing
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def article_counts(self) -> Dict[str, int]:
+        """Number of generated questions (rows with a parent) per article."""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT article_id, COUNT(*) FROM questions "
+                "WHERE parent_question_id IS NOT NULL GROUP BY article_id"
+            ).fetchall())
+
+    def article_ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT article_id FROM questions ORDER BY article_id"
+            )]
+
+    def parent_ids(self) -> Set[str]:
+        with self._lock:
+            return {row[0] for row in self._conn.execute(
+                "SELECT DISTINCT parent_question_id FROM questions WHERE parent_question_id IS NOT NULL"
+            )}
+
+    def get_article(self, article_id: str) -> List[Dict[str, Any]]:
+        """All stored records for one article (uses the article_id index)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM questions WHERE article_id = ? ORDER BY rowid", (article_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield every stored record in insertion order without loading them all."""
+        # Separate read connection: WAL lets it stream while writers continue
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            for row in conn.execute("SELECT data FROM questions ORDER BY rowid"):
+                yield json.loads(row[0])
+        finally:
+            conn.close()
+
+    def import_csv(self, csv_path: Path) -> int:
+        """Load an existing extended CSV (e.g. from before the store existed). Returns new rows."""
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            return self.upsert_many(csv.DictReader(f))
+
+    def export_csv(
+        self,
+        csv_path: Path,
+        fieldnames: List[str],
+        records: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> int:
+        """
+        Write records (default: every stored record) to csv_path atomically.
+
+        Returns:
+            Number of rows written
+        """
+        csv_path = Path(csv_path)
+        tmp_path = csv_path.with_name(csv_path.name + ".tmp")
+        written = 0
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            for record in (records if records is not None else self.iter_records()):
+                writer.writerow(record)
+                written += 1
+        tmp_path.replace(csv_path)
+        return written
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
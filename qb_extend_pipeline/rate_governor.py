@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+Rate Governor
+
+One rate governor per (provider, API key), shared by every stage that calls
+Anthropic, OpenAI or OpenRouter: generation (qb_extender.py), QC
+(qc_pipeline), fixes (fix_pipeline) and rewrites (explanation_rewriter.py,
+rewrite_guiding_explanations.py).
+
+Each governor paces three budgets with continuously refilling buckets:
+- requests per minute
+- input tokens per minute
+- output tokens per minute
+
+Limits start from provider defaults and are corrected from response headers
+as soon as they are seen:
+- retry-after
+- anthropic-ratelimit-{requests,tokens,input-tokens,output-tokens}-{limit,remaining,reset}
+- x-ratelimit-{limit,remaining,reset}-{requests,tokens}  (OpenAI)
+- x-ratelimit-{limit,remaining,reset}                    (OpenRouter)
+
+so requests slow down before the API starts returning 429s. Providers that
+don't report per-minute limits (OpenRouter) fall back to adaptive pacing:
+the request rate drops on a 429 and creeps back up after a run of successes.
+
+State is guarded by a threading lock and waits happen outside it (time.sleep
+or asyncio.sleep), so one governor can be shared across threads and event
+loops.
+
+Usage:
+    governor = get_rate_governor_for(client)
+    response = await governed_create(client.chat.completions, governor, model=..., messages=...)
+"""
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Starting limits per provider until headers report the real ones.
+# None = unlimited until a header says otherwise.
+PROVIDER_DEFAULTS: Dict[str, Dict[str, Optional[float]]] = {
+    'anthropic': {'rpm': 1000, 'input_tpm': None, 'output_tpm': None},
+    'openai': {'rpm': 500, 'input_tpm': None, 'output_tpm': None},
+    'openrouter': {'rpm': 20, 'input_tpm': None, 'output_tpm': None},
+}
+
+# Burst size (requests) allowed on top of the steady rate
+DEFAULT_BURST = 5
+
+# Adaptive pacing when the provider doesn't report limits
+BACKOFF_FACTOR = 0.7
+RECOVERY_FACTOR = 1.2
+RECOVERY_AFTER_SUCCESSES = 10
+MIN_RPM = 5
+MAX_ADAPTIVE_RPM = 50
+
+# Wait after a 429 that carries no retry-after header
+DEFAULT_RETRY_AFTER = 2.0
+
+# Rough characters-per-token ratio used to estimate input tokens before a call
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: Any) -> int:
+    """Cheap input token estimate for pacing (exact counts come from usage)."""
+    if text is None:
+        return 0
+    if not isinstance(text, str):
+        text = str(text)
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    True for HTTP 429 errors from the Anthropic or OpenAI SDKs (RateLimitError).
+
+    Decided by status code only: message text can contain '429' for unrelated
+    reasons (an id, a token count).
+    """
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status == 429
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse OpenAI-style reset durations ('1s', '6m0s', '20ms', '1h2m') into seconds."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value):
+        matched = True
+        amount = float(amount)
+        total += {'ms': amount / 1000, 's': amount, 'm': amount * 60, 'h': amount * 3600}[unit]
+    return total if matched else None
+
+
+def _parse_reset(value: str, now: float) -> Optional[float]:
+    """Parse a reset header (RFC 3339 time, epoch seconds/ms, or duration) into seconds from now."""
+    value = value.strip()
+    if not value:
+        return None
+    if 'T' in value and '-' in value:
+        try:
+            reset_at = datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+            return max(0.0, reset_at - time.time())
+        except ValueError:
+            return None
+    try:
+        number = float(value)
+    except ValueError:
+        return _parse_duration(value)
+    # Epoch timestamps (OpenRouter reports milliseconds)
+    if number > 1e12:
+        return max(0.0, number / 1000 - time.time())
+    if number > 1e9:
+        return max(0.0, number - time.time())
+    return number
+
+
+class _Bucket:
+    """Continuously refilling budget; level may go negative (debt) to queue callers."""
+
+    def __init__(self, per_minute: Optional[float], capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity or 0.0
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        if self.per_minute:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.per_minute / 60.0)
+        self.updated = now
+
+    def wait_for(self) -> float:
+        """Seconds until the level is back to zero (0 if not in debt or unlimited)."""
+        if not self.per_minute or self.level >= 0:
+            return 0.0
+        return -self.level * 60.0 / self.per_minute
+
+    def set_rate(self, per_minute: Optional[float], capacity: Optional[float] = None):
+        """Change the rate without discarding the current level."""
+        was_unlimited = not self.per_minute
+        self.per_minute = per_minute
+        self.capacity = capacity if capacity is not None else per_minute
+        if self.capacity is not None:
+            # A newly limited bucket starts full (headers then cap it at 'remaining')
+            self.level = self.capacity if was_unlimited else min(self.level, self.capacity)
+
+
+class RateGovernor:
+    """Paces requests and tokens for one provider + API key. Thread- and event-loop-safe."""
+
+    def __init__(
+        self,
+        provider: str,
+        rpm: Optional[float] = None,
+        input_tpm: Optional[float] = None,
+        output_tpm: Optional[float] = None,
+        burst: int = DEFAULT_BURST
+    ):
+        defaults = PROVIDER_DEFAULTS.get(provider, PROVIDER_DEFAULTS['openai'])
+        self.provider = provider
+        self.burst = burst
+        rpm = rpm or defaults['rpm']
+
+        self._lock = threading.Lock()
+        self._requests = _Bucket(rpm, capacity=self._request_capacity(rpm))
+        self._input = _Bucket(input_tpm or defaults['input_tpm'])
+        self._output = _Bucket(output_tpm or defaults['output_tpm'])
+        self._blocked_until = 0.0
+        self._limits_from_headers = False
+        self._consecutive_successes = 0
+
+        self._stats = {
+            'requests': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'rate_limit_hits': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_read_tokens': 0,
+            'cache_creation_tokens': 0
+        }
+
+    def _request_capacity(self, rpm: Optional[float]) -> Optional[float]:
+        if not rpm:
+            return None
+        return max(float(self.burst), rpm / 60.0)
+
+    @property
+    def current_rate(self) -> float:
+        """Current request rate (requests per minute)."""
+        return self._requests.per_minute or 0
+
+    def configure(
+        self,
+        rpm: Optional[float] = None,
+        input_tpm: Optional[float] = None,
+        output_tpm: Optional[float] = None
+    ) -> None:
+        """Override limits (e.g. from a --rate-limit flag) without losing current state."""
+        with self._lock:
+            if rpm:
+                self._requests.set_rate(rpm, self._request_capacity(rpm))
+            if input_tpm:
+                self._input.set_rate(input_tpm)
+            if output_tpm:
+                self._output.set_rate(output_tpm)
+
+    def _reserve(self, input_tokens: int) -> float:
+        """Take a request slot and input tokens; return how long the caller must wait."""
+        now = time.monotonic()
+        with self._lock:
+            for bucket in (self._requests, self._input, self._output):
+                bucket.refill(now)
+            self._requests.level -= 1
+            if self._input.per_minute:
+                self._input.level -= input_tokens
+            self._stats['requests'] += 1
+
+            wait = max(
+                self._requests.wait_for(),
+                self._input.wait_for(),
+                self._output.wait_for(),
+                self._blocked_until - now
+            )
+            if wait > 0:
+                self._stats['waits'] += 1
+                self._stats['wait_seconds'] += wait
+            return max(0.0, wait)
+
+    async def acquire(self, input_tokens: int = 0) -> None:
+        """Wait (asynchronously) until a request with input_tokens may be sent."""
+        wait = self._reserve(input_tokens)
+        if wait > 0:
+            logger.debug(f"Rate governor [{self.provider}]: waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, input_tokens: int = 0) -> None:
+        """Blocking variant of acquire() for threaded callers."""
+        wait = self._reserve(input_tokens)
+        if wait > 0:
+            logger.debug(f"Rate governor [{self.provider}]: waiting {wait:.2f}s")
+            time.sleep(wait)
+
+    def record_usage(
+        self,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        estimated_input: int = 0,
+        cache_read_tokens: int = 0,
+        cache_creation_tokens: int = 0
+    ) -> None:
+        """Charge actual token usage (correcting the input estimate taken in acquire)."""
+        with self._lock:
+            self._stats['cache_read_tokens'] += cache_read_tokens
+            self._stats['cache_creation_tokens'] += cache_creation_tokens
+            if self._input.per_minute:
+                self._input.level -= max(0, input_tokens - estimated_input)
+            if self._output.per_minute:
+                self._output.level -= output_tokens
+            self._stats['input_tokens'] += input_tokens
+            self._stats['output_tokens'] += output_tokens
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Sync limits and remaining budgets with the provider's rate limit headers."""
+        if not headers:
+            return
+        lower = {str(k).lower(): str(v) for k, v in headers.items()}
+        now = time.monotonic()
+
+        # (limit, remaining, reset) header names per bucket
+        families = {
+            'requests': [
+                ('anthropic-ratelimit-requests-limit', 'anthropic-ratelimit-requests-remaining',
+                 'anthropic-ratelimit-requests-reset'),
+                ('x-ratelimit-limit-requests', 'x-ratelimit-remaining-requests', 'x-ratelimit-reset-requests'),
+            ],
+            'input': [
+                ('anthropic-ratelimit-input-tokens-limit', 'anthropic-ratelimit-input-tokens-remaining',
+                 'anthropic-ratelimit-input-tokens-reset'),
+                ('anthropic-ratelimit-tokens-limit', 'anthropic-ratelimit-tokens-remaining',
+                 'anthropic-ratelimit-tokens-reset'),
+                ('x-ratelimit-limit-tokens', 'x-ratelimit-remaining-tokens', 'x-ratelimit-reset-tokens'),
+            ],
+            'output': [
+                ('anthropic-ratelimit-output-tokens-limit', 'anthropic-ratelimit-output-tokens-remaining',
+                 'anthropic-ratelimit-output-tokens-reset'),
+            ],
+        }
+
+        with self._lock:
+            for name, bucket in (('requests', self._requests), ('input', self._input), ('output', self._output)):
+                for limit_key, remaining_key, reset_key in families[name]:
+                    if limit_key not in lower and remaining_key not in lower:
+                        continue
+                    limit, remaining, reset = self._read_family(lower, limit_key, remaining_key, reset_key, now)
+                    if limit:
+                        capacity = self._request_capacity(limit) if name == 'requests' else limit
+                        bucket.set_rate(limit, capacity)
+                        self._limits_from_headers = True
+                    if remaining is not None:
+                        bucket.refill(now)
+                        bucket.level = min(bucket.level, remaining)
+                        if remaining <= 0 and reset:
+                            self._blocked_until = max(self._blocked_until, now + reset)
+                    break
+
+            # OpenRouter: x-ratelimit-{limit,remaining,reset} for the current interval
+            if 'x-ratelimit-remaining' in lower:
+                try:
+                    remaining = float(lower['x-ratelimit-remaining'])
+                except ValueError:
+                    remaining = None
+                reset = _parse_reset(lower.get('x-ratelimit-reset', ''), now)
+                if remaining is not None and remaining <= 0 and reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+
+            retry_after = lower.get('retry-after')
+            if retry_after:
+                seconds = _parse_reset(retry_after, now)
+                if seconds:
+                    self._blocked_until = max(self._blocked_until, now + seconds)
+
+    @staticmethod
+    def _read_family(
+        lower: Dict[str, str],
+        limit_key: str,
+        remaining_key: str,
+        reset_key: str,
+        now: float
+    ) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        def number(key: str) -> Optional[float]:
+            try:
+                return float(lower[key]) if key in lower else None
+            except ValueError:
+                return None
+        return number(limit_key), number(remaining_key), _parse_reset(lower.get(reset_key, ''), now)
+
+    def report_success(self) -> None:
+        """Count a successful request; adaptive pacing slowly raises the rate."""
+        with self._lock:
+            self._consecutive_successes += 1
+            if (
+                not self._limits_from_headers
+                and self._consecutive_successes >= RECOVERY_AFTER_SUCCESSES
+                and self.current_rate < MAX_ADAPTIVE_RPM
+            ):
+                rpm = min(MAX_ADAPTIVE_RPM, self.current_rate * RECOVERY_FACTOR)
+                self._requests.set_rate(rpm, self._request_capacity(rpm))
+                self._consecutive_successes = 0
+                logger.info(f"Rate governor [{self.provider}]: increased rate to {rpm:.0f}/min")
+
+    def report_rate_limit(self, error: Optional[BaseException] = None) -> float:
+        """
+        Record a 429: honour retry-after (or back off) and, for providers without
+        limit headers, lower the request rate. Returns seconds until the next slot.
+        """
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        self.update_from_headers(headers)
+
+        now = time.monotonic()
+        with self._lock:
+            self._stats['rate_limit_hits'] += 1
+            self._consecutive_successes = 0
+            if self._blocked_until <= now:
+                self._blocked_until = now + DEFAULT_RETRY_AFTER
+            if not self._limits_from_headers:
+                rpm = max(MIN_RPM, self.current_rate * BACKOFF_FACTOR)
+                self._requests.set_rate(rpm, self._request_capacity(rpm))
+                logger.warning(f"Rate governor [{self.provider}]: decreased rate to {rpm:.0f}/min after rate limit")
+            return self._blocked_until - now
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['provider'] = self.provider
+            stats['rpm'] = self._requests.per_minute
+            stats['input_tpm'] = self._input.per_minute
+            stats['output_tpm'] = self._output.per_minute
+            stats['limits_from_headers'] = self._limits_from_headers
+        return stats
+
+
+# Global governors, one per (provider, API key)
+_governors: Dict[Tuple[str, str], RateGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def _key_id(api_key: Optional[str]) -> str:
+    return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:12]
+
+
+def get_rate_governor(provider: str, api_key: Optional[str] = None, rpm: Optional[float] = None) -> RateGovernor:
+    """
+    Get or create the governor for provider + API key.
+
+    rpm sets the starting request rate of a new governor only; an existing
+    governor keeps the rate it has learned from headers and 429s (call
+    configure() to override it explicitly).
+    """
+    key = (provider, _key_id(api_key))
+    with _governors_lock:
+        governor = _governors.get(key)
+        if governor is None:
+            governor = RateGovernor(provider, rpm=rpm)
+            _governors[key] = governor
+        return governor
+
+
+def provider_for_client(client: Any) -> str:
+    """'anthropic', 'openrouter' or 'openai' for an SDK client instance."""
+    if type(client).__module__.startswith('anthropic'):
+        return 'anthropic'
+    if 'openrouter' in str(getattr(client, 'base_url', '')):
+        return 'openrouter'
+    return 'openai'
+
+
+def get_rate_governor_for(client: Any, rpm: Optional[float] = None) -> RateGovernor:
+    """Governor for an Anthropic / OpenAI / OpenRouter SDK client (keyed by its API key)."""
+    return get_rate_governor(provider_for_client(client), getattr(client, 'api_key', None), rpm=rpm)
+
+
+def get_all_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every governor, keyed by 'provider:key-hash'."""
+    with _governors_lock:
+        items = list(_governors.items())
+    return {f"{provider}:{key_id}": governor.get_stats() for (provider, key_id), governor in items}
+
+
+def usage_tokens(response: Any) -> Tuple[int, int]:
+    """(input, output) tokens reported for a response (0, 0 if it has no usage)."""
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return 0, 0
+    # Anthropic: input_tokens/output_tokens (+ cache reads/writes); OpenAI: prompt/completion_tokens
+    input_tokens = (
+        getattr(usage, 'input_tokens', None)
+        or getattr(usage, 'prompt_tokens', None)
+        or 0
+    )
+    input_tokens += (getattr(usage, 'cache_creation_input_tokens', None) or 0)
+    output_tokens = (
+        getattr(usage, 'output_tokens', None)
+        or getattr(usage, 'completion_tokens', None)
+        or 0
+    )
+    return int(input_tokens), int(output_tokens)
+
+
+def record_usage(usage: Dict[str, Dict[str, int]], model: str, response: Any) -> None:
+    """Add one response's call and tokens to per-model usage: {model: {'calls', 'input_tokens', 'output_tokens'}}."""
+    input_tokens, output_tokens = usage_tokens(response)
+    totals = usage.setdefault(model, {'calls': 0, 'input_tokens': 0, 'output_tokens': 0})
+    totals['calls'] += 1
+    totals['input_tokens'] += input_tokens
+    totals['output_tokens'] += output_tokens
+
+
+# USD per million (input, output) tokens, matched by substring of the model name
+MODEL_PRICES = {
+    'opus': (15.0, 75.0),
+    'sonnet': (3.0, 15.0),
+    'haiku': (1.0, 5.0),
+    'gpt-4o-mini': (0.15, 0.6),
+    'gpt-4o': (2.5, 10.0),
+    'gpt-4-turbo': (10.0, 30.0),
+}
+
+
+def estimate_cost_usd(model: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    """Approximate list-price cost of a call, or None for unknown models."""
+    for name, (input_price, output_price) in MODEL_PRICES.items():
+        if name in (model or '').lower():
+            return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+    return None
+
+
+def _field(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def cache_usage_tokens(response: Any) -> Tuple[int, int]:
+    """
+    (cache_read, cache_creation) prompt tokens reported for a response.
+
+    Anthropic: usage.cache_read_input_tokens / cache_creation_input_tokens.
+    OpenAI / OpenRouter: usage.prompt_tokens_details.cached_tokens (and
+    cache_write_tokens where OpenRouter reports it).
+    """
+    usage = _field(response, 'usage')
+    if usage is None:
+        return 0, 0
+    read = _field(usage, 'cache_read_input_tokens') or 0
+    creation = _field(usage, 'cache_creation_input_tokens') or 0
+    details = _field(usage, 'prompt_tokens_details')
+    if details is not None:
+        read = read or _field(details, 'cached_tokens') or 0
+        creation = creation or _field(details, 'cache_write_tokens') or 0
+    return int(read), int(creation)
+
+
+async def governed_create(resource: Any, governor: RateGovernor, **kwargs: Any) -> Any:
+    """
+    Call resource.create(**kwargs) under the governor and feed back headers and usage.
+
+    resource is an async SDK resource such as client.chat.completions or
+    client.messages. On a 429 the governor is told (so every caller sharing the
+    key slows down) and the error is re-raised for the caller's retry loop.
+    """
+    estimated = estimate_tokens(kwargs.get('messages')) + estimate_tokens(kwargs.get('system'))
+    await governor.acquire(estimated)
+    try:
+        raw = await resource.with_raw_response.create(**kwargs)
+    except Exception as e:
+        if is_rate_limit_error(e):
+            governor.report_rate_limit(e)
+        raise
+    governor.update_from_headers(raw.headers)
+    # AsyncAnthropic's raw response parses asynchronously, OpenAI's synchronously
+    response = raw.parse()
+    if inspect.isawaitable(response):
+        response = await response
+    input_tokens, output_tokens = usage_tokens(response)
+    cache_read, cache_creation = cache_usage_tokens(response)
+    governor.record_usage(
+        input_tokens, output_tokens, estimated_input=estimated,
+        cache_read_tokens=cache_read, cache_creation_tokens=cache_creation
+    )
+    logger.debug(
+        f"Rate governor [{governor.provider}]: {input_tokens} in ({cache_read} cache read, "
+        f"{cache_creation} cache write), {output_tokens} out"
+    )
+    governor.report_success()
+    return response
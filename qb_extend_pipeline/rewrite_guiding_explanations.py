@@ -12,7 +12,6 @@ import json
 import logging
 import os
 import random
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List
@@ -24,6 +23,8 @@ load_dotenv(SCRIPT_DIR / ".env")
 
 from openai import AsyncOpenAI
 
+from rate_governor import get_rate_governor_for, governed_create, is_rate_limit_error
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -45,44 +46,13 @@ CHECKPOINT_FILE = OUTPUT_DIR / "guiding_rewrite_checkpoint.json"
 LOG_DIR = OUTPUT_DIR / "guiding_rewrite_logs"
 
 
-class TokenBucketRateLimiter:
-    """Token bucket rate limiter for smooth request distribution."""
-    
-    def __init__(self, rate_per_minute: int = 25, burst_size: int = 5):
-        self.rate_per_second = rate_per_minute / 60.0
-        self.max_tokens = burst_size
-        self.tokens = burst_size
-        self.last_update = time.monotonic()
-        self._lock = asyncio.Lock()
-    
-    async def acquire(self):
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self.last_update
-            self.tokens = min(self.max_tokens, self.tokens + elapsed * self.rate_per_second)
-            self.last_update = now
-            
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return
-            
-            wait_time = (1 - self.tokens) / self.rate_per_second
-            
-        if wait_time > 0:
-            await asyncio.sleep(wait_time)
-            
-        async with self._lock:
-            self.tokens = 0
-            self.last_update = time.monotonic()
-
-
 class GuidingExplanationRewriter:
     """Rewrites guiding question explanations for Grade 3 readability."""
     
     def __init__(self, client: AsyncOpenAI, model: str = DEFAULT_MODEL):
         self.client = client
         self.model = model
-        self.rate_limiter = TokenBucketRateLimiter(rate_per_minute=30, burst_size=5)
+        self.rate_governor = get_rate_governor_for(client, rpm=30)
         self.stats = {'processed': 0, 'errors': 0}
     
     def _build_prompt(self, question_data: Dict[str, Any]) -> str:
@@ -167,9 +137,9 @@ D) {explanations.get('D', '')}
             
             for attempt in range(MAX_RETRIES):
                 try:
-                    await self.rate_limiter.acquire()
-                    
-                    response = await self.client.chat.completions.create(
+                    response = await governed_create(
+                        self.client.chat.completions,
+                        self.rate_governor,
                         model=self.model,
                         max_tokens=1000,
                         messages=[{"role": "user", "content": prompt}],
@@ -209,8 +179,7 @@ D) {explanations.get('D', '')}
                         pass
                     
                 except Exception as e:
-                    error_str = str(e)
-                    if '429' in error_str or 'rate' in error_str.lower():
+                    if is_rate_limit_error(e):
                         delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, JITTER_FACTOR), MAX_DELAY)
                         logger.warning(f"Rate limit for {question_id}, retry in {delay:.1f}s")
                         await asyncio.sleep(delay)
@@ -0,0 +1,120 @@
+"""governed_create against real SDK clients over a mock HTTP transport.
+
+The anthropic SDK is built on httpx2 and rejects httpx objects; the openai
+SDK still takes httpx.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import httpx2
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI, BadRequestError, RateLimitError
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rate_governor import RateGovernor, get_rate_governor, governed_create, is_rate_limit_error
+
+
+def _anthropic_handler(request: httpx2.Request) -> httpx2.Response:
+    return httpx2.Response(
+        200,
+        headers={'anthropic-ratelimit-requests-limit': '4000'},
+        json={
+            'id': 'msg_1',
+            'type': 'message',
+            'role': 'assistant',
+            'model': 'claude-sonnet-4-5-20250929',
+            'content': [{'type': 'text', 'text': '{"ok": true}'}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': 120, 'output_tokens': 30}
+        }
+    )
+
+
+def _openai_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        headers={'x-ratelimit-limit-requests': '5000'},
+        json={
+            'id': 'chatcmpl-1',
+            'object': 'chat.completion',
+            'created': 0,
+            'model': 'gpt-4o',
+            'choices': [{
+                'index': 0,
+                'finish_reason': 'stop',
+                'message': {'role': 'assistant', 'content': '{"ok": true}'}
+            }],
+            'usage': {'prompt_tokens': 80, 'completion_tokens': 20, 'total_tokens': 100}
+        }
+    )
+
+
+def test_governed_create_async_anthropic():
+    async def run():
+        client = AsyncAnthropic(
+            api_key='test',
+            http_client=httpx2.AsyncClient(transport=httpx2.MockTransport(_anthropic_handler))
+        )
+        governor = RateGovernor('anthropic')
+        response = await governed_create(
+            client.messages, governor,
+            model='claude-sonnet-4-5-20250929', max_tokens=100,
+            messages=[{'role': 'user', 'content': 'hi'}]
+        )
+        await client.close()
+        return response, governor.get_stats()
+
+    response, stats = asyncio.run(run())
+    assert response.content[0].text == '{"ok": true}'
+    assert stats['input_tokens'] == 120
+    assert stats['output_tokens'] == 30
+
+
+def test_governed_create_async_openai():
+    async def run():
+        client = AsyncOpenAI(
+            api_key='test',
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(_openai_handler))
+        )
+        governor = RateGovernor('openai')
+        response = await governed_create(
+            client.chat.completions, governor,
+            model='gpt-4o', messages=[{'role': 'user', 'content': 'hi'}]
+        )
+        await client.close()
+        return response, governor.get_stats()
+
+    response, stats = asyncio.run(run())
+    assert response.choices[0].message.content == '{"ok": true}'
+    assert stats['input_tokens'] == 80
+    assert stats['output_tokens'] == 20
+
+
+def test_get_rate_governor_keeps_learned_rate():
+    governor = get_rate_governor('openrouter', 'test-keep-rate', rpm=25)
+    assert governor.current_rate == 25
+    governor.report_rate_limit()
+    learned = governor.current_rate
+    assert learned < 25
+
+    assert get_rate_governor('openrouter', 'test-keep-rate', rpm=25) is governor
+    assert governor.current_rate == learned
+
+
+def test_is_rate_limit_error_uses_status_code():
+    request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+    rate_limited = RateLimitError(
+        'Too many requests', response=httpx.Response(429, request=request), body=None
+    )
+    bad_request = BadRequestError(
+        'max_tokens 4290 exceeds the limit', response=httpx.Response(400, request=request), body=None
+    )
+
+    assert is_rate_limit_error(rate_limited)
+    assert not is_rate_limit_error(bad_request)
+    assert not is_rate_limit_error(ValueError('no result for request req_01429'))